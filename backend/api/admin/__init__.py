@@ -6,7 +6,6 @@ and enhanced user experience for all models.
 """
 
 from django.contrib import admin
-from ..models import User, ProgramOutcome, LearningOutcome, Course
 
 # =============================================================================
 # ADMIN SITE CUSTOMIZATION
@@ -29,15 +28,8 @@ from .achievement import StudentPOAchievementAdmin, StudentLOAchievementAdmin
 from .contact import ContactRequestAdmin
 from .activity import ActivityLogAdmin
 
-# =============================================================================
-# AUTOCOMPLETE CONFIGURATION
-# =============================================================================
-
-# Enable autocomplete for better performance with large datasets
-User.search_fields = ['username', 'email', 'student_id']
-ProgramOutcome.search_fields = ['code', 'title']
-LearningOutcome.search_fields = ['code', 'title', 'course__code']
-Course.search_fields = ['code', 'name']
+# Changelist and autocomplete searches go through FullTextSearchAdminMixin
+# (api/search.py), so they use the search_vector GIN indexes.
 
 __all__ = [
     'UserAdmin',
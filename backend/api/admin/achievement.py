@@ -9,6 +9,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement, ActivityLog,
     AssessmentLO, LOPO
 )
+from ..search import FullTextSearchAdminMixin
 
 
 # =============================================================================
@@ -16,7 +17,7 @@ from ..models import (
 # =============================================================================
 
 @admin.register(StudentPOAchievement)
-class StudentPOAchievementAdmin(admin.ModelAdmin):
+class StudentPOAchievementAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Student PO Achievement Admin with progress tracking
     """
@@ -72,6 +73,8 @@ class StudentPOAchievementAdmin(admin.ModelAdmin):
                     'target_status', 'completion_display', 'last_calculated']
     list_filter = ['program_outcome', 'student__department', 'last_calculated']
     search_fields = ['student__username', 'student__student_id', 'program_outcome__code']
+    search_vectors = ['student__search_vector', 'program_outcome__search_vector']
+    search_trigram_fields = ['student__student_id', 'student__username', 'program_outcome__code']
     autocomplete_fields = ['student', 'program_outcome']
     date_hierarchy = 'last_calculated'
     readonly_fields = ['last_calculated']
@@ -94,7 +97,7 @@ class StudentPOAchievementAdmin(admin.ModelAdmin):
 # =============================================================================
 
 @admin.register(StudentLOAchievement)
-class StudentLOAchievementAdmin(admin.ModelAdmin):
+class StudentLOAchievementAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Student LO Achievement Admin with progress tracking and badges
     """
@@ -160,6 +163,10 @@ class StudentLOAchievementAdmin(admin.ModelAdmin):
     list_filter = ['learning_outcome__course', 'student__department', 'last_calculated']
     search_fields = ['student__username', 'student__student_id', 
                      'learning_outcome__code', 'learning_outcome__course__code']
+    search_vectors = ['student__search_vector', 'learning_outcome__search_vector',
+                      'learning_outcome__course__search_vector']
+    search_trigram_fields = ['student__student_id', 'student__username',
+                             'learning_outcome__code', 'learning_outcome__course__code']
     autocomplete_fields = ['student', 'learning_outcome']
     date_hierarchy = 'last_calculated'
     readonly_fields = ['last_calculated']
@@ -9,10 +9,11 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement, ActivityLog,
     AssessmentLO, LOPO
 )
+from ..search import FullTextSearchAdminMixin
 
 
 @admin.register(ActivityLog)
-class ActivityLogAdmin(admin.ModelAdmin):
+class ActivityLogAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """Admin interface for Activity Logs"""
     
     def action_display(self, obj):
@@ -66,6 +67,8 @@ class ActivityLogAdmin(admin.ModelAdmin):
     list_filter = ['action_type', 'institution', 'department', 'created_at']
     search_fields = ['description', 'user__username', 'user__email', 
                      'institution__username', 'institution__email']
+    search_vectors = ['search_vector', 'user__search_vector', 'institution__search_vector']
+    search_trigram_fields = ['user__username', 'institution__username']
     readonly_fields = ['created_at']
     date_hierarchy = 'created_at'
     ordering = ['-created_at']
@@ -9,6 +9,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement, ActivityLog,
     AssessmentLO, LOPO
 )
+from ..search import FullTextSearchAdminMixin
 
 
 # =============================================================================
@@ -37,7 +38,7 @@ class EnrollmentInline(admin.TabularInline):
 # =============================================================================
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Course Admin with semester badges and inlines
     """
@@ -80,6 +81,7 @@ class CourseAdmin(admin.ModelAdmin):
                     'credits_badge', 'academic_year', 'enrolled_count']
     list_filter = ['department', 'semester', 'academic_year', 'teacher']
     search_fields = ['code', 'name', 'description']
+    search_trigram_fields = ['code']
     autocomplete_fields = ['teacher']
     date_hierarchy = 'created_at'
     
@@ -103,7 +105,7 @@ class CourseAdmin(admin.ModelAdmin):
 # =============================================================================
 
 @admin.register(CoursePO)
-class CoursePOAdmin(admin.ModelAdmin):
+class CoursePOAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Course-PO Mapping Admin
     """
@@ -120,6 +122,8 @@ class CoursePOAdmin(admin.ModelAdmin):
     list_display = ['course', 'program_outcome', 'weight_badge', 'created_at']
     list_filter = ['course__department', 'program_outcome']
     search_fields = ['course__code', 'course__name', 'program_outcome__code']
+    search_vectors = ['course__search_vector', 'program_outcome__search_vector']
+    search_trigram_fields = ['course__code', 'program_outcome__code']
     autocomplete_fields = ['course', 'program_outcome']
     date_hierarchy = 'created_at'
 
@@ -129,7 +133,7 @@ class CoursePOAdmin(admin.ModelAdmin):
 # =============================================================================
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Enrollment Admin with grade display
     """
@@ -175,5 +179,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
     list_display = ['student', 'course', 'status_badge', 'grade_display', 'enrolled_at']
     list_filter = ['is_active', 'course__department', 'enrolled_at']
     search_fields = ['student__username', 'student__student_id', 'course__code', 'course__name']
+    search_vectors = ['student__search_vector', 'course__search_vector']
+    search_trigram_fields = ['student__student_id', 'student__username', 'course__code']
     autocomplete_fields = ['student', 'course']
     date_hierarchy = 'enrolled_at'
@@ -9,6 +9,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement, ActivityLog,
     AssessmentLO, LOPO
 )
+from ..search import FullTextSearchAdminMixin
 
 
 # =============================================================================
@@ -16,7 +17,7 @@ from ..models import (
 # =============================================================================
 
 @admin.register(ProgramOutcome)
-class ProgramOutcomeAdmin(admin.ModelAdmin):
+class ProgramOutcomeAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Program Outcome Admin with target percentage badges
     """
@@ -46,6 +47,7 @@ class ProgramOutcomeAdmin(admin.ModelAdmin):
     list_display = ['code', 'title', 'department', 'target_badge', 'status_badge', 'is_active', 'created_at']
     list_filter = ['department', 'is_active']
     search_fields = ['code', 'title', 'description']
+    search_trigram_fields = ['code']
     date_hierarchy = 'created_at'
     
     fieldsets = (
@@ -74,7 +76,7 @@ class LOPOInline(admin.TabularInline):
 
 
 @admin.register(LearningOutcome)
-class LearningOutcomeAdmin(admin.ModelAdmin):
+class LearningOutcomeAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     """
     Learning Outcome Admin with course and target badges
     """
@@ -113,6 +115,8 @@ class LearningOutcomeAdmin(admin.ModelAdmin):
     list_display = ['code', 'title', 'course_display', 'target_badge', 'status_badge', 'is_active', 'created_at']
     list_filter = ['course__department', 'is_active', 'course']
     search_fields = ['code', 'title', 'description', 'course__code', 'course__name']
+    search_vectors = ['search_vector', 'course__search_vector']
+    search_trigram_fields = ['code', 'course__code']
     autocomplete_fields = ['course']
     date_hierarchy = 'created_at'
     inlines = [LOPOInline]
@@ -9,6 +9,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement, ActivityLog,
     AssessmentLO, LOPO
 )
+from ..search import FullTextSearchAdminMixin
 
 
 # =============================================================================
@@ -16,7 +17,7 @@ from ..models import (
 # =============================================================================
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(FullTextSearchAdminMixin, BaseUserAdmin):
     """
     Enhanced User Admin with role badges and better organization
     """
@@ -39,6 +40,7 @@ class UserAdmin(BaseUserAdmin):
     list_display = ['username', 'email', 'role_badge', 'department', 'student_id', 'is_active', 'date_joined']
     list_filter = ['role', 'department', 'is_active', 'year_of_study']
     search_fields = ['username', 'email', 'student_id', 'first_name', 'last_name']
+    search_trigram_fields = ['student_id', 'username', 'first_name', 'last_name']
     list_editable = ['is_active']
     
     fieldsets = (
@@ -140,6 +140,57 @@ def invalidate_dashboard_cache(user_id=None, role=None):
         invalidate_cache_pattern("dashboard:*")
 
 
+def curriculum_cache_key(department):
+    """
+    Cache key for the assembled curriculum of a department
+    
+    Args:
+        department: Department name
+    
+    Returns:
+        str: Cache key
+    """
+    department_hash = hashlib.md5((department or '').encode()).hexdigest()[:12]
+    return f"curriculum:department_{department_hash}"
+
+
+def invalidate_curriculum_cache(*departments):
+    """
+    Invalidate cached curriculum for one or more departments
+    
+    Args:
+        *departments: Department names
+    """
+    keys = {curriculum_cache_key(department) for department in departments if department}
+    if keys:
+        cache.delete_many(list(keys))
+
+
+def lo_heatmap_cache_key(course_id):
+    """
+    Cache key for the student x LO heatmap of a course
+    
+    Args:
+        course_id: Course ID
+    
+    Returns:
+        str: Cache key
+    """
+    return f"lo_heatmap:course_{course_id}"
+
+
+def invalidate_lo_heatmap_cache(*course_ids):
+    """
+    Invalidate cached LO heatmaps for one or more courses
+    
+    Args:
+        *course_ids: Course IDs
+    """
+    keys = {lo_heatmap_cache_key(course_id) for course_id in course_ids if course_id}
+    if keys:
+        cache.delete_many(list(keys))
+
+
 def get_or_set_cache(key, timeout, callable_func, *args, **kwargs):
     """
     Get value from cache or set it by calling a function
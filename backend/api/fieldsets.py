@@ -0,0 +1,307 @@
+"""
+AcuRate - Sparse Fieldsets
+
+``?fields=`` and ``?expand=`` for read requests on the api serializers, and
+a queryset optimizer that loads only what the requested fields read.
+
+``?fields=id,code,program_outcomes.po_code`` keeps the listed fields (dotted
+names select fields of a nested serializer); every other field is dropped
+before anything is computed, so unrequested method fields never run.
+``?expand=teacher`` replaces a primary key with the related object, using the
+serializer named in the serializer's ``expandable_fields``. Without either
+parameter the response is unchanged.
+
+``optimize_queryset`` walks the fields that are left and adds the
+``select_related`` / ``prefetch_related`` lookups they traverse. When the
+client asked for specific fields it also drops the view's own eager loading
+and restricts the columns with ``only()``, as long as every field can be
+traced to columns; method fields and model properties declare what they read
+in the serializer's ``optimizer_hints``.
+
+Usage:
+    class CourseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+        expandable_fields = {'teacher': ('api.serializers.user.UserSerializer', {})}
+        optimizer_hints = {'teacher_name': {'select_related': ['teacher'], 'only': ['teacher']}}
+
+    class CourseViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+        ...
+
+    GET /api/courses/?fields=id,code,teacher_name
+    GET /api/enrollments/?expand=course&fields=id,course.code
+"""
+
+from dataclasses import dataclass, field as dataclass_field
+from typing import Any, Iterator
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from .search import defer_search_vectors
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+OPTIMIZED_ACTIONS = ('list', 'retrieve')  # Viewset actions whose queryset is optimized
+
+FieldSpec = dict[str, 'FieldSpec']  # {'course': {'code': {}}} for "course.code"
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def parse_field_spec(value: str | None) -> FieldSpec:
+    """Parse ``"a,b.c,b.d"`` into ``{'a': {}, 'b': {'c': {}, 'd': {}}}``."""
+    spec: FieldSpec = {}
+    for item in (value or '').split(','):
+        node = spec
+        for name in filter(None, (part.strip() for part in item.split('.'))):
+            node = node.setdefault(name, {})
+    return spec
+
+
+def _dynamic_child(field: serializers.Field) -> 'DynamicFieldsMixin | None':
+    """Return the dynamic serializer behind a (possibly many=True) field."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return field if isinstance(field, DynamicFieldsMixin) else None
+
+
+# =============================================================================
+# SERIALIZER MIXIN
+# =============================================================================
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin that honours ``?fields=`` / ``?expand=`` on safe requests.
+
+    Only the outermost serializer reads the query string; nested dynamic
+    serializers receive their part of the spec from their parent. Unknown
+    names are ignored. Write requests always use the full field set.
+
+    Class attributes:
+        expandable_fields: ``{name: (dotted serializer path, kwargs)}``
+        optimizer_hints: ``{name: {'select_related': [...],
+            'prefetch_related': [lookup or callable returning a Prefetch],
+            'annotate': callable returning annotations,
+            'only': [columns]}}`` for fields the optimizer cannot trace
+            from their ``source``; omit ``only`` if the columns are unknown.
+    """
+
+    expandable_fields: dict[str, tuple[str, dict[str, Any]]] = {}
+    optimizer_hints: dict[str, dict[str, Any]] = {}
+
+    def _is_outermost(self) -> bool:
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_field_spec(self) -> tuple[FieldSpec, FieldSpec]:
+        """Return the (fields, expand) spec that applies to this serializer."""
+        if hasattr(self, '_field_spec'):
+            return self._field_spec
+        request = self.context.get('request')
+        if not self._is_outermost() or request is None or request.method not in SAFE_METHODS:
+            return {}, {}
+        params = getattr(request, 'query_params', request.GET)
+        return (
+            parse_field_spec(params.get(FIELDS_QUERY_PARAM)),
+            parse_field_spec(params.get(EXPAND_QUERY_PARAM)),
+        )
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        fields = super().get_fields()
+        requested, expand = self.get_field_spec()
+
+        for name in expand:
+            if name not in self.expandable_fields or (requested and name not in requested):
+                continue
+            path, kwargs = self.expandable_fields[name]
+            fields[name] = import_string(path)(read_only=True, **kwargs)
+
+        if requested:
+            fields = {name: value for name, value in fields.items() if name in requested}
+
+        for name, value in fields.items():
+            child = _dynamic_child(value)
+            if child is not None:
+                child._field_spec = (requested.get(name, {}), expand.get(name, {}))
+        return fields
+
+
+# =============================================================================
+# QUERYSET OPTIMIZER
+# =============================================================================
+
+@dataclass
+class QueryPlan:
+    """Lookups and columns a serializer's fields read."""
+    select_related: set[str] = dataclass_field(default_factory=set)
+    prefetch_related: list[str | Prefetch] = dataclass_field(default_factory=list)
+    annotations: dict[str, Any] = dataclass_field(default_factory=dict)
+    only: set[str] | None = dataclass_field(default_factory=set)
+
+    def add_related(self, lookup: str, prefetched: bool) -> None:
+        if prefetched:
+            self.add_prefetch(lookup)
+        else:
+            self.select_related.add(lookup)
+
+    def add_prefetch(self, lookup: str | Prefetch) -> None:
+        if lookup not in self.prefetch_related:
+            self.prefetch_related.append(lookup)
+
+    def add_only(self, *columns: str) -> None:
+        if self.only is not None:
+            self.only.update(columns)
+
+
+def _apply_hint(plan: QueryPlan, hint: dict[str, Any], prefix: str, prefetched: bool) -> None:
+    """Apply an ``optimizer_hints`` entry; callables only make sense on the root."""
+    for lookup in hint.get('select_related', ()):
+        plan.add_related(prefix + lookup, prefetched)
+    for lookup in hint.get('prefetch_related', ()):
+        if not callable(lookup):
+            plan.add_prefetch(prefix + lookup)
+        elif not prefix:
+            plan.add_prefetch(lookup())
+    if prefix:
+        return
+    if 'annotate' in hint:
+        plan.annotations.update(hint['annotate']())
+    if 'only' in hint:
+        plan.add_only(*hint['only'])
+    else:
+        plan.only = None
+
+
+def _display_column(attr: str) -> str | None:
+    """Return ``x`` for a ``get_x_display`` source."""
+    if attr.startswith('get_') and attr.endswith('_display'):
+        return attr[len('get_'):-len('_display')]
+    return None
+
+
+def collect_plan(serializer: serializers.Serializer, model, plan: QueryPlan,
+                 prefix: str = '', prefetched: bool = False) -> QueryPlan:
+    """Add the lookups and columns ``serializer``'s readable fields use to ``plan``."""
+    root = not prefix
+    hints = getattr(serializer, 'optimizer_hints', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in hints:
+            _apply_hint(plan, hints[name], prefix, prefetched)
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            if root:
+                plan.only = None
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        nested = nested if isinstance(nested, serializers.Serializer) else None
+        current, path, branch_prefetched = model, [], prefetched
+
+        for index, attr in enumerate(field.source_attrs):
+            last = index == len(field.source_attrs) - 1
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # Properties and methods: only their own columns are known
+                if root and index == 0:
+                    column = _display_column(attr)
+                    if column is None:
+                        plan.only = None
+                    else:
+                        plan.add_only(column)
+                break
+
+            path.append(attr)
+            lookup = prefix + '__'.join(path)
+            if not model_field.is_relation:
+                if root and index == 0:
+                    plan.add_only(attr)
+                break
+
+            if model_field.many_to_many or model_field.one_to_many:
+                plan.add_prefetch(lookup)
+                branch_prefetched = True
+            else:
+                if root and index == 0 and model_field.concrete:
+                    plan.add_only(attr)
+                if last and nested is None:
+                    # Primary key fields read the FK column, no join needed
+                    break
+                plan.add_related(lookup, branch_prefetched)
+
+            if last and nested is not None:
+                collect_plan(nested, model_field.related_model, plan, lookup + '__', branch_prefetched)
+            current = model_field.related_model
+    return plan
+
+
+def optimize_queryset(queryset: QuerySet, serializer: serializers.Serializer) -> QuerySet:
+    """
+    Eager-load what ``serializer`` will read from ``queryset``'s rows.
+
+    If the client restricted the fields, the queryset's existing
+    ``select_related`` / ``prefetch_related`` are replaced and the columns
+    restricted with ``only()``; both are skipped when a requested field
+    cannot be traced, so a sparse response never costs extra queries.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    plan = collect_plan(serializer, queryset.model, QueryPlan())
+    restricted = isinstance(serializer, DynamicFieldsMixin) and bool(serializer.get_field_spec()[0])
+
+    if restricted and plan.only is not None:
+        queryset = queryset.select_related(None).prefetch_related(None)
+        queryset = queryset.only(queryset.model._meta.pk.name, *plan.only)
+    if plan.select_related:
+        queryset = queryset.select_related(*sorted(plan.select_related))
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    if plan.annotations:
+        queryset = queryset.annotate(**plan.annotations)
+    return defer_search_vectors(queryset)
+
+
+# =============================================================================
+# VIEW MIXIN
+# =============================================================================
+
+class SparseFieldsetMixin:
+    """
+    Runs ``optimize_queryset`` for the serializer of ``list`` / ``retrieve``.
+
+    Hooked into ``filter_queryset`` so it covers both the list and
+    ``get_object()`` without touching the viewsets' ``get_queryset``.
+    """
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset)
+        if self.action not in OPTIMIZED_ACTIONS or self.request.method not in SAFE_METHODS:
+            return queryset
+        return optimize_queryset(queryset, self.get_serializer())
+
+    def project(self, projection_class, queryset: QuerySet) -> Iterator[dict[str, Any]] | None:
+        """
+        Serialize ``queryset`` lazily with a ``values()`` projection honouring ``?fields=``.
+
+        Returns None if ``?expand=`` asks for nesting, which only the
+        serializer can do.
+        """
+        params = self.request.query_params
+        if params.get(EXPAND_QUERY_PARAM):
+            return None
+        requested = parse_field_spec(params.get(FIELDS_QUERY_PARAM))
+        return projection_class(queryset, fields=set(requested) if requested else None).iter_data()
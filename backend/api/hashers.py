@@ -0,0 +1,63 @@
+"""
+AcuRate - Password Hashing Helpers
+
+Fast hashing for backend-generated temporary passwords.
+
+Bulk student imports generate thousands of random temporary passwords at
+once. Hashing each with the full PBKDF2 work factor keeps a single worker
+busy for minutes, so temporary passwords are hashed with a reduced
+iteration count instead. They are 12 random letters/digits (~71 bits of
+entropy), so the work factor adds little protection for them, and the
+hashes keep the ``pbkdf2_sha256`` algorithm name: Django verifies them with
+the configured hasher and, because the iteration count differs, upgrades
+them to the full work factor on the first successful login
+(``must_update``). Students must change the temporary password on first
+login anyway.
+
+Usage:
+    from api.hashers import make_temporary_password_hashes
+
+    hashes = make_temporary_password_hashes(['a1B2c3D4e5F6', ...])
+"""
+
+from typing import Iterable
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, make_password
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+TEMPORARY_PASSWORD_ITERATIONS = 1000  # Upgraded to the default work factor on first login
+
+
+# =============================================================================
+# HASHERS
+# =============================================================================
+
+class TemporaryPasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with a reduced iteration count for random temporary passwords.
+
+    Not registered in PASSWORD_HASHERS: hashes it produces are identified and
+    verified by the regular PBKDF2 hasher through their algorithm prefix.
+    """
+
+    iterations = TEMPORARY_PASSWORD_ITERATIONS
+
+
+def make_temporary_password_hashes(raw_passwords: Iterable[str]) -> list[str]:
+    """
+    Hash backend-generated temporary passwords for bulk account creation.
+
+    Uses ``TemporaryPasswordHasher`` when the default hasher is PBKDF2-SHA256
+    (so the hashes can be verified and upgraded); otherwise falls back to the
+    default hasher.
+    """
+    default_hasher = get_hasher()
+    if default_hasher.algorithm == TemporaryPasswordHasher.algorithm:
+        hasher = TemporaryPasswordHasher()
+    else:
+        hasher = default_hasher
+    return [make_password(raw_password, hasher=hasher) for raw_password in raw_passwords]
@@ -1,16 +1,26 @@
 """
 AcuRate - Custom Middleware
-Rate limiting, request logging, and security headers
+Rate limiting, request logging, security headers and response compression
 SECURITY: Includes endpoint-specific rate limiting
 """
 
 import logging
+import re
 from functools import wraps
 from django.core.cache import cache
 from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -236,3 +246,86 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
             response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
         
         return response
+
+
+# =============================================================================
+# RESPONSE COMPRESSION
+# =============================================================================
+
+# Payloads that are already compressed; recompressing only costs CPU
+UNCOMPRESSIBLE_CONTENT_TYPES = frozenset({
+    'application/gzip',
+    'application/x-gzip',
+    'application/zip',
+    'application/pdf',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+})
+UNCOMPRESSIBLE_CONTENT_PREFIXES = ('image/', 'audio/', 'video/')
+BROTLI_QUALITY = 5  # Close to gzip's speed with smaller output; 11 is for static assets
+
+_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with brotli when the client and server support it,
+    gzip otherwise.
+
+    Bodies smaller than ``COMPRESSION_MIN_SIZE`` bytes and already
+    compressed content types (gzip/XLSX exports, images) are sent as is.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not self._compressible(response):
+            return response
+        if BROTLI_AVAILABLE and _accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return self._brotli(response)
+        return super().process_response(request, response)
+
+    @staticmethod
+    def _compressible(response) -> bool:
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type in UNCOMPRESSIBLE_CONTENT_TYPES or content_type.startswith(UNCOMPRESSIBLE_CONTENT_PREFIXES):
+            return False
+        return response.streaming or len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+    @staticmethod
+    def _brotli(response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _brotli_async_sequence(response.streaming_content)
+            else:
+                response.streaming_content = _brotli_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _brotli_async_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    async for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
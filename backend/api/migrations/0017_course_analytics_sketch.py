@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:52
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_create_demo_accounts_for_login'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessmentlo',
+            name='weight',
+            field=models.DecimalField(decimal_places=2, default=1.0, help_text='Weight/contribution of this assessment to the LO (0.01-10.0 scale, where 1.0 = 10%, 10.0 = 100%)', max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0.01')), django.core.validators.MaxValueValidator(Decimal('10.0'))]),
+        ),
+        migrations.AlterField(
+            model_name='coursepo',
+            name='weight',
+            field=models.DecimalField(decimal_places=2, default=1.0, help_text='Weight/importance of this PO in the course (default: 1.0)', max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0.1')), django.core.validators.MaxValueValidator(Decimal('10.0'))]),
+        ),
+        migrations.AlterField(
+            model_name='lopo',
+            name='weight',
+            field=models.DecimalField(decimal_places=2, default=1.0, help_text='Weight/contribution of this LO to the PO (0.01-10.0 scale, where 1.0 = 10%, 10.0 = 100%)', max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0.01')), django.core.validators.MaxValueValidator(Decimal('10.0'))]),
+        ),
+        migrations.CreateModel(
+            name='CourseAnalyticsSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('final_grade_count', models.PositiveIntegerField(default=0, help_text='Number of final grades summarised')),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Serialized KLL sketches keyed by metric and segment')),
+                ('is_stale', models.BooleanField(default=False, help_text='Whether the underlying data changed since the last rebuild')),
+                ('built_at', models.DateTimeField(auto_now=True, help_text='When the sketch was last rebuilt')),
+                ('course', models.OneToOneField(help_text='Course summarised by this sketch', on_delete=django.db.models.deletion.CASCADE, related_name='analytics_sketch', to='api.course')),
+            ],
+            options={
+                'verbose_name': 'Course Analytics Sketch',
+                'verbose_name_plural': 'Course Analytics Sketches',
+                'db_table': 'course_analytics_sketches',
+                'indexes': [models.Index(fields=['is_stale'], name='course_anal_is_stal_57cf8d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_course_analytics_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AchievementSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot_date', models.DateField(help_text='Date the snapshot was taken')),
+                ('outcome_type', models.CharField(choices=[('PO', 'Program Outcome'), ('LO', 'Learning Outcome')], help_text='Type of outcome aggregated', max_length=2)),
+                ('department', models.CharField(help_text='Department of the course offering', max_length=100)),
+                ('academic_year', models.CharField(help_text='Academic year of the course offering', max_length=20)),
+                ('semester', models.IntegerField(help_text='Semester of the course offering')),
+                ('student_count', models.PositiveIntegerField(default=0, help_text='Number of students aggregated')),
+                ('achieved_count', models.PositiveIntegerField(default=0, help_text='Number of students at or above the outcome target')),
+                ('average_percentage', models.DecimalField(decimal_places=2, help_text='Average achievement percentage', max_digits=5)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(help_text='Course offering the aggregate belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='achievement_snapshots', to='api.course')),
+                ('learning_outcome', models.ForeignKey(blank=True, help_text='Learning outcome (for LO snapshots)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='api.learningoutcome')),
+                ('program_outcome', models.ForeignKey(blank=True, help_text='Program outcome (for PO snapshots)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='api.programoutcome')),
+            ],
+            options={
+                'verbose_name': 'Achievement Snapshot',
+                'verbose_name_plural': 'Achievement Snapshots',
+                'db_table': 'achievement_snapshots',
+                'ordering': ['-snapshot_date'],
+                'indexes': [models.Index(fields=['program_outcome', 'snapshot_date'], include=('student_count', 'achieved_count', 'average_percentage'), name='snap_po_date_idx'), models.Index(fields=['course', 'outcome_type', 'snapshot_date'], include=('student_count', 'average_percentage'), name='snap_course_date_idx'), models.Index(fields=['department', 'outcome_type', 'snapshot_date'], name='snap_dept_date_idx'), models.Index(fields=['learning_outcome', 'snapshot_date'], name='snap_lo_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:56
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_year_of_study(apps, schema_editor):
+    """
+    Populate year_of_study for existing courses from their codes.
+    
+    Mirrors Course.extract_year_of_study (historical models have no custom methods).
+    """
+    Course = apps.get_model('api', 'Course')
+    
+    def extract(code):
+        match = re.search(r'(\d{3})', code or '')
+        if match and 1 <= int(match.group(1)) // 100 <= 6:
+            return int(match.group(1)) // 100
+        match = re.search(r'(\d)', code or '')
+        if match and 1 <= int(match.group(1)) <= 6:
+            return int(match.group(1))
+        return 0
+    
+    courses = list(Course.objects.only('id', 'code'))
+    for course in courses:
+        course.year_of_study = extract(course.code)
+    Course.objects.bulk_update(courses, ['year_of_study'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_achievement_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='year_of_study',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Year of study derived from the course code (0 if unknown)'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['department', 'year_of_study'], name='courses_departm_ca0cdc_idx'),
+        ),
+        migrations.RunPython(backfill_year_of_study, migrations.RunPython.noop),
+    ]
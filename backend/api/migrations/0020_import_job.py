@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_course_year_of_study'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(choices=[('students', 'Students')], default='students', help_text='Type of data being imported', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', help_text='Current state of the job', max_length=20)),
+                ('file', models.FileField(blank=True, help_text='Uploaded file (deleted after processing)', upload_to='imports/%Y/%m/')),
+                ('original_filename', models.CharField(blank=True, help_text='Name of the uploaded file', max_length=255)),
+                ('options', models.JSONField(blank=True, default=dict, help_text='Import options')),
+                ('total_rows', models.PositiveIntegerField(default=0, help_text='Number of data rows in the file')),
+                ('processed_rows', models.PositiveIntegerField(default=0, help_text='Number of rows processed and committed')),
+                ('success_count', models.PositiveIntegerField(default=0, help_text='Number of records created')),
+                ('skipped_count', models.PositiveIntegerField(default=0, help_text='Number of rows skipped as already existing')),
+                ('errors', models.JSONField(blank=True, default=list, help_text='Per-row errors')),
+                ('message', models.TextField(blank=True, help_text='Failure reason for failed jobs')),
+                ('started_at', models.DateTimeField(blank=True, help_text='When processing started', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When processing finished', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who submitted the import', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Import Job',
+                'verbose_name_plural': 'Import Jobs',
+                'db_table': 'import_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_by', 'created_at'], name='import_jobs_created_3dbaf4_idx'), models.Index(fields=['status'], name='import_jobs_status_46b7f9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_import_job'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='activitylog',
+            name='activity_lo_created_d8c226_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='assessment',
+            name='assessments_due_dat_796263_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollments_enrolle_00c691_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at', '-id'], name='activity_lo_created_fc6e69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['due_date', 'id'], name='assessments_due_dat_b5994a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['enrolled_at', 'id'], name='enrollments_enrolle_13a894_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentgrade',
+            index=models.Index(fields=['graded_at', 'id'], name='student_gra_graded__2da474_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:30
+
+import api.models.managers
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', api.models.managers.UserManager()),
+            ],
+        ),
+    ]
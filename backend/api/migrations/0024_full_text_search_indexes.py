@@ -0,0 +1,59 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+# Trigram indexes for fuzzy / substring matching of identifiers (api/search.py).
+# Created in SQL rather than Meta.indexes so test databases built without
+# migrations (and without pg_trgm) still work.
+TRIGRAM_INDEXES = [
+    ('users_student_id_trgm_idx', 'users', 'student_id'),
+    ('users_username_trgm_idx', 'users', 'username'),
+    ('users_first_name_trgm_idx', 'users', 'first_name'),
+    ('users_last_name_trgm_idx', 'users', 'last_name'),
+    ('courses_code_trgm_idx', 'courses', 'code'),
+    ('program_outcomes_code_trgm_idx', 'program_outcomes', 'code'),
+    ('learning_outcomes_code_trgm_idx', 'learning_outcomes', 'code'),
+]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes concurrently keeps the tables writable while they are built.
+    # A build that fails leaves an INVALID index behind: drop it before
+    # re-running, as IF NOT EXISTS would otherwise keep it.
+    atomic = False
+
+    dependencies = [
+        ('api', '0023_user_manager'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='activitylog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='activity_logs_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='courses_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='learningoutcome',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='learning_outcomes_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='programoutcome',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='program_outcomes_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='users_search_idx'),
+        ),
+        *(
+            migrations.RunSQL(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" USING gin ("{column}" gin_trgm_ops);',
+                reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}";',
+            )
+            for name, table, column in TRIGRAM_INDEXES
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_full_text_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='achievementsnapshot',
+            name='snap_po_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='achievementsnapshot',
+            index=models.Index(condition=models.Q(('outcome_type', 'PO')), fields=['program_outcome', 'snapshot_date'], include=('semester', 'academic_year', 'student_count', 'achieved_count', 'average_percentage'), name='snap_po_date_idx'),
+        ),
+    ]
@@ -27,6 +27,12 @@ from .achievement import StudentPOAchievement, StudentLOAchievement
 # Miscellaneous models
 from .misc import ContactRequest, ActivityLog
 
+# Analytics models
+from .analytics import CourseAnalyticsSketch, AchievementSnapshot
+
+# Import job models
+from .import_job import ImportJob
+
 __all__ = [
     # User
     'User',
@@ -53,6 +59,11 @@ __all__ = [
     # Miscellaneous
     'ContactRequest',
     'ActivityLog',
+    # Analytics
+    'CourseAnalyticsSketch',
+    'AchievementSnapshot',
+    # Import jobs
+    'ImportJob',
 ]
 
 
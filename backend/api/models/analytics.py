@@ -0,0 +1,195 @@
+"""ANALYTICS Models Module"""
+
+from django.db import models
+
+
+# =============================================================================
+# COURSE ANALYTICS SKETCH MODEL
+# =============================================================================
+
+class CourseAnalyticsSketch(models.Model):
+    """
+    Persisted quantile sketches for a single course.
+
+    Holds mergeable KLL sketches (see ``api.sketches``) of the course's final
+    grades and of its students' PO achievements, so institution and
+    department rollups can merge one small payload per course instead of
+    rescanning enrollments.
+
+    Payload layout:
+        {
+            "final_grade": {"<student department>": <sketch>, ...},
+            "po_achievement": {"<program outcome id>": <sketch>, ...}
+        }
+
+    Final grades are segmented by the student's department (inactive
+    students fall into the "" segment) so the department filter of the
+    performance distribution can be answered by merging segments.
+    """
+
+    course = models.OneToOneField(
+        'Course',
+        on_delete=models.CASCADE,
+        related_name='analytics_sketch',
+        help_text="Course summarised by this sketch"
+    )
+
+    final_grade_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of final grades summarised"
+    )
+
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Serialized KLL sketches keyed by metric and segment"
+    )
+
+    is_stale = models.BooleanField(
+        default=False,
+        help_text="Whether the underlying data changed since the last rebuild"
+    )
+
+    built_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the sketch was last rebuilt"
+    )
+
+    class Meta:
+        db_table = 'course_analytics_sketches'
+        verbose_name = 'Course Analytics Sketch'
+        verbose_name_plural = 'Course Analytics Sketches'
+        indexes = [
+            models.Index(fields=['is_stale']),
+        ]
+
+    def __str__(self):
+        return f"Analytics sketch for course {self.course_id}"
+
+
+# =============================================================================
+# ACHIEVEMENT SNAPSHOT MODEL
+# =============================================================================
+
+class AchievementSnapshot(models.Model):
+    """
+    Periodic snapshot of aggregated PO/LO achievement for one course offering.
+
+    Student achievement models only keep the latest value; snapshots keep a
+    compact history (one row per outcome, course offering and snapshot date)
+    so trends and deltas can be read with range scans instead of being
+    recomputed from raw grades.
+
+    Key Fields:
+        snapshot_date: Day the aggregate was captured.
+        outcome_type: Whether the row aggregates a PO or an LO.
+        program_outcome / learning_outcome: The aggregated outcome.
+        course, department, academic_year, semester: Offering context
+            (denormalized from the course for filtering).
+        student_count, achieved_count, average_percentage: The aggregate.
+    """
+
+    class OutcomeType(models.TextChoices):
+        PO = 'PO', 'Program Outcome'
+        LO = 'LO', 'Learning Outcome'
+
+    snapshot_date = models.DateField(
+        help_text="Date the snapshot was taken"
+    )
+
+    outcome_type = models.CharField(
+        max_length=2,
+        choices=OutcomeType.choices,
+        help_text="Type of outcome aggregated"
+    )
+
+    program_outcome = models.ForeignKey(
+        'ProgramOutcome',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='snapshots',
+        help_text="Program outcome (for PO snapshots)"
+    )
+
+    learning_outcome = models.ForeignKey(
+        'LearningOutcome',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='snapshots',
+        help_text="Learning outcome (for LO snapshots)"
+    )
+
+    course = models.ForeignKey(
+        'Course',
+        on_delete=models.CASCADE,
+        related_name='achievement_snapshots',
+        help_text="Course offering the aggregate belongs to"
+    )
+
+    department = models.CharField(
+        max_length=100,
+        help_text="Department of the course offering"
+    )
+
+    academic_year = models.CharField(
+        max_length=20,
+        help_text="Academic year of the course offering"
+    )
+
+    semester = models.IntegerField(
+        help_text="Semester of the course offering"
+    )
+
+    student_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of students aggregated"
+    )
+
+    achieved_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of students at or above the outcome target"
+    )
+
+    average_percentage = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text="Average achievement percentage"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'achievement_snapshots'
+        ordering = ['-snapshot_date']
+        verbose_name = 'Achievement Snapshot'
+        verbose_name_plural = 'Achievement Snapshots'
+        indexes = [
+            # Covering indexes so trend reads are index-only range scans.
+            # po_history filters PO rows by date, semester and academic year
+            # and groups by (program_outcome, snapshot_date).
+            models.Index(
+                fields=['program_outcome', 'snapshot_date'],
+                include=['semester', 'academic_year', 'student_count', 'achieved_count', 'average_percentage'],
+                condition=models.Q(outcome_type='PO'),
+                name='snap_po_date_idx',
+            ),
+            models.Index(
+                fields=['course', 'outcome_type', 'snapshot_date'],
+                include=['student_count', 'average_percentage'],
+                name='snap_course_date_idx',
+            ),
+            models.Index(
+                fields=['department', 'outcome_type', 'snapshot_date'],
+                name='snap_dept_date_idx',
+            ),
+            models.Index(
+                fields=['learning_outcome', 'snapshot_date'],
+                name='snap_lo_date_idx',
+            ),
+        ]
+
+    def __str__(self):
+        outcome = self.program_outcome_id if self.outcome_type == self.OutcomeType.PO else self.learning_outcome_id
+        return f"{self.outcome_type} {outcome} @ course {self.course_id} ({self.snapshot_date})"
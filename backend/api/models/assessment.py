@@ -104,7 +104,7 @@ class Assessment(models.Model):
         verbose_name_plural = 'Assessments'
         indexes = [
             models.Index(fields=['course', 'is_active']),
-            models.Index(fields=['due_date']),
+            models.Index(fields=['due_date', 'id']),
             models.Index(fields=['assessment_type']),
             models.Index(fields=['created_at']),
         ]
@@ -230,6 +230,7 @@ class StudentGrade(models.Model):
             models.Index(fields=['assessment', 'graded_at']),
             models.Index(fields=['student', 'graded_at']),
             models.Index(fields=['score']),
+            models.Index(fields=['graded_at', 'id']),
         ]
     
     def __str__(self):
@@ -1,15 +1,25 @@
 """COURSE Models Module"""
 
+import re
 from decimal import Decimal
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
+from .managers import SearchVectorManager
 
 
 # =============================================================================
 # COURSE MODEL
 # =============================================================================
 
+# Course level patterns: CS101 -> 1, CS201 -> 2, ..., MATH601 -> 6
+COURSE_LEVEL_PATTERN = re.compile(r'(\d{3})')
+COURSE_FIRST_DIGIT_PATTERN = re.compile(r'(\d)')
+MAX_YEAR_OF_STUDY = 6
+
+
 class Course(models.Model):
     """
     Academic courses offered by the institution.
@@ -79,8 +89,27 @@ class Course(models.Model):
         help_text="Students enrolled in this course"
     )
     
+    year_of_study = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Year of study derived from the course code (0 if unknown)"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Full-text search document, maintained by PostgreSQL (see api/search.py)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('code', weight='A', config='simple')
+            + SearchVector('name', weight='B', config='simple')
+            + SearchVector('description', weight='D', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorManager()
     
     class Meta:
         db_table = 'courses'
@@ -92,10 +121,41 @@ class Course(models.Model):
             models.Index(fields=['code', 'academic_year']),
             models.Index(fields=['teacher', 'academic_year']),
             models.Index(fields=['department', 'academic_year']),
+            models.Index(fields=['department', 'year_of_study']),
+            GinIndex(fields=['search_vector'], name='courses_search_idx'),
         ]
     
     def __str__(self):
         return f"{self.code}: {self.name} ({self.academic_year})"
+    
+    @staticmethod
+    def extract_year_of_study(course_code):
+        """
+        Extract year of study from a course code.
+        
+        Uses the hundreds digit of the first 3-digit number (CS101 -> 1,
+        CS301 -> 3), falling back to the first digit. Returns 0 when the
+        year cannot be determined or is beyond MAX_YEAR_OF_STUDY.
+        """
+        match = COURSE_LEVEL_PATTERN.search(course_code or '')
+        if match:
+            hundreds = int(match.group(1)) // 100
+            if 1 <= hundreds <= MAX_YEAR_OF_STUDY:
+                return hundreds
+        match = COURSE_FIRST_DIGIT_PATTERN.search(course_code or '')
+        if match:
+            first_digit = int(match.group(1))
+            if 1 <= first_digit <= MAX_YEAR_OF_STUDY:
+                return first_digit
+        return 0
+    
+    def save(self, *args, **kwargs):
+        """Keep the persisted year_of_study in sync with the course code."""
+        self.year_of_study = self.extract_year_of_study(self.code)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'code' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'year_of_study'}
+        super().save(*args, **kwargs)
 
 
 # =============================================================================
@@ -200,7 +260,7 @@ class Enrollment(models.Model):
             models.Index(fields=['student', 'is_active']),
             models.Index(fields=['course', 'is_active']),
             models.Index(fields=['student', 'course']),
-            models.Index(fields=['enrolled_at']),
+            models.Index(fields=['enrolled_at', 'id']),
         ]
     
     def __str__(self):
@@ -0,0 +1,158 @@
+"""IMPORT JOB Models Module"""
+
+from django.db import models
+from django.utils import timezone
+
+
+# =============================================================================
+# IMPORT JOB MODEL
+# =============================================================================
+
+class ImportJob(models.Model):
+    """
+    A bulk import processed in the background.
+
+    The uploaded file is persisted to storage and a Celery task processes it
+    in chunks, committing each chunk and updating the progress counters so
+    clients can poll the job instead of holding a web worker for the whole
+    import.
+
+    Key Fields:
+        job_type: What is being imported.
+        status: Lifecycle state (pending -> running -> completed/failed).
+        file: The uploaded CSV, removed once the job finishes.
+        options: Import options (e.g. skip_existing, send_emails).
+        total_rows / processed_rows: Progress counters.
+        success_count / skipped_count: Outcome counters.
+        errors: Per-row errors ({"row", "message", "email"}).
+    """
+
+    class JobType(models.TextChoices):
+        STUDENTS = 'students', 'Students'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    job_type = models.CharField(
+        max_length=20,
+        choices=JobType.choices,
+        default=JobType.STUDENTS,
+        help_text="Type of data being imported"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text="Current state of the job"
+    )
+
+    created_by = models.ForeignKey(
+        'User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+        help_text="User who submitted the import"
+    )
+
+    file = models.FileField(
+        upload_to='imports/%Y/%m/',
+        blank=True,
+        help_text="Uploaded file (deleted after processing)"
+    )
+
+    original_filename = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Name of the uploaded file"
+    )
+
+    options = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Import options"
+    )
+
+    total_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of data rows in the file"
+    )
+
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of rows processed and committed"
+    )
+
+    success_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of records created"
+    )
+
+    skipped_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of rows skipped as already existing"
+    )
+
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Per-row errors"
+    )
+
+    message = models.TextField(
+        blank=True,
+        help_text="Failure reason for failed jobs"
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When processing started"
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When processing finished"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'import_jobs'
+        ordering = ['-created_at']
+        verbose_name = 'Import Job'
+        verbose_name_plural = 'Import Jobs'
+        indexes = [
+            models.Index(fields=['created_by', 'created_at']),
+            models.Index(fields=['status']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_job_type_display()} import #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+    @property
+    def progress(self) -> float:
+        """Percentage of rows processed."""
+        if not self.total_rows:
+            return 100.0 if self.is_finished else 0.0
+        return round(self.processed_rows * 100 / self.total_rows, 1)
+
+    @property
+    def throughput(self) -> float | None:
+        """Rows processed per second since the job started."""
+        if not self.started_at or not self.processed_rows:
+            return None
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return round(self.processed_rows / elapsed, 1)
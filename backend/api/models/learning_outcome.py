@@ -1,9 +1,12 @@
 """LEARNING OUTCOME Models Module"""
 
 from decimal import Decimal
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
+from .managers import SearchVectorManager
 
 
 # =============================================================================
@@ -57,6 +60,19 @@ class LearningOutcome(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Full-text search document, maintained by PostgreSQL (see api/search.py)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('code', weight='A', config='simple')
+            + SearchVector('title', weight='B', config='simple')
+            + SearchVector('description', weight='D', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorManager()
     
     class Meta:
         db_table = 'learning_outcomes'
@@ -64,6 +80,9 @@ class LearningOutcome(models.Model):
         unique_together = ['course', 'code']
         verbose_name = 'Learning Outcome'
         verbose_name_plural = 'Learning Outcomes'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='learning_outcomes_search_idx'),
+        ]
     
     program_outcomes = models.ManyToManyField(
         'ProgramOutcome',
@@ -0,0 +1,29 @@
+"""MANAGERS Models Module"""
+
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.db import models
+
+
+SEARCH_VECTOR_FIELD = 'search_vector'
+
+
+class SearchVectorDeferringMixin:
+    """
+    Leave the generated ``search_vector`` column out of default fetches.
+
+    Searches match it inside PostgreSQL and nothing reads it back, so the
+    tsvector is not loaded with every row (JWT authentication, detail
+    views, related objects). ``select_related`` joins ignore managers;
+    ``api.search.defer_search_vectors`` covers those.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer(SEARCH_VECTOR_FIELD)
+
+
+class SearchVectorManager(SearchVectorDeferringMixin, models.Manager):
+    """Default manager of the models with a ``search_vector`` column."""
+
+
+class UserManager(SearchVectorDeferringMixin, BaseUserManager):
+    """``UserManager`` that defers ``search_vector``."""
@@ -1,11 +1,14 @@
 """MISC Models Module"""
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .managers import SearchVectorManager
 
 
 # =============================================================================
@@ -257,17 +260,30 @@ class ActivityLog(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # Full-text search document, maintained by PostgreSQL (see api/search.py)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('description', weight='A', config='simple')
+            + SearchVector('department', weight='B', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorManager()
     
     class Meta:
         db_table = 'activity_logs'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['-created_at']),
+            models.Index(fields=['-created_at', '-id']),
             models.Index(fields=['action_type']),
             models.Index(fields=['institution']),
             models.Index(fields=['department']),
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['related_object_type', 'related_object_id']),
+            GinIndex(fields=['search_vector'], name='activity_logs_search_idx'),
         ]
         verbose_name = 'Activity Log'
         verbose_name_plural = 'Activity Logs'
@@ -2,11 +2,14 @@
 
 from decimal import Decimal
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .managers import SearchVectorManager
 
 
 # =============================================================================
@@ -58,12 +61,28 @@ class ProgramOutcome(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Full-text search document, maintained by PostgreSQL (see api/search.py)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('code', weight='A', config='simple')
+            + SearchVector('title', weight='B', config='simple')
+            + SearchVector('description', weight='D', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SearchVectorManager()
     
     class Meta:
         db_table = 'program_outcomes'
         ordering = ['code']
         verbose_name = 'Program Outcome'
         verbose_name_plural = 'Program Outcomes'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='program_outcomes_search_idx'),
+        ]
     
     def __str__(self):
         return f"{self.code}: {self.title}"
@@ -1,6 +1,8 @@
 """USER Models Module"""
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
@@ -9,6 +11,7 @@ from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 import secrets
+from .managers import UserManager
 
 
 # =============================================================================
@@ -96,6 +99,19 @@ class User(AbstractUser):
         related_name="created_teachers",
         help_text="Admin/Institution user who created this account (for teachers)"
     )
+
+    # Full-text search document, maintained by PostgreSQL (see api/search.py)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('username', 'student_id', weight='A', config='simple')
+            + SearchVector('first_name', 'last_name', weight='B', config='simple')
+            + SearchVector('email', weight='C', config='simple')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = UserManager()
     
     class Meta:
         db_table = 'users'
@@ -109,6 +125,7 @@ class User(AbstractUser):
             models.Index(fields=['department', 'role']),
             models.Index(fields=['created_by']),
             models.Index(fields=['created_at']),
+            GinIndex(fields=['search_vector'], name='users_search_idx'),
         ]
     
     def __str__(self):
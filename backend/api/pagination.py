@@ -0,0 +1,311 @@
+"""
+AcuRate - Keyset Pagination
+
+Opt-in cursor pagination for list endpoints that otherwise return the whole
+filtered queryset. Pages are cut with a ``WHERE (key, id) > (last key, last
+id)`` seek on the list's ordering plus ``id`` as a tie-breaker instead of an
+OFFSET, so with a matching ``(key, id)`` index every page costs the same as
+the first one.
+
+Pagination only kicks in when the client sends ``cursor`` or ``page_size``;
+without them the endpoints keep returning a plain list. The cursor is an
+opaque token that encodes the last row's key values and the ordering it was
+issued for, so a cursor cannot be replayed against a different ``ordering``.
+
+Usage:
+    class StudentGradeViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
+        def list(self, request, *args, **kwargs):
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_keyset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_keyset_paginated_response(serializer.data)
+            ...
+"""
+
+import base64
+import binascii
+import datetime
+import json
+import operator
+import uuid
+from decimal import Decimal
+from functools import reduce
+from typing import Any, NamedTuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Field, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+KEYSET_ALIAS = 'keyset_{}'  # Annotation names the ordering keys are read from
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+class KeysetKey(NamedTuple):
+    """One ordering key of a keyset page."""
+    path: str
+    descending: bool
+    field: Field
+    nullable: bool
+
+
+def _to_json(value: Any) -> Any:
+    # Full precision on purpose: DjangoJSONEncoder drops microseconds, which
+    # would make a cursor skip or repeat rows graded in the same millisecond
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+# =============================================================================
+# PAGINATION CLASS
+# =============================================================================
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination on (ordering keys..., id).
+
+    NULL keys sort last in ascending and first in descending order (the
+    PostgreSQL default, so existing btree indexes still match), on every
+    database backend.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_requested(self, request) -> bool:
+        """Return True if the client asked for a paginated response."""
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    # -------------------------------------------------------------------------
+    # Ordering
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve_key(model, item: str) -> KeysetKey | None:
+        """Resolve an ``order_by()`` item to a concrete column, or None."""
+        descending = item.startswith('-')
+        parts = item.lstrip('-').split('__')
+        if parts == ['pk']:
+            return KeysetKey('id', descending, model._meta.pk, False)
+
+        nullable = False
+        for index, part in enumerate(parts):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete:
+                return None
+            nullable = nullable or field.null
+            if field.is_relation:
+                if index == len(parts) - 1:
+                    # Ordering by a relation is cut on its key column
+                    path = '__'.join(parts[:-1] + [field.attname])
+                    return KeysetKey(path, descending, field.target_field, nullable)
+                model = field.related_model
+        return KeysetKey('__'.join(parts), descending, field, nullable)
+
+    def get_ordering(self, queryset: QuerySet) -> list[KeysetKey]:
+        """
+        Return the keys the page is cut on.
+
+        The queryset's ordering is used up to ``id``, which is appended as
+        the tie-breaker (in the direction of the first key) if missing.
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        keys: list[KeysetKey] = []
+        for item in ordering:
+            if not isinstance(item, str) or item == '?':
+                continue
+            key = self._resolve_key(queryset.model, item)
+            if key is None or any(key.path == existing.path for existing in keys):
+                continue
+            keys.append(key)
+            if key.path == 'id':
+                return keys
+
+        descending = keys[0].descending if keys else False
+        keys.append(KeysetKey('id', descending, queryset.model._meta.pk, False))
+        return keys
+
+    # -------------------------------------------------------------------------
+    # Cursor
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def encode_cursor(values: list[Any], signature: list[str]) -> str:
+        payload = json.dumps({'v': [_to_json(value) for value in values], 'o': signature}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str, keys: list[KeysetKey], signature: list[str]) -> list[Any]:
+        """Decode a cursor into typed key values, rejecting foreign or tampered tokens."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values = payload['v']
+            if payload['o'] != signature or len(values) != len(keys):
+                raise ValueError('Cursor does not match the ordering')
+            return [
+                None if value is None else key.field.to_python(value)
+                for value, key in zip(values, keys)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # -------------------------------------------------------------------------
+    # Seek condition
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _after(alias: str, descending: bool, nullable: bool, value: Any) -> Q | None:
+        """Condition for a key sorting strictly after ``value``; None if nothing can."""
+        if descending:
+            # NULLS FIRST: every non-NULL value follows a NULL
+            if value is None:
+                return Q(**{f'{alias}__isnull': False})
+            return Q(**{f'{alias}__lt': value})
+        # NULLS LAST: only NULLs follow the largest value
+        if value is None:
+            return None
+        condition = Q(**{f'{alias}__gt': value})
+        if nullable:
+            condition |= Q(**{f'{alias}__isnull': True})
+        return condition
+
+    @classmethod
+    def seek_condition(cls, keys: list[KeysetKey], values: list[Any]) -> Q:
+        """
+        Build ``(k1, ..., kn) > (v1, ..., vn)`` in the page ordering.
+
+        A redundant range on the first key is added so the planner can start
+        an index scan at the cursor instead of filtering the whole index.
+        """
+        branches = []
+        equal = Q()
+        for index, (key, value) in enumerate(zip(keys, values)):
+            alias = KEYSET_ALIAS.format(index)
+            after = cls._after(alias, key.descending, key.nullable, value)
+            if after is not None:
+                branches.append(equal & after)
+            equal &= Q(**{f'{alias}__isnull': True} if value is None else {alias: value})
+
+        # The last key is the non-NULL id, so there is always a branch
+        condition = reduce(operator.or_, branches)
+        first, first_value = keys[0], values[0]
+        if first_value is not None:
+            if first.descending:
+                condition &= Q(**{f'{KEYSET_ALIAS.format(0)}__lte': first_value})
+            elif not first.nullable:
+                condition &= Q(**{f'{KEYSET_ALIAS.format(0)}__gte': first_value})
+        return condition
+
+    # -------------------------------------------------------------------------
+    # BasePagination interface
+    # -------------------------------------------------------------------------
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list | None:
+        """Return one page of ``queryset``, or None if pagination was not requested."""
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        keys = self.get_ordering(queryset)
+        signature = [f"{'-' if key.descending else ''}{key.path}" for key in keys]
+
+        aliases = {KEYSET_ALIAS.format(index): F(key.path) for index, key in enumerate(keys)}
+        queryset = queryset.annotate(**aliases).order_by(*[
+            F(alias).desc(nulls_first=True) if key.descending else F(alias).asc(nulls_last=True)
+            for alias, key in zip(aliases, keys)
+        ])
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.seek_condition(keys, self.decode_cursor(cursor, keys, signature)))
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = self.page[-1]
+            values = [getattr(last, alias) for alias in aliases]
+            self.next_cursor = self.encode_cursor(values, signature)
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+# =============================================================================
+# VIEW MIXIN
+# =============================================================================
+
+class KeysetPaginationMixin:
+    """
+    Adds opt-in keyset pagination to a viewset's custom ``list()``.
+
+    The viewset keeps DRF's ``pagination_class`` untouched; ``list()``
+    overrides call ``paginate_keyset`` and fall back to their full response
+    when it returns None.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    @property
+    def keyset_paginator(self) -> KeysetPagination:
+        if not hasattr(self, '_keyset_paginator'):
+            self._keyset_paginator = self.keyset_pagination_class()
+        return self._keyset_paginator
+
+    def paginate_keyset(self, queryset: QuerySet) -> list | None:
+        return self.keyset_paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_keyset_paginated_response(self, data) -> Response:
+        return self.keyset_paginator.get_paginated_response(data)
@@ -0,0 +1,198 @@
+"""
+AcuRate - orjson Renderer and Parser
+
+Drop-in replacements for DRF's ``JSONRenderer`` / ``JSONParser`` backed by
+orjson. Datetimes, dates, times and UUIDs are encoded natively by orjson and
+Decimals through a small ``default`` hook, producing the same bytes as DRF's
+encoder (``Z`` for UTC, Decimals as numbers) at a fraction of the CPU cost.
+
+Anything orjson cannot reproduce exactly goes through the DRF classes:
+indented output (the browsable API), ``UNICODE_JSON = False``, request
+bodies in other encodings, or orjson not being installed at all.
+
+``json_list_response`` serves large unpaginated lists as a
+``StreamingJSONResponse``: array elements are encoded in small batches as
+the (queryset) iterator produces them, so the serialized array is never
+held in memory as a whole.
+
+Usage (backend/settings.py):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'api.renderers.ORJSONParser', ...
+    )
+
+    # In a view: a Response below STREAMING_JSON_MIN_ITEMS items, streamed above
+    return json_list_response(request, projection.iter_data())
+"""
+
+import codecs
+import decimal
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+if ORJSON_AVAILABLE:
+    # UTC as "Z" like DRF; int dict keys become strings like json.dumps
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+else:
+    ORJSON_OPTIONS = 0
+
+# DRF escapes these so responses stay a strict JavaScript subset
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+STREAM_BATCH_ITEMS = 500  # Array elements encoded per streamed chunk
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _default(obj: Any) -> Any:
+    """Encode what orjson does not support natively, exactly as DRF does."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    return _drf_encoder.default(obj)
+
+
+# =============================================================================
+# RENDERER
+# =============================================================================
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` with the same output, encoded by orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+        if (
+            not ORJSON_AVAILABLE
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits; json handles (or reports) those
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not ORJSON_AVAILABLE or codecs.lookup(encoding).name != 'utf-8' or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    Stream ``items`` as a JSON array, or as the ``list_key`` member of an
+    object made of ``envelope`` followed by the array (and its length under
+    ``count_key``). Output is byte-identical to rendering the whole
+    structure with ``ORJSONRenderer``.
+    """
+
+    def __init__(self, items: Iterable[Any], envelope: dict | None = None, list_key: str | None = None,
+                 count_key: str | None = None, **kwargs) -> None:
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(self._chunks(items, envelope, list_key, count_key), **kwargs)
+
+    @staticmethod
+    def _chunks(items: Iterable[Any], envelope: dict | None, list_key: str | None,
+                count_key: str | None) -> Iterator[bytes]:
+        render = ORJSONRenderer().render
+        if envelope is not None:
+            opening = render(envelope)[:-1]
+            yield opening + (b',' if envelope else b'') + render(list_key) + b':['
+        else:
+            yield b'['
+
+        count = 0
+        iterator = iter(items)
+        while batch := list(islice(iterator, STREAM_BATCH_ITEMS)):
+            yield (b',' if count else b'') + render(batch)[1:-1]
+            count += len(batch)
+
+        if envelope is None:
+            yield b']'
+        elif count_key is None:
+            yield b']}'
+        else:
+            yield b'],' + render(count_key) + b':' + render(count) + b'}'
+
+
+def _streams_json(request) -> bool:
+    """Whether the negotiated renderer is compact JSON (not the browsable API)."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return (
+        isinstance(renderer, JSONRenderer)
+        and renderer.get_indent(getattr(request, 'accepted_media_type', None), {}) is None
+    )
+
+
+def json_list_response(request, items: Iterable[Any], envelope: dict | None = None,
+                       list_key: str | None = None, count_key: str | None = None):
+    """
+    Return ``items`` as a regular ``Response``, or stream them once there are
+    at least ``STREAMING_JSON_MIN_ITEMS`` of them.
+
+    Only that many items are read ahead to decide, so small lists cost
+    nothing extra and large ones are never materialized. ``envelope``,
+    ``list_key`` and ``count_key`` are as for ``StreamingJSONResponse``.
+    """
+    iterator = iter(items)
+    head = list(islice(iterator, settings.STREAMING_JSON_MIN_ITEMS))
+    if len(head) >= settings.STREAMING_JSON_MIN_ITEMS and _streams_json(request):
+        return StreamingJSONResponse(chain(head, iterator), envelope, list_key, count_key)
+
+    data = head + list(iterator)
+    if envelope is None:
+        return Response(data)
+    response_data = {**envelope, list_key: data}
+    if count_key is not None:
+        response_data[count_key] = len(data)
+    return Response(response_data)
@@ -0,0 +1,232 @@
+"""
+AcuRate - Full-Text Search
+
+Ranked search over the ``search_vector`` columns PostgreSQL maintains for
+users, courses, program/learning outcomes and activity logs (generated
+``tsvector`` columns with GIN indexes). Every word of ``?search=`` is
+matched as a prefix, so ``ada lov`` finds "Ada Lovelace", and results are
+ordered by ``ts_rank`` unless the client picked an ``?ordering=`` or pages
+with a keyset cursor.
+
+Identifiers that full-text parsing handles poorly (student numbers,
+usernames, names, course and outcome codes) are listed as trigram fields: they also match by
+substring and, where the ``pg_trgm`` extension is installed, by trigram
+word similarity, so partial student ids and misspelt names still hit. The
+``gin_trgm_ops`` indexes created by migration 0024 serve both lookups;
+without ``pg_trgm`` the fields fall back to a plain ``icontains``.
+
+Documents on related tables are matched through ``<relation>__in``
+subqueries, so each table is searched through its own GIN index instead of
+an ILIKE scan over the join.
+
+Usage:
+    class UserViewSet(viewsets.ModelViewSet):
+        filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+        search_vectors = ['search_vector']
+        search_trigram_fields = ['student_id', 'username', 'first_name', 'last_name']
+
+    class StudentLOAchievementViewSet(viewsets.ModelViewSet):
+        search_vectors = ['student__search_vector', 'learning_outcome__search_vector']
+
+    # Outside a viewset (no ranking)
+    logs = full_text_search(ActivityLog.objects.all(), request.query_params.get('search', ''))
+
+    # Django admin (changelist and autocomplete)
+    class CourseAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
+        search_fields = ['code', 'name', 'description']
+        search_trigram_fields = ['code']
+"""
+
+import operator
+from functools import reduce
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+SEARCH_CONFIG = 'simple'  # Text search configuration the search_vector columns are built with
+SEARCH_VECTOR_FIELD = 'search_vector'
+SEARCH_RANK_ALIAS = 'search_rank'
+TRIGRAM_EXTENSION = 'pg_trgm'
+
+_trigram_support: dict[str, bool] = {}
+
+
+def trigram_available(using: str = 'default') -> bool:
+    """Whether ``pg_trgm`` is installed in the ``using`` database (checked once per process)."""
+    if using not in _trigram_support:
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_extension WHERE extname = %s', [TRIGRAM_EXTENSION])
+            _trigram_support[using] = cursor.fetchone() is not None
+    return _trigram_support[using]
+
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+def search_terms(search: str) -> list[str]:
+    """Split ``?search=`` like ``SearchFilter`` and drop words without letters or digits."""
+    terms = filters.search_smart_split(search.replace('\x00', ''))
+    return [term for term in terms if any(char.isalnum() for char in term)]
+
+
+def prefix_query(terms: Iterable[str]) -> SearchQuery:
+    """``tsquery`` matching documents that contain every term as a word prefix."""
+    quoted = ("'" + term.replace('\\', '\\\\').replace("'", "''") + "':*" for term in terms)
+    return SearchQuery(' & '.join(quoted), search_type='raw', config=SEARCH_CONFIG)
+
+
+def _split(lookup: str) -> tuple[str, str]:
+    """``'student__search_vector'`` -> ``('student', 'search_vector')``"""
+    relation, _, field = lookup.rpartition(LOOKUP_SEP)
+    return relation, field
+
+
+def _related_model(model, relation: str):
+    for name in relation.split(LOOKUP_SEP):
+        model = model._meta.get_field(name).related_model
+    return model
+
+
+def defer_search_vectors(queryset: QuerySet) -> QuerySet:
+    """
+    Defer ``search_vector`` on the models joined by ``select_related``.
+
+    The default managers defer the column on their own rows, but joined
+    rows load every concrete field; only explicit ``select_related``
+    paths are followed.
+    """
+    select_related = queryset.query.select_related
+    if not isinstance(select_related, dict):
+        return queryset
+
+    deferred = []
+
+    def walk(model, tree: dict, prefix: str):
+        for name, nested in tree.items():
+            related = model._meta.get_field(name).related_model
+            if any(field.name == SEARCH_VECTOR_FIELD for field in related._meta.concrete_fields):
+                deferred.append(f'{prefix}{name}{LOOKUP_SEP}{SEARCH_VECTOR_FIELD}')
+            walk(related, nested, f'{prefix}{name}{LOOKUP_SEP}')
+
+    walk(queryset.model, select_related, '')
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+def full_text_search(queryset: QuerySet, search: str, vectors: Iterable[str] = (SEARCH_VECTOR_FIELD,),
+                     trigram_fields: Iterable[str] = (), rank: bool = False) -> QuerySet:
+    """
+    Filter ``queryset`` to the rows matching ``search``.
+
+    Args:
+        vectors: ``search_vector`` lookups, on the model or across relations.
+        trigram_fields: Text lookups also matched by substring / trigram similarity.
+        rank: Add a ``search_rank`` alias (``ts_rank`` plus trigram similarity)
+            for ``order_by('-search_rank')``.
+
+    Returns:
+        ``queryset`` unchanged when ``search`` has no terms, else filtered.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return queryset
+
+    vectors, trigram_fields = list(vectors), list(trigram_fields)
+    query = prefix_query(terms)
+    phrase = ' '.join(terms)
+    trigram = trigram_available(queryset.db)
+
+    # One condition per table, so every table is searched once through its own index
+    conditions: dict[str, Q] = {}
+    for lookup in vectors:
+        relation, field = _split(lookup)
+        conditions[relation] = conditions.get(relation, Q()) | Q(**{field: query})
+    for lookup in trigram_fields:
+        relation, field = _split(lookup)
+        match = Q(**{f'{field}__icontains': phrase})
+        if trigram:
+            match |= Q(**{f'{field}__trigram_word_similar': phrase})
+        conditions[relation] = conditions.get(relation, Q()) | match
+
+    matches = Q()
+    for relation, condition in conditions.items():
+        if relation:
+            related = _related_model(queryset.model, relation)
+            condition = Q(**{f'{relation}__in': related._default_manager.filter(condition).values('pk')})
+        matches |= condition
+    queryset = queryset.filter(matches)
+
+    if rank:
+        scores = [Coalesce(SearchRank(F(lookup), query), Value(0.0)) for lookup in vectors]
+        if trigram:
+            scores += [Coalesce(TrigramWordSimilarity(phrase, lookup), Value(0.0)) for lookup in trigram_fields]
+        queryset = queryset.alias(**{SEARCH_RANK_ALIAS: reduce(operator.add, scores)})
+    return queryset
+
+
+# =============================================================================
+# FILTER BACKEND
+# =============================================================================
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` over the view's ``search_vectors`` and
+    ``search_trigram_fields``, most relevant first.
+
+    List it after ``OrderingFilter``: the rank then leads and the view's
+    ordering breaks ties. Views without ``search_vectors`` get the regular
+    ``SearchFilter`` on ``search_fields``.
+    """
+
+    def ranks(self, request, view) -> bool:
+        """Rank unless the client chose an ordering or pages by keyset cursor."""
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return False
+        paginator = getattr(view, 'keyset_paginator', None)
+        return not (paginator and paginator.is_requested(request))
+
+    def filter_queryset(self, request, queryset, view):
+        vectors = getattr(view, 'search_vectors', None)
+        if not vectors:
+            return super().filter_queryset(request, queryset, view)
+
+        rank = self.ranks(request, view)
+        queryset = full_text_search(
+            queryset, request.query_params.get(self.search_param, ''),
+            vectors, getattr(view, 'search_trigram_fields', ()), rank=rank,
+        )
+        if rank and SEARCH_RANK_ALIAS in queryset.query.annotations:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by(f'-{SEARCH_RANK_ALIAS}', *ordering)
+        return queryset
+
+
+# =============================================================================
+# ADMIN
+# =============================================================================
+
+class FullTextSearchAdminMixin:
+    """
+    ``ModelAdmin`` search over ``search_vectors`` and ``search_trigram_fields``.
+
+    Replaces the ILIKE scan Django builds from ``search_fields`` for the
+    changelist and autocomplete; ``search_fields`` stays set because the
+    admin only shows the search box (and allows autocomplete) when it is.
+    """
+    search_vectors = [SEARCH_VECTOR_FIELD]
+    search_trigram_fields = []
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset = full_text_search(queryset, search_term, self.search_vectors, self.search_trigram_fields)
+        return queryset, False  # Related documents match through subqueries, not joins
@@ -42,6 +42,7 @@ from .assessment import (
     StudentGradeDetailSerializer,
     AssessmentLOSerializer,
     LOPOSerializer,
+    StudentGradeProjection,
 )
 
 # Achievement serializers
@@ -49,6 +50,12 @@ from .achievement import (
     StudentPOAchievementSerializer,
     StudentPOAchievementDetailSerializer,
     StudentLOAchievementSerializer,
+    StudentLOAchievementProjection,
+)
+
+# Projection serializers
+from .projection import (
+    ProjectionSerializer,
 )
 
 # Dashboard serializers
@@ -64,6 +71,11 @@ from .contact import (
     InstitutionDashboardSerializer,
 )
 
+# Import job serializers
+from .import_job import (
+    ImportJobSerializer,
+)
+
 __all__ = [
     # User
     'UserSerializer',
@@ -91,10 +103,14 @@ __all__ = [
     'StudentGradeDetailSerializer',
     'AssessmentLOSerializer',
     'LOPOSerializer',
+    'StudentGradeProjection',
     # Achievements
     'StudentPOAchievementSerializer',
     'StudentPOAchievementDetailSerializer',
     'StudentLOAchievementSerializer',
+    'StudentLOAchievementProjection',
+    # Projections
+    'ProjectionSerializer',
     # Dashboards
     'StudentDashboardSerializer',
     'TeacherDashboardSerializer',
@@ -102,6 +118,8 @@ __all__ = [
     # Contact
     'ContactRequestSerializer',
     'ContactRequestCreateSerializer',
+    # Import jobs
+    'ImportJobSerializer',
 ]
 
 
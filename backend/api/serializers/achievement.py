@@ -11,13 +11,15 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin
+from .projection import Computed, ProjectionSerializer, full_name
 
 
 # =============================================================================
 # STUDENT PO ACHIEVEMENT SERIALIZERS
 # =============================================================================
 
-class StudentPOAchievementSerializer(serializers.ModelSerializer):
+class StudentPOAchievementSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for StudentPOAchievement model"""
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     student_id = serializers.CharField(source='student.student_id', read_only=True)
@@ -27,6 +29,11 @@ class StudentPOAchievementSerializer(serializers.ModelSerializer):
     achievement_percentage = serializers.DecimalField(source='current_percentage', max_digits=5, decimal_places=2, read_only=True)
     is_achieved = serializers.BooleanField(read_only=True)
     
+    expandable_fields = {
+        'student': ('api.serializers.user.UserSerializer', {}),
+        'program_outcome': ('api.serializers.outcome.ProgramOutcomeSerializer', {}),
+    }
+    
     class Meta:
         model = StudentPOAchievement
         fields = [
@@ -39,11 +46,18 @@ class StudentPOAchievementSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_achieved', 'created_at', 'updated_at']
 
 
-class StudentPOAchievementDetailSerializer(serializers.ModelSerializer):
+class StudentPOAchievementDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Detailed PO achievement with student and PO info"""
     is_achieved = serializers.BooleanField(read_only=True)
     progress_percentage = serializers.SerializerMethodField()
     
+    # student and program_outcome are nested in to_representation
+    optimizer_hints = {
+        'student': {'select_related': ['student'], 'only': ['student']},
+        'program_outcome': {'select_related': ['program_outcome'], 'only': ['program_outcome']},
+        'progress_percentage': {'select_related': ['program_outcome'], 'only': ['current_percentage', 'program_outcome']},
+    }
+    
     class Meta:
         model = StudentPOAchievement
         fields = [
@@ -61,8 +75,10 @@ class StudentPOAchievementDetailSerializer(serializers.ModelSerializer):
         from .outcome import ProgramOutcomeSerializer
         
         ret = super().to_representation(instance)
-        ret['student'] = UserSerializer(instance.student).data
-        ret['program_outcome'] = ProgramOutcomeSerializer(instance.program_outcome).data
+        if 'student' in ret:
+            ret['student'] = UserSerializer(instance.student).data
+        if 'program_outcome' in ret:
+            ret['program_outcome'] = ProgramOutcomeSerializer(instance.program_outcome).data
         return ret
     
     def get_progress_percentage(self, obj):
@@ -75,7 +91,7 @@ class StudentPOAchievementDetailSerializer(serializers.ModelSerializer):
 # STUDENT LO ACHIEVEMENT SERIALIZER
 # =============================================================================
 
-class StudentLOAchievementSerializer(serializers.ModelSerializer):
+class StudentLOAchievementSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Student LO Achievement model"""
     
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
@@ -94,6 +110,16 @@ class StudentLOAchievementSerializer(serializers.ModelSerializer):
     gap_to_target = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
     completion_rate = serializers.FloatField(read_only=True)
     
+    expandable_fields = {
+        'student': ('api.serializers.user.UserSerializer', {}),
+        'learning_outcome': ('api.serializers.outcome.LearningOutcomeSerializer', {}),
+    }
+    optimizer_hints = {
+        'is_target_met': {'select_related': ['learning_outcome'], 'only': ['current_percentage', 'learning_outcome']},
+        'gap_to_target': {'select_related': ['learning_outcome'], 'only': ['current_percentage', 'learning_outcome']},
+        'completion_rate': {'only': ['total_assessments', 'completed_assessments']},
+    }
+    
     class Meta:
         model = StudentLOAchievement
         fields = [
@@ -105,3 +131,40 @@ class StudentLOAchievementSerializer(serializers.ModelSerializer):
             'last_calculated', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'last_calculated', 'created_at', 'updated_at']
+
+
+def _completion_rate(completed, total) -> float:
+    # StudentLOAchievement.completion_rate as rendered by a FloatField
+    return float((completed / total) * 100) if total > 0 else 0.0
+
+
+class StudentLOAchievementProjection(ProjectionSerializer):
+    """Read-only StudentLOAchievementSerializer output for large achievement lists"""
+    model = StudentLOAchievement
+    fields = {
+        'id': 'id',
+        'student': 'student_id',
+        'student_name': full_name('student__'),
+        'student_id_number': 'student__student_id',
+        'learning_outcome': 'learning_outcome_id',
+        'lo_code': 'learning_outcome__code',
+        'lo_title': 'learning_outcome__title',
+        'course_code': 'learning_outcome__course__code',
+        'course_name': 'learning_outcome__course__name',
+        'current_percentage': 'current_percentage',
+        'target_percentage': 'learning_outcome__target_percentage',
+        'is_target_met': Computed(
+            lambda current, target: current >= target,
+            ('current_percentage', 'learning_outcome__target_percentage'),
+        ),
+        'gap_to_target': Computed(
+            lambda current, target: target - current,
+            ('current_percentage', 'learning_outcome__target_percentage'),
+        ),
+        'total_assessments': 'total_assessments',
+        'completed_assessments': 'completed_assessments',
+        'completion_rate': Computed(_completion_rate, ('completed_assessments', 'total_assessments')),
+        'last_calculated': 'last_calculated',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
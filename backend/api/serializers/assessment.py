@@ -11,19 +11,23 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin
+from .projection import Computed, ProjectionSerializer, display, full_name
 
 
 # =============================================================================
 # ASSESSMENT SERIALIZERS
 # =============================================================================
 
-class AssessmentSerializer(serializers.ModelSerializer):
+class AssessmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Assessment model"""
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
     type_display = serializers.CharField(source='get_assessment_type_display', read_only=True)
     # NOTE: related_pos removed - use related_los instead (POs are accessed through LO → PO path)
     
+    expandable_fields = {'course': ('api.serializers.course.CourseSerializer', {})}
+    
     class Meta:
         model = Assessment
         fields = [
@@ -104,7 +108,7 @@ class AssessmentSerializer(serializers.ModelSerializer):
 # ASSESSMENT-LO MAPPING SERIALIZERS
 # =============================================================================
 
-class AssessmentLOSerializer(serializers.ModelSerializer):
+class AssessmentLOSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Assessment-LO mapping
     
     Supports both field naming conventions:
@@ -123,6 +127,11 @@ class AssessmentLOSerializer(serializers.ModelSerializer):
     learningOutcomeId = serializers.IntegerField(source='learning_outcome.id', read_only=True)
     courseId = serializers.IntegerField(source='assessment.course.id', read_only=True)
     
+    expandable_fields = {
+        'assessment': ('api.serializers.assessment.AssessmentSerializer', {}),
+        'learning_outcome': ('api.serializers.outcome.LearningOutcomeSerializer', {}),
+    }
+    
     class Meta:
         model = AssessmentLO
         fields = [
@@ -156,7 +165,7 @@ class AssessmentLOSerializer(serializers.ModelSerializer):
 # LO-PO MAPPING SERIALIZERS
 # =============================================================================
 
-class LOPOSerializer(serializers.ModelSerializer):
+class LOPOSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for LO-PO mapping
     
     Supports both field naming conventions:
@@ -175,6 +184,11 @@ class LOPOSerializer(serializers.ModelSerializer):
     programOutcomeId = serializers.IntegerField(source='program_outcome.id', read_only=True)
     courseId = serializers.IntegerField(source='learning_outcome.course.id', read_only=True)
     
+    expandable_fields = {
+        'learning_outcome': ('api.serializers.outcome.LearningOutcomeSerializer', {}),
+        'program_outcome': ('api.serializers.outcome.ProgramOutcomeSerializer', {}),
+    }
+    
     class Meta:
         model = LOPO
         fields = [
@@ -205,7 +219,7 @@ class LOPOSerializer(serializers.ModelSerializer):
 # STUDENT GRADE SERIALIZERS
 # =============================================================================
 
-class StudentGradeSerializer(serializers.ModelSerializer):
+class StudentGradeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for StudentGrade model"""
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     assessment_title = serializers.CharField(source='assessment.title', read_only=True)
@@ -213,6 +227,12 @@ class StudentGradeSerializer(serializers.ModelSerializer):
     max_score = serializers.DecimalField(source='assessment.max_score', max_digits=6, decimal_places=2, read_only=True)
     percentage = serializers.SerializerMethodField()
     
+    expandable_fields = {
+        'student': ('api.serializers.user.UserSerializer', {}),
+        'assessment': ('api.serializers.assessment.AssessmentSerializer', {}),
+    }
+    optimizer_hints = {'percentage': {'select_related': ['assessment'], 'only': ['score', 'assessment']}}
+    
     class Meta:
         model = StudentGrade
         fields = [
@@ -249,13 +269,15 @@ class StudentGradeSerializer(serializers.ModelSerializer):
         return 0.0
 
 
-class StudentGradeDetailSerializer(serializers.ModelSerializer):
+class StudentGradeDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Detailed grade serializer with all info"""
     student = serializers.SerializerMethodField()
     assessment = serializers.SerializerMethodField()
     max_score = serializers.DecimalField(source='assessment.max_score', max_digits=6, decimal_places=2, read_only=True)
     percentage = serializers.SerializerMethodField()
     
+    optimizer_hints = {'percentage': {'select_related': ['assessment'], 'only': ['score', 'assessment']}}
+    
     class Meta:
         model = StudentGrade
         fields = [
@@ -270,3 +292,30 @@ class StudentGradeDetailSerializer(serializers.ModelSerializer):
         if obj.assessment.max_score > 0:
             return float((obj.score / obj.assessment.max_score) * 100)
         return 0.0
+
+
+def _grade_percentage(score, max_score) -> float:
+    # Same arithmetic as StudentGradeSerializer.get_percentage
+    if max_score > 0:
+        return float((score / max_score) * 100)
+    return 0.0
+
+
+class StudentGradeProjection(ProjectionSerializer):
+    """Read-only StudentGradeSerializer output for large grade lists"""
+    model = StudentGrade
+    fields = {
+        'id': 'id',
+        'student': 'student_id',
+        'student_name': full_name('student__'),
+        'assessment': 'assessment_id',
+        'assessment_title': 'assessment__title',
+        'assessment_type': display('assessment__assessment_type', Assessment.AssessmentType.choices),
+        'score': 'score',
+        'max_score': 'assessment__max_score',
+        'percentage': Computed(_grade_percentage, ('score', 'assessment__max_score')),
+        'feedback': 'feedback',
+        'graded_at': 'graded_at',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
@@ -13,6 +13,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin
 from ..validators import sanitize_text_field, sanitize_html, validate_no_html
 
 
@@ -20,7 +21,7 @@ from ..validators import sanitize_text_field, sanitize_html, validate_no_html
 # CONTACT REQUEST SERIALIZERS
 # =============================================================================
 
-class ContactRequestSerializer(serializers.ModelSerializer):
+class ContactRequestSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Contact Request model"""
     
     institution_type_display = serializers.CharField(source='get_institution_type_display', read_only=True)
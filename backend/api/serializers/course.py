@@ -2,7 +2,7 @@
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q, QuerySet
 import secrets
 import string
 from ..models import (
@@ -11,13 +11,14 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin, optimize_queryset
 
 
 # =============================================================================
 # COURSE SERIALIZERS
 # =============================================================================
 
-class CoursePOSerializer(serializers.ModelSerializer):
+class CoursePOSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Course-PO mapping"""
     po_code = serializers.CharField(source='program_outcome.code', read_only=True)
     po_title = serializers.CharField(source='program_outcome.title', read_only=True)
@@ -27,11 +28,14 @@ class CoursePOSerializer(serializers.ModelSerializer):
         fields = ['id', 'program_outcome', 'po_code', 'po_title', 'weight']
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Course model"""
     teacher_name = serializers.SerializerMethodField()
     semester_display = serializers.CharField(source='get_semester_display', read_only=True)
     
+    expandable_fields = {'teacher': ('api.serializers.user.UserSerializer', {})}
+    optimizer_hints = {'teacher_name': {'select_related': ['teacher'], 'only': ['teacher']}}
+    
     class Meta:
         model = Course
         fields = [
@@ -49,8 +53,27 @@ class CourseSerializer(serializers.ModelSerializer):
         return None
 
 
-class CourseDetailSerializer(serializers.ModelSerializer):
-    """Detailed course serializer with PO mappings"""
+def _active_enrollments() -> Prefetch:
+    return Prefetch(
+        'enrollments',
+        queryset=Enrollment.objects.filter(is_active=True).select_related('student'),
+        to_attr='active_enrollments'
+    )
+
+
+def _active_enrollment_count() -> dict:
+    return {'active_enrollment_count': Count('enrollments', filter=Q(enrollments__is_active=True))}
+
+
+class CourseDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Detailed course serializer with PO mappings
+
+    Serializing many courses costs a constant number of queries when the
+    queryset comes from ``setup_eager_loading``; plain instances still work
+    and fall back to per-course queries. With ``?fields=`` only the relations
+    of the requested fields are loaded.
+    """
     teacher_name = serializers.SerializerMethodField()
     semester_display = serializers.CharField(source='get_semester_display', read_only=True)
     program_outcomes = CoursePOSerializer(source='course_pos', many=True, read_only=True)
@@ -58,6 +81,14 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     enrollments = serializers.SerializerMethodField()
     enrollment_count = serializers.SerializerMethodField()
     
+    expandable_fields = {'teacher': ('api.serializers.user.UserSerializer', {})}
+    optimizer_hints = {
+        'teacher_name': {'select_related': ['teacher'], 'only': ['teacher']},
+        'learning_outcomes': {'prefetch_related': ['learning_outcomes'], 'only': []},
+        'enrollments': {'prefetch_related': [_active_enrollments], 'only': []},
+        'enrollment_count': {'annotate': _active_enrollment_count, 'only': []},
+    }
+    
     class Meta:
         model = Course
         fields = [
@@ -69,6 +100,11 @@ class CourseDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
+    @classmethod
+    def setup_eager_loading(cls, queryset: QuerySet[Course]) -> QuerySet[Course]:
+        """Load everything the serializer reads with one query per relation."""
+        return optimize_queryset(queryset, cls())
+    
     def get_teacher_name(self, obj) -> str | None:
         """Safely get teacher's full name, handling null teacher"""
         if obj.teacher:
@@ -77,6 +113,10 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     
     def get_enrollment_count(self, obj) -> int:
         """Get count of active enrollments for this course"""
+        if hasattr(obj, 'active_enrollment_count'):
+            return obj.active_enrollment_count
+        if hasattr(obj, 'active_enrollments'):
+            return len(obj.active_enrollments)
         return obj.enrollments.filter(is_active=True).count()
     
     def get_learning_outcomes(self, obj):
@@ -87,7 +127,9 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     def get_enrollments(self, obj):
         """Return active enrollments with final grades for dashboard analytics"""
         # Use existing EnrollmentSerializer defined below
-        qs = obj.enrollments.filter(is_active=True)
+        qs = getattr(obj, 'active_enrollments', None)
+        if qs is None:
+            qs = obj.enrollments.filter(is_active=True).select_related('student')
         return EnrollmentSerializer(qs, many=True).data
 
 
@@ -95,13 +137,18 @@ class CourseDetailSerializer(serializers.ModelSerializer):
 # ENROLLMENT SERIALIZERS
 # =============================================================================
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class EnrollmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for Enrollment model"""
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     student_id = serializers.CharField(source='student.student_id', read_only=True)
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
     
+    expandable_fields = {
+        'student': ('api.serializers.user.UserSerializer', {}),
+        'course': ('api.serializers.course.CourseSerializer', {}),
+    }
+    
     class Meta:
         model = Enrollment
         fields = [
@@ -0,0 +1,30 @@
+"""IMPORT JOB Serializers Module"""
+
+from rest_framework import serializers
+from ..models import ImportJob
+
+
+# =============================================================================
+# IMPORT JOB SERIALIZERS
+# =============================================================================
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Read-only serializer for polling background import jobs"""
+    
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    progress = serializers.FloatField(read_only=True)
+    throughput = serializers.FloatField(read_only=True, allow_null=True)
+    error_count = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'job_type', 'status', 'status_display', 'original_filename',
+            'total_rows', 'processed_rows', 'progress', 'throughput',
+            'success_count', 'skipped_count', 'error_count', 'errors', 'message',
+            'started_at', 'finished_at', 'created_at'
+        ]
+        read_only_fields = fields
+    
+    def get_error_count(self, obj):
+        return len(obj.errors)
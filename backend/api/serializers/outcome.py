@@ -11,13 +11,14 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin
 
 
 # =============================================================================
 # PROGRAM OUTCOME SERIALIZERS
 # =============================================================================
 
-class ProgramOutcomeSerializer(serializers.ModelSerializer):
+class ProgramOutcomeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProgramOutcome model"""
     
     class Meta:
@@ -49,11 +50,13 @@ class ProgramOutcomeStatsSerializer(serializers.ModelSerializer):
 # LEARNING OUTCOME SERIALIZERS
 # =============================================================================
 
-class LearningOutcomeSerializer(serializers.ModelSerializer):
+class LearningOutcomeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for LearningOutcome model"""
     course_code = serializers.CharField(source='course.code', read_only=True)
     course_name = serializers.CharField(source='course.name', read_only=True)
     
+    expandable_fields = {'course': ('api.serializers.course.CourseSerializer', {})}
+    
     class Meta:
         model = LearningOutcome
         fields = [
@@ -16,6 +16,7 @@ from ..models import (
     ContactRequest, LearningOutcome, StudentLOAchievement,
     AssessmentLO, LOPO
 )
+from ..fieldsets import DynamicFieldsMixin
 from ..validators import sanitize_text_field
 
 
@@ -23,7 +24,7 @@ from ..validators import sanitize_text_field
 # USER SERIALIZERS
 # =============================================================================
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer for User model (basic info)"""
     
     class Meta:
@@ -82,7 +83,7 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Detailed user serializer with extra info"""
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     
@@ -3,10 +3,22 @@
 
 from .email_service import EmailService
 from .student_import_service import StudentImportService, StudentImportServiceError
+from .analytics_sketch_service import AnalyticsSketchService
+from .achievement_snapshot_service import AchievementSnapshotService
+from .grade_import_service import GradeImportService
+from .grade_copy_import_service import GradeCopyImportService
+from .gradebook_export_service import GradebookExportService
+from .import_job_service import ImportJobService
 
 __all__ = [
     'EmailService',
     'StudentImportService',
     'StudentImportServiceError',
+    'AnalyticsSketchService',
+    'AchievementSnapshotService',
+    'GradeImportService',
+    'GradeCopyImportService',
+    'GradebookExportService',
+    'ImportJobService',
 ]
 
@@ -0,0 +1,196 @@
+"""
+AcuRate - Achievement Snapshot Service
+
+Captures periodic PO/LO achievement aggregates per course offering into
+``AchievementSnapshot`` and reads trends and deltas back from that history.
+
+Snapshots are written by the ``snapshot_achievements`` Celery task (daily
+via celery beat); analytics views only read them, so trend queries never
+recompute history from raw grades.
+
+Usage:
+    from api.services.achievement_snapshot_service import AchievementSnapshotService
+
+    AchievementSnapshotService.take_snapshot()
+    trends = AchievementSnapshotService.course_trends([course.id])
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.utils import timezone
+
+from ..models import AchievementSnapshot, StudentLOAchievement, StudentPOAchievement
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+TREND_WINDOW_DAYS = 120  # How far back trend reads look
+TREND_THRESHOLD = Decimal('1.0')  # Minimum delta (percentage points) to report up/down
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class AchievementSnapshotService:
+    """Write and query achievement snapshots."""
+
+    @staticmethod
+    def take_snapshot(snapshot_date: date | None = None) -> int:
+        """
+        Capture PO and LO aggregates for every course offering.
+
+        Re-running for the same date replaces that day's snapshot.
+
+        Returns:
+            Number of snapshot rows written.
+        """
+        snapshot_date = snapshot_date or timezone.localdate()
+
+        # PO achievement is per student; attribute it to each offering the
+        # student is actively enrolled in
+        po_rows = StudentPOAchievement.objects.filter(
+            student__enrollments__is_active=True
+        ).values(
+            'program_outcome_id',
+            course_id=F('student__enrollments__course_id'),
+            department=F('student__enrollments__course__department'),
+            academic_year=F('student__enrollments__course__academic_year'),
+            semester=F('student__enrollments__course__semester'),
+        ).annotate(
+            student_count=Count('id'),
+            achieved_count=Count(
+                'id', filter=Q(current_percentage__gte=F('program_outcome__target_percentage'))
+            ),
+            average_percentage=Avg('current_percentage'),
+        ).order_by()
+
+        lo_rows = StudentLOAchievement.objects.values(
+            'learning_outcome_id',
+            course_id=F('learning_outcome__course_id'),
+            department=F('learning_outcome__course__department'),
+            academic_year=F('learning_outcome__course__academic_year'),
+            semester=F('learning_outcome__course__semester'),
+        ).annotate(
+            student_count=Count('id'),
+            achieved_count=Count(
+                'id', filter=Q(current_percentage__gte=F('learning_outcome__target_percentage'))
+            ),
+            average_percentage=Avg('current_percentage'),
+        ).order_by()
+
+        snapshots = [
+            AchievementSnapshot(
+                snapshot_date=snapshot_date,
+                outcome_type=AchievementSnapshot.OutcomeType.PO,
+                **row
+            )
+            for row in po_rows
+        ]
+        snapshots.extend(
+            AchievementSnapshot(
+                snapshot_date=snapshot_date,
+                outcome_type=AchievementSnapshot.OutcomeType.LO,
+                **row
+            )
+            for row in lo_rows
+        )
+        for snapshot in snapshots:
+            snapshot.average_percentage = Decimal(snapshot.average_percentage).quantize(Decimal('0.01'))
+
+        with transaction.atomic():
+            AchievementSnapshot.objects.filter(snapshot_date=snapshot_date).delete()
+            AchievementSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+
+        logger.info(f"Achievement snapshot for {snapshot_date}: {len(snapshots)} rows")
+        return len(snapshots)
+
+    @staticmethod
+    def _weighted_series(rows: Iterable[dict], key: str) -> dict[Any, list[dict]]:
+        series = defaultdict(list)
+        for row in rows:
+            if not row['students']:
+                continue
+            series[row[key]].append({
+                'date': row['snapshot_date'].isoformat(),
+                'average': round(float(row['weighted'] / row['students']), 1),
+                'students': row['students'],
+            })
+        return series
+
+    @classmethod
+    def po_history(
+        cls,
+        semester: int | None = None,
+        academic_year: str | None = None,
+        days: int = TREND_WINDOW_DAYS,
+    ) -> dict[int, list[dict]]:
+        """
+        Institution-wide PO averages per snapshot date (oldest first).
+
+        Course-level averages are combined weighted by student count.
+        """
+        since = timezone.localdate() - timedelta(days=days)
+        snapshots = AchievementSnapshot.objects.filter(
+            outcome_type=AchievementSnapshot.OutcomeType.PO,
+            snapshot_date__gte=since,
+        )
+        if semester:
+            snapshots = snapshots.filter(semester=semester)
+        if academic_year:
+            snapshots = snapshots.filter(academic_year=academic_year)
+
+        rows = snapshots.values('program_outcome_id', 'snapshot_date').annotate(
+            weighted=Sum(F('average_percentage') * F('student_count')),
+            students=Sum('student_count'),
+        ).order_by('program_outcome_id', 'snapshot_date')
+        return cls._weighted_series(rows, 'program_outcome_id')
+
+    @classmethod
+    def course_trends(cls, course_ids: Iterable[int], days: int = TREND_WINDOW_DAYS) -> dict[int, dict]:
+        """
+        Trend of each course's PO achievement between its two latest snapshots.
+
+        Returns:
+            Dict keyed by course id with 'trend' ('up'/'down'/'neutral') and
+            'delta' (percentage points, None without enough history).
+        """
+        since = timezone.localdate() - timedelta(days=days)
+        rows = AchievementSnapshot.objects.filter(
+            course_id__in=list(course_ids),
+            outcome_type=AchievementSnapshot.OutcomeType.PO,
+            snapshot_date__gte=since,
+        ).values('course_id', 'snapshot_date').annotate(
+            weighted=Sum(F('average_percentage') * F('student_count')),
+            students=Sum('student_count'),
+        ).order_by('course_id', 'snapshot_date')
+
+        trends = {}
+        for course_id, series in cls._weighted_series(rows, 'course_id').items():
+            trends[course_id] = cls.delta(series)
+        return trends
+
+    @staticmethod
+    def delta(series: list[dict]) -> dict:
+        """Trend and delta between the last two points of a series."""
+        if len(series) < 2:
+            return {'trend': 'neutral', 'delta': None}
+        change = Decimal(str(series[-1]['average'])) - Decimal(str(series[-2]['average']))
+        if change >= TREND_THRESHOLD:
+            trend = 'up'
+        elif change <= -TREND_THRESHOLD:
+            trend = 'down'
+        else:
+            trend = 'neutral'
+        return {'trend': trend, 'delta': float(round(change, 1))}
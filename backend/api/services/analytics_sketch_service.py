@@ -0,0 +1,212 @@
+"""
+AcuRate - Analytics Sketch Service
+
+Builds, refreshes and merges the per-course quantile sketches stored in
+``CourseAnalyticsSketch``. Analytics views use it to answer percentile and
+histogram questions for departments and the whole institution by merging
+one sketch per course instead of rescanning every enrollment.
+
+Accuracy:
+    Merged answers carry the KLL rank error bound documented in
+    ``api.sketches`` (about 1.7 / k, i.e. ~0.85% of rank with k = 200).
+    Populations at or below ``SKETCH_EXACT_THRESHOLD`` values, and reads
+    that hit a missing or stale sketch, are answered exactly from the raw
+    rows by the callers.
+
+Freshness:
+    Sketches are rebuilt by the ``refresh_course_sketches`` task (periodic,
+    and queued by reads that find a stale sketch), never inside a request.
+
+Usage:
+    from api.services.analytics_sketch_service import AnalyticsSketchService
+
+    if AnalyticsSketchService.sketches_current(course_ids):
+        sketch = AnalyticsSketchService.merge_final_grades(course_ids, department='Computer Science')
+"""
+
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+from django.conf import settings
+
+from ..models import Course, CourseAnalyticsSketch, Enrollment, StudentPOAchievement
+from ..sketches import KLLSketch
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+FINAL_GRADE = 'final_grade'
+PO_ACHIEVEMENT = 'po_achievement'
+
+# At or below this many values analytics are computed exactly from raw rows
+SKETCH_EXACT_THRESHOLD = getattr(settings, 'ANALYTICS_SKETCH_EXACT_THRESHOLD', 2000)
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class AnalyticsSketchService:
+    """Build and merge per-course analytics sketches."""
+
+    @staticmethod
+    def build_course_payload(course_id: int) -> tuple[dict, int]:
+        """
+        Build the sketch payload for one course from raw rows.
+
+        Returns:
+            Tuple of (payload dict, number of final grades summarised).
+        """
+        grade_sketches: dict[str, KLLSketch] = defaultdict(KLLSketch)
+        grade_rows = Enrollment.objects.filter(
+            course_id=course_id,
+            final_grade__isnull=False
+        ).values_list('final_grade', 'student__department', 'student__is_active')
+
+        final_grade_count = 0
+        for final_grade, department, is_active in grade_rows.iterator():
+            segment = (department or '') if is_active else ''
+            grade_sketches[segment].update(final_grade)
+            final_grade_count += 1
+
+        po_sketches: dict[str, KLLSketch] = defaultdict(KLLSketch)
+        graded_students = Enrollment.objects.filter(
+            course_id=course_id,
+            final_grade__isnull=False
+        ).values('student_id')
+        po_rows = StudentPOAchievement.objects.filter(
+            student_id__in=graded_students
+        ).values_list('program_outcome_id', 'current_percentage')
+
+        for program_outcome_id, percentage in po_rows.iterator():
+            po_sketches[str(program_outcome_id)].update(percentage)
+
+        payload = {
+            FINAL_GRADE: {segment: sketch.to_dict() for segment, sketch in grade_sketches.items()},
+            PO_ACHIEVEMENT: {po_id: sketch.to_dict() for po_id, sketch in po_sketches.items()},
+        }
+        return payload, final_grade_count
+
+    @classmethod
+    def rebuild_course(cls, course_id: int) -> CourseAnalyticsSketch:
+        """Rebuild and persist the sketch for a single course."""
+        payload, final_grade_count = cls.build_course_payload(course_id)
+        sketch, _ = CourseAnalyticsSketch.objects.update_or_create(
+            course_id=course_id,
+            defaults={
+                'payload': payload,
+                'final_grade_count': final_grade_count,
+                'is_stale': False,
+            }
+        )
+        return sketch
+
+    @classmethod
+    def refresh(cls, course_ids: Iterable[int] | None = None) -> int:
+        """
+        Rebuild sketches that are missing or marked stale.
+
+        Args:
+            course_ids: Restrict the refresh to these courses (all courses when None).
+
+        Returns:
+            Number of courses rebuilt.
+        """
+        pending = cls.stale_course_ids(course_ids)
+        for course_id in pending:
+            cls.rebuild_course(course_id)
+
+        if pending:
+            logger.info(f"Rebuilt analytics sketches for {len(pending)} courses")
+        return len(pending)
+
+    @staticmethod
+    def stale_course_ids(course_ids: Iterable[int] | None = None) -> list[int]:
+        """Ids of the courses whose sketch is missing or marked stale."""
+        courses = Course.objects.all()
+        if course_ids is not None:
+            courses = courses.filter(id__in=list(course_ids))
+        return list(courses.exclude(analytics_sketch__is_stale=False).values_list('id', flat=True))
+
+    @staticmethod
+    def schedule_refresh(course_ids: Iterable[int]) -> None:
+        """Queue a background rebuild; the periodic refresh catches up if no broker is reachable."""
+        from ..tasks import refresh_course_sketches
+
+        try:
+            refresh_course_sketches.delay(list(course_ids))
+        except Exception as e:
+            logger.warning(f"Could not enqueue analytics sketch refresh: {str(e)}")
+
+    @classmethod
+    def sketches_current(cls, course_ids: Iterable[int]) -> bool:
+        """
+        Whether every given course has an up-to-date sketch to merge.
+
+        Missing or stale sketches are queued for ``refresh_course_sketches``
+        instead of being rebuilt inside the read; callers answer exactly
+        until the rebuild lands.
+        """
+        stale = cls.stale_course_ids(course_ids)
+        if stale:
+            cls.schedule_refresh(stale)
+        return not stale
+
+    @staticmethod
+    def mark_stale(course_ids: Iterable[int]) -> None:
+        """Flag sketches of the given courses for rebuild."""
+        course_ids = list(course_ids)
+        if course_ids:
+            CourseAnalyticsSketch.objects.filter(course_id__in=course_ids).update(is_stale=True)
+
+    @staticmethod
+    def mark_stale_for_student(student_id: int) -> None:
+        """Flag sketches of every course the student is enrolled in."""
+        CourseAnalyticsSketch.objects.filter(
+            course__enrollments__student_id=student_id
+        ).update(is_stale=True)
+
+    @staticmethod
+    def mark_stale_for_students(student_ids: Iterable[int]) -> None:
+        """Flag sketches of every course any of the students is enrolled in."""
+        CourseAnalyticsSketch.objects.filter(
+            course__enrollments__student_id__in=list(student_ids)
+        ).update(is_stale=True)
+
+    @staticmethod
+    def _payloads(course_ids: Iterable[int]) -> Iterable[dict]:
+        return CourseAnalyticsSketch.objects.filter(
+            course_id__in=list(course_ids)
+        ).values_list('payload', flat=True).iterator()
+
+    @classmethod
+    def merge_final_grades(cls, course_ids: Iterable[int], department: str | None = None) -> KLLSketch:
+        """Merge final grade sketches of the given courses, optionally for one student department."""
+        merged = KLLSketch()
+        for payload in cls._payloads(course_ids):
+            for segment, data in payload.get(FINAL_GRADE, {}).items():
+                if department and segment != department:
+                    continue
+                merged.merge(KLLSketch.from_dict(data))
+        return merged
+
+    @classmethod
+    def merge_po_achievements(cls, course_ids: Iterable[int]) -> dict[int, KLLSketch]:
+        """
+        Merge PO achievement sketches of the given courses, keyed by PO id.
+
+        Students enrolled in several of the courses contribute once per
+        course, so the merged distribution is enrollment-weighted.
+        """
+        merged: dict[int, KLLSketch] = defaultdict(KLLSketch)
+        for payload in cls._payloads(course_ids):
+            for po_id, data in payload.get(PO_ACHIEVEMENT, {}).items():
+                merged[int(po_id)].merge(KLLSketch.from_dict(data))
+        return merged
+
@@ -0,0 +1,273 @@
+"""
+AcuRate - Grade COPY Import Service
+
+PostgreSQL fast path for very large grade loads (e.g. term-end registrar
+files). Rows are streamed into a staging table with ``COPY FROM STDIN``,
+validated with set-based SQL, merged into ``student_grades`` with a single
+``INSERT ... ON CONFLICT`` and the achievement rollup is deferred to one
+background task after commit.
+
+The row checks and error messages match ``GradeImportService``, so clients
+get the same ``"Row N: ..."`` report whichever path handled the upload.
+
+Usage:
+    from api.services.grade_copy_import_service import GradeCopyImportService
+
+    if GradeCopyImportService.should_handle(uploaded_file):
+        result = GradeCopyImportService(request.user).import_file(uploaded_file)
+        # result.created, result.updated, result.errors
+"""
+
+import csv
+import io
+import logging
+from typing import BinaryIO, Iterable, Iterator
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from ..models import User, Assessment, Course, StudentGrade
+from .grade_import_service import GradeImportResult, GradeImportService
+from .student_import_service import iter_decoded_lines
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+STAGING_TABLE = 'pg_temp.grade_import_staging'  # Schema-qualified: never resolves to a permanent table
+COPY_BUFFER_SIZE = 64 * 1024  # Characters handed to COPY per write
+
+# Same shapes GradeImportService accepts via int() / Decimal(); the digit
+# limits keep the casts below from overflowing
+INTEGER_PATTERN = r'^[+-]?[0-9]{1,18}$'
+DECIMAL_PATTERN = r'^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]{1,3})?$'
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+class _CopyStream:
+    """File-like object that renders rows as CSV on demand for COPY."""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator='\n')
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or self._buffer.tell() < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+
+        data = self._buffer.getvalue()
+        data, rest = (data, '') if size < 0 else (data[:size], data[size:])
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._buffer.write(rest)
+        return data
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class GradeCopyImportService:
+    """
+    Import a grades CSV through a PostgreSQL staging table.
+
+    Only usable on PostgreSQL; ``should_handle`` decides whether an upload
+    is large enough to take this path (``GRADE_IMPORT_COPY_THRESHOLD``).
+    """
+
+    def __init__(self, user: User) -> None:
+        self.user = user
+
+    @staticmethod
+    def should_handle(uploaded_file) -> bool:
+        """Return True if the upload should use the COPY fast path."""
+        threshold = getattr(settings, 'GRADE_IMPORT_COPY_THRESHOLD', 0)
+        return (
+            connection.vendor == 'postgresql'
+            and bool(threshold)
+            and uploaded_file.size >= threshold
+        )
+
+    @staticmethod
+    def _staged_rows(file: BinaryIO, start: int) -> Iterator[tuple]:
+        for row_num, row in enumerate(csv.DictReader(iter_decoded_lines(file, 'utf-8')), start=start):
+            yield (
+                row_num,
+                (row.get('student_id') or '').strip(),
+                (row.get('assessment_id') or '').strip(),
+                (row.get('score') or '').strip(),
+                (row.get('feedback') or '').strip(),
+            )
+
+    @staticmethod
+    def _copy(cursor, sql: str, stream: _CopyStream) -> None:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            cursor.copy_expert(sql, stream, COPY_BUFFER_SIZE)
+        else:
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                while data := stream.read(COPY_BUFFER_SIZE):
+                    copy.write(data)
+
+    def _validate(self, cursor) -> None:
+        """Mark every staged row with its first error, as GradeImportService would."""
+        users = User._meta.db_table
+        assessments = Assessment._meta.db_table
+        courses = Course._meta.db_table
+
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET error = 'student_id, assessment_id, and score are required'
+            WHERE student_id = '' OR assessment_id = '' OR score = ''
+        """)
+
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE} s
+            SET student_pk = u.id
+            FROM {users} u
+            WHERE s.error IS NULL AND u.student_id = s.student_id AND u.role = %s
+        """, [User.Role.STUDENT])
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET error = 'Student with ID ' || student_id || ' not found'
+            WHERE error IS NULL AND student_pk IS NULL
+        """)
+
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET assessment_pk = CASE WHEN assessment_id ~ %s THEN assessment_id::bigint END
+            WHERE error IS NULL
+        """, [INTEGER_PATTERN])
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE} s
+            SET max_score = a.max_score, teacher_pk = c.teacher_id
+            FROM {assessments} a
+            JOIN {courses} c ON c.id = a.course_id
+            WHERE s.error IS NULL AND a.id = s.assessment_pk
+        """)
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET error = 'Assessment with ID ' || assessment_id || ' not found'
+            WHERE error IS NULL AND max_score IS NULL
+        """)
+
+        if self.user.role == User.Role.TEACHER:
+            cursor.execute(f"""
+                UPDATE {STAGING_TABLE}
+                SET error = 'You don''t have permission to grade this assessment'
+                WHERE error IS NULL AND teacher_pk IS DISTINCT FROM %s
+            """, [self.user.id])
+
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET score_value = CASE WHEN score ~ %s THEN score::numeric END
+            WHERE error IS NULL
+        """, [DECIMAL_PATTERN])
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET error = 'Invalid score format: ' || score
+            WHERE error IS NULL AND score_value IS NULL
+        """)
+        cursor.execute(f"""
+            UPDATE {STAGING_TABLE}
+            SET error = 'Score must be between 0 and ' || max_score
+            WHERE error IS NULL AND (score_value < 0 OR score_value > max_score)
+        """)
+
+    @staticmethod
+    def _merge(cursor) -> list[tuple[int, int, bool]]:
+        """
+        Upsert the valid rows; the last row for a (student, assessment) wins.
+
+        Rows without feedback keep the stored feedback of an existing grade.
+
+        Returns:
+            (student_id, assessment_id, inserted) for every written grade.
+        """
+        grades = StudentGrade._meta.db_table
+        cursor.execute(f"""
+            INSERT INTO {grades} AS g
+                (student_id, assessment_id, score, feedback, graded_at, created_at, updated_at)
+            SELECT DISTINCT ON (student_pk, assessment_pk)
+                student_pk, assessment_pk, score_value, feedback, now(), now(), now()
+            FROM {STAGING_TABLE}
+            WHERE error IS NULL
+            ORDER BY student_pk, assessment_pk, row_num DESC
+            ON CONFLICT (student_id, assessment_id) DO UPDATE SET
+                score = EXCLUDED.score,
+                feedback = CASE WHEN EXCLUDED.feedback <> '' THEN EXCLUDED.feedback ELSE g.feedback END,
+                updated_at = EXCLUDED.updated_at
+            RETURNING g.student_id, g.assessment_id, (g.xmax = 0)
+        """)
+        return cursor.fetchall()
+
+    def import_file(self, file: BinaryIO, start: int = 2) -> GradeImportResult:
+        """
+        Stage, validate and merge a UTF-8 grades CSV in one transaction.
+
+        Args:
+            file: Binary file-like object with the CSV upload.
+            start: Row number of the first data row (2 for files with a header).
+
+        Returns:
+            GradeImportResult with created/updated counts and per-row errors.
+        """
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+            # Temporary tables are unlogged and private to the session
+            cursor.execute(f"""
+                CREATE TEMPORARY TABLE {STAGING_TABLE} (
+                    row_num integer PRIMARY KEY,
+                    student_id text NOT NULL,
+                    assessment_id text NOT NULL,
+                    score text NOT NULL,
+                    feedback text NOT NULL,
+                    student_pk bigint,
+                    assessment_pk bigint,
+                    max_score numeric,
+                    teacher_pk bigint,
+                    score_value numeric,
+                    error text
+                ) ON COMMIT DROP
+            """)
+            self._copy(
+                cursor,
+                f"COPY {STAGING_TABLE} (row_num, student_id, assessment_id, score, feedback) "
+                f"FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (student_id, assessment_id, score, feedback))",
+                _CopyStream(self._staged_rows(file, start)),
+            )
+
+            self._validate(cursor)
+            written = self._merge(cursor)
+
+            cursor.execute(f"""
+                SELECT row_num, error FROM {STAGING_TABLE}
+                WHERE error IS NOT NULL ORDER BY row_num
+            """)
+            errors = [f"Row {row_num}: {message}" for row_num, message in cursor.fetchall()]
+            cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+            assessment_ids = {assessment_pk for _, assessment_pk, _ in written}
+            if assessment_ids:
+                transaction.on_commit(lambda: GradeImportService.enqueue_recalculation(assessment_ids))
+
+        created = sum(1 for *_, inserted in written if inserted)
+        result = GradeImportResult(created=created, updated=len(written) - created, errors=errors)
+
+        logger.info(
+            f"Grade COPY import by {self.user.username}: {result.created} created, "
+            f"{result.updated} updated, {len(errors)} errors"
+        )
+        return result
@@ -0,0 +1,404 @@
+"""
+AcuRate - Grade Import Service
+
+Set-based bulk grade import. Rows are parsed and validated in full first,
+students and assessments are resolved with one IN query each, ownership and
+score ranges are checked in memory, and valid grades are written with a
+single upsert followed by one achievement rollup for the affected set.
+
+Usage:
+    from api.services.grade_import_service import GradeImportService
+
+    result = GradeImportService(request.user).import_rows(csv.DictReader(stream))
+    # result.created, result.updated, result.errors
+
+    # Dry run: same checks and counts, nothing written
+    result = GradeImportService(request.user).preview(csv.DictReader(stream))
+
+    # API batch: students by primary key, per-item results, deferred rollup
+    result = GradeImportService(request.user).batch(request.data['grades'])
+    # result.created, result.updated, result.items
+"""
+
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Iterable
+
+from django.db import transaction
+
+from ..models import User, Assessment, StudentGrade
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+UPSERT_BATCH_SIZE = 1000  # Rows per INSERT ... ON CONFLICT statement
+GRADE_BATCH_MAX_ITEMS = 1000  # Entries accepted by one POST /api/grades/batch/
+
+REQUIRED_MESSAGE = "student_id, assessment_id, and score are required"
+BATCH_REQUIRED_MESSAGE = "student, assessment, and score are required"
+
+
+# =============================================================================
+# DATA CLASSES
+# =============================================================================
+
+@dataclass
+class ParsedGradeRow:
+    """A grade row that passed the per-row checks."""
+    row: int
+    student_id: str
+    assessment_id: int | None
+    raw_assessment_id: str
+    raw_score: str
+    feedback: str
+
+
+@dataclass
+class ValidGrade:
+    """A fully validated grade ready to be written."""
+    row: int
+    student_pk: int
+    assessment_pk: int
+    score: Decimal
+    feedback: str
+
+
+@dataclass
+class GradeImportResult:
+    """Result of a grade import operation."""
+    created: int = 0
+    updated: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class GradeBatchItem:
+    """Outcome of one entry of a grade batch."""
+    index: int
+    status: str  # 'created', 'updated', 'superseded' or 'error'
+    id: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class GradeBatchResult:
+    """Result of a grade batch: counts plus one item per entry, in order."""
+    created: int = 0
+    updated: int = 0
+    items: list[GradeBatchItem] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for item in self.items if item.status == 'error')
+
+
+def _text(value) -> str:
+    """Batch entries arrive as JSON values; the row checks expect strings."""
+    return '' if value is None else str(value)
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class GradeImportService:
+    """
+    Validate and upsert grades for a teacher (or staff user).
+
+    Error messages keep the ``"Row N: ..."`` format of the original per-row
+    import so API clients see the same output.
+    """
+
+    def __init__(self, user: User) -> None:
+        self.user = user
+
+    def _parse(self, rows: Iterable[dict], start: int,
+               required_message: str = REQUIRED_MESSAGE) -> tuple[list[ParsedGradeRow], list[tuple[int, str]]]:
+        """Strip and shape raw rows; report rows missing required values."""
+        parsed = []
+        errors = []
+        for row_num, row in enumerate(rows, start=start):
+            student_id = (row.get('student_id') or '').strip()
+            assessment_id = (row.get('assessment_id') or '').strip()
+            score = (row.get('score') or '').strip()
+
+            if not all([student_id, assessment_id, score]):
+                errors.append((row_num, required_message))
+                continue
+
+            try:
+                assessment_pk = int(assessment_id)
+            except ValueError:
+                assessment_pk = None
+
+            parsed.append(ParsedGradeRow(
+                row=row_num,
+                student_id=student_id,
+                assessment_id=assessment_pk,
+                raw_assessment_id=assessment_id,
+                raw_score=score,
+                feedback=(row.get('feedback') or '').strip(),
+            ))
+        return parsed, errors
+
+    def validate(self, rows: Iterable[dict], start: int = 2) -> tuple[list[ValidGrade], list[str]]:
+        """
+        Validate every row without writing anything.
+
+        Args:
+            rows: Mappings with student_id, assessment_id, score and optional feedback.
+            start: Row number of the first row (2 for CSV files with a header).
+
+        Returns:
+            Tuple of (valid grades, error messages).
+        """
+        valid, errors = self._check(*self._parse(rows, start), self._students_by_number)
+        return valid, [f"Row {row_num}: {message}" for row_num, message in errors]
+
+    @staticmethod
+    def _students_by_number(keys: set[str]) -> dict[str, int]:
+        return dict(
+            User.objects.filter(student_id__in=keys, role=User.Role.STUDENT).values_list('student_id', 'id')
+        )
+
+    @staticmethod
+    def _students_by_pk(keys: set[str]) -> dict[str, int]:
+        pks = {int(key) for key in keys if key.isdigit()}
+        return {
+            str(pk): pk
+            for pk in User.objects.filter(id__in=pks, role=User.Role.STUDENT).values_list('id', flat=True)
+        }
+
+    def _check(self, parsed: list[ParsedGradeRow], errors: list[tuple[int, str]],
+               resolve_students) -> tuple[list[ValidGrade], list[tuple[int, str]]]:
+        """Resolve students and assessments in bulk and run the per-row checks."""
+        students = resolve_students({row.student_id for row in parsed})
+        assessments = {
+            assessment['id']: assessment
+            for assessment in Assessment.objects.filter(
+                id__in={row.assessment_id for row in parsed if row.assessment_id is not None}
+            ).values('id', 'max_score', 'course__teacher_id')
+        }
+
+        valid = []
+        check_owner = self.user.role == User.Role.TEACHER
+        for row in parsed:
+            student_pk = students.get(row.student_id)
+            if student_pk is None:
+                errors.append((row.row, f"Student with ID {row.student_id} not found"))
+                continue
+
+            assessment = assessments.get(row.assessment_id)
+            if assessment is None:
+                errors.append((row.row, f"Assessment with ID {row.raw_assessment_id} not found"))
+                continue
+
+            if check_owner and assessment['course__teacher_id'] != self.user.id:
+                errors.append((row.row, "You don't have permission to grade this assessment"))
+                continue
+
+            try:
+                score = Decimal(row.raw_score)
+            except (InvalidOperation, ValueError):
+                score = None
+            if score is None or not score.is_finite():
+                errors.append((row.row, f"Invalid score format: {row.raw_score}"))
+                continue
+
+            if score < 0 or score > assessment['max_score']:
+                errors.append((row.row, f"Score must be between 0 and {assessment['max_score']}"))
+                continue
+
+            valid.append(ValidGrade(
+                row=row.row,
+                student_pk=student_pk,
+                assessment_pk=assessment['id'],
+                score=score,
+                feedback=row.feedback,
+            ))
+
+        errors.sort(key=lambda error: error[0])
+        return valid, errors
+
+    @staticmethod
+    def _latest_per_key(grades: list[ValidGrade]) -> dict[tuple[int, int], ValidGrade]:
+        # ON CONFLICT cannot touch the same row twice in one statement;
+        # like the sequential import, the last row for a pair wins
+        latest = {}
+        for grade in grades:
+            latest[(grade.student_pk, grade.assessment_pk)] = grade
+        return latest
+
+    @staticmethod
+    def _existing_keys(keys: Iterable[tuple[int, int]]) -> set[tuple[int, int]]:
+        keys = set(keys)
+        if not keys:
+            return set()
+        existing = StudentGrade.objects.filter(
+            student_id__in={student_pk for student_pk, _ in keys},
+            assessment_id__in={assessment_pk for _, assessment_pk in keys},
+        ).values_list('student_id', 'assessment_id')
+        return keys & set(existing)
+
+    @staticmethod
+    def enqueue_recalculation(assessment_ids: Iterable[int]) -> None:
+        """
+        Hand the rollup of ``assessment_ids``' grades to Celery.
+
+        Only the assessment ids travel in the message, the task reads the
+        students back. Runs inline if no broker is reachable.
+        """
+        from ..signals import recalculate_achievements_for_assessments
+        from ..tasks import recalculate_grade_achievements
+
+        assessment_ids = sorted(set(assessment_ids))
+        try:
+            recalculate_grade_achievements.delay(assessment_ids)
+        except Exception as e:
+            logger.warning(f"Could not enqueue achievement recalculation, running inline: {str(e)}")
+            recalculate_achievements_for_assessments(assessment_ids)
+
+    @classmethod
+    def upsert(cls, grades: list[ValidGrade]) -> tuple[int, int]:
+        """
+        Write validated grades with INSERT ... ON CONFLICT and run one rollup.
+
+        Rows without feedback keep the stored feedback of an existing grade.
+
+        Returns:
+            Tuple of (created, updated) counts.
+        """
+        latest = cls._latest_per_key(grades)
+        if not latest:
+            return 0, 0
+
+        existing = cls._existing_keys(latest)
+        cls._write(latest, defer_rollup=False)
+        updated = len(existing)
+        return len(latest) - updated, updated
+
+    @classmethod
+    def _write(cls, latest: dict[tuple[int, int], ValidGrade], defer_rollup: bool) -> dict[tuple[int, int], int]:
+        """
+        Upsert ``latest`` and run (or, after commit, enqueue) one rollup.
+
+        Returns:
+            Grade primary key per (student, assessment) pair.
+        """
+        with_feedback = []
+        without_feedback = []
+        for (student_pk, assessment_pk), grade in latest.items():
+            target = with_feedback if grade.feedback else without_feedback
+            target.append(StudentGrade(
+                student_id=student_pk,
+                assessment_id=assessment_pk,
+                score=grade.score,
+                feedback=grade.feedback,
+            ))
+
+        from ..signals import recalculate_achievements_for_grades
+
+        with transaction.atomic():
+            for objs, update_fields in (
+                (with_feedback, ['score', 'feedback', 'updated_at']),
+                (without_feedback, ['score', 'updated_at']),
+            ):
+                if objs:
+                    StudentGrade.objects.bulk_create(
+                        objs,
+                        batch_size=UPSERT_BATCH_SIZE,
+                        update_conflicts=True,
+                        unique_fields=['student', 'assessment'],
+                        update_fields=update_fields,
+                    )
+            if defer_rollup:
+                assessment_ids = {assessment_pk for _, assessment_pk in latest}
+                transaction.on_commit(lambda: cls.enqueue_recalculation(assessment_ids))
+            else:
+                recalculate_achievements_for_grades(latest)
+
+        # ON CONFLICT ... RETURNING sets the primary key of inserted and updated rows alike
+        return {
+            (obj.student_id, obj.assessment_id): obj.pk
+            for obj in with_feedback + without_feedback
+        }
+
+    def preview(self, rows: Iterable[dict], start: int = 2) -> GradeImportResult:
+        """
+        Dry run: validate all rows and count what an import would do.
+
+        Runs only reads (one extra IN query for the existing grades), so no
+        write transaction is opened.
+        """
+        valid, errors = self.validate(rows, start=start)
+        latest = self._latest_per_key(valid)
+        updated = len(self._existing_keys(latest))
+        return GradeImportResult(created=len(latest) - updated, updated=updated, errors=errors)
+
+    def import_rows(self, rows: Iterable[dict], start: int = 2) -> GradeImportResult:
+        """Validate all rows, then upsert the valid ones in one transaction."""
+        valid, errors = self.validate(rows, start=start)
+        created, updated = self.upsert(valid)
+
+        logger.info(
+            f"Grade import by {self.user.username}: {created} created, "
+            f"{updated} updated, {len(errors)} errors"
+        )
+        return GradeImportResult(created=created, updated=updated, errors=errors)
+
+    def batch(self, entries: list[dict]) -> GradeBatchResult:
+        """
+        Validate a list of API grade entries together and upsert the valid ones.
+
+        Entries carry ``student`` (user primary key), ``assessment``, ``score``
+        and optional ``feedback``, like ``StudentGradeSerializer``. Invalid
+        entries are reported without blocking the rest. The achievement
+        rollup for the whole batch is enqueued once after commit.
+
+        Returns:
+            GradeBatchResult with one item per entry, indexed from 0.
+        """
+        rows = [
+            {
+                'student_id': _text(entry.get('student')),
+                'assessment_id': _text(entry.get('assessment')),
+                'score': _text(entry.get('score')),
+                'feedback': _text(entry.get('feedback')),
+            } if isinstance(entry, dict) else {}
+            for entry in entries
+        ]
+        parsed, errors = self._parse(rows, 0, required_message=BATCH_REQUIRED_MESSAGE)
+        valid, errors = self._check(parsed, errors, self._students_by_pk)
+
+        latest = self._latest_per_key(valid)
+        existing = self._existing_keys(latest)
+        grade_ids = self._write(latest, defer_rollup=True) if latest else {}
+
+        items = {index: GradeBatchItem(index, 'error', error=message) for index, message in errors}
+        for grade in valid:
+            key = (grade.student_pk, grade.assessment_pk)
+            if latest[key] is not grade:
+                items[grade.row] = GradeBatchItem(
+                    grade.row, 'superseded', error=f"Superseded by entry {latest[key].row}"
+                )
+            else:
+                status = 'updated' if key in existing else 'created'
+                items[grade.row] = GradeBatchItem(grade.row, status, id=grade_ids[key])
+
+        updated = len(existing)
+        result = GradeBatchResult(
+            created=len(latest) - updated,
+            updated=updated,
+            items=[items[index] for index in range(len(rows))],
+        )
+        logger.info(
+            f"Grade batch by {self.user.username}: {result.created} created, "
+            f"{result.updated} updated, {result.failed} errors"
+        )
+        return result
@@ -0,0 +1,179 @@
+"""
+AcuRate - Gradebook Export Service
+
+Wide gradebook export for a set of courses: one row per enrolled student,
+one column per assessment followed by LO and PO achievement columns.
+
+Column definitions are loaded with one query per kind. All cell values come
+from a single ordered ``values_list()`` stream (a UNION of the students,
+their grades, LO achievements and PO achievements) read through a
+server-side cursor, and are pivoted in Python one student at a time, so the
+export never issues per-student queries and only holds one row in memory.
+
+Usage:
+    from api.services.gradebook_export_service import GradebookExportService
+
+    export = GradebookExportService(Course.objects.filter(department='Computer Science'))
+    response = StreamingHttpResponse(export.iter_csv(), content_type='text/csv')
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from django.db.models import DecimalField, F, IntegerField, Q, QuerySet, Value
+
+from ..models import (
+    User, Course, Enrollment, Assessment, StudentGrade, LearningOutcome,
+    ProgramOutcome, StudentLOAchievement, StudentPOAchievement
+)
+from ..xlsx import iter_xlsx
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+GRADEBOOK_CHUNK_SIZE = 2000  # Rows fetched per server-side cursor round trip
+GRADEBOOK_FLUSH_ROWS = 200  # Students buffered before a CSV chunk is yielded
+STUDENT_COLUMNS = ['Student ID', 'Student Name']
+
+# Kinds of rows in the merged stream; students sort first within their group
+KIND_STUDENT, KIND_GRADE, KIND_LO, KIND_PO = range(4)
+
+
+# =============================================================================
+# DATA CLASSES
+# =============================================================================
+
+@dataclass
+class GradebookColumns:
+    """Column headers and the index of each column's source object."""
+    header: list[str]
+    index: dict[tuple[int, int], int]
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class GradebookExportService:
+    """Pivot grades and achievements of a course set into a wide table."""
+
+    def __init__(self, courses: QuerySet[Course]) -> None:
+        self.courses = courses
+
+    def _students(self) -> QuerySet:
+        return Enrollment.objects.filter(course__in=self.courses, is_active=True).values('student_id')
+
+    def columns(self) -> GradebookColumns:
+        """Load assessment, LO and PO columns (three queries)."""
+        header = list(STUDENT_COLUMNS)
+        index = {}
+
+        def add(kind: int, object_id: int, title: str) -> None:
+            index[(kind, object_id)] = len(header)
+            header.append(title)
+
+        for assessment_id, code, title, max_score in Assessment.objects.filter(
+            course__in=self.courses
+        ).order_by('course__code', 'due_date', 'id').values_list('id', 'course__code', 'title', 'max_score'):
+            add(KIND_GRADE, assessment_id, f'{code} {title} ({max_score})')
+
+        for lo_id, course_code, code in LearningOutcome.objects.filter(
+            course__in=self.courses
+        ).order_by('course__code', 'code', 'id').values_list('id', 'course__code', 'code'):
+            add(KIND_LO, lo_id, f'{course_code} {code} (%)')
+
+        for po_id, code in ProgramOutcome.objects.filter(
+            Q(courses__in=self.courses) | Q(lo_pos__learning_outcome__course__in=self.courses)
+        ).distinct().order_by('code', 'id').values_list('id', 'code'):
+            add(KIND_PO, po_id, f'{code} (%)')
+
+        return GradebookColumns(header=header, index=index)
+
+    def _stream(self) -> Iterator[tuple]:
+        """
+        Yield (last name, first name, user id, student number, kind, column, value)
+        for every student, grade and achievement, grouped by student.
+        """
+        students = self._students()
+        no_column = Value(None, output_field=IntegerField())
+        no_value = Value(None, output_field=DecimalField(max_digits=6, decimal_places=2))
+        fields = ['key_last', 'key_first', 'key_user', 'key_number', 'kind', 'column', 'value']
+
+        def keyed(queryset: QuerySet, prefix: str) -> QuerySet:
+            return queryset.annotate(
+                key_last=F(f'{prefix}last_name'),
+                key_first=F(f'{prefix}first_name'),
+                key_user=F(f'{prefix}id'),
+                key_number=F(f'{prefix}student_id'),
+            )
+
+        rows = keyed(User.objects.filter(id__in=students), '').annotate(
+            kind=Value(KIND_STUDENT), column=no_column, value=no_value,
+        ).values_list(*fields)
+        grades = keyed(StudentGrade.objects.filter(
+            student_id__in=students, assessment__course__in=self.courses
+        ), 'student__').annotate(
+            kind=Value(KIND_GRADE), column=F('assessment_id'), value=F('score'),
+        ).values_list(*fields)
+        lo_achievements = keyed(StudentLOAchievement.objects.filter(
+            student_id__in=students, learning_outcome__course__in=self.courses
+        ), 'student__').annotate(
+            kind=Value(KIND_LO), column=F('learning_outcome_id'), value=F('current_percentage'),
+        ).values_list(*fields)
+        po_achievements = keyed(StudentPOAchievement.objects.filter(
+            student_id__in=students
+        ), 'student__').annotate(
+            kind=Value(KIND_PO), column=F('program_outcome_id'), value=F('current_percentage'),
+        ).values_list(*fields)
+
+        return rows.union(grades, lo_achievements, po_achievements, all=True).order_by(
+            'key_last', 'key_first', 'key_user', 'kind'
+        ).iterator(chunk_size=GRADEBOOK_CHUNK_SIZE)
+
+    def iter_rows(self, columns: GradebookColumns | None = None) -> Iterator[list[Any]]:
+        """Yield one gradebook row per student, ordered by name."""
+        columns = columns or self.columns()
+        width = len(columns.header)
+        row = None
+
+        for last_name, first_name, _, student_number, kind, column, value in self._stream():
+            if kind == KIND_STUDENT:
+                # The student's own row opens its group; everything after it
+                # up to the next student row belongs to this student
+                if row is not None:
+                    yield row
+                row = [None] * width
+                row[0] = student_number or ''
+                row[1] = f'{first_name} {last_name}'.strip()
+                continue
+            position = columns.index.get((kind, column))
+            if position is not None:
+                row[position] = value
+
+        if row is not None:
+            yield row
+
+    def iter_csv(self) -> Iterator[str]:
+        """Yield the gradebook as CSV text chunks."""
+        columns = self.columns()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns.header)
+
+        for count, row in enumerate(self.iter_rows(columns), start=1):
+            writer.writerow(['' if value is None else value for value in row])
+            if count % GRADEBOOK_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+
+        yield buffer.getvalue()
+
+    def iter_xlsx(self, sheet_name: str = 'Gradebook') -> Iterator[bytes]:
+        """Yield the gradebook as the bytes of an .xlsx workbook."""
+        columns = self.columns()
+        return iter_xlsx(columns.header, self.iter_rows(columns), sheet_name=sheet_name)
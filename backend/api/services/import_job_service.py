@@ -0,0 +1,158 @@
+"""
+AcuRate - Import Job Service
+
+Runs bulk imports as background jobs. ``submit`` persists the upload on an
+``ImportJob`` and enqueues the ``process_import_job`` Celery task once the
+job row is committed; ``run`` (called by the task) processes the file in
+committed chunks and records progress on the job so clients can poll it.
+
+Usage:
+    from api.services.import_job_service import ImportJobService
+
+    job = ImportJobService.submit(uploaded_file, created_by=request.user,
+                                  options={'skip_existing': True})
+    # later, from the Celery worker
+    ImportJobService.run(job.id)
+"""
+
+import logging
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import ActivityLog, ImportJob, User
+from ..utils import log_activity
+from .student_import_service import ImportResult, StudentImportService, StudentImportServiceError
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+IMPORT_JOB_CHUNK_SIZE = 500  # Rows committed per chunk
+
+
+# =============================================================================
+# SERVICE CLASS
+# =============================================================================
+
+class ImportJobService:
+    """Submit and process background import jobs."""
+
+    @staticmethod
+    def submit(
+        uploaded_file,
+        created_by: User | None = None,
+        options: dict[str, Any] | None = None,
+        job_type: str = ImportJob.JobType.STUDENTS,
+    ) -> ImportJob:
+        """
+        Persist the upload and enqueue processing after the job is committed.
+
+        Returns:
+            The pending ImportJob.
+        """
+        job = ImportJob.objects.create(
+            job_type=job_type,
+            created_by=created_by,
+            file=uploaded_file,
+            original_filename=uploaded_file.name,
+            options=options or {},
+        )
+        transaction.on_commit(lambda: ImportJobService.enqueue(job.id))
+        return job
+
+    @staticmethod
+    def enqueue(job_id: int) -> None:
+        """Hand the job to Celery, processing it inline if no broker is reachable."""
+        from ..tasks import process_import_job
+
+        try:
+            process_import_job.delay(job_id)
+        except Exception as e:
+            logger.warning(f"Could not enqueue import job {job_id}, processing inline: {str(e)}")
+            ImportJobService.run(job_id)
+
+    @staticmethod
+    def _record_progress(job: ImportJob, processed: int, total: int, result: ImportResult) -> None:
+        job.total_rows = total
+        job.processed_rows = processed
+        job.success_count = result.success_count
+        job.skipped_count = result.skipped_count
+        job.errors = result.to_dict()['errors']
+        job.save(update_fields=[
+            'total_rows', 'processed_rows', 'success_count', 'skipped_count', 'errors', 'updated_at'
+        ])
+
+    @classmethod
+    def run(cls, job_id: int) -> ImportJob:
+        """
+        Process a pending job chunk by chunk.
+
+        Each chunk is committed before progress is recorded, so a failure
+        part-way keeps the rows already imported and the job reports how
+        far it got. The job is claimed with one conditional UPDATE, so a
+        task delivered twice (or retried while running) processes it once.
+        """
+        started_at = timezone.now()
+        claimed = ImportJob.objects.filter(pk=job_id, status=ImportJob.Status.PENDING).update(
+            status=ImportJob.Status.RUNNING, started_at=started_at, updated_at=started_at
+        )
+        job = ImportJob.objects.select_related('created_by').get(pk=job_id)
+        if not claimed:
+            logger.info(f"Import job {job_id} already {job.status}, skipping")
+            return job
+
+        try:
+            with job.file.open('rb') as stored_file:
+                service = StudentImportService(stored_file)
+                service.import_students(
+                    created_by=job.created_by,
+                    skip_existing=job.options.get('skip_existing', True),
+                    send_emails=job.options.get('send_emails', False),
+                    chunk_size=IMPORT_JOB_CHUNK_SIZE,
+                    on_progress=lambda processed, total, result: cls._record_progress(
+                        job, processed, total, result
+                    ),
+                )
+            job.status = ImportJob.Status.COMPLETED
+        except StudentImportServiceError as e:
+            job.status = ImportJob.Status.FAILED
+            job.message = str(e)
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed: {str(e)}", exc_info=True)
+            job.status = ImportJob.Status.FAILED
+            job.message = f"Import failed: {str(e)}"
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+
+        # The upload may contain personal data; keep it only while processing
+        job.file.delete(save=True)
+
+        log_activity(
+            action_type=ActivityLog.ActionType.USER_CREATED,
+            user=job.created_by,
+            description=(
+                f'Bulk imported {job.success_count} students, '
+                f'skipped {job.skipped_count}'
+            ),
+            related_object_type='ImportJob',
+            related_object_id=job.id,
+            metadata={
+                'status': job.status,
+                'created': job.success_count,
+                'skipped': job.skipped_count,
+                'errors': len(job.errors),
+            }
+        )
+
+        logger.info(
+            f"Import job {job_id} {job.status}: {job.success_count} created, "
+            f"{job.skipped_count} skipped, {len(job.errors)} errors"
+        )
+        return job
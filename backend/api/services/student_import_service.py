@@ -12,17 +12,21 @@ Usage:
     # result = {"success_count": 10, "skipped_count": 2, "errors": [...]}
 """
 
+import codecs
 import csv
 import io
 import logging
 import secrets
 import string
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, BinaryIO
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Iterator, NamedTuple
 
 from django.db import transaction
 
+from ..hashers import make_temporary_password_hashes
 from ..models import User
 
 
@@ -35,9 +39,99 @@ logger = logging.getLogger(__name__)
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB max file size
 MAX_ROWS = 10000  # Maximum rows to process
+BATCH_SIZE = 500  # Rows validated and written per batch
+BULK_CREATE_BATCH_SIZE = 500  # Users per INSERT statement
+READ_CHUNK_SIZE = 64 * 1024  # Bytes read from the upload per step
+LOOKUP_CHUNK_SIZE = 1000  # Values per IN (...) duplicate lookup
 REQUIRED_COLUMNS = {'email', 'first_name', 'last_name'}
 OPTIONAL_COLUMNS = {'student_id', 'department', 'year_of_study', 'phone'}
 
+ENCODING_SAMPLE_SIZE = 64 * 1024  # Bytes inspected to pick the encoding
+
+# Bytes that are Turkish letters in cp1254 (Ğ, İ, Ş, ğ, ı, ş) but Icelandic or
+# Latin letters in cp1252/latin-1
+TURKISH_CP1254_BYTES = frozenset(b'\xd0\xdd\xde\xf0\xfd\xfe')
+# Bytes with no character assigned in cp1254
+CP1254_UNDEFINED_BYTES = frozenset(b'\x81\x8d\x8e\x8f\x90\x9d\x9e')
+
+
+# =============================================================================
+# STREAMING HELPERS
+# =============================================================================
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Pick the codec for an upload from a bounded prefix of its bytes.
+    
+    Checks, in order: a byte order mark, UTF-8 validity of the sample (a
+    multi-byte sequence cut off at the end of the sample is allowed), and
+    finally the Turkish letters only cp1254 has. Files saved by Turkish
+    Excel contain those letters, Western files fall back to cp1252 (which
+    agrees with cp1254 everywhere else), and latin-1 takes anything left.
+    
+    An all-ASCII sample is reported as UTF-8 but proves nothing; see the
+    ``fallback`` of ``iter_decoded_lines``.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    high_bytes = {byte for byte in sample if byte >= 0x80}
+    if high_bytes & CP1254_UNDEFINED_BYTES:
+        return 'latin-1'
+    if high_bytes & TURKISH_CP1254_BYTES:
+        return 'cp1254'
+    return 'cp1252'
+
+
+def iter_decoded_lines(
+    file: BinaryIO,
+    encoding: str,
+    chunk_size: int = READ_CHUNK_SIZE,
+    fallback: Callable[[bytes], str] | None = None,
+) -> Iterator[str]:
+    """
+    Yield the lines of an upload, decoding it incrementally chunk by chunk.
+    
+    Line endings are kept (LF, CRLF and bare CR) so the result can be fed
+    straight to ``csv.reader``; only one chunk plus a partial line is held
+    in memory at a time.
+    
+    If ``encoding`` rejects a chunk while everything before it was ASCII
+    (which all candidate codecs decode alike), ``fallback(chunk)`` names
+    the codec that chunk and the rest of the upload are decoded with.
+    """
+    file.seek(0)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    ascii_so_far = True
+    while chunk := file.read(chunk_size):
+        if isinstance(chunk, str):
+            text = chunk
+        else:
+            try:
+                text = decoder.decode(chunk)
+            except UnicodeDecodeError as e:
+                if fallback is None or not (ascii_so_far and chunk[:e.start].isascii()):
+                    raise
+                decoder = codecs.getincrementaldecoder(fallback(chunk))()
+                text = decoder.decode(chunk)
+            ascii_so_far = ascii_so_far and chunk.isascii()
+        lines = io.StringIO(pending + text, newline='').readlines()
+        # A trailing CR may be the first half of a CRLF split across chunks
+        pending = lines.pop() if lines and not lines[-1].endswith('\n') else ''
+        yield from lines
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
 
 # =============================================================================
 # DATA CLASSES
@@ -70,6 +164,19 @@ class ImportResult:
         }
 
 
+class _StudentCredentials(NamedTuple):
+    """What the welcome email of a newly imported student needs."""
+    username: str
+    email: str
+    first_name: str
+    student_id: str | None
+    temp_password: str
+    
+    @classmethod
+    def of(cls, user: User) -> "_StudentCredentials":
+        return cls(user.username, user.email, user.first_name, user.student_id, user._temp_password)
+
+
 # =============================================================================
 # SERVICE CLASS
 # =============================================================================
@@ -121,24 +228,54 @@ class StudentImportService:
         """
         self.file = file
         self.encoding = encoding  # Kept for backward compatibility
-        self._rows: list[dict[str, str]] = []
+        self._encoding: str | None = None
+        # Only values from the upload are tracked, so memory depends on the
+        # file rather than on the size of the users table
         self._existing_emails: set[str] = set()
         self._existing_student_ids: set[str] = set()
+        self._database_student_ids: set[str] = set()
+        self._student_id_pool: list[str] = []
     
     def _generate_temp_password(self, length: int = 12) -> str:
         """Generate a secure random temporary password."""
         alphabet = string.ascii_letters + string.digits
         return ''.join(secrets.choice(alphabet) for _ in range(length))
     
+    @staticmethod
+    def _find_existing(field_name: str, values: set[str]) -> set[str]:
+        """Return the values already stored in ``field_name``, using chunked IN queries."""
+        existing: set[str] = set()
+        values_iter = iter(sorted(values))
+        while chunk := list(islice(values_iter, LOOKUP_CHUNK_SIZE)):
+            existing.update(
+                User.objects.filter(**{f'{field_name}__in': chunk}).values_list(field_name, flat=True)
+            )
+        return existing
+    
+    def _reserve_student_ids(self, count: int) -> None:
+        """
+        Fill the pool with ``count`` unused student IDs (year + random number).
+        
+        Candidates are checked against the database with one IN query per
+        round instead of one query per candidate.
+        """
+        current_year = datetime.now().year
+        needed = count - len(self._student_id_pool)
+        while needed > 0:
+            candidates = {
+                f"{current_year}{secrets.randbelow(9000) + 1000}" for _ in range(needed)
+            } - self._existing_student_ids - set(self._student_id_pool)
+            available = candidates - self._find_existing('student_id', candidates)
+            self._student_id_pool.extend(sorted(available))
+            needed -= len(available)
+    
     def _generate_student_id(self) -> str:
         """Generate a unique student ID based on year and random number."""
-        current_year = datetime.now().year
-        while True:
-            candidate = f"{current_year}{secrets.randbelow(9000) + 1000}"
-            if candidate not in self._existing_student_ids:
-                if not User.objects.filter(student_id=candidate).exists():
-                    self._existing_student_ids.add(candidate)
-                    return candidate
+        if not self._student_id_pool:
+            self._reserve_student_ids(1)
+        student_id = self._student_id_pool.pop()
+        self._existing_student_ids.add(student_id)
+        return student_id
     
     def _validate_file_size(self) -> None:
         """Validate that file size is within limits."""
@@ -151,123 +288,98 @@ class StudentImportService:
                 f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB"
             )
     
-    def _read_and_validate_csv(self) -> None:
-        """Read CSV file and validate its structure."""
-        # =====================================================================
-        # STEP 1: Read file as raw bytes
-        # =====================================================================
-        print("DEBUG: Starting CSV file read...")
-        
-        # Handle different file wrapper types
-        file_data = self.file.read()
+    def _detect_encoding(self) -> str:
+        """
+        Pick the upload's encoding from its first ENCODING_SAMPLE_SIZE bytes.
         
-        # Debug: Show what type we got
-        print(f"DEBUG: file.read() returned type: {type(file_data)}")
-        print(f"DEBUG: Data length: {len(file_data) if file_data else 0}")
+        Files that already yield text are read as-is.
+        """
+        self.file.seek(0)
+        sample = self.file.read(ENCODING_SAMPLE_SIZE)
+        if isinstance(sample, str):
+            return 'utf-8'
+        
+        encoding = detect_encoding(sample)
+        logger.info(f"CSV encoding detected from sample: {encoding}")
+        return encoding
+    
+    def _redetect_encoding(self, chunk: bytes) -> str:
+        """Pick the codec again from the first chunk UTF-8 rejected after an ASCII sample."""
+        self._encoding = detect_encoding(chunk)
+        logger.info(f"CSV encoding re-detected past the sample: {self._encoding}")
+        return self._encoding
+    
+    def _iter_lines(self) -> Iterator[str]:
+        """Decode the upload once, reporting bytes the detected codec rejects."""
+        fallback = self._redetect_encoding if self._encoding == 'utf-8' else None
+        try:
+            yield from iter_decoded_lines(self.file, self._encoding, fallback=fallback)
+        except UnicodeDecodeError as e:
+            raise StudentImportServiceError(
+                "Dosya formatı algılanamadı. Lütfen UTF-8 veya Excel formatında kaydedin. "
+                f"Dosya {self._encoding} olarak okunamadı."
+            ) from e
+    
+    def _open_reader(self) -> csv.DictReader:
+        """
+        Open a streaming CSV reader over the upload and validate its header.
         
-        if not isinstance(file_data, bytes):
-            # If already a string (unlikely but possible), use it directly
-            print("DEBUG: Content is already a string, using directly")
-            content = file_data
-        else:
-            # Show first 100 bytes for debugging
-            print(f"DEBUG: First 100 bytes (raw): {file_data[:100]}")
-            
-            # =====================================================================
-            # STEP 2: Try multiple encodings
-            # =====================================================================
-            # Priority order optimized for Turkish Excel files
-            encodings_to_try = [
-                'utf-8-sig',      # UTF-8 with BOM (Excel often adds this)
-                'utf-8',          # Standard UTF-8
-                'cp1254',         # Turkish Windows code page (same as windows-1254)
-                'windows-1254',   # Turkish Windows encoding
-                'latin-1',        # Fallback - accepts ANY byte sequence
-                'iso-8859-9',     # Turkish ISO encoding (Latin-5)
-            ]
-            
-            content = None
-            successful_encoding = None
-            
-            print(f"DEBUG: Will try {len(encodings_to_try)} encodings: {encodings_to_try}")
-            
-            for encoding in encodings_to_try:
-                print(f"DEBUG: Trying encoding '{encoding}'...")
-                try:
-                    content = file_data.decode(encoding)
-                    successful_encoding = encoding
-                    print(f"DEBUG: SUCCESS! Decoded with '{encoding}'")
-                    print(f"DEBUG: Decoded content length: {len(content)} chars")
-                    print(f"DEBUG: First 200 chars: {content[:200]}")
-                    break
-                except UnicodeDecodeError as e:
-                    print(f"DEBUG: FAILED with '{encoding}' - UnicodeDecodeError: {e}")
-                    continue
-                except LookupError as e:
-                    print(f"DEBUG: FAILED with '{encoding}' - LookupError (unknown encoding): {e}")
-                    continue
-                except Exception as e:
-                    print(f"DEBUG: FAILED with '{encoding}' - Unexpected error: {type(e).__name__}: {e}")
-                    continue
-            
-            # =====================================================================
-            # STEP 3: Check if decoding was successful
-            # =====================================================================
-            if content is None:
-                print("DEBUG: ALL ENCODINGS FAILED!")
-                raise StudentImportServiceError(
-                    "Dosya formatı algılanamadı. Lütfen UTF-8 veya Excel formatında kaydedin. "
-                    f"Denenen encoding'ler: {', '.join(encodings_to_try)}"
-                )
-            
-            # Log successful encoding
-            logger.info(f"CSV decoded successfully with encoding: {successful_encoding}")
-            print(f"DEBUG: Proceeding with content decoded via '{successful_encoding}'")
+        Rows are decoded and parsed lazily as the reader is iterated.
+        """
+        if self._encoding is None:
+            self._encoding = self._detect_encoding()
         
-        # =====================================================================
-        # STEP 4: Parse CSV
-        # =====================================================================
-        print("DEBUG: Creating CSV DictReader...")
-        reader = csv.DictReader(io.StringIO(content))
+        reader = csv.DictReader(self._iter_lines())
         
         # Check required columns
         if reader.fieldnames is None:
-            print("DEBUG: CSV has no fieldnames/headers!")
             raise StudentImportServiceError("CSV file is empty or has no header row.")
         
-        print(f"DEBUG: CSV headers (raw): {reader.fieldnames}")
         fieldnames = {name.strip().lower() for name in reader.fieldnames if name}
-        print(f"DEBUG: CSV headers (normalized): {fieldnames}")
-        
         missing_columns = REQUIRED_COLUMNS - fieldnames
         
         if missing_columns:
-            print(f"DEBUG: Missing required columns: {missing_columns}")
             raise StudentImportServiceError(
                 f"Missing required columns: {', '.join(missing_columns)}. "
                 f"Required columns are: {', '.join(REQUIRED_COLUMNS)}"
             )
         
-        print("DEBUG: All required columns present, reading rows...")
-        
-        # Read all rows
-        self._rows = list(reader)
-        print(f"DEBUG: Read {len(self._rows)} data rows from CSV")
-        
-        if len(self._rows) > MAX_ROWS:
+        return reader
+    
+    def _count_rows(self) -> int:
+        """Count data rows with a streaming pass that touches no database."""
+        rows = sum(1 for _ in self._open_reader())
+        if rows > MAX_ROWS:
             raise StudentImportServiceError(
                 f"Too many rows. Maximum allowed: {MAX_ROWS}. "
-                f"File contains {len(self._rows)} rows."
+                f"File contains {rows} rows."
             )
-        
-        if len(self._rows) == 0:
-            raise StudentImportServiceError("CSV file contains no data rows.")
+        return rows
     
-    def _load_existing_emails(self) -> None:
-        """Load existing emails from database for duplicate detection."""
-        self._existing_emails = set(
-            User.objects.values_list('email', flat=True)
+    def _load_existing_for_batch(self, rows: list[dict[str, str]], reserve_ids: bool = True) -> None:
+        """
+        Look up which emails and student IDs of a batch are already stored.
+        
+        Emails join the in-import set (both are reported as "already
+        exists"); stored student IDs are kept apart so the error message
+        can tell them from repeats within the file. Student IDs for rows
+        that leave the column empty are reserved up front unless
+        ``reserve_ids`` is False (dry runs create nobody).
+        """
+        emails = {row.get('email', '').strip().lower() for row in rows} - {''}
+        student_ids = {row.get('student_id', '').strip() for row in rows} - {''}
+        
+        self._existing_emails.update(self._find_existing('email', emails - self._existing_emails))
+        self._database_student_ids.update(
+            self._find_existing('student_id', student_ids - self._existing_student_ids)
         )
+        if not reserve_ids:
+            return
+        # Never hand out an ID that a row of this batch asks for explicitly
+        self._student_id_pool = [
+            student_id for student_id in self._student_id_pool if student_id not in student_ids
+        ]
+        self._reserve_student_ids(sum(1 for row in rows if not row.get('student_id', '').strip()))
     
     def _validate_row(self, row: dict[str, str], row_number: int) -> tuple[bool, str | None]:
         """
@@ -310,20 +422,23 @@ class StudentImportService:
         
         return True, None
     
-    def _create_student(
+    def _build_student(
         self,
         row: dict[str, str],
         created_by: User | None = None,
     ) -> User:
         """
-        Create a new student user from row data.
+        Build an unsaved student user from row data.
+        
+        The password is hashed later for the whole batch by
+        ``_bulk_create_students``.
         
         Args:
             row: Dictionary containing row data.
             created_by: The user creating this student (for audit).
         
         Returns:
-            The created User instance.
+            The unsaved User instance.
         """
         email = row.get('email', '').strip().lower()
         first_name = row.get('first_name', '').strip()
@@ -341,17 +456,12 @@ class StudentImportService:
         year_str = row.get('year_of_study', '').strip()
         year_of_study = int(year_str) if year_str else 1
         
-        # Generate temporary password
-        temp_password = self._generate_temp_password()
-        
-        # Create user
-        user = User.objects.create_user(
+        user = User(
             username=email,
             email=email,
             first_name=first_name,
             last_name=last_name,
             role=User.Role.STUDENT,
-            password=temp_password,
             is_temporary_password=True,
             student_id=student_id,
             department=department,
@@ -360,29 +470,156 @@ class StudentImportService:
             created_by=created_by,
         )
         
-        # Store temp password for potential email notification
-        user._temp_password = temp_password
+        # Store temp password for hashing and potential email notification
+        user._temp_password = self._generate_temp_password()
         
         return user
     
+    @staticmethod
+    def _bulk_create_students(users: list[User]) -> list[User]:
+        """
+        Hash temporary passwords for the batch and insert users in bulk.
+        
+        New accounts have no previous password, so the PasswordHistory
+        bookkeeping of ``User.set_password`` is not needed and is skipped.
+        """
+        hashes = make_temporary_password_hashes(user._temp_password for user in users)
+        for user, password_hash in zip(users, hashes):
+            user.password = password_hash
+        return User.objects.bulk_create(users, batch_size=BULK_CREATE_BATCH_SIZE)
+    
+    def _process_rows(
+        self,
+        rows: list[tuple[int, dict[str, str]]],
+        result: ImportResult,
+        created_by: User | None,
+        skip_existing: bool,
+        dry_run: bool = False,
+    ) -> list[User]:
+        """
+        Validate a batch of (row number, row) pairs and bulk insert the valid students.
+        
+        Must be called inside a transaction unless ``dry_run`` is set, in
+        which case valid rows are only counted. Errors and counters are
+        recorded on ``result``.
+        
+        Returns:
+            The created User instances.
+        """
+        created_users: list[User] = []
+        
+        # Normalize column names
+        normalized_rows = [
+            (row_num, {k.strip().lower(): v or '' for k, v in row.items() if k})
+            for row_num, row in rows
+        ]
+        self._load_existing_for_batch([row for _, row in normalized_rows], reserve_ids=not dry_run)
+        
+        for row_num, normalized_row in normalized_rows:
+            email = normalized_row.get('email', '').strip().lower()
+            
+            # Validate row
+            is_valid, error_msg = self._validate_row(normalized_row, row_num)
+            if not is_valid:
+                result.errors.append(ImportError(
+                    row=row_num,
+                    message=error_msg or "Validation failed",
+                    email=email or None,
+                ))
+                continue
+            
+            # Check for duplicate email
+            if email in self._existing_emails:
+                if skip_existing:
+                    result.skipped_count += 1
+                    result.errors.append(ImportError(
+                        row=row_num,
+                        message="Email already exists (skipped)",
+                        email=email,
+                    ))
+                else:
+                    result.errors.append(ImportError(
+                        row=row_num,
+                        message="Email already exists",
+                        email=email,
+                    ))
+                continue
+            
+            # Check for duplicate student_id if provided
+            student_id = normalized_row.get('student_id', '').strip()
+            if student_id:
+                if student_id in self._existing_student_ids:
+                    result.errors.append(ImportError(
+                        row=row_num,
+                        message=f"Student ID '{student_id}' already exists in this import",
+                        email=email,
+                    ))
+                    continue
+                
+                if student_id in self._database_student_ids:
+                    result.errors.append(ImportError(
+                        row=row_num,
+                        message=f"Student ID '{student_id}' already exists in database",
+                        email=email,
+                    ))
+                    continue
+                
+                self._existing_student_ids.add(student_id)
+            
+            if dry_run:
+                self._existing_emails.add(email)
+                result.success_count += 1
+                continue
+            
+            # Build student; inserted with the rest of the batch below
+            try:
+                user = self._build_student(normalized_row, created_by)
+                created_users.append(user)
+                self._existing_emails.add(email)
+                result.success_count += 1
+                
+            except Exception as e:
+                result.errors.append(ImportError(
+                    row=row_num,
+                    message=f"Failed to create student: {str(e)}",
+                    email=email,
+                ))
+        
+        if created_users:
+            self._bulk_create_students(created_users)
+        
+        return created_users
+    
     def import_students(
         self,
         created_by: User | None = None,
         skip_existing: bool = True,
         send_emails: bool = False,
+        chunk_size: int | None = None,
+        on_progress: Callable[[int, int, ImportResult], None] | None = None,
+        dry_run: bool = False,
     ) -> ImportResult:
         """
         Import students from the CSV file.
         
         This method performs the entire import process including validation,
-        duplicate detection, and database operations. All database changes
-        are wrapped in an atomic transaction.
+        duplicate detection, and database operations. By default all
+        database changes are wrapped in a single atomic transaction; with
+        ``chunk_size`` every chunk of rows is committed on its own so long
+        imports make durable progress (used by background import jobs).
         
         Args:
             created_by: The user performing the import (for audit trail).
             skip_existing: If True, skip rows with existing emails.
                           If False, report them as errors.
             send_emails: If True, send welcome emails to new students.
+            chunk_size: Rows per committed chunk. None imports everything
+                        in one transaction.
+            on_progress: Called after each committed chunk with
+                         (processed_rows, total_rows, result).
+            dry_run: If True, run every check but write nothing and open no
+                     transaction; ``success_count`` is the number of
+                     students that would be created.
         
         Returns:
             ImportResult containing success count, skipped count, and errors.
@@ -399,91 +636,51 @@ class StudentImportService:
         # Step 1: Validate file size
         self._validate_file_size()
         
-        # Step 2: Read and validate CSV structure
-        self._read_and_validate_csv()
+        # Step 2: Validate CSV structure (rows are streamed below)
+        self._open_reader()
         
-        # Step 3: Load existing emails for duplicate detection
-        self._load_existing_emails()
+        # Committed chunks cannot be rolled back, so chunked imports enforce
+        # the row limit (and learn the total for progress) with a counting
+        # pass first; single-transaction imports abort while streaming
+        total_rows = self._count_rows() if chunk_size is not None else None
         
-        logger.info(f"Processing {len(self._rows)} rows for student import")
-        
-        # Step 4: Process rows in atomic transaction
-        created_users: list[User] = []
+        # Step 3: Stream rows and process them in batches (duplicates are looked up per batch)
+        batch_size = chunk_size or BATCH_SIZE
+        rows = enumerate(self._open_reader(), start=2)  # Header is row 1
+        processed = 0
+        pending_emails: list[_StudentCredentials] = []  # Not Users: kept across batches until commit
         
         try:
-            with transaction.atomic():
-                for row_num, row in enumerate(self._rows, start=2):  # Header is row 1
-                    # Normalize column names
-                    normalized_row = {
-                        k.strip().lower(): v for k, v in row.items() if k
-                    }
-                    
-                    email = normalized_row.get('email', '').strip().lower()
-                    
-                    # Validate row
-                    is_valid, error_msg = self._validate_row(normalized_row, row_num)
-                    if not is_valid:
-                        result.errors.append(ImportError(
-                            row=row_num,
-                            message=error_msg or "Validation failed",
-                            email=email or None,
-                        ))
-                        continue
-                    
-                    # Check for duplicate email
-                    if email in self._existing_emails:
-                        if skip_existing:
-                            result.skipped_count += 1
-                            result.errors.append(ImportError(
-                                row=row_num,
-                                message="Email already exists (skipped)",
-                                email=email,
-                            ))
-                        else:
-                            result.errors.append(ImportError(
-                                row=row_num,
-                                message="Email already exists",
-                                email=email,
-                            ))
-                        continue
+            with transaction.atomic() if chunk_size is None and not dry_run else nullcontext():
+                while batch := list(islice(rows, batch_size)):
+                    processed += len(batch)
+                    if processed > MAX_ROWS:
+                        raise StudentImportServiceError(
+                            f"Too many rows. Maximum allowed: {MAX_ROWS}."
+                        )
                     
-                    # Check for duplicate student_id if provided
-                    student_id = normalized_row.get('student_id', '').strip()
-                    if student_id:
-                        if student_id in self._existing_student_ids:
-                            result.errors.append(ImportError(
-                                row=row_num,
-                                message=f"Student ID '{student_id}' already exists in this import",
-                                email=email,
-                            ))
-                            continue
-                        
-                        if User.objects.filter(student_id=student_id).exists():
-                            result.errors.append(ImportError(
-                                row=row_num,
-                                message=f"Student ID '{student_id}' already exists in database",
-                                email=email,
-                            ))
-                            continue
-                        
-                        self._existing_student_ids.add(student_id)
+                    with nullcontext() if dry_run else transaction.atomic():
+                        created_users = self._process_rows(
+                            batch, result, created_by, skip_existing, dry_run=dry_run
+                        )
+                    if send_emails:
+                        pending_emails.extend(
+                            _StudentCredentials.of(user) for user in created_users
+                            if getattr(user, '_temp_password', None)
+                        )
                     
-                    # Create student
-                    try:
-                        user = self._create_student(normalized_row, created_by)
-                        created_users.append(user)
-                        self._existing_emails.add(email)
-                        result.success_count += 1
-                        
-                    except Exception as e:
-                        result.errors.append(ImportError(
-                            row=row_num,
-                            message=f"Failed to create student: {str(e)}",
-                            email=email,
-                        ))
+                    if chunk_size is not None:
+                        # Send emails (outside transaction to not block on email failures)
+                        self._send_welcome_emails(pending_emails)
+                        pending_emails = []
+                        if on_progress:
+                            on_progress(processed, total_rows, result)
+                
+                if processed == 0:
+                    raise StudentImportServiceError("CSV file contains no data rows.")
                 
                 # If no students were created successfully, raise to rollback
-                if result.success_count == 0 and len(result.errors) > 0:
+                if chunk_size is None and not dry_run and result.success_count == 0 and len(result.errors) > 0:
                     # Don't rollback if there are skipped entries
                     if result.skipped_count == 0:
                         logger.warning("No students created successfully, rolling back")
@@ -497,18 +694,18 @@ class StudentImportService:
             logger.error(f"Error during student import: {str(e)}", exc_info=True)
             raise StudentImportServiceError(f"Import failed: {str(e)}")
         
-        # Step 5: Send emails (outside transaction to not block on email failures)
-        if send_emails and created_users:
-            self._send_welcome_emails(created_users)
+        # Step 4: Send emails (outside transaction to not block on email failures)
+        if pending_emails:
+            self._send_welcome_emails(pending_emails)
         
         logger.info(
-            f"Student import completed: {result.success_count} created, "
+            f"Student import {'dry run ' if dry_run else ''}completed: {result.success_count} created, "
             f"{result.skipped_count} skipped, {len(result.errors)} errors"
         )
         
         return result
     
-    def _send_welcome_emails(self, users: list[User]) -> None:
+    def _send_welcome_emails(self, credentials: list[_StudentCredentials]) -> None:
         """
         Send welcome emails to newly created students.
         
@@ -516,30 +713,28 @@ class StudentImportService:
         email failures from rolling back the database changes.
         
         Args:
-            users: List of User instances to send emails to.
+            credentials: Credentials of the students to send emails to.
         """
         from .email_service import EmailService
         
-        for user in users:
+        for student in credentials:
             try:
-                temp_password = getattr(user, '_temp_password', None)
-                if temp_password:
-                    # Send welcome email with credentials
-                    EmailService.send_html_email(
-                        subject="🎓 AcuRate'e Hoş Geldiniz!",
-                        template_name="student_welcome.html",
-                        context={
-                            "first_name": user.first_name,
-                            "email": user.email,
-                            "username": user.username,
-                            "student_id": user.student_id,
-                            "temp_password": temp_password,
-                        },
-                        recipient_list=[user.email],
-                    )
+                # Send welcome email with credentials
+                EmailService.send_html_email(
+                    subject="🎓 AcuRate'e Hoş Geldiniz!",
+                    template_name="student_welcome.html",
+                    context={
+                        "first_name": student.first_name,
+                        "email": student.email,
+                        "username": student.username,
+                        "student_id": student.student_id,
+                        "temp_password": student.temp_password,
+                    },
+                    recipient_list=[student.email],
+                )
             except Exception as e:
                 logger.warning(
-                    f"Failed to send welcome email to {user.email}: {str(e)}"
+                    f"Failed to send welcome email to {student.email}: {str(e)}"
                 )
     
     @staticmethod
@@ -5,23 +5,31 @@ Automatic calculation of PO/LO achievements when grades are added/updated/delete
 All signal handlers use database transactions to ensure data consistency.
 """
 
-from django.db.models.signals import post_save, post_delete
+from collections import defaultdict
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Avg, Count, Q
+from django.db.models import Avg, Count, F, Q
 from django.db import transaction
 from decimal import Decimal
 from django.core.cache import cache
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
-    from .models import User, ProgramOutcome, LearningOutcome
+    from .models import ProgramOutcome, LearningOutcome
 
 from .models import (
     StudentGrade, StudentPOAchievement, StudentLOAchievement,
     Assessment, ProgramOutcome, LearningOutcome, Enrollment,
-    AssessmentLO, LOPO
+    AssessmentLO, LOPO, Course, User
 )
-from .cache_utils import invalidate_dashboard_cache, invalidate_user_cache
+from .cache_utils import (
+    invalidate_dashboard_cache, invalidate_user_cache, invalidate_curriculum_cache,
+    invalidate_lo_heatmap_cache
+)
+from .services.analytics_sketch_service import AnalyticsSketchService
+
+
+ROLLUP_BATCH_SIZE = 1000  # Rows per achievement upsert statement
 
 
 @transaction.atomic
@@ -241,6 +249,218 @@ def calculate_lo_achievement(student: 'User', learning_outcome: 'LearningOutcome
     )
 
 
+def _active_course_ids(student_ids: Iterable[int]) -> dict[int, set[int]]:
+    """Course ids of every active enrollment, per student."""
+    courses = defaultdict(set)
+    for student_id, course_id in Enrollment.objects.filter(
+        student_id__in=student_ids, is_active=True
+    ).values_list('student_id', 'course_id'):
+        courses[student_id].add(course_id)
+    return courses
+
+
+def _rollup_lo_achievements(affected_los: dict[int, set[int]], enrolled: dict[int, set[int]]) -> set[int]:
+    """
+    ``calculate_lo_achievement`` for every (student, LO) pair in ``affected_los``.
+    
+    Reads the LO mappings and grades once and writes one upsert.
+    
+    Returns:
+        Course ids of the recalculated learning outcomes.
+    """
+    lo_ids = set().union(*affected_los.values())
+    course_by_lo = dict(LearningOutcome.objects.filter(pk__in=lo_ids).values_list('pk', 'course_id'))
+    
+    # Active assessments of the LO's own course, with their AssessmentLO weight
+    mappings = defaultdict(list)
+    for lo_id, assessment_id, weight, max_score in AssessmentLO.objects.filter(
+        learning_outcome_id__in=lo_ids,
+        assessment__is_active=True,
+        assessment__course_id=F('learning_outcome__course_id'),
+    ).values_list('learning_outcome_id', 'assessment_id', 'weight', 'assessment__max_score'):
+        mappings[lo_id].append((assessment_id, weight, max_score))
+    
+    scores = dict(
+        ((student_id, assessment_id), score)
+        for student_id, assessment_id, score in StudentGrade.objects.filter(
+            student_id__in=affected_los,
+            assessment_id__in={assessment_id for mapped in mappings.values() for assessment_id, _, _ in mapped},
+        ).values_list('student_id', 'assessment_id', 'score')
+    )
+    
+    achievements = []
+    unenrolled = Q()
+    for student_id, student_lo_ids in affected_los.items():
+        for lo_id in student_lo_ids:
+            if course_by_lo[lo_id] not in enrolled[student_id]:
+                # Student not enrolled, remove achievement if exists
+                unenrolled |= Q(student_id=student_id, learning_outcome_id=lo_id)
+                continue
+            
+            total_weighted_score = Decimal('0.00')
+            total_weight = Decimal('0.00')
+            completed_assessments = 0
+            for assessment_id, weight, max_score in mappings[lo_id]:
+                score = scores.get((student_id, assessment_id))
+                if score is None:
+                    continue
+                completed_assessments += 1
+                if max_score > 0:
+                    percentage = (score / max_score) * Decimal('100.00')
+                else:
+                    percentage = Decimal('0.00')
+                total_weighted_score += percentage * weight
+                total_weight += weight
+            
+            achievements.append(StudentLOAchievement(
+                student_id=student_id,
+                learning_outcome_id=lo_id,
+                current_percentage=total_weighted_score / total_weight if total_weight > 0 else Decimal('0.00'),
+                total_assessments=len(mappings[lo_id]),
+                completed_assessments=completed_assessments,
+            ))
+    
+    if unenrolled:
+        StudentLOAchievement.objects.filter(unenrolled).delete()
+    StudentLOAchievement.objects.bulk_create(
+        achievements,
+        batch_size=ROLLUP_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['student', 'learning_outcome'],
+        update_fields=['current_percentage', 'total_assessments', 'completed_assessments',
+                       'last_calculated', 'updated_at'],
+    )
+    return set(course_by_lo.values())
+
+
+def _rollup_po_achievements(affected_pos: dict[int, set[int]], enrolled: dict[int, set[int]]) -> None:
+    """
+    ``calculate_po_achievement`` for every (student, PO) pair in ``affected_pos``.
+    
+    Reads the LO-PO mappings and the (already recalculated) LO achievements
+    once and writes one upsert.
+    """
+    po_ids = set().union(*affected_pos.values())
+    lopos = defaultdict(list)
+    for po_id, lo_id, weight, course_id in LOPO.objects.filter(
+        program_outcome_id__in=po_ids,
+        learning_outcome__is_active=True,
+    ).values_list('program_outcome_id', 'learning_outcome_id', 'weight', 'learning_outcome__course_id'):
+        lopos[po_id].append((lo_id, weight, course_id))
+    
+    lo_achievements = {
+        (student_id, lo_id): (percentage, total, completed)
+        for student_id, lo_id, percentage, total, completed in StudentLOAchievement.objects.filter(
+            student_id__in=affected_pos,
+            learning_outcome_id__in={lo_id for mapped in lopos.values() for lo_id, _, _ in mapped},
+        ).values_list('student_id', 'learning_outcome_id', 'current_percentage',
+                      'total_assessments', 'completed_assessments')
+    }
+    
+    achievements = []
+    for student_id, student_po_ids in affected_pos.items():
+        for po_id in student_po_ids:
+            total_weighted_score = Decimal('0.00')
+            total_weight = Decimal('0.00')
+            total_assessments = 0
+            completed_assessments = 0
+            # LOs of other courses count only while the student is enrolled there;
+            # without any mapped LO the achievement is reset to 0 (fallback)
+            for lo_id, weight, course_id in lopos[po_id]:
+                lo_achievement = lo_achievements.get((student_id, lo_id))
+                if course_id not in enrolled[student_id] or lo_achievement is None:
+                    continue
+                percentage, total, completed = lo_achievement
+                total_weighted_score += percentage * weight
+                total_weight += weight
+                total_assessments += total
+                completed_assessments += completed
+            
+            achievements.append(StudentPOAchievement(
+                student_id=student_id,
+                program_outcome_id=po_id,
+                current_percentage=total_weighted_score / total_weight if total_weight > 0 else Decimal('0.00'),
+                total_assessments=total_assessments,
+                completed_assessments=completed_assessments,
+            ))
+    
+    StudentPOAchievement.objects.bulk_create(
+        achievements,
+        batch_size=ROLLUP_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['student', 'program_outcome'],
+        update_fields=['current_percentage', 'total_assessments', 'completed_assessments',
+                       'last_calculated', 'updated_at'],
+    )
+
+
+def recalculate_achievements_for_grades(grade_keys: Iterable[tuple[int, int]]) -> None:
+    """
+    Recalculate achievements once for a batch of grades written in bulk.
+    
+    ``bulk_create`` upserts skip the StudentGrade post_save receiver, so
+    set-based writers call this with the (student_id, assessment_id) pairs
+    they touched. Every affected (student, LO) and (student, PO) pair is
+    recalculated with the rules of ``calculate_lo_achievement`` and
+    ``calculate_po_achievement``, LOs first, but set-based: mappings,
+    enrollments, grades and LO achievements are read once and each
+    achievement table gets one upsert, so the query count does not grow
+    with the number of grades.
+    """
+    grade_keys = set(grade_keys)
+    if not grade_keys:
+        return
+    
+    los_by_assessment = defaultdict(set)
+    for assessment_id, lo_id in AssessmentLO.objects.filter(
+        assessment_id__in={assessment_id for _, assessment_id in grade_keys}
+    ).values_list('assessment_id', 'learning_outcome_id'):
+        los_by_assessment[assessment_id].add(lo_id)
+    
+    affected_los = defaultdict(set)
+    for student_id, assessment_id in grade_keys:
+        affected_los[student_id].update(los_by_assessment.get(assessment_id, ()))
+    affected_los = {student_id: lo_ids for student_id, lo_ids in affected_los.items() if lo_ids}
+    student_ids = {student_id for student_id, _ in grade_keys}
+    
+    if affected_los:
+        pos_by_lo = defaultdict(set)
+        for lo_id, po_id in LOPO.objects.filter(
+            learning_outcome_id__in=set().union(*affected_los.values())
+        ).values_list('learning_outcome_id', 'program_outcome_id'):
+            pos_by_lo[lo_id].add(po_id)
+        affected_pos = {
+            student_id: set().union(*(pos_by_lo[lo_id] for lo_id in lo_ids))
+            for student_id, lo_ids in affected_los.items()
+        }
+        affected_pos = {student_id: po_ids for student_id, po_ids in affected_pos.items() if po_ids}
+        
+        enrolled = _active_course_ids(affected_los)
+        with transaction.atomic():
+            course_ids = _rollup_lo_achievements(affected_los, enrolled)
+            if affected_pos:
+                _rollup_po_achievements(affected_pos, enrolled)
+        # bulk_create skips the StudentLOAchievement post_save receiver
+        invalidate_lo_heatmap_cache(*course_ids)
+    
+    AnalyticsSketchService.mark_stale_for_students(student_ids)
+    for student_id in student_ids:
+        invalidate_user_cache(student_id)
+        invalidate_dashboard_cache(user_id=student_id)
+
+
+def recalculate_achievements_for_assessments(assessment_ids: Iterable[int]) -> None:
+    """
+    Recalculate achievements for every grade of ``assessment_ids``.
+    
+    Bulk loads enqueue the few assessments they touched instead of one
+    (student, assessment) pair per grade; the students are read back here.
+    """
+    recalculate_achievements_for_grades(
+        StudentGrade.objects.filter(assessment_id__in=list(assessment_ids)).values_list('student_id', 'assessment_id')
+    )
+
+
 @receiver(post_save, sender=StudentGrade)
 def update_achievements_on_grade_save(sender, instance: StudentGrade, created: bool, **kwargs) -> None:
     """
@@ -269,6 +489,9 @@ def update_achievements_on_grade_save(sender, instance: StudentGrade, created: b
         for po in affected_pos:
             calculate_po_achievement(student, po)
         
+        # PO achievements feed the per-course analytics sketches
+        AnalyticsSketchService.mark_stale_for_student(student.id)
+        
         # Invalidate cache for this student (outside transaction)
         invalidate_user_cache(student.id)
         invalidate_dashboard_cache(user_id=student.id)
@@ -299,6 +522,9 @@ def update_achievements_on_grade_delete(sender, instance: StudentGrade, **kwargs
         for po in affected_pos:
             calculate_po_achievement(student, po)
         
+        # PO achievements feed the per-course analytics sketches
+        AnalyticsSketchService.mark_stale_for_student(student.id)
+        
         # Invalidate cache for this student (outside transaction)
         invalidate_user_cache(student.id)
         invalidate_dashboard_cache(user_id=student.id)
@@ -351,6 +577,11 @@ def update_achievements_on_enrollment(sender, instance: Enrollment, created: boo
     Update achievements when a student enrolls in a course.
     Uses database transaction to ensure all calculations are atomic.
     """
+    # Final grade or enrollment changes invalidate the course analytics sketch
+    AnalyticsSketchService.mark_stale([instance.course_id])
+    invalidate_curriculum_cache(instance.course.department)
+    invalidate_lo_heatmap_cache(instance.course_id)
+    
     if not instance.is_active:
         return
     
@@ -376,7 +607,74 @@ def update_achievements_on_enrollment(sender, instance: Enrollment, created: boo
         for po in affected_pos:
             calculate_po_achievement(student, po)
         
+        # PO achievements feed the per-course analytics sketches
+        AnalyticsSketchService.mark_stale_for_student(student.id)
+        
         # Invalidate cache for this student (outside transaction)
         invalidate_user_cache(student.id)
         invalidate_dashboard_cache(user_id=student.id)
 
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_analytics_on_enrollment_delete(sender, instance: Enrollment, **kwargs) -> None:
+    """
+    Flag the course analytics sketch for rebuild and drop the cached
+    curriculum and LO heatmap when an enrollment is removed.
+    """
+    AnalyticsSketchService.mark_stale([instance.course_id])
+    department = Course.objects.filter(pk=instance.course_id).values_list('department', flat=True).first()
+    invalidate_curriculum_cache(department)
+    invalidate_lo_heatmap_cache(instance.course_id)
+
+
+@receiver(pre_save, sender=Course)
+def remember_course_department(sender, instance: Course, **kwargs) -> None:
+    """
+    Remember the stored department so a department change can invalidate
+    the curriculum cache of both the old and the new department.
+    """
+    if instance.pk:
+        instance._previous_department = Course.objects.filter(
+            pk=instance.pk
+        ).values_list('department', flat=True).first()
+
+
+@receiver(post_save, sender=Course)
+def invalidate_curriculum_on_course_save(sender, instance: Course, **kwargs) -> None:
+    """
+    Drop the cached curriculum of the course's department(s).
+    """
+    invalidate_curriculum_cache(instance.department, getattr(instance, '_previous_department', None))
+
+
+@receiver(post_delete, sender=Course)
+def invalidate_curriculum_on_course_delete(sender, instance: Course, **kwargs) -> None:
+    """
+    Drop the cached curriculum of a deleted course's department.
+    """
+    invalidate_curriculum_cache(instance.department)
+
+
+@receiver(post_save, sender=StudentLOAchievement)
+@receiver(post_delete, sender=StudentLOAchievement)
+def invalidate_heatmap_on_lo_achievement_change(sender, instance: StudentLOAchievement, **kwargs) -> None:
+    """
+    Drop the cached LO heatmap of the achievement's course.
+    """
+    if StudentLOAchievement.learning_outcome.is_cached(instance):
+        course_id = instance.learning_outcome.course_id
+    else:
+        course_id = LearningOutcome.objects.filter(
+            pk=instance.learning_outcome_id
+        ).values_list('course_id', flat=True).first()
+    invalidate_lo_heatmap_cache(course_id)
+
+
+@receiver(post_save, sender=LearningOutcome)
+@receiver(post_delete, sender=LearningOutcome)
+def invalidate_heatmap_on_learning_outcome_change(sender, instance: LearningOutcome, **kwargs) -> None:
+    """
+    Drop the cached LO heatmap when a course's learning outcomes change.
+    """
+    invalidate_lo_heatmap_cache(instance.course_id)
@@ -0,0 +1,219 @@
+"""
+AcuRate - Mergeable Quantile Sketches
+
+KLL quantile sketch (Karnin, Lang & Liberty, 2016) used to answer percentile
+and histogram questions over institution-wide grade and achievement
+distributions without rescanning raw enrollments.
+
+Sketches are built per course, persisted as JSON and merged on read, so a
+department or institution rollup only touches one small payload per course.
+
+Error bounds:
+    For a sketch with parameter ``k`` the normalized rank error of any
+    quantile/rank query is roughly ``1.7 / k`` with high probability
+    (~99%), independent of the number of values summarised. With the
+    default ``k = 200`` a reported P50 is therefore within about 0.85
+    percentage points of rank of the true median. Merging sketches does
+    not degrade this bound.
+
+    While no compaction has happened (fewer than ``k`` values in total) the
+    sketch holds every value and answers are exact.
+
+Usage:
+    from api.sketches import KLLSketch
+
+    sketch = KLLSketch()
+    sketch.update_many([72.5, 88.0, 91.5])
+    sketch.merge(KLLSketch.from_dict(other_payload))
+    sketch.quantile(0.9)
+"""
+
+import math
+import random
+from typing import Any, Iterable
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_K = 200
+CAPACITY_DECAY = 2.0 / 3.0
+MIN_CAPACITY = 2
+
+
+# =============================================================================
+# KLL SKETCH
+# =============================================================================
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch.
+
+    Values are kept in a stack of compactors. Level ``h`` items stand for
+    ``2 ** h`` original values. When a level overflows it is sorted and every
+    other item (random offset) is promoted to the next level.
+    """
+
+    def __init__(self, k: int = DEFAULT_K):
+        if k < MIN_CAPACITY:
+            raise ValueError(f"k must be at least {MIN_CAPACITY}")
+        self.k = k
+        self.n = 0
+        self.min_value: float | None = None
+        self.max_value: float | None = None
+        self.compactors: list[list[float]] = [[]]
+        self._rng = random.Random()
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    def update(self, value: float) -> None:
+        """Add a single value to the sketch."""
+        value = float(value)
+        self.compactors[0].append(value)
+        self.n += 1
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+        self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """Add every value of an iterable to the sketch."""
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Merge another sketch into this one (in place) and return self."""
+        if other.n == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        if self.min_value is None or (other.min_value is not None and other.min_value < self.min_value):
+            self.min_value = other.min_value
+        if self.max_value is None or (other.max_value is not None and other.max_value > self.max_value):
+            self.max_value = other.max_value
+        self._compress()
+        return self
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @property
+    def is_exact(self) -> bool:
+        """True while every value is still held at level 0."""
+        return len(self.compactors) == 1
+
+    def rank(self, value: float, inclusive: bool = True) -> float:
+        """
+        Estimated fraction of values ``<= value`` (or ``< value`` when
+        ``inclusive`` is False).
+        """
+        if self.n == 0:
+            return 0.0
+        weight = 0
+        for level, items in enumerate(self.compactors):
+            if inclusive:
+                count = sum(1 for item in items if item <= value)
+            else:
+                count = sum(1 for item in items if item < value)
+            weight += count << level
+        return weight / self.n
+
+    def count_le(self, value: float) -> int:
+        """Estimated number of values ``<= value``."""
+        return int(round(self.rank(value) * self.n))
+
+    def quantile(self, q: float) -> float | None:
+        """Estimated value at quantile ``q`` (0 <= q <= 1)."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> list[float | None]:
+        """Estimated values for several quantiles with a single sort."""
+        qs = list(qs)
+        if self.n == 0:
+            return [None for _ in qs]
+        weighted = sorted(
+            (item, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for item in items
+        )
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError("Quantile must be between 0 and 1")
+            if q == 0:
+                results.append(self.min_value)
+                continue
+            if q == 1:
+                results.append(self.max_value)
+                continue
+            target = q * total
+            cumulative = 0
+            value = weighted[-1][0]
+            for item, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    value = item
+                    break
+            results.append(value)
+        return results
+
+    # -------------------------------------------------------------------------
+    # Serialization
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the sketch to a JSON-compatible dictionary."""
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': self.min_value,
+            'max': self.max_value,
+            'compactors': [list(items) for items in self.compactors],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'KLLSketch':
+        """Rebuild a sketch from :meth:`to_dict` output."""
+        sketch = cls(k=int(data.get('k', DEFAULT_K)))
+        sketch.n = int(data.get('n', 0))
+        sketch.min_value = data.get('min')
+        sketch.max_value = data.get('max')
+        compactors = data.get('compactors') or [[]]
+        sketch.compactors = [[float(item) for item in items] for items in compactors]
+        return sketch
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(MIN_CAPACITY, int(math.ceil(self.k * (CAPACITY_DECAY ** depth))))
+
+    def _compress(self) -> None:
+        while sum(len(items) for items in self.compactors) > sum(
+            self._capacity(level) for level in range(len(self.compactors))
+        ):
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) >= self._capacity(level):
+                    self._compact(level)
+                    break
+
+    def _compact(self, level: int) -> None:
+        if level + 1 >= len(self.compactors):
+            self.compactors.append([])
+        items = sorted(self.compactors[level])
+        # Keep one item back on odd sizes so total weight is preserved exactly
+        leftover = [items.pop()] if len(items) % 2 else []
+        offset = self._rng.getrandbits(1)
+        self.compactors[level + 1].extend(items[offset::2])
+        self.compactors[level] = leftover
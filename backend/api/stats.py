@@ -0,0 +1,171 @@
+"""
+AcuRate - Aggregate Statistics
+
+Summary numbers for a viewset's queryset computed in a single query: every
+requested aggregate (counts, filtered counts, averages, min/max, standard
+deviation) goes into one ``aggregate()`` call, or into one
+``values().annotate()`` when the client groups by a dimension. Values
+derived from the aggregates (rates, differences) are computed in Python
+from that one row, so a summary widget costs one round trip.
+
+``?stats=a,b`` limits the response to the listed statistics (and computes
+only the aggregates they need); ``?group_by=course`` returns one row per
+value of a declared dimension.
+
+Usage:
+    class StudentLOAchievementViewSet(StatsMixin, viewsets.ModelViewSet):
+        stats_spec = StatsSpec(
+            aggregates={
+                'total': Count('id'),
+                'targets_met': Count('id', filter=Q(current_percentage__gte=F('learning_outcome__target_percentage'))),
+                'average_percentage': Avg('current_percentage', default=0),
+            },
+            derived={'success_rate': Derived(lambda row: percent(row['targets_met'], row['total']),
+                                             ('targets_met', 'total'))},
+            dimensions={'course': {'course': 'learning_outcome__course_id'}},
+        )
+
+    GET /api/lo-achievements/stats/
+    GET /api/lo-achievements/stats/?group_by=course&stats=total,success_rate
+"""
+
+from dataclasses import dataclass, field as dataclass_field
+from decimal import Decimal
+from typing import Any, Callable, NamedTuple
+
+from django.db.models import Aggregate, QuerySet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+STATS_QUERY_PARAM = 'stats'
+GROUP_BY_QUERY_PARAM = 'group_by'
+
+
+# =============================================================================
+# DECLARATIONS
+# =============================================================================
+
+class Derived(NamedTuple):
+    """A statistic computed in Python from other statistics of the same row."""
+    function: Callable[[dict[str, Any]], Any]
+    requires: tuple[str, ...]
+
+
+def percent(part, whole, precision: int = 2) -> float:
+    """``part / whole * 100`` rounded, 0 for an empty whole."""
+    return round(float(part) / float(whole) * 100, precision) if whole else 0
+
+
+@dataclass
+class StatsSpec:
+    """
+    Declared statistics of a queryset.
+
+    Attributes:
+        aggregates: ``{name: aggregate expression}``; use ``default=`` for
+            the value of an empty queryset.
+        derived: ``{name: Derived}`` computed from aggregates of the same row.
+        dimensions: ``{name: {output key: lookup}}`` for ``?group_by=``; the
+            first lookup is the group key, the others are labels that
+            groups are sorted by.
+        precision: Decimal places floats and Decimals are rounded to.
+    """
+    aggregates: dict[str, Aggregate]
+    derived: dict[str, Derived] = dataclass_field(default_factory=dict)
+    dimensions: dict[str, dict[str, str]] = dataclass_field(default_factory=dict)
+    precision: int = 2
+
+    @property
+    def names(self) -> list[str]:
+        return [*self.aggregates, *self.derived]
+
+    def _aggregates_for(self, names: list[str]) -> dict[str, Aggregate]:
+        needed = {name for name in names if name in self.aggregates}
+        for name in names:
+            if name in self.derived:
+                needed.update(self.derived[name].requires)
+        return {name: expression for name, expression in self.aggregates.items() if name in needed}
+
+    def _finish(self, row: dict[str, Any], names: list[str]) -> dict[str, Any]:
+        for name, value in row.items():
+            if isinstance(value, (Decimal, float)):
+                row[name] = round(float(value), self.precision)
+        for name in names:
+            if name in self.derived:
+                row[name] = self.derived[name].function(row)
+        return row
+
+    def compute(self, queryset: QuerySet, names: list[str] | None = None,
+                group_by: str | None = None) -> dict[str, Any] | list[dict[str, Any]]:
+        """
+        Compute ``names`` (default: all) over ``queryset`` in one query.
+
+        Returns:
+            A dict of statistics, or with ``group_by`` a list of dicts, one
+            per group, holding the dimension's keys followed by the statistics.
+        """
+        names = self.names if names is None else [name for name in self.names if name in names]
+        aggregates = self._aggregates_for(names)
+
+        if group_by is None:
+            row = queryset.aggregate(**aggregates) if aggregates else {}
+            return {name: value for name, value in self._finish(row, names).items() if name in names}
+
+        keys = self.dimensions[group_by]
+        lookups = list(keys.values())
+        rows = queryset.order_by().values(*lookups).annotate(**aggregates).order_by(*lookups[1:], lookups[0])
+        groups = []
+        for row in rows:
+            group = {key: row[lookup] for key, lookup in keys.items()}
+            stats = self._finish({name: row[name] for name in aggregates}, names)
+            group.update((name, stats[name]) for name in names)
+            groups.append(group)
+        return groups
+
+
+# =============================================================================
+# VIEW MIXIN
+# =============================================================================
+
+class StatsMixin:
+    """
+    Adds ``GET <list route>/stats/`` computing ``stats_spec`` over the
+    viewset's filtered queryset.
+    """
+
+    stats_spec: StatsSpec | None = None
+
+    def get_stats_queryset(self) -> QuerySet:
+        return self.filter_queryset(self.get_queryset())
+
+    def stats_response(self, request, queryset: QuerySet | None = None) -> Response:
+        """Validate ``?stats=`` / ``?group_by=`` and compute the statistics."""
+        spec = self.stats_spec
+        group_by = request.query_params.get(GROUP_BY_QUERY_PARAM) or None
+        if group_by is not None and group_by not in spec.dimensions:
+            return Response({
+                'error': f"group_by must be one of: {', '.join(spec.dimensions)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        requested = request.query_params.get(STATS_QUERY_PARAM)
+        names = [name.strip() for name in requested.split(',') if name.strip()] if requested else None
+        unknown = [name for name in names or () if name not in spec.names]
+        if unknown:
+            return Response({
+                'error': f"Unknown statistics: {', '.join(unknown)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if queryset is None:
+            queryset = self.get_stats_queryset()
+        return Response(spec.compute(queryset, names, group_by))
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Aggregate statistics in one query; ?stats=a,b and ?group_by=<dimension>"""
+        return self.stats_response(request)
@@ -142,3 +142,73 @@ def bulk_calculate_achievements(student_ids):
     
     logger.info(f"Bulk achievement calculation completed: {results}")
     return results
+
+
+@shared_task
+def refresh_course_sketches(course_ids=None):
+    """
+    Rebuild missing or stale per-course analytics sketches.
+    
+    Intended to run periodically (e.g. from celery beat) so analytics
+    reads rarely have to rebuild sketches inline.
+    
+    Args:
+        course_ids: Optional list of course IDs to restrict the refresh to
+    """
+    from .services.analytics_sketch_service import AnalyticsSketchService
+    
+    rebuilt = AnalyticsSketchService.refresh(course_ids)
+    logger.info(f"Analytics sketch refresh completed: {rebuilt} courses rebuilt")
+    return rebuilt
+
+
+@shared_task
+def snapshot_achievements():
+    """
+    Capture today's PO/LO achievement aggregates per course offering.
+    
+    Scheduled daily via celery beat; feeds the trend and delta figures of
+    the analytics endpoints.
+    """
+    from .services.achievement_snapshot_service import AchievementSnapshotService
+    
+    written = AchievementSnapshotService.take_snapshot()
+    logger.info(f"Achievement snapshot completed: {written} rows")
+    return written
+
+
+@shared_task
+def process_import_job(job_id):
+    """
+    Process a background import job chunk by chunk.
+    
+    Enqueued by ImportJobService.submit once the job row is committed;
+    progress is recorded on the ImportJob for the polling endpoint.
+    
+    Args:
+        job_id: ImportJob ID
+    """
+    from .services.import_job_service import ImportJobService
+    
+    job = ImportJobService.run(job_id)
+    return job.status
+
+
+@shared_task
+def recalculate_grade_achievements(assessment_ids):
+    """
+    Recalculate achievements once for grades written by a bulk load.
+    
+    Enqueued after commit by the grade importers so large loads do not
+    hold their transaction open for the rollup. Every grade of the
+    assessments is recalculated; the message stays small however many
+    rows were imported.
+    
+    Args:
+        assessment_ids: IDs of the assessments whose grades were written
+    """
+    from .signals import recalculate_achievements_for_assessments
+    
+    recalculate_achievements_for_assessments(assessment_ids)
+    logger.info(f"Achievement recalculation completed for {len(assessment_ids)} assessments")
+    return len(assessment_ids)
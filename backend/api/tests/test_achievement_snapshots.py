@@ -0,0 +1,118 @@
+"""
+Achievement Snapshot Tests - Pytest Version
+
+Tests for the achievement snapshot store in
+api/services/achievement_snapshot_service.py and the trend figures the
+analytics views read from it.
+"""
+
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import AchievementSnapshot, StudentPOAchievement
+from api.services.achievement_snapshot_service import AchievementSnapshotService
+
+
+@pytest.fixture
+def po_achievement_enrolled(enrollment, student_user, program_outcome_1):
+    """PO achievement for a student actively enrolled in the course"""
+    return StudentPOAchievement.objects.create(
+        student=student_user,
+        program_outcome=program_outcome_1,
+        current_percentage=Decimal('60.00')
+    )
+
+
+# =============================================================================
+# SNAPSHOT SERVICE TESTS
+# =============================================================================
+
+@pytest.mark.integration
+class TestAchievementSnapshotService:
+    """Test writing and reading achievement snapshots"""
+
+    def test_take_snapshot_writes_po_rows(self, po_achievement_enrolled, course, program_outcome_1):
+        """Test that PO aggregates are captured per course offering"""
+        written = AchievementSnapshotService.take_snapshot()
+
+        assert written >= 1
+        snapshot = AchievementSnapshot.objects.get(
+            outcome_type=AchievementSnapshot.OutcomeType.PO,
+            program_outcome=program_outcome_1,
+            course=course
+        )
+        assert snapshot.student_count == 1
+        assert snapshot.achieved_count == 0
+        assert snapshot.average_percentage == Decimal('60.00')
+        assert snapshot.department == course.department
+        assert snapshot.academic_year == course.academic_year
+
+    def test_take_snapshot_is_idempotent_per_day(self, po_achievement_enrolled):
+        """Test that re-running a snapshot replaces the day's rows"""
+        first = AchievementSnapshotService.take_snapshot()
+        second = AchievementSnapshotService.take_snapshot()
+
+        assert first == second
+        assert AchievementSnapshot.objects.count() == first
+
+    def test_course_trend_from_history(self, po_achievement_enrolled, course):
+        """Test that course trends compare the two latest snapshots"""
+        today = timezone.localdate()
+        AchievementSnapshotService.take_snapshot(today - timedelta(days=7))
+        po_achievement_enrolled.current_percentage = Decimal('75.00')
+        po_achievement_enrolled.save()
+        AchievementSnapshotService.take_snapshot(today)
+
+        trends = AchievementSnapshotService.course_trends([course.id])
+
+        assert trends[course.id] == {'trend': 'up', 'delta': 15.0}
+
+    def test_delta_without_history(self):
+        """Test that a single point reports a neutral trend"""
+        assert AchievementSnapshotService.delta([{'average': 70.0}]) == {
+            'trend': 'neutral', 'delta': None
+        }
+
+
+# =============================================================================
+# ANALYTICS VIEW TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestSnapshotBackedAnalytics:
+    """Test analytics endpoints reading trends from snapshots"""
+
+    def test_course_overview_trend(self, authenticated_student_client, po_achievement_enrolled, enrollment):
+        """Test that course overview reports a trend from snapshot history"""
+        enrollment.final_grade = Decimal('80.00')
+        enrollment.save()
+        today = timezone.localdate()
+        AchievementSnapshotService.take_snapshot(today - timedelta(days=1))
+        po_achievement_enrolled.current_percentage = Decimal('50.00')
+        po_achievement_enrolled.save()
+        AchievementSnapshotService.take_snapshot(today)
+
+        response = authenticated_student_client.get('/api/course-analytics/')
+
+        assert response.status_code == status.HTTP_200_OK
+        course_data = response.data['courses'][0]
+        assert course_data['trend'] == 'down'
+        assert course_data['trend_delta'] == -10.0
+
+    def test_po_trends_history(self, authenticated_institution_client, po_achievement_enrolled, program_outcome_1):
+        """Test that PO trends include the snapshot history"""
+        AchievementSnapshotService.take_snapshot()
+
+        response = authenticated_institution_client.get('/api/analytics/po-trends/')
+
+        assert response.status_code == status.HTTP_200_OK
+        po_data = next(
+            po for po in response.data['program_outcomes'] if po['code'] == program_outcome_1.code
+        )
+        assert len(po_data['history']) == 1
+        assert po_data['history'][0]['average'] == 60.0
+        assert po_data['trend'] == 'neutral'
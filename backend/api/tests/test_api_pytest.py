@@ -8,9 +8,11 @@ The original test_api.py still works with pytest-django.
 import pytest
 import uuid
 from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
-from api.models import User, ProgramOutcome, Course, Assessment, StudentGrade
+from api.models import User, ProgramOutcome, Course, Assessment, StudentGrade, Enrollment
 
 
 # =============================================================================
@@ -193,6 +195,34 @@ class TestCourseAPI:
         
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['code'] == 'CSE302'
+    
+    def test_retrieve_course_query_count_is_constant(self, authenticated_teacher_client, course, learning_outcome_1):
+        """Test that course detail queries do not grow with enrollments"""
+        def enroll(count, prefix, is_active=True):
+            for index in range(count):
+                student = User.objects.create_user(
+                    username=f'{prefix}_{index}_{uuid.uuid4().hex[:6]}',
+                    email=f'{prefix}_{index}_{uuid.uuid4().hex[:6]}@test.com',
+                    password='testpass123',
+                    role=User.Role.STUDENT
+                )
+                Enrollment.objects.create(student=student, course=course, is_active=is_active)
+        
+        enroll(1, 'few')
+        with CaptureQueriesContext(connection) as few:
+            response = authenticated_teacher_client.get(f'/api/courses/{course.id}/')
+        assert response.data['enrollment_count'] == 1
+        
+        enroll(6, 'many')
+        enroll(1, 'inactive', is_active=False)
+        with CaptureQueriesContext(connection) as many:
+            response = authenticated_teacher_client.get(f'/api/courses/{course.id}/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['enrollment_count'] == 7
+        assert len(response.data['enrollments']) == 7
+        assert response.data['learning_outcomes'][0]['course_code'] == course.code
+        assert len(many) == len(few)
 
 
 @pytest.mark.api
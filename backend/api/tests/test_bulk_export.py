@@ -0,0 +1,259 @@
+"""
+Bulk Export Tests - Pytest Version
+
+Tests for the streaming grade export and the wide gradebook export in
+api/views/bulk_operations.py, including memory and timing benchmarks.
+"""
+
+import csv
+import gzip
+import io
+import time
+import tracemalloc
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import Assessment, Course, Enrollment, StudentGrade, User
+from api.services.gradebook_export_service import GradebookExportService
+from api.tests.utils import create_test_students
+from api.views import bulk_operations
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def _consume(response):
+    """Read a streaming response fully and return its bytes."""
+    return b''.join(
+        chunk if isinstance(chunk, bytes) else chunk.encode()
+        for chunk in response.streaming_content
+    )
+
+
+def _seed_grades(course, count, prefix):
+    """Create `count` students with one grade each (bypassing signals)."""
+    assessment = Assessment.objects.create(
+        course=course,
+        title=f'Bench {prefix}',
+        assessment_type=Assessment.AssessmentType.QUIZ,
+        weight=Decimal('10.00'),
+        max_score=Decimal('100.00')
+    )
+    students = create_test_students(count, prefix, first_name='Bench')
+    StudentGrade.objects.bulk_create([
+        StudentGrade(student=student, assessment=assessment, score=Decimal(index % 100))
+        for index, student in enumerate(students)
+    ])
+    return assessment
+
+
+# =============================================================================
+# STREAMING EXPORT TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestBulkExportGrades:
+    """Test bulk_export_grades streaming CSV export"""
+
+    def test_export_streams_csv(self, authenticated_teacher_client, student_grade, student_user):
+        """Test that the export is a streaming CSV with the expected rows"""
+        response = authenticated_teacher_client.get('/api/bulk/export/grades/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        rows = list(csv.reader(io.StringIO(_consume(response).decode())))
+        assert rows[0] == bulk_operations.GRADE_EXPORT_HEADER
+        assert rows[1][0] == student_user.student_id
+        assert rows[1][5] == '85.0'
+
+    def test_export_gzip(self, authenticated_teacher_client, student_grade):
+        """Test that compress=gzip returns a valid gzip stream"""
+        response = authenticated_teacher_client.get('/api/bulk/export/grades/', {'compress': 'gzip'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/gzip'
+        text = gzip.decompress(_consume(response)).decode()
+        assert text.startswith('Student ID,')
+        assert len(text.strip().splitlines()) == 2
+
+    def test_export_forbidden_for_students(self, authenticated_student_client):
+        """Test that students cannot export grades"""
+        response = authenticated_student_client.get('/api/bulk/export/grades/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestBulkExportGradebook:
+    """Test bulk_export_gradebook wide CSV/XLSX export"""
+
+    @pytest.fixture
+    def gradebook(self, course, enrollment, student_user, assessment, student_grade, lo_achievement, po_achievement):
+        """A course with one graded student, one ungraded student and one unenrolled grade."""
+        ungraded = User.objects.create(
+            username='gb_ungraded', email='gb_ungraded@test.com', role=User.Role.STUDENT,
+            student_id='GB002', first_name='Aaron', last_name='Aardvark'
+        )
+        Enrollment.objects.create(student=ungraded, course=course)
+        dropped = User.objects.create(
+            username='gb_dropped', email='gb_dropped@test.com', role=User.Role.STUDENT, student_id='GB003'
+        )
+        StudentGrade.objects.create(student=dropped, assessment=assessment, score=Decimal('10.00'))
+        return course
+
+    def test_csv_pivots_students_by_assessment(self, authenticated_teacher_client, gradebook, student_user, assessment):
+        """Test one row per enrolled student with assessment, LO and PO columns"""
+        response = authenticated_teacher_client.get('/api/bulk/export/gradebook/', {'course_id': gradebook.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        rows = list(csv.reader(io.StringIO(_consume(response).decode())))
+        assert rows[0] == [
+            'Student ID', 'Student Name', f'{gradebook.code} Midterm Exam (100.00)',
+            f'{gradebook.code} LO1 (%)', 'PO1 (%)',
+        ]
+        # Ungraded students still get a row, with empty assessment cells
+        assert rows[1][:3] == ['GB002', 'Aaron Aardvark', '']
+        assert rows[2] == [
+            student_user.student_id, student_user.get_full_name(), '85.00', '80.00', '75.00'
+        ]
+        assert len(rows) == 3
+
+    def test_xlsx_workbook(self, authenticated_teacher_client, gradebook, student_user):
+        """Test that file_format=xlsx streams a readable workbook with numeric cells"""
+        response = authenticated_teacher_client.get(
+            '/api/bulk/export/gradebook/', {'course_id': gradebook.id, 'file_format': 'xlsx'}
+        )
+
+        assert response['Content-Type'] == bulk_operations.XLSX_CONTENT_TYPE
+        with zipfile.ZipFile(io.BytesIO(_consume(response))) as workbook:
+            assert workbook.testzip() is None
+            sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('.//s:row', SHEET_NS)
+        assert len(rows) == 3
+        graded = rows[2].findall('s:c', SHEET_NS)
+        assert graded[0].find('.//s:t', SHEET_NS).text == student_user.student_id
+        assert [cell.find('s:v', SHEET_NS).text for cell in graded[2:]] == ['85.00', '80.00', '75.00']
+
+    def test_department_scope_for_institution(self, authenticated_institution_client, gradebook):
+        """Test that institution admins export every course of a department"""
+        response = authenticated_institution_client.get(
+            '/api/bulk/export/gradebook/', {'department': 'Computer Science', 'compress': 'gzip'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        text = gzip.decompress(_consume(response)).decode()
+        assert f'{gradebook.code} Midterm Exam (100.00)' in text.splitlines()[0]
+
+    def test_teacher_limited_to_own_courses(self, api_client, gradebook):
+        """Test that teachers cannot export other teachers' courses"""
+        other = User.objects.create_user(
+            username='gb_teacher', email='gb_teacher@test.com', password='testpass123', role=User.Role.TEACHER
+        )
+        api_client.force_authenticate(user=other)
+
+        response = api_client.get('/api/bulk/export/gradebook/', {'course_id': gradebook.id})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_scope(self, authenticated_teacher_client):
+        """Test that course_id or department is required"""
+        response = authenticated_teacher_client.get('/api/bulk/export/gradebook/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_forbidden_for_students(self, authenticated_student_client):
+        """Test that students cannot export gradebooks"""
+        response = authenticated_student_client.get(
+            '/api/bulk/export/gradebook/', {'department': 'Computer Science'}
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_query_count_independent_of_students(self, course, assessment):
+        """Test that the pivot runs the same queries for 5 and 50 students"""
+        counts = []
+        for size, prefix in ((5, 'gba'), (50, 'gbb')):
+            Enrollment.objects.bulk_create([
+                Enrollment(student=student, course=course) for student in create_test_students(size, prefix)
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                rows = list(GradebookExportService(Course.objects.filter(id=course.id)).iter_rows())
+            counts.append(len(queries))
+            assert len(rows) == Enrollment.objects.filter(course=course).count()
+
+        assert counts[0] == counts[1]
+
+
+# =============================================================================
+# MEMORY BENCHMARK
+# =============================================================================
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestBulkExportMemory:
+    """Benchmark: export memory does not grow with the number of rows"""
+
+    def _peak_export_memory(self, assessment):
+        queryset = StudentGrade.objects.filter(assessment=assessment)
+        tracemalloc.start()
+        total_bytes = sum(len(chunk) for chunk in bulk_operations._grade_export_csv(queryset))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, total_bytes
+
+    def test_peak_memory_independent_of_row_count(self, course, monkeypatch):
+        """Test that 10x more rows does not mean 10x more memory"""
+        monkeypatch.setattr(bulk_operations, 'EXPORT_CHUNK_SIZE', 200)
+        monkeypatch.setattr(bulk_operations, 'EXPORT_FLUSH_ROWS', 100)
+        small = _seed_grades(course, 500, 'small')
+        large = _seed_grades(course, 5000, 'large')
+
+        small_peak, small_bytes = self._peak_export_memory(small)
+        large_peak, large_bytes = self._peak_export_memory(large)
+
+        assert large_bytes > 9 * small_bytes
+        # Output grew ~10x; peak memory stays within a small constant factor
+        assert large_peak < small_peak * 2, f'{small_peak} B for 500 rows, {large_peak} B for 5000 rows'
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestGradebookExportBenchmark:
+    """Benchmark: a 1,000-student department gradebook"""
+
+    def test_department_export(self, course, department):
+        """Test that 1,000 students x 10 assessments export quickly with bounded memory"""
+        assessments = Assessment.objects.bulk_create([
+            Assessment(
+                course=course, title=f'Quiz {index}', assessment_type=Assessment.AssessmentType.QUIZ,
+                weight=Decimal('10.00'), max_score=Decimal('100.00')
+            )
+            for index in range(10)
+        ])
+        students = create_test_students(1000, 'gbbench', first_name='Bench')
+        Enrollment.objects.bulk_create([Enrollment(student=student, course=course) for student in students])
+        StudentGrade.objects.bulk_create([
+            StudentGrade(student=student, assessment=assessment, score=Decimal(index % 100))
+            for index, student in enumerate(students)
+            for assessment in assessments
+        ])
+
+        export = GradebookExportService(Course.objects.filter(department=course.department))
+        tracemalloc.start()
+        started = time.perf_counter()
+        total_bytes = sum(len(chunk) for chunk in export.iter_xlsx())
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert total_bytes > 0
+        assert elapsed < 10, f'1000 students took {elapsed:.2f}s'
+        assert peak < 5 * 1024 * 1024, f'peak {peak} B'
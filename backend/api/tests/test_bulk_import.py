@@ -0,0 +1,1147 @@
+"""
+Bulk Import Tests - Pytest Version
+
+Tests for the set-based grade import in api/services/grade_import_service.py
+(its PostgreSQL COPY fast path and the /api/grades/batch/ endpoint),
+bulk student creation with fast temporary password hashes (api/hashers.py),
+background import jobs, CSV encoding detection and the bulk import views.
+"""
+
+import csv
+import io
+import tracemalloc
+
+import pytest
+from decimal import Decimal
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.hashers import TEMPORARY_PASSWORD_ITERATIONS, make_temporary_password_hashes
+from api.models import (
+    ActivityLog, Assessment, AssessmentLO, Course, Enrollment, ImportJob, LearningOutcome, LOPO,
+    PasswordHistory, ProgramOutcome, StudentGrade, StudentLOAchievement, StudentPOAchievement, User
+)
+from api.services.import_job_service import ImportJobService
+from api.services import student_import_service
+from api.services.student_import_service import (
+    StudentImportService, StudentImportServiceError, detect_encoding, iter_decoded_lines
+)
+from api.signals import calculate_lo_achievement, calculate_po_achievement, recalculate_achievements_for_grades
+from api.tests.utils import create_test_students
+from api.views import bulk_operations
+
+
+PBKDF2_HASHERS = ['django.contrib.auth.hashers.PBKDF2PasswordHasher']
+
+
+def _grades_csv(rows):
+    """Build an uploaded grades CSV from (student_id, assessment_id, score, feedback) tuples."""
+    lines = ['student_id,assessment_id,score,feedback']
+    lines.extend(','.join(str(value) for value in row) for row in rows)
+    return SimpleUploadedFile('grades.csv', '\n'.join(lines).encode('utf-8'), content_type='text/csv')
+
+
+def _students_csv(rows, header='email,first_name,last_name,student_id,department,year_of_study'):
+    """Build an uploaded students CSV from row tuples."""
+    lines = [header]
+    lines.extend(','.join(str(value) for value in row) for row in rows)
+    return SimpleUploadedFile('students.csv', '\n'.join(lines).encode('utf-8'), content_type='text/csv')
+
+
+def _create_students(course, count, prefix):
+    """Create `count` enrolled students."""
+    students = create_test_students(count, prefix)
+    Enrollment.objects.bulk_create([Enrollment(student=student, course=course) for student in students])
+    return students
+
+
+# =============================================================================
+# GRADE IMPORT TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestBulkImportGrades:
+    """Test POST /api/bulk/import/grades/"""
+
+    def test_import_creates_and_updates(self, authenticated_teacher_client, student_user, assessment, student_grade):
+        """Test that new grades are created and existing ones updated"""
+        other = User.objects.create_user(
+            username='import_other', email='import_other@test.com',
+            password='testpass123', role=User.Role.STUDENT, student_id='IMP001'
+        )
+        upload = _grades_csv([
+            (student_user.student_id, assessment.id, '70', ''),
+            ('IMP001', assessment.id, '90.5', 'Great'),
+        ])
+
+        response = authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 1
+        assert response.data['updated'] == 1
+        assert response.data['errors'] is None
+        student_grade.refresh_from_db()
+        assert student_grade.score == Decimal('70.00')
+        new_grade = StudentGrade.objects.get(student=other, assessment=assessment)
+        assert new_grade.score == Decimal('90.50')
+        assert new_grade.feedback == 'Great'
+
+    def test_update_without_feedback_keeps_feedback(self, authenticated_teacher_client, student_grade):
+        """Test that an empty feedback cell keeps the stored feedback"""
+        student_grade.feedback = 'Keep me'
+        student_grade.save()
+        upload = _grades_csv([(student_grade.student.student_id, student_grade.assessment_id, '60', '')])
+
+        authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        student_grade.refresh_from_db()
+        assert student_grade.score == Decimal('60.00')
+        assert student_grade.feedback == 'Keep me'
+
+    def test_row_errors_reported_in_order(self, authenticated_teacher_client, student_user, assessment):
+        """Test that invalid rows are reported and valid rows still imported"""
+        upload = _grades_csv([
+            ('UNKNOWN', assessment.id, '50', ''),
+            (student_user.student_id, 'abc', '50', ''),
+            (student_user.student_id, assessment.id, '', ''),
+            (student_user.student_id, assessment.id, 'lots', ''),
+            (student_user.student_id, assessment.id, '150', ''),
+            (student_user.student_id, assessment.id, '55', ''),
+        ])
+
+        response = authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        assert response.data['created'] == 1
+        assert response.data['errors'] == [
+            'Row 2: Student with ID UNKNOWN not found',
+            'Row 3: Assessment with ID abc not found',
+            'Row 4: student_id, assessment_id, and score are required',
+            'Row 5: Invalid score format: lots',
+            'Row 6: Score must be between 0 and 100.00',
+        ]
+
+    def test_other_teachers_assessment_rejected(self, api_client, student_user, assessment):
+        """Test that teachers cannot import grades for other teachers' courses"""
+        other = User.objects.create_user(
+            username='import_teacher', email='import_teacher@test.com',
+            password='testpass123', role=User.Role.TEACHER
+        )
+        api_client.force_authenticate(user=other)
+        upload = _grades_csv([(student_user.student_id, assessment.id, '50', '')])
+
+        response = api_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        assert response.data['created'] == 0
+        assert response.data['errors'] == ["Row 2: You don't have permission to grade this assessment"]
+        assert not StudentGrade.objects.exists()
+
+    def test_import_recalculates_achievements(
+        self, authenticated_teacher_client, student_user, enrollment, assessment,
+        learning_outcome_1, program_outcome_1
+    ):
+        """Test that one rollup updates LO and PO achievements for imported grades"""
+        AssessmentLO.objects.create(assessment=assessment, learning_outcome=learning_outcome_1, weight=Decimal('1.00'))
+        LOPO.objects.create(learning_outcome=learning_outcome_1, program_outcome=program_outcome_1, weight=Decimal('1.00'))
+        upload = _grades_csv([(student_user.student_id, assessment.id, '80', '')])
+
+        authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        lo_achievement = StudentLOAchievement.objects.get(student=student_user, learning_outcome=learning_outcome_1)
+        assert lo_achievement.current_percentage == Decimal('80.00')
+        po_achievement = StudentPOAchievement.objects.get(student=student_user, program_outcome=program_outcome_1)
+        assert po_achievement.current_percentage == Decimal('80.00')
+
+    def test_query_count_independent_of_rows(
+        self, authenticated_teacher_client, course, assessment, learning_outcome_1, program_outcome_1
+    ):
+        """Test that the import and its rollup issue the same number of queries for 5 and 50 rows"""
+        second = LearningOutcome.objects.create(
+            course=course, code='LO2', title='Second', target_percentage=Decimal('70.00')
+        )
+        for learning_outcome in (learning_outcome_1, second):
+            AssessmentLO.objects.create(assessment=assessment, learning_outcome=learning_outcome, weight=Decimal('1.00'))
+            LOPO.objects.create(
+                learning_outcome=learning_outcome, program_outcome=program_outcome_1, weight=Decimal('1.00')
+            )
+        counts = []
+        for size, prefix in ((5, 'qa'), (50, 'qb')):
+            students = _create_students(course, size, prefix)
+            upload = _grades_csv([(student.student_id, assessment.id, '75', '') for student in students])
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_teacher_client.post(
+                    '/api/bulk/import/grades/', {'file': upload}, format='multipart'
+                )
+            assert response.data['created'] == size
+            counts.append(len(queries))
+
+        assert counts[0] == counts[1]
+        assert StudentLOAchievement.objects.filter(learning_outcome__in=[learning_outcome_1, second]).count() == 110
+        assert StudentPOAchievement.objects.filter(program_outcome=program_outcome_1).count() == 55
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestGradeCopyImport:
+    """Test the PostgreSQL COPY fast path of POST /api/bulk/import/grades/"""
+
+    @pytest.fixture(autouse=True)
+    def copy_path(self, settings):
+        settings.GRADE_IMPORT_COPY_THRESHOLD = 1
+
+    def _post(self, client, upload, capture):
+        with capture(execute=True):
+            return client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+    def test_copy_creates_and_updates(
+        self, authenticated_teacher_client, student_user, assessment, student_grade,
+        django_capture_on_commit_callbacks
+    ):
+        """Test that the staging merge creates and updates grades, last row winning"""
+        student_grade.feedback = 'Keep me'
+        student_grade.save()
+        other = User.objects.create_user(
+            username='copy_other', email='copy_other@test.com',
+            password='testpass123', role=User.Role.STUDENT, student_id='CPY001'
+        )
+        upload = _grades_csv([
+            (student_user.student_id, assessment.id, '70', ''),
+            ('CPY001', assessment.id, '40', 'First'),
+            ('CPY001', assessment.id, '90.5', '"Great, really"'),
+        ])
+
+        response = self._post(authenticated_teacher_client, upload, django_capture_on_commit_callbacks)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['created'], response.data['updated']) == (1, 1)
+        assert response.data['errors'] is None
+        student_grade.refresh_from_db()
+        assert (student_grade.score, student_grade.feedback) == (Decimal('70.00'), 'Keep me')
+        new_grade = StudentGrade.objects.get(student=other, assessment=assessment)
+        assert (new_grade.score, new_grade.feedback) == (Decimal('90.50'), 'Great, really')
+
+    def test_copy_errors_match_orm_path(
+        self, settings, authenticated_teacher_client, student_user, assessment,
+        django_capture_on_commit_callbacks
+    ):
+        """Test that set-based validation reports the same rows and messages"""
+        rows = [
+            ('UNKNOWN', assessment.id, '50', ''),
+            (student_user.student_id, 'abc', '50', ''),
+            (student_user.student_id, '99999999999999999999', '50', ''),
+            (student_user.student_id, assessment.id, '', ''),
+            (student_user.student_id, assessment.id, 'lots', ''),
+            (student_user.student_id, assessment.id, '150', ''),
+            (student_user.student_id, assessment.id, '-1', ''),
+            (student_user.student_id, assessment.id, '55', ''),
+        ]
+
+        copy_response = self._post(authenticated_teacher_client, _grades_csv(rows), django_capture_on_commit_callbacks)
+        settings.GRADE_IMPORT_COPY_THRESHOLD = 0
+        orm_response = self._post(authenticated_teacher_client, _grades_csv(rows), django_capture_on_commit_callbacks)
+
+        assert copy_response.data['created'] == 1
+        assert orm_response.data['updated'] == 1
+        assert copy_response.data['errors'] == orm_response.data['errors']
+        assert len(copy_response.data['errors']) == 7
+
+    def test_copy_rejects_other_teachers_assessment(
+        self, api_client, student_user, assessment, django_capture_on_commit_callbacks
+    ):
+        """Test the ownership check of the staging validation"""
+        other = User.objects.create_user(
+            username='copy_teacher', email='copy_teacher@test.com',
+            password='testpass123', role=User.Role.TEACHER
+        )
+        api_client.force_authenticate(user=other)
+        upload = _grades_csv([(student_user.student_id, assessment.id, '50', '')])
+
+        response = self._post(api_client, upload, django_capture_on_commit_callbacks)
+
+        assert response.data['errors'] == ["Row 2: You don't have permission to grade this assessment"]
+        assert not StudentGrade.objects.exists()
+
+    def test_copy_defers_one_recalculation(
+        self, authenticated_teacher_client, student_user, enrollment, assessment,
+        learning_outcome_1, program_outcome_1, django_capture_on_commit_callbacks
+    ):
+        """Test that achievements are recalculated once, after commit"""
+        AssessmentLO.objects.create(assessment=assessment, learning_outcome=learning_outcome_1, weight=Decimal('1.00'))
+        LOPO.objects.create(learning_outcome=learning_outcome_1, program_outcome=program_outcome_1, weight=Decimal('1.00'))
+        upload = _grades_csv([(student_user.student_id, assessment.id, '80', '')])
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        assert not StudentLOAchievement.objects.exists()
+        for callback in callbacks:
+            callback()
+        lo_achievement = StudentLOAchievement.objects.get(student=student_user, learning_outcome=learning_outcome_1)
+        assert lo_achievement.current_percentage == Decimal('80.00')
+        po_achievement = StudentPOAchievement.objects.get(student=student_user, program_outcome=program_outcome_1)
+        assert po_achievement.current_percentage == Decimal('80.00')
+
+    def test_copy_enqueues_assessment_ids(
+        self, authenticated_teacher_client, course, assessment, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        """Test that the task message carries the assessments, not one key per grade"""
+        from api.tasks import recalculate_grade_achievements
+
+        sent = []
+        monkeypatch.setattr(recalculate_grade_achievements, 'delay', sent.append)
+        students = _create_students(course, 20, 'ce')
+        upload = _grades_csv([(student.student_id, assessment.id, '75', '') for student in students])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_teacher_client.post('/api/bulk/import/grades/', {'file': upload}, format='multipart')
+
+        assert sent == [[assessment.id]]
+
+    def test_copy_query_count_independent_of_rows(
+        self, authenticated_teacher_client, course, assessment, django_capture_on_commit_callbacks
+    ):
+        """Test that the COPY path issues the same number of queries for 5 and 50 rows"""
+        counts = []
+        for size, prefix in ((5, 'ca'), (50, 'cb')):
+            students = _create_students(course, size, prefix)
+            upload = _grades_csv([(student.student_id, assessment.id, '75', '') for student in students])
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_teacher_client.post(
+                    '/api/bulk/import/grades/', {'file': upload}, format='multipart'
+                )
+            assert response.data['created'] == size
+            counts.append(len(queries))
+
+        assert counts[0] == counts[1]
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestGradeBatch:
+    """Test POST /api/grades/batch/"""
+
+    def test_batch_creates_updates_and_reports_per_item(
+        self, authenticated_teacher_client, student_user, assessment, student_grade,
+        django_capture_on_commit_callbacks
+    ):
+        """Test per-item results for created, updated, superseded and invalid entries"""
+        other = User.objects.create_user(
+            username='batch_other', email='batch_other@test.com',
+            password='testpass123', role=User.Role.STUDENT, student_id='BAT001'
+        )
+        entries = [
+            {'student': student_user.id, 'assessment': assessment.id, 'score': 70},
+            {'student': other.id, 'assessment': assessment.id, 'score': '40', 'feedback': 'First'},
+            {'student': other.id, 'assessment': assessment.id, 'score': 90.5, 'feedback': 'Great'},
+            {'student': other.id, 'assessment': assessment.id, 'score': 150},
+            {'student': '99999999999999999999', 'assessment': assessment.id, 'score': 50},
+            {'assessment': assessment.id},
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_teacher_client.post('/api/grades/batch/', entries, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['created'], response.data['updated'], response.data['failed']) == (1, 1, 3)
+        new_grade = StudentGrade.objects.get(student=other, assessment=assessment)
+        assert response.data['results'] == [
+            {'index': 0, 'status': 'updated', 'id': student_grade.id, 'error': None},
+            {'index': 1, 'status': 'superseded', 'id': None, 'error': 'Superseded by entry 2'},
+            {'index': 2, 'status': 'created', 'id': new_grade.id, 'error': None},
+            {'index': 3, 'status': 'error', 'id': None, 'error': 'Score must be between 0 and 100.00'},
+            {'index': 4, 'status': 'error', 'id': None, 'error': 'Student with ID 99999999999999999999 not found'},
+            {'index': 5, 'status': 'error', 'id': None,
+             'error': 'student, assessment, and score are required'},
+        ]
+        assert (new_grade.score, new_grade.feedback) == (Decimal('90.50'), 'Great')
+        student_grade.refresh_from_db()
+        assert student_grade.score == Decimal('70.00')
+
+    def test_batch_writes_one_activity_log(
+        self, authenticated_teacher_client, course, assessment, django_capture_on_commit_callbacks
+    ):
+        """Test that the whole batch is logged as one aggregated entry"""
+        students = _create_students(course, 5, 'bl')
+        entries = {'grades': [
+            {'student': student.id, 'assessment': assessment.id, 'score': 60} for student in students
+        ]}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            authenticated_teacher_client.post('/api/grades/batch/', entries, format='json')
+
+        log = ActivityLog.objects.get(related_object_type='StudentGrade')
+        assert log.metadata == {'created': 5, 'updated': 0, 'errors': 0, 'assessment_ids': [assessment.id]}
+
+    def test_batch_defers_one_recalculation(
+        self, authenticated_teacher_client, student_user, enrollment, assessment,
+        learning_outcome_1, program_outcome_1, django_capture_on_commit_callbacks
+    ):
+        """Test that achievements are recalculated once, after commit"""
+        AssessmentLO.objects.create(assessment=assessment, learning_outcome=learning_outcome_1, weight=Decimal('1.00'))
+        LOPO.objects.create(learning_outcome=learning_outcome_1, program_outcome=program_outcome_1, weight=Decimal('1.00'))
+        entries = [{'student': student_user.id, 'assessment': assessment.id, 'score': 80}]
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            authenticated_teacher_client.post('/api/grades/batch/', entries, format='json')
+
+        assert not StudentLOAchievement.objects.exists()
+        assert len(callbacks) == 1
+        callbacks[0]()
+        lo_achievement = StudentLOAchievement.objects.get(student=student_user, learning_outcome=learning_outcome_1)
+        assert lo_achievement.current_percentage == Decimal('80.00')
+
+    def test_batch_query_count_independent_of_size(
+        self, authenticated_teacher_client, course, assessment, django_capture_on_commit_callbacks
+    ):
+        """Test that 5 and 50 entries cost the same number of queries"""
+        counts = []
+        for size, prefix in ((5, 'qa'), (50, 'qb')):
+            students = _create_students(course, size, prefix)
+            entries = [{'student': student.id, 'assessment': assessment.id, 'score': 75} for student in students]
+            with django_capture_on_commit_callbacks(execute=False):
+                with CaptureQueriesContext(connection) as queries:
+                    response = authenticated_teacher_client.post('/api/grades/batch/', entries, format='json')
+            assert response.data['created'] == size
+            counts.append(len(queries))
+
+        assert counts[0] == counts[1]
+
+    def test_batch_rejects_other_teachers_assessment(self, api_client, student_user, assessment):
+        """Test the ownership check per entry"""
+        other = User.objects.create_user(
+            username='batch_teacher', email='batch_teacher@test.com',
+            password='testpass123', role=User.Role.TEACHER
+        )
+        api_client.force_authenticate(user=other)
+
+        response = api_client.post(
+            '/api/grades/batch/', [{'student': student_user.id, 'assessment': assessment.id, 'score': 50}],
+            format='json'
+        )
+
+        assert response.data['results'][0]['error'] == "You don't have permission to grade this assessment"
+        assert not StudentGrade.objects.exists()
+
+    @pytest.mark.parametrize('body', [[], {'grades': 'x'}, [{}] * 1001])
+    def test_batch_rejects_malformed_body(self, authenticated_teacher_client, body):
+        """Test that empty, non-list and oversized batches are a 400"""
+        response = authenticated_teacher_client.post('/api/grades/batch/', body, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_students_cannot_batch_grade(self, authenticated_student_client, student_user, assessment):
+        """Test that students get a 403"""
+        response = authenticated_student_client.post(
+            '/api/grades/batch/', [{'student': student_user.id, 'assessment': assessment.id, 'score': 100}],
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.integration
+class TestAchievementRollup:
+    """Test the set-based rollup of recalculate_achievements_for_grades"""
+
+    @staticmethod
+    def _achievements():
+        return (
+            set(StudentLOAchievement.objects.values_list(
+                'student_id', 'learning_outcome_id', 'current_percentage', 'total_assessments', 'completed_assessments'
+            )),
+            set(StudentPOAchievement.objects.values_list(
+                'student_id', 'program_outcome_id', 'current_percentage', 'total_assessments', 'completed_assessments'
+            )),
+        )
+
+    def test_matches_per_row_calculation(self, course, teacher_user, program_outcome_1, program_outcome_2):
+        """Test that weights, enrollments, inactive rows and stale rows are handled like the per-row functions"""
+        other_course = Course.objects.create(
+            code='RLP200', name='Rollup', department=course.department, credits=3,
+            semester=Course.Semester.SPRING, academic_year='2024-2025', teacher=teacher_user,
+        )
+
+        def make_assessment(target, title, max_score, is_active=True):
+            return Assessment.objects.create(
+                course=target, title=title, assessment_type=Assessment.AssessmentType.QUIZ,
+                weight=Decimal('10.00'), max_score=Decimal(max_score), is_active=is_active,
+            )
+
+        def make_lo(target, code, is_active=True):
+            return LearningOutcome.objects.create(
+                course=target, code=code, title=code, target_percentage=Decimal('70.00'), is_active=is_active
+            )
+
+        quiz, project, retired = (make_assessment(course, 'Quiz', '100'), make_assessment(course, 'Project', '40'),
+                                  make_assessment(course, 'Retired', '100', is_active=False))
+        elsewhere = make_assessment(other_course, 'Elsewhere', '20')
+        lo_a, lo_b, lo_other = make_lo(course, 'RLA'), make_lo(course, 'RLB'), make_lo(other_course, 'RLC')
+        for assessment, learning_outcome, weight in (
+            (quiz, lo_a, '0.60'), (project, lo_a, '0.40'), (project, lo_b, '1.00'),
+            (retired, lo_b, '1.00'), (elsewhere, lo_other, '1.00'),
+        ):
+            AssessmentLO.objects.create(assessment=assessment, learning_outcome=learning_outcome, weight=Decimal(weight))
+        for learning_outcome, program_outcome, weight in (
+            (lo_a, program_outcome_1, '1.00'), (lo_b, program_outcome_1, '2.00'),
+            (lo_other, program_outcome_1, '1.00'), (lo_b, program_outcome_2, '1.00'),
+        ):
+            LOPO.objects.create(learning_outcome=learning_outcome, program_outcome=program_outcome, weight=Decimal(weight))
+
+        students = create_test_students(4, 'rollup')
+        Enrollment.objects.bulk_create(
+            [Enrollment(student=student, course=course) for student in students[:3]]
+            + [Enrollment(student=students[0], course=other_course)]
+        )
+        grades = StudentGrade.objects.bulk_create([
+            StudentGrade(student=student, assessment=assessment, score=Decimal(score))
+            for student, assessment, score in (
+                (students[0], quiz, '77'), (students[0], project, '31.5'), (students[0], retired, '10'),
+                (students[0], elsewhere, '13'), (students[1], quiz, '100'), (students[2], project, '0'),
+                (students[3], quiz, '50'),
+            )
+        ])
+        keys = {(grade.student_id, grade.assessment_id) for grade in grades}
+
+        def reset():
+            StudentLOAchievement.objects.all().delete()
+            StudentPOAchievement.objects.all().delete()
+            # Stale rows: one for a student no longer enrolled, one to be overwritten
+            StudentLOAchievement.objects.create(student=students[3], learning_outcome=lo_a,
+                                                current_percentage=Decimal('99.00'))
+            StudentPOAchievement.objects.create(student=students[1], program_outcome=program_outcome_1,
+                                                current_percentage=Decimal('99.00'))
+
+        reset()
+        for student in students:
+            # What the StudentGrade post_save receiver does for each of the student's grades
+            learning_outcomes = {
+                learning_outcome for grade in grades if grade.student_id == student.id
+                for learning_outcome in grade.assessment.related_los.all()
+            }
+            for learning_outcome in learning_outcomes:
+                calculate_lo_achievement(student, learning_outcome)
+            for program_outcome in ProgramOutcome.objects.filter(
+                lo_pos__learning_outcome__in=learning_outcomes
+            ).distinct():
+                calculate_po_achievement(student, program_outcome)
+        expected = self._achievements()
+
+        reset()
+        recalculate_achievements_for_grades(keys)
+
+        assert self._achievements() == expected
+        assert not StudentLOAchievement.objects.filter(student=students[3]).exists()
+
+
+# =============================================================================
+# STUDENT IMPORT TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestTemporaryPasswordHashes:
+    """Test fast hashing of temporary passwords"""
+
+    def test_hashes_upgrade_on_first_login(self, settings, db):
+        """Test that fast hashes verify and are upgraded to the default work factor"""
+        settings.PASSWORD_HASHERS = PBKDF2_HASHERS
+        [password_hash] = make_temporary_password_hashes(['a1B2c3D4e5F6'])
+        assert identify_hasher(password_hash).decode(password_hash)['iterations'] == TEMPORARY_PASSWORD_ITERATIONS
+
+        student = User.objects.create(
+            username='fast_hash', email='fast_hash@test.com', role=User.Role.STUDENT,
+            student_id='FH001', password=password_hash
+        )
+
+        assert student.check_password('a1B2c3D4e5F6')
+        student.refresh_from_db()
+        assert identify_hasher(student.password).decode(student.password)['iterations'] == get_hasher().iterations
+
+    def test_falls_back_to_default_hasher(self, db):
+        """Test that non-PBKDF2 defaults are used as-is"""
+        [password_hash] = make_temporary_password_hashes(['a1B2c3D4e5F6'])
+
+        assert identify_hasher(password_hash).algorithm == get_hasher().algorithm
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestBulkImportStudents:
+    """Test POST /api/bulk/import/students/ and /api/students/import/"""
+
+    def test_function_view_creates_and_updates(self, authenticated_institution_client, student_user):
+        """Test that new students are bulk created and existing ones updated"""
+        upload = _students_csv([
+            ('new_one@import.test', 'New', 'One', 'NEW001', 'Physics', '2'),
+            ('new_two@import.test', 'New', 'Two', '', '', ''),
+            (student_user.email, 'Renamed', '', '', '', '3'),
+            ('', 'No', 'Email', '', '', ''),
+        ])
+
+        response = authenticated_institution_client.post(
+            '/api/bulk/import/students/', {'file': upload}, format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 2
+        assert response.data['updated'] == 1
+        assert response.data['errors'] == ['Row 5: Email is required']
+        new_one = User.objects.get(email='new_one@import.test')
+        assert new_one.role == User.Role.STUDENT
+        assert new_one.year_of_study == 2
+        assert new_one.is_temporary_password
+        assert new_one.has_usable_password()
+        student_user.refresh_from_db()
+        assert student_user.first_name == 'Renamed'
+        assert student_user.year_of_study == 3
+        assert not PasswordHistory.objects.exists()
+
+    def test_service_bulk_creates(self, institution_user, django_assert_max_num_queries):
+        """Test that StudentImportService inserts students in bulk"""
+        upload = _students_csv(
+            [(f'svc_{index}@import.test', 'Svc', str(index), f'SVC{index:03d}', 'Physics', '1') for index in range(20)]
+        )
+
+        with django_assert_max_num_queries(30):
+            result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert result.success_count == 20
+        assert User.objects.filter(email__startswith='svc_').count() == 20
+        assert not PasswordHistory.objects.exists()
+
+    def test_service_emails_credentials_after_commit(self, institution_user, monkeypatch):
+        """Test that welcome emails go out once, after the import, across batches"""
+        monkeypatch.setattr('api.services.student_import_service.BATCH_SIZE', 2)
+        sent = []
+        monkeypatch.setattr(
+            'api.services.email_service.EmailService.send_html_email',
+            lambda **kwargs: sent.append(kwargs['context']),
+        )
+        upload = _students_csv(
+            [(f'mail_{index}@import.test', 'Mail', str(index), '', '', '') for index in range(5)]
+        )
+
+        result = StudentImportService(upload).import_students(created_by=institution_user, send_emails=True)
+
+        assert result.success_count == 5
+        assert sorted(context['email'] for context in sent) == [f'mail_{index}@import.test' for index in range(5)]
+        for context in sent:
+            user = User.objects.get(email=context['email'])
+            assert context['username'] == user.username
+            assert user.check_password(context['temp_password'])
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestImportJobs:
+    """Test background import jobs submitted through /api/students/import/"""
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+
+    def test_submit_and_poll(self, authenticated_institution_client, django_capture_on_commit_callbacks):
+        """Test that an upload becomes a job that is processed and can be polled"""
+        upload = _students_csv(
+            [(f'job_{index}@import.test', 'Job', str(index), f'JOB{index:03d}', 'Physics', '1') for index in range(5)]
+            + [('bad-email', 'Bad', 'Row', '', '', '')]
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_institution_client.post(
+                '/api/students/import/', {'file': upload}, format='multipart'
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['data']['status'] == ImportJob.Status.PENDING
+
+        poll = authenticated_institution_client.get(response.data['status_url'])
+
+        assert poll.status_code == status.HTTP_200_OK
+        job = poll.data['data']
+        assert job['status'] == ImportJob.Status.COMPLETED
+        assert job['total_rows'] == 6
+        assert job['processed_rows'] == 6
+        assert job['progress'] == 100.0
+        assert job['success_count'] == 5
+        assert job['error_count'] == 1
+        assert job['errors'][0]['row'] == 7
+        assert User.objects.filter(email__startswith='job_').count() == 5
+        assert not ImportJob.objects.get(pk=job['id']).file
+
+    def test_chunks_are_committed_with_progress(self, institution_user, monkeypatch):
+        """Test that jobs record progress after every chunk"""
+        monkeypatch.setattr('api.services.import_job_service.IMPORT_JOB_CHUNK_SIZE', 2)
+        progress = []
+        record_progress = ImportJobService._record_progress
+
+        def spy(job, processed, total, result):
+            progress.append(processed)
+            record_progress(job, processed, total, result)
+
+        monkeypatch.setattr(ImportJobService, '_record_progress', staticmethod(spy))
+        job = ImportJob.objects.create(
+            created_by=institution_user,
+            file=_students_csv([(f'chunk_{index}@import.test', 'C', str(index), '', '', '') for index in range(5)]),
+        )
+
+        ImportJobService.run(job.id)
+
+        job.refresh_from_db()
+        assert progress == [2, 4, 5]
+        assert job.status == ImportJob.Status.COMPLETED
+        assert job.success_count == 5
+        assert job.throughput is None or job.throughput > 0
+
+    def test_invalid_file_fails_job(self, institution_user):
+        """Test that structural problems mark the job failed"""
+        job = ImportJob.objects.create(
+            created_by=institution_user,
+            file=_students_csv([], header='name,surname'),
+        )
+
+        ImportJobService.run(job.id)
+
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.FAILED
+        assert 'Missing required columns' in job.message
+
+    def test_job_is_claimed_once(self, institution_user):
+        """Test that the job is claimed by one conditional UPDATE and a claimed job is skipped"""
+        job = ImportJob.objects.create(
+            created_by=institution_user,
+            file=_students_csv([('claim@import.test', 'Claim', 'Once', '', '', '')]),
+        )
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.Status.RUNNING)
+
+        with CaptureQueriesContext(connection) as queries:
+            ImportJobService.run(job.id)
+
+        claim = queries[0]['sql']
+        assert claim.startswith('UPDATE') and '"status" = \'pending\'' in claim
+        assert not User.objects.filter(email='claim@import.test').exists()
+        job.refresh_from_db()
+        assert job.status == ImportJob.Status.RUNNING
+        assert job.started_at is None
+
+    def test_other_users_cannot_poll(self, api_client, institution_user, teacher_user):
+        """Test that jobs are only visible to their submitter"""
+        job = ImportJob.objects.create(created_by=institution_user)
+        api_client.force_authenticate(user=teacher_user)
+
+        response = api_client.get(f'/api/students/import/jobs/{job.id}/')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+
+# =============================================================================
+# STREAMING CSV TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestStreamingCSV:
+    """Test incremental decoding of uploads"""
+
+    def test_lines_match_full_decode(self):
+        """Test that tiny chunks split multi-byte characters and CRLF safely"""
+        text = 'email,first_name\r\nayşe@test.com,Ayşe\r\n"multi\r\nline@test.com",Çağrı\rlast@test.com,Şule'
+        stream = io.BytesIO(text.encode('utf-8'))
+
+        rows = list(csv.reader(iter_decoded_lines(stream, 'utf-8', chunk_size=3)))
+
+        assert rows == list(csv.reader(io.StringIO(text, newline='')))
+        assert rows[2] == ['multi\r\nline@test.com', 'Çağrı']
+
+    def test_invalid_bytes_raise(self):
+        """Test that undecodable input surfaces as UnicodeDecodeError"""
+        stream = io.BytesIO(b'email\n\xff\xfe@test.com\n')
+
+        with pytest.raises(UnicodeDecodeError):
+            list(iter_decoded_lines(stream, 'utf-8'))
+
+    @pytest.mark.slow
+    def test_peak_memory_independent_of_row_count(self):
+        """Test that streaming 10x more rows does not mean 10x more memory"""
+        def peak(rows):
+            stream = io.BytesIO(b'email,first_name\n' + b'student@test.com,Student\n' * rows)
+            tracemalloc.start()
+            count = sum(1 for _ in csv.DictReader(iter_decoded_lines(stream, 'utf-8')))
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert count == rows
+            return peak_bytes
+
+        small_peak = peak(5000)
+        large_peak = peak(50000)
+
+        assert large_peak < small_peak * 2, f'{small_peak} B for 5000 rows, {large_peak} B for 50000 rows'
+
+
+@pytest.mark.integration
+class TestStreamingStudentImport:
+    """Test row limits and batching of streamed student imports"""
+
+    def test_service_aborts_on_row_limit(self, institution_user, monkeypatch):
+        """Test that the service stops at MAX_ROWS and rolls back"""
+        monkeypatch.setattr(student_import_service, 'MAX_ROWS', 3)
+        monkeypatch.setattr(student_import_service, 'BATCH_SIZE', 2)
+        upload = _students_csv([(f'limit_{index}@import.test', 'L', str(index), '', '', '') for index in range(5)])
+
+        with pytest.raises(StudentImportServiceError, match='Too many rows'):
+            StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert not User.objects.filter(email__startswith='limit_').exists()
+
+    def test_service_batches_rows(self, institution_user, monkeypatch):
+        """Test that rows spanning several batches are all imported"""
+        monkeypatch.setattr(student_import_service, 'BATCH_SIZE', 2)
+        upload = _students_csv([(f'batch_{index}@import.test', 'B', str(index), '', '', '') for index in range(5)])
+
+        result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert result.success_count == 5
+        assert User.objects.filter(email__startswith='batch_').count() == 5
+
+    def test_view_aborts_on_row_limit(self, authenticated_institution_client, monkeypatch):
+        """Test that bulk_import_students rejects files over the row limit"""
+        monkeypatch.setattr(bulk_operations, 'MAX_CSV_ROWS', 3)
+        monkeypatch.setattr(bulk_operations, 'STUDENT_BATCH_SIZE', 2)
+        upload = _students_csv([(f'vlimit_{index}@import.test', 'V', str(index), '', '', '') for index in range(5)])
+
+        response = authenticated_institution_client.post(
+            '/api/bulk/import/students/', {'file': upload}, format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not User.objects.filter(email__startswith='vlimit_').exists()
+
+    def test_view_keeps_only_credentials(self, authenticated_institution_client, monkeypatch):
+        """Test that only (username, email, name, id, password) tuples reach the emails"""
+        monkeypatch.setattr(bulk_operations, 'STUDENT_BATCH_SIZE', 2)
+        sent = []
+        monkeypatch.setattr(bulk_operations, '_send_student_credentials', sent.append)
+        upload = _students_csv([(f'mail_{index}@import.test', 'M', str(index), '', '', '') for index in range(3)])
+
+        response = authenticated_institution_client.post(
+            '/api/bulk/import/students/', {'file': upload}, format='multipart'
+        )
+
+        assert response.data['created'] == 3
+        assert [credentials.email for credentials in sent] == [f'mail_{index}@import.test' for index in range(3)]
+        assert all(isinstance(credentials, tuple) and credentials.temp_password for credentials in sent)
+
+    def test_view_rejects_non_utf8(self, authenticated_institution_client):
+        """Test that bulk_import_students still requires UTF-8"""
+        upload = SimpleUploadedFile(
+            'students.csv', 'email,first_name,last_name\nçiğdem@test.com,Çiğdem,Ş\n'.encode('cp1254'),
+            content_type='text/csv'
+        )
+
+        response = authenticated_institution_client.post(
+            '/api/bulk/import/students/', {'file': upload}, format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'UTF-8' in response.data['error']['message']
+
+
+@pytest.mark.unit
+class TestEncodingDetection:
+    """Test sample-based encoding detection for student uploads"""
+
+    @pytest.mark.parametrize('sample,expected', [
+        ('\ufeffemail,ad\n'.encode('utf-8'), 'utf-8-sig'),
+        ('email,ad\n'.encode('utf-16'), 'utf-16'),
+        ('email,ad\nçiğdem@test.com,Çiğdem\n'.encode('utf-8'), 'utf-8'),
+        ('email,ad\nşule@test.com,Şule Işık\n'.encode('cp1254'), 'cp1254'),
+        ('email,ad\nrene@test.com,René Müller\n'.encode('cp1252'), 'cp1252'),
+        (b'email,ad\nx@test.com,\x81\xfd\n', 'latin-1'),
+    ])
+    def test_detect_encoding(self, sample, expected):
+        """Test BOM sniffing, UTF-8 validity and the Turkish byte heuristics"""
+        assert detect_encoding(sample) == expected
+
+    def test_truncated_utf8_sequence_at_sample_end(self):
+        """Test that a multi-byte character cut off by the sample is still UTF-8"""
+        sample = 'ad,soyad\nAyşe,Yılmaz ğ'.encode('utf-8')[:-1]
+
+        assert detect_encoding(sample) == 'utf-8'
+
+    def test_detection_reads_only_the_sample(self, monkeypatch):
+        """Test that detection reads one bounded prefix of the upload"""
+        monkeypatch.setattr(student_import_service, 'ENCODING_SAMPLE_SIZE', 16)
+        upload = io.BytesIO(('email,first_name,last_name\n' + 'a@b.co,Ş,Ğ\n' * 100).encode('cp1254'))
+        reads = []
+        original_read = upload.read
+        monkeypatch.setattr(upload, 'read', lambda size=-1: reads.append(size) or original_read(size))
+
+        assert StudentImportService(upload)._detect_encoding() == 'utf-8'
+        assert reads == [16]
+
+    def test_service_imports_cp1254_file(self, institution_user):
+        """Test that a Turkish Excel export is decoded with cp1254"""
+        upload = SimpleUploadedFile(
+            'students.csv',
+            'email,first_name,last_name\nsule_enc@import.test,Şule,Işık\n'.encode('cp1254'),
+            content_type='text/csv'
+        )
+
+        result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert result.success_count == 1
+        student = User.objects.get(email='sule_enc@import.test')
+        assert (student.first_name, student.last_name) == ('Şule', 'Işık')
+
+    def test_cp1254_bytes_after_ascii_sample_import(self, institution_user, monkeypatch):
+        """Test that an all-ASCII sample does not lock a Turkish Excel file into UTF-8"""
+        monkeypatch.setattr(student_import_service, 'ENCODING_SAMPLE_SIZE', 64)
+        content = 'email,first_name,last_name\n'.encode('utf-8')
+        content += b''.join(f'late_{index}@import.test,A,B\n'.encode('utf-8') for index in range(5))
+        content += 'late_x@import.test,Şule,Işık\n'.encode('cp1254')
+        upload = SimpleUploadedFile('students.csv', content, content_type='text/csv')
+
+        result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert result.success_count == 6
+        student = User.objects.get(email='late_x@import.test')
+        assert (student.first_name, student.last_name) == ('Şule', 'Işık')
+
+    def test_fallback_switches_codec_between_chunks(self):
+        """Test that the chunk UTF-8 rejects and everything after it use the fallback codec"""
+        stream = io.BytesIO(b'ascii,row\n' * 4 + 'Şule,Işık\n'.encode('cp1254'))
+
+        lines = list(iter_decoded_lines(stream, 'utf-8', chunk_size=7, fallback=detect_encoding))
+
+        assert lines[-1] == 'Şule,Işık\n'
+        assert len(lines) == 5
+
+    def test_invalid_bytes_after_utf8_text_fail_cleanly(self, institution_user, monkeypatch):
+        """Test that cp1254 bytes after real UTF-8 text still abort the import"""
+        monkeypatch.setattr(student_import_service, 'ENCODING_SAMPLE_SIZE', 64)
+        content = 'email,first_name,last_name\nmixed_1@import.test,Çiğdem,B\n'.encode('utf-8')
+        content += 'mixed_2@import.test,Şule,Işık\n'.encode('cp1254')
+        upload = SimpleUploadedFile('students.csv', content, content_type='text/csv')
+
+        with pytest.raises(StudentImportServiceError, match='utf-8'):
+            StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert not User.objects.filter(email__startswith='mixed_').exists()
+
+
+@pytest.mark.integration
+class TestImportDuplicateDetection:
+    """Test duplicate detection scoped to the uploaded rows"""
+
+    def test_lookups_only_cover_upload_values(self, institution_user):
+        """Test that duplicate queries are IN lookups on the file's values, not table scans"""
+        User.objects.bulk_create([
+            User(username=f'bystander_{index}', email=f'bystander_{index}@import.test')
+            for index in range(50)
+        ])
+        upload = _students_csv(
+            [(f'scope_{index}@import.test', 'S', str(index), f'SCOPE{index}', '', '') for index in range(3)]
+            + [('scope_new@import.test', 'S', 'New', '', '', '')]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        assert result.success_count == 4
+        lookups = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "users"' in query['sql']
+        ]
+        assert lookups
+        assert all(' IN (' in sql for sql in lookups)
+        assert User.objects.get(email='scope_new@import.test').student_id
+
+    def test_existing_and_repeated_values_are_reported(self, institution_user, student_user):
+        """Test duplicates against the database and within the file"""
+        upload = _students_csv([
+            (student_user.email, 'Dup', 'Email', '', '', ''),
+            ('dup_id@import.test', 'Dup', 'Db', student_user.student_id, '', ''),
+            ('dup_a@import.test', 'Dup', 'A', 'DUPFILE1', '', ''),
+            ('dup_b@import.test', 'Dup', 'B', 'DUPFILE1', '', ''),
+            ('dup_a@import.test', 'Dup', 'Again', '', '', ''),
+        ])
+
+        result = StudentImportService(upload).import_students(created_by=institution_user)
+
+        messages = {error.row: error.message for error in result.errors}
+        assert result.success_count == 1
+        assert result.skipped_count == 2
+        assert messages[2] == 'Email already exists (skipped)'
+        assert messages[3] == f"Student ID '{student_user.student_id}' already exists in database"
+        assert messages[5] == "Student ID 'DUPFILE1' already exists in this import"
+        assert messages[6] == 'Email already exists (skipped)'
+
+    def test_lookups_are_chunked(self, institution_user, monkeypatch):
+        """Test that lookups split large value sets into several IN queries"""
+        monkeypatch.setattr(student_import_service, 'LOOKUP_CHUNK_SIZE', 2)
+        service = StudentImportService(io.BytesIO(b''))
+
+        with CaptureQueriesContext(connection) as queries:
+            existing = service._find_existing('email', {institution_user.email, 'a@x.co', 'b@x.co', 'c@x.co', 'd@x.co'})
+
+        assert existing == {institution_user.email}
+        assert len(queries.captured_queries) == 3
+
+    def test_generated_ids_skip_taken_ones(self, institution_user, monkeypatch):
+        """Test that generated student IDs avoid IDs already in the database"""
+        year = student_import_service.datetime.now().year
+        User.objects.create(username='taken_id', email='taken_id@import.test', student_id=f'{year}1000')
+        draws = iter([0, 1, 2])
+        monkeypatch.setattr(student_import_service.secrets, 'randbelow', lambda _: next(draws))
+        service = StudentImportService(io.BytesIO(b''))
+
+        service._reserve_student_ids(2)
+
+        assert sorted(service._student_id_pool) == [f'{year}1001', f'{year}1002']
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestImportDryRun:
+    """Test ?dry_run=true on the grade and student import endpoints"""
+
+    @staticmethod
+    def _writes(queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].split(' ', 1)[0] in ('INSERT', 'UPDATE', 'DELETE', 'SAVEPOINT')
+        ]
+
+    def test_grades_dry_run_counts_without_writing(
+        self, authenticated_teacher_client, student_user, assessment, student_grade
+    ):
+        """Test that a grade dry run reports would-create/update counts and errors only"""
+        User.objects.create_user(
+            username='dry_other', email='dry_other@test.com',
+            password='testpass123', role=User.Role.STUDENT, student_id='DRY001'
+        )
+        upload = _grades_csv([
+            (student_user.student_id, assessment.id, '70', ''),
+            ('DRY001', assessment.id, '90', ''),
+            ('DRY001', assessment.id, '95', ''),
+            ('UNKNOWN', assessment.id, '50', ''),
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_teacher_client.post(
+                '/api/bulk/import/grades/?dry_run=true', {'file': upload}, format='multipart'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['dry_run'] is True
+        assert (response.data['created'], response.data['updated']) == (1, 1)
+        assert response.data['errors'] == ['Row 5: Student with ID UNKNOWN not found']
+        assert self._writes(queries) == []
+        student_grade.refresh_from_db()
+        assert student_grade.score == Decimal('85.00')
+        assert StudentGrade.objects.count() == 1
+
+    def test_grades_dry_run_10k_rows(self, authenticated_teacher_client, student_user, assessment):
+        """Test that a 10k-row dry run stays at a constant handful of queries"""
+        upload = _grades_csv([(student_user.student_id, assessment.id, str(index % 100), '') for index in range(10000)])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_teacher_client.post(
+                '/api/bulk/import/grades/?dry_run=true', {'file': upload}, format='multipart'
+            )
+
+        assert (response.data['created'], response.data['errors']) == (1, None)
+        assert len(queries) <= 10
+
+    def test_students_dry_run_counts_without_writing(self, authenticated_institution_client, student_user):
+        """Test the function view dry run, including student ID conflicts"""
+        upload = _students_csv([
+            (student_user.email, 'Up', 'Dated', '', '', ''),
+            ('dry_new@import.test', 'New', 'One', 'DRYNEW1', '', ''),
+            ('dry_taken@import.test', 'Taken', 'Id', student_user.student_id, '', ''),
+            ('dry_repeat@import.test', 'Repeat', 'Id', 'DRYNEW1', '', ''),
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_institution_client.post(
+                '/api/bulk/import/students/?dry_run=true', {'file': upload}, format='multipart'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['created'], response.data['updated']) == (1, 1)
+        assert response.data['errors'] == [
+            f'Row 4: Student ID {student_user.student_id} already exists',
+            'Row 5: Student ID DRYNEW1 already exists',
+        ]
+        assert self._writes(queries) == []
+        assert not User.objects.filter(email__startswith='dry_').exists()
+
+    def test_students_dry_run_matches_import_across_batches(self, authenticated_institution_client, monkeypatch):
+        """Test that an email repeated in a later batch is a would-update, as in the real import"""
+        monkeypatch.setattr(bulk_operations, 'STUDENT_BATCH_SIZE', 2)
+        rows = [
+            ('span_a@import.test', 'A', 'One', 'SPANA', '', ''),
+            ('span_b@import.test', 'B', 'One', '', '', ''),
+            ('span_c@import.test', 'C', 'One', '', '', ''),
+            ('span_a@import.test', 'A', 'Two', 'SPANA', '', ''),
+            ('span_b@import.test', 'B', 'Two', '', '', ''),
+        ]
+
+        def run(query):
+            response = authenticated_institution_client.post(
+                f'/api/bulk/import/students/{query}', {'file': _students_csv(rows)}, format='multipart'
+            )
+            return response.data['created'], response.data['updated'], response.data['errors']
+
+        dry = run('?dry_run=true')
+        assert not User.objects.filter(email__startswith='span_').exists()
+        assert dry == run('') == (3, 2, None)
+
+    def test_students_import_reports_taken_student_id(self, authenticated_institution_client, student_user):
+        """Test that a real import reports a taken student ID instead of failing"""
+        upload = _students_csv([
+            ('taken_ok@import.test', 'Ok', 'One', 'TAKENOK1', '', ''),
+            ('taken_dup@import.test', 'Dup', 'Id', student_user.student_id, '', ''),
+        ])
+
+        response = authenticated_institution_client.post(
+            '/api/bulk/import/students/', {'file': upload}, format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 1
+        assert response.data['errors'] == [f'Row 3: Student ID {student_user.student_id} already exists']
+
+    def test_class_view_dry_run_is_synchronous(self, authenticated_institution_client, student_user):
+        """Test that the job-based view validates inline and submits no job"""
+        upload = _students_csv([
+            (student_user.email, 'Skip', 'Me', '', '', ''),
+            ('dry_class@import.test', 'Dry', 'Class', 'DRYCLS1', '', ''),
+            ('dry_class@import.test', 'Dry', 'Again', '', '', ''),
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_institution_client.post(
+                '/api/students/import/?dry_run=true', {'file': upload}, format='multipart'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['dry_run'] is True
+        assert response.data['data']['success_count'] == 1
+        assert response.data['data']['skipped_count'] == 2
+        assert self._writes(queries) == []
+        assert not ImportJob.objects.exists()
+        assert not User.objects.filter(email='dry_class@import.test').exists()
+
+    def test_class_view_dry_run_rejects_bad_header(self, authenticated_institution_client):
+        """Test that structural problems surface as a validation error"""
+        upload = _students_csv([('x@import.test',)], header='email')
+
+        response = authenticated_institution_client.post(
+            '/api/students/import/?dry_run=true', {'file': upload}, format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'Missing required columns' in response.data['error']['message']
@@ -0,0 +1,107 @@
+"""
+Response Compression Tests - Pytest Version
+
+Tests for CompressionMiddleware in api/middleware.py: the size threshold,
+gzip and brotli encoding of regular and streamed responses, and skipping
+payloads that are already compressed.
+"""
+
+import gzip
+
+import pytest
+from rest_framework import status
+
+from api.middleware import BROTLI_AVAILABLE
+from api.models import Course, StudentGrade
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+
+def _body(response):
+    """Return the raw (still encoded) response body."""
+    if response.streaming:
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+@pytest.fixture
+def large_course_list(authenticated_teacher_client, course, teacher_user, department):
+    """Enough courses for /api/courses/ to pass the compression threshold."""
+    Course.objects.bulk_create([
+        Course(
+            code=f'CMP{index:03d}', name=f'Compressible Course {index}', department=department.name,
+            teacher=teacher_user, credits=3, semester=Course.Semester.FALL, academic_year='2024-2025',
+        )
+        for index in range(40)
+    ])
+    return authenticated_teacher_client
+
+
+# =============================================================================
+# COMPRESSION TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestCompressionMiddleware:
+    """Test gzip/brotli response compression"""
+
+    def test_large_json_is_gzipped(self, large_course_list):
+        """Test that a large API response is gzipped and decodes to the same JSON"""
+        plain = large_course_list.get('/api/courses/')
+
+        response = large_course_list.get('/api/courses/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert gzip.decompress(_body(response)) == plain.content
+        assert len(_body(response)) < len(plain.content) / 3
+
+    def test_small_response_is_not_compressed(self, settings, authenticated_teacher_client, course):
+        """Test that responses under COMPRESSION_MIN_SIZE are sent as is"""
+        settings.COMPRESSION_MIN_SIZE = 10 * 1024
+
+        response = authenticated_teacher_client.get(f'/api/courses/{course.id}/', HTTP_ACCEPT_ENCODING='gzip')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.has_header('Content-Encoding')
+
+    def test_streamed_json_is_gzipped(self, settings, large_course_list, assessment, student_user):
+        """Test that streamed lists are compressed chunk by chunk"""
+        settings.STREAMING_JSON_MIN_ITEMS = 1
+        StudentGrade.objects.create(student=student_user, assessment=assessment, score=50)
+        plain = large_course_list.get('/api/grades/')
+
+        response = large_course_list.get('/api/grades/', HTTP_ACCEPT_ENCODING='gzip')
+
+        assert response.streaming
+        assert response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(_body(response)) == _body(plain)
+
+    def test_gzip_export_is_not_compressed_twice(self, authenticated_teacher_client, student_grade):
+        """Test that application/gzip downloads keep their own encoding"""
+        response = authenticated_teacher_client.get(
+            '/api/bulk/export/grades/?compress=gzip', HTTP_ACCEPT_ENCODING='gzip'
+        )
+
+        assert response['Content-Type'] == 'application/gzip'
+        assert not response.has_header('Content-Encoding')
+        assert gzip.decompress(_body(response)).startswith(b'Student ID')
+
+    @pytest.mark.skipif(not BROTLI_AVAILABLE, reason='brotli is not installed')
+    def test_brotli_is_preferred(self, large_course_list):
+        """Test that clients accepting br get brotli"""
+        plain = large_course_list.get('/api/courses/')
+
+        response = large_course_list.get('/api/courses/', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        assert response['Content-Encoding'] == 'br'
+        assert brotli.decompress(_body(response)) == plain.content
+
+    @pytest.mark.skipif(BROTLI_AVAILABLE, reason='brotli is installed')
+    def test_gzip_without_brotli(self, large_course_list):
+        """Test that br-capable clients fall back to gzip when brotli is missing"""
+        response = large_course_list.get('/api/courses/', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        assert response['Content-Encoding'] == 'gzip'
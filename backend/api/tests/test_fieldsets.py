@@ -0,0 +1,179 @@
+"""
+Sparse Fieldset Tests - Pytest Version
+
+Tests for ?fields= / ?expand= in api/fieldsets.py and the queryset
+optimizer behind them.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.fieldsets import parse_field_spec
+from api.models import Enrollment, StudentGrade, StudentLOAchievement
+from api.tests.utils import create_test_students
+
+
+# =============================================================================
+# FIELD SELECTION TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestSparseFieldsets:
+    """Test that ?fields= trims responses and the queries behind them"""
+
+    def test_default_response_is_unchanged(self, authenticated_teacher_client, course):
+        """Test that without parameters every field is returned"""
+        response = authenticated_teacher_client.get(f'/api/courses/{course.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {'teacher_name', 'program_outcomes', 'learning_outcomes', 'enrollments',
+                'enrollment_count'} <= set(response.data)
+        assert response.data['teacher'] == course.teacher_id
+
+    def test_list_returns_requested_fields(self, authenticated_teacher_client, course):
+        """Test that list items only carry the requested fields"""
+        response = authenticated_teacher_client.get('/api/courses/?fields=id,code,teacher_name')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{
+            'id': course.id,
+            'code': course.code,
+            'teacher_name': course.teacher.get_full_name() or course.teacher.username,
+        }]
+
+    def test_unrequested_relations_are_not_queried(self, authenticated_teacher_client, course):
+        """Test that a sparse course detail skips PO, LO and enrollment queries"""
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, course=course) for student in create_test_students(5, 'sparse')
+        ])
+
+        with CaptureQueriesContext(connection) as full:
+            authenticated_teacher_client.get(f'/api/courses/{course.id}/')
+        with CaptureQueriesContext(connection) as sparse:
+            response = authenticated_teacher_client.get(f'/api/courses/{course.id}/?fields=id,code,name')
+
+        assert set(response.data) == {'id', 'code', 'name'}
+        assert len(sparse) < len(full)
+        sql = ' '.join(query['sql'] for query in sparse.captured_queries)
+        for table in ('"enrollments"', '"course_pos"', '"learning_outcomes"'):
+            assert table not in sql
+
+    def test_nested_fields_are_selected_with_dots(self, authenticated_teacher_client, course):
+        """Test that program_outcomes.po_code trims the nested PO mappings"""
+        response = authenticated_teacher_client.get(
+            f'/api/courses/{course.id}/?fields=id,program_outcomes.po_code'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'id', 'program_outcomes'}
+        assert response.data['program_outcomes'] == [
+            {'po_code': mapping.program_outcome.code} for mapping in course.course_pos.all()
+        ]
+
+    def test_sparse_list_restricts_columns(self, authenticated_teacher_client, learning_outcome_1):
+        """Test that LO achievements only select the requested columns, without joins"""
+        StudentLOAchievement.objects.bulk_create([
+            StudentLOAchievement(student=student, learning_outcome=learning_outcome_1,
+                                 current_percentage=Decimal('60.00'))
+            for student in create_test_students(4, 'cols')
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_teacher_client.get('/api/lo-achievements/?fields=id,current_percentage')
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        assert len(results) == 4
+        assert all(set(item) == {'id', 'current_percentage'} for item in results)
+        select = next(q['sql'] for q in queries.captured_queries if 'FROM "student_lo_achievements"' in q['sql'])
+        assert 'last_calculated' not in select.split(' FROM ')[0]
+        assert '"learning_outcomes"."title"' not in select
+
+    def test_hinted_method_fields_stay_constant(self, authenticated_teacher_client, assessment):
+        """Test that a sparse grade list with percentage does not query per row"""
+        StudentGrade.objects.bulk_create([
+            StudentGrade(student=student, assessment=assessment, score=Decimal('50.00'))
+            for student in create_test_students(6, 'pct')
+        ])
+        url = f'/api/grades/?assessment={assessment.id}&fields=id,percentage'
+
+        with CaptureQueriesContext(connection) as six:
+            response = authenticated_teacher_client.get(url)
+        StudentGrade.objects.bulk_create([
+            StudentGrade(student=student, assessment=assessment, score=Decimal('50.00'))
+            for student in create_test_students(6, 'pct2')
+        ])
+        with CaptureQueriesContext(connection) as twelve:
+            authenticated_teacher_client.get(url)
+
+        assert response.data[0] == {'id': response.data[0]['id'], 'percentage': 50.0}
+        assert len(twelve) == len(six)
+
+    def test_write_requests_ignore_fields(self, authenticated_teacher_client, course):
+        """Test that ?fields= never drops input fields of a write"""
+        response = authenticated_teacher_client.patch(
+            f'/api/courses/{course.id}/?fields=id', {'name': 'Renamed'}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        course.refresh_from_db()
+        assert course.name == 'Renamed'
+        assert 'code' in response.data
+
+
+# =============================================================================
+# EXPANSION TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestExpandableFields:
+    """Test that ?expand= nests related objects"""
+
+    def test_expand_replaces_primary_key(self, authenticated_teacher_client, course):
+        """Test that ?expand=teacher nests the teacher"""
+        response = authenticated_teacher_client.get(f'/api/courses/?expand=teacher&fields=id,teacher')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['teacher']['id'] == course.teacher_id
+        assert response.data[0]['teacher']['username'] == course.teacher.username
+
+    def test_expanded_fields_can_be_trimmed(self, authenticated_teacher_client, enrollment):
+        """Test that dotted ?fields= apply to an expanded relation"""
+        response = authenticated_teacher_client.get(
+            '/api/enrollments/?expand=course&fields=id,course.code,course.teacher_name'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['course'] == {
+            'code': enrollment.course.code,
+            'teacher_name': enrollment.course.teacher.get_full_name() or enrollment.course.teacher.username,
+        }
+
+    def test_unknown_names_are_ignored(self, authenticated_teacher_client, course):
+        """Test that unknown fields and expansions do not fail the request"""
+        response = authenticated_teacher_client.get('/api/courses/?fields=id,nope&expand=nope')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'id': course.id}]
+
+
+# =============================================================================
+# UNIT TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestFieldSpec:
+    """Test parsing of the fields/expand parameters"""
+
+    def test_parse_nested_spec(self):
+        """Test that dotted names become nested specs"""
+        assert parse_field_spec('id, course.code,course.name,,') == {
+            'id': {}, 'course': {'code': {}, 'name': {}},
+        }
+        assert parse_field_spec(None) == {}
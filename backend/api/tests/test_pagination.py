@@ -0,0 +1,225 @@
+"""
+Keyset Pagination Tests - Pytest Version
+
+Tests for the opt-in cursor pagination in api/pagination.py on the list
+endpoints and the super admin activity log.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import ActivityLog, Assessment, StudentGrade, User
+from api.pagination import KeysetPagination
+from api.tests.utils import create_test_students
+
+
+def _seed_grades(assessment, count):
+    """Create `count` graded students; grades share timestamps in pairs to force ties."""
+    students = create_test_students(count, 'page')
+    grades = StudentGrade.objects.bulk_create([
+        StudentGrade(student=student, assessment=assessment, score=Decimal(index % 100))
+        for index, student in enumerate(students)
+    ])
+    base = timezone.now()
+    for index, grade in enumerate(grades):
+        StudentGrade.objects.filter(pk=grade.pk).update(graded_at=base - timedelta(seconds=index // 2))
+    return grades
+
+
+def _walk(client, url, page_size):
+    """Follow `next` links from the first page; return the pages' id lists."""
+    pages = []
+    separator = '&' if '?' in url else '?'
+    response = client.get(f'{url}{separator}page_size={page_size}')
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([item['id'] for item in response.data['results']])
+        if not response.data['next']:
+            return pages
+        response = client.get(response.data['next'])
+
+
+# =============================================================================
+# LIST ENDPOINT TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestKeysetPagination:
+    """Test keyset pages on the viewset list endpoints"""
+
+    def test_list_without_params_is_unpaginated(self, authenticated_teacher_client, assessment):
+        """Test that the plain list response is unchanged"""
+        _seed_grades(assessment, 5)
+
+        response = authenticated_teacher_client.get('/api/grades/', {'assessment': assessment.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data, list)
+        assert len(response.data) == 5
+
+    def test_pages_cover_list_once_in_order(self, authenticated_teacher_client, assessment):
+        """Test that walking the cursors yields the full list, ties broken by id"""
+        _seed_grades(assessment, 23)
+        url = f'/api/grades/?assessment={assessment.id}'
+        expected = list(StudentGrade.objects.filter(
+            assessment=assessment
+        ).order_by('-graded_at', '-id').values_list('id', flat=True))
+
+        pages = _walk(authenticated_teacher_client, url, 5)
+
+        assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+        assert [grade_id for page in pages for grade_id in page] == expected
+
+    def test_pages_follow_requested_ordering(self, authenticated_teacher_client, assessment):
+        """Test that ?ordering= is honoured and ties are broken by id"""
+        _seed_grades(assessment, 12)
+        url = f'/api/grades/?assessment={assessment.id}&ordering=score'
+
+        pages = _walk(authenticated_teacher_client, url, 4)
+
+        ids = [grade_id for page in pages for grade_id in page]
+        expected = list(StudentGrade.objects.filter(
+            assessment=assessment
+        ).order_by('score', 'id').values_list('id', flat=True))
+        assert ids == expected
+
+    def test_nullable_key_pages_match_list(self, authenticated_teacher_client, course):
+        """Test that assessments without due dates are paged like the list orders them"""
+        now = timezone.now()
+        for index in range(9):
+            Assessment.objects.create(
+                course=course,
+                title=f'Paged {index}',
+                assessment_type=Assessment.AssessmentType.QUIZ,
+                weight=Decimal('5.00'),
+                max_score=Decimal('100.00'),
+                due_date=None if index % 3 == 0 else now + timedelta(days=index % 4),
+            )
+
+        ascending = list(Assessment.objects.filter(course=course).order_by(
+            F('due_date').asc(nulls_last=True), 'id'
+        ).values_list('id', flat=True))
+        descending = list(Assessment.objects.filter(course=course).order_by(
+            F('due_date').desc(nulls_first=True), '-id'
+        ).values_list('id', flat=True))
+
+        for ordering, expected in (('due_date', ascending), ('-due_date', descending)):
+            pages = _walk(authenticated_teacher_client, f'/api/assessments/?course={course.id}&ordering={ordering}', 2)
+            assert [assessment_id for page in pages for assessment_id in page] == expected
+
+    def test_later_pages_cost_the_same(self, authenticated_teacher_client, assessment):
+        """Test that a deep page runs the same queries as the first one"""
+        _seed_grades(assessment, 40)
+        url = f'/api/grades/?assessment={assessment.id}'
+        first = authenticated_teacher_client.get(url, {'page_size': 5})
+        cursor = first.data['next']
+        for _ in range(5):
+            cursor = authenticated_teacher_client.get(cursor).data['next']
+
+        with CaptureQueriesContext(connection) as first_page:
+            authenticated_teacher_client.get(url, {'page_size': 5})
+        with CaptureQueriesContext(connection) as deep_page:
+            response = authenticated_teacher_client.get(cursor)
+
+        assert len(response.data['results']) == 5
+        assert len(deep_page) == len(first_page)
+        assert not any('OFFSET' in query['sql'] for query in deep_page.captured_queries)
+
+    def test_invalid_cursor_is_rejected(self, authenticated_teacher_client, assessment):
+        """Test that garbage cursors are answered with 404"""
+        response = authenticated_teacher_client.get('/api/grades/', {'cursor': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_is_bound_to_ordering(self, authenticated_teacher_client, assessment):
+        """Test that a cursor cannot be replayed against another ordering"""
+        _seed_grades(assessment, 6)
+        next_link = authenticated_teacher_client.get(
+            '/api/grades/', {'assessment': assessment.id, 'page_size': 2}
+        ).data['next']
+
+        response = authenticated_teacher_client.get(next_link + '&ordering=score')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+# =============================================================================
+# ACTIVITY LOG TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestActivityLogKeysetPagination:
+    """Test keyset pages on the super admin activity log"""
+
+    @pytest.fixture
+    def superuser_client(self, db, api_client, unique_id):
+        admin = User.objects.create_superuser(
+            username=f'root_{unique_id}',
+            email=f'root_{unique_id}@test.com',
+            password='testpass123'
+        )
+        api_client.force_authenticate(user=admin)
+        return api_client
+
+    def test_logs_are_paged_by_cursor(self, superuser_client):
+        """Test that following cursors returns every log once, newest first"""
+        ActivityLog.objects.all().delete()
+        logs = ActivityLog.objects.bulk_create([
+            ActivityLog(action_type=ActivityLog.ActionType.LOGIN, description=f'Login {index}')
+            for index in range(11)
+        ])
+        ActivityLog.objects.update(created_at=timezone.now())
+
+        seen = []
+        response = superuser_client.get('/api/super-admin/activity-logs/', {'page_size': 4})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(log['id'] for log in response.data['logs'])
+            if not response.data['next']:
+                break
+            response = superuser_client.get(response.data['next'])
+
+        assert seen == sorted((log.id for log in logs), reverse=True)
+
+    def test_limit_still_applies_without_cursor(self, superuser_client):
+        """Test that the legacy ?limit= response is unchanged"""
+        ActivityLog.objects.bulk_create([
+            ActivityLog(action_type=ActivityLog.ActionType.LOGIN, description=f'Login {index}')
+            for index in range(5)
+        ])
+
+        response = superuser_client.get('/api/super-admin/activity-logs/', {'limit': 3})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert 'next' not in response.data
+
+
+# =============================================================================
+# UNIT TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestKeysetCursor:
+    """Test cursor encoding round trips"""
+
+    def test_cursor_round_trip_keeps_microseconds(self, db):
+        """Test that datetimes survive the cursor at full precision"""
+        paginator = KeysetPagination()
+        keys = paginator.get_ordering(StudentGrade.objects.order_by('-graded_at'))
+        graded_at = timezone.now().replace(microsecond=123456)
+        signature = ['-graded_at', '-id']
+
+        cursor = paginator.encode_cursor([graded_at, 42], signature)
+
+        assert [key.path for key in keys] == ['graded_at', 'id']
+        assert paginator.decode_cursor(cursor, keys, signature) == [graded_at, 42]
@@ -0,0 +1,163 @@
+"""
+Projection Serializer Tests - Pytest Version
+
+Tests that the values()-based projections in api/serializers/projection.py
+emit exactly what the matching ModelSerializers emit, plus a 10k row
+throughput benchmark.
+"""
+
+import time
+from decimal import Decimal
+
+import pytest
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Assessment, StudentGrade, StudentLOAchievement
+from api.serializers import (
+    StudentGradeProjection, StudentGradeSerializer,
+    StudentLOAchievementProjection, StudentLOAchievementSerializer,
+)
+from api.tests.utils import create_test_students
+
+
+def _render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def mixed_grades(db, assessment, course):
+    """Grades that exercise blank names, empty feedback, zero max score and odd decimals."""
+    unscored = Assessment.objects.create(
+        course=course, title='Ungraded', assessment_type=Assessment.AssessmentType.PROJECT,
+        weight=Decimal('0.00'), max_score=Decimal('0.00'),
+    )
+    named = create_test_students(3, 'named', first_name='Ada', last_name='Lovelace')
+    blank = create_test_students(2, 'blank')
+    StudentGrade.objects.bulk_create(
+        [StudentGrade(student=student, assessment=assessment, score=Decimal('33.33'), feedback='ok')
+         for student in named]
+        + [StudentGrade(student=student, assessment=unscored, score=Decimal('0.00'))
+           for student in blank]
+    )
+    return StudentGrade.objects.order_by('id')
+
+
+# =============================================================================
+# EQUIVALENCE TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestProjectionEquivalence:
+    """Test that projections render the same JSON as the ModelSerializers"""
+
+    def test_grade_projection_matches_serializer(self, mixed_grades):
+        """Test StudentGradeProjection against StudentGradeSerializer"""
+        expected = StudentGradeSerializer(mixed_grades, many=True).data
+        projected = StudentGradeProjection(mixed_grades).data
+
+        assert [list(item) for item in projected] == [list(item) for item in expected]
+        assert _render(projected) == _render(expected)
+
+    def test_lo_achievement_projection_matches_serializer(self, learning_outcome_1):
+        """Test StudentLOAchievementProjection against StudentLOAchievementSerializer"""
+        students = create_test_students(3, 'lo', first_name='Grace')
+        StudentLOAchievement.objects.bulk_create([
+            StudentLOAchievement(student=students[0], learning_outcome=learning_outcome_1,
+                                 current_percentage=Decimal('80.00'),
+                                 total_assessments=3, completed_assessments=2),
+            StudentLOAchievement(student=students[1], learning_outcome=learning_outcome_1,
+                                 current_percentage=Decimal('75.00'),
+                                 total_assessments=0, completed_assessments=0),
+            StudentLOAchievement(student=students[2], learning_outcome=learning_outcome_1,
+                                 current_percentage=Decimal('12.50'),
+                                 total_assessments=7, completed_assessments=7),
+        ])
+        achievements = StudentLOAchievement.objects.order_by('id')
+
+        expected = StudentLOAchievementSerializer(achievements, many=True).data
+        projected = StudentLOAchievementProjection(achievements).data
+
+        assert [list(item) for item in projected] == [list(item) for item in expected]
+        assert _render(projected) == _render(expected)
+
+    def test_projection_honours_field_subset(self, mixed_grades):
+        """Test that a field subset keeps declaration order"""
+        projected = StudentGradeProjection(mixed_grades, fields={'score', 'id'}).data
+
+        assert list(projected[0]) == ['id', 'score']
+
+
+# =============================================================================
+# ENDPOINT TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestProjectedEndpoints:
+    """Test the endpoints that serve projections"""
+
+    def test_grade_list_is_unchanged(self, authenticated_teacher_client, mixed_grades, course):
+        """Test that /api/grades/ returns the serializer's output"""
+        response = authenticated_teacher_client.get('/api/grades/')
+
+        assert response.status_code == status.HTTP_200_OK
+        ordered = mixed_grades.filter(assessment__course=course).order_by('-graded_at')
+        assert response.content == _render(StudentGradeSerializer(ordered, many=True).data)
+
+    def test_grade_list_expand_uses_serializer(self, authenticated_teacher_client, mixed_grades):
+        """Test that ?expand= still nests through the serializer"""
+        response = authenticated_teacher_client.get('/api/grades/?expand=student&fields=id,student')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.data[0]['student'], dict)
+
+    def test_by_course_is_projected(self, authenticated_teacher_client, lo_achievement, course):
+        """Test that by_course returns projected LO achievements"""
+        response = authenticated_teacher_client.get(
+            f'/api/lo-achievements/by_course/?course_id={course.id}&fields=id,lo_code,is_target_met'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [{'id': lo_achievement.id, 'lo_code': 'LO1', 'is_target_met': True}]
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestProjectionBenchmark:
+    """Benchmark: serializing 10,000 grades"""
+
+    def test_projection_throughput(self, course):
+        """Test that the projection serializes 10k rows several times faster"""
+        assessments = Assessment.objects.bulk_create([
+            Assessment(
+                course=course, title=f'Bench {index}', assessment_type=Assessment.AssessmentType.QUIZ,
+                weight=Decimal('1.00'), max_score=Decimal('100.00'),
+            )
+            for index in range(100)
+        ])
+        students = create_test_students(100, 'bench', first_name='Bench')
+        StudentGrade.objects.bulk_create([
+            StudentGrade(student=student, assessment=assessment, score=Decimal(index % 100))
+            for index, student in enumerate(students)
+            for assessment in assessments
+        ])
+        grades = StudentGrade.objects.select_related('student', 'assessment').order_by('id')
+
+        started = time.perf_counter()
+        expected = StudentGradeSerializer(grades, many=True).data
+        serializer_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        projected = StudentGradeProjection(grades).data
+        projection_seconds = time.perf_counter() - started
+
+        assert len(projected) == 10000
+        assert projected == list(expected)
+        assert projection_seconds * 5 < serializer_seconds, (
+            f'serializer {serializer_seconds:.2f}s, projection {projection_seconds:.2f}s'
+        )
@@ -0,0 +1,92 @@
+"""
+Query Budget Tests - Pytest Version
+
+Calls every GET route of the API as each role against a seeded synthetic
+dataset and checks the SQL query count, total DB time and response size
+against the checked-in table in api/tests/query_budgets.json.
+
+A route over budget fails with its most duplicated SQL listed, which is
+usually the N+1 that caused it. Error responses are never budgeted: a 5xx
+fails the test unless the route is listed in KNOWN_SERVER_ERRORS. After an
+intentional change, re-record the table with:
+
+    UPDATE_QUERY_BUDGETS=1 pytest api/tests/test_query_budgets.py
+"""
+
+import os
+
+import pytest
+
+from api.tests.utils.query_budget import (
+    BUDGET_ROLES, KNOWN_SERVER_ERRORS, budget_key, format_violation, iter_get_routes, load_budgets,
+    measure, over_budget, route_url, seed_budget_dataset, server_errors, write_budgets,
+)
+
+
+@pytest.fixture
+def budget_dataset(db):
+    return seed_budget_dataset()
+
+
+# =============================================================================
+# BUDGET TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+@pytest.mark.slow
+class TestQueryBudgets:
+    """Test per-endpoint query, DB time and response size budgets"""
+
+    def test_every_route_can_be_requested(self, budget_dataset):
+        """Test that the harness can build a URL for every GET route"""
+        unreachable = [
+            name for name, kwargs in iter_get_routes()
+            if route_url(name, kwargs, budget_dataset['objects']) is None
+        ]
+
+        assert not unreachable, f'No seeded object for routes: {unreachable}'
+
+    def test_every_route_within_budget(self, api_client, budget_dataset):
+        """Test that no route exceeds its budget for any role"""
+        budgets = load_budgets()
+        api_client.raise_request_exception = False
+
+        measurements = []
+        for role in BUDGET_ROLES:
+            api_client.force_authenticate(user=budget_dataset['users'][role])
+            for name, kwargs in iter_get_routes():
+                url = route_url(name, kwargs, budget_dataset['objects'])
+                measurements.append(measure(api_client, name, role, url))
+
+        unexpected, fixed = server_errors(measurements)
+        assert not unexpected, f'Server errors (never budgeted): {unexpected}'
+        assert not fixed, f'No longer failing, remove from KNOWN_SERVER_ERRORS and re-record: {fixed}'
+        measurements = [m for m in measurements if m.status < 500]
+
+        if os.environ.get('UPDATE_QUERY_BUDGETS') == '1':
+            write_budgets(measurements)
+            pytest.skip('Query budgets re-recorded')
+
+        missing = [m.key for m in measurements if m.key not in budgets]
+        assert not missing, (
+            f'No budget for {missing}; re-record with UPDATE_QUERY_BUDGETS=1'
+        )
+
+        violations = [
+            format_violation(m, problems)
+            for m in measurements
+            if (problems := over_budget(m, budgets[m.key]))
+        ]
+        assert not violations, 'Over budget:\n' + '\n'.join(violations)
+
+    def test_stale_budgets_are_reported(self, budget_dataset):
+        """Test that the table has no entries for routes that no longer exist"""
+        budgets = load_budgets()
+        current = {
+            budget_key(name, role) for name, _ in iter_get_routes() for role in BUDGET_ROLES
+        } - KNOWN_SERVER_ERRORS
+
+        assert not set(budgets) - current, (
+            f'Budgets for removed routes: {sorted(set(budgets) - current)}'
+        )
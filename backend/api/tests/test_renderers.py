@@ -0,0 +1,291 @@
+"""
+orjson Renderer Tests - Pytest Version
+
+Tests that api/renderers.py produces the same bytes as DRF's JSONRenderer
+and parses like JSONParser, that streamed lists match rendered ones, plus
+dashboard rendering and streaming memory benchmarks.
+"""
+
+import datetime
+import io
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from api.models import ActivityLog, Assessment, StudentGrade
+from api.renderers import (
+    ORJSON_AVAILABLE, ORJSONParser, ORJSONRenderer, StreamingJSONResponse,
+)
+from api.serializers import StudentGradeProjection
+from api.tests.utils import create_test_students
+from api.tests.utils.query_budget import seed_budget_dataset
+
+pytestmark = pytest.mark.skipif(not ORJSON_AVAILABLE, reason='orjson is not installed')
+
+
+def _payload():
+    utc = datetime.timezone.utc
+    return ReturnDict({
+        'score': Decimal('85.50'),
+        'weights': [Decimal('0.3333333333333333333'), Decimal('100'), Decimal('-0.10')],
+        'graded_at': datetime.datetime(2024, 5, 1, 9, 30, 15, 123456, tzinfo=utc),
+        'local': datetime.datetime(2024, 5, 1, 9, 30, tzinfo=ZoneInfo('Europe/Istanbul')),
+        'naive': datetime.datetime(2024, 5, 1, 9, 30, 0, 500),
+        'due': datetime.date(2024, 6, 1),
+        'at': datetime.time(8, 15),
+        'elapsed': datetime.timedelta(minutes=90),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Active'),
+        'text': 'Öğrenci   satır  ',
+        1: {'nested': (1, 2.5, None, True)},
+    }, serializer=None)
+
+
+# =============================================================================
+# RENDERER TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestORJSONRenderer:
+    """Test that the orjson renderer matches DRF byte for byte"""
+
+    def test_matches_drf_renderer(self):
+        """Test Decimal, datetime, UUID, lazy string and int key output"""
+        assert ORJSONRenderer().render(_payload()) == JSONRenderer().render(_payload())
+
+    def test_indent_falls_back_to_drf(self):
+        """Test that indented output is left to DRF"""
+        media_type = 'application/json; indent=4'
+
+        rendered = ORJSONRenderer().render(_payload(), media_type)
+
+        assert rendered == JSONRenderer().render(_payload(), media_type)
+        assert b'\n    ' in rendered
+
+    def test_wide_integers_fall_back_to_drf(self):
+        """Test that integers orjson cannot encode still render"""
+        assert ORJSONRenderer().render({'big': 2 ** 70}) == b'{"big":1180591620717411303424}'
+
+    def test_none_renders_empty(self):
+        """Test that an empty response body stays empty"""
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_configured_as_default(self):
+        """Test that REST_FRAMEWORK uses the orjson classes"""
+        assert api_settings.DEFAULT_RENDERER_CLASSES[0] is ORJSONRenderer
+        assert api_settings.DEFAULT_PARSER_CLASSES[0] is ORJSONParser
+
+
+# =============================================================================
+# PARSER TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestORJSONParser:
+    """Test that the orjson parser behaves like JSONParser"""
+
+    def test_parses_like_drf(self):
+        """Test that both parsers return the same data"""
+        body = '{"score": 85.5, "name": "Öğrenci", "items": [1, null, true]}'.encode()
+
+        parsed = ORJSONParser().parse(io.BytesIO(body))
+
+        assert parsed == JSONParser().parse(io.BytesIO(body))
+
+    def test_invalid_json_raises_parse_error(self):
+        """Test that malformed bodies are a 400, not a 500"""
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"score": '))
+
+    def test_nan_is_rejected(self):
+        """Test that non-standard constants are rejected as under STRICT_JSON"""
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"score": NaN}'))
+
+    def test_json_request_round_trip(self, authenticated_teacher_client, course):
+        """Test that a JSON write goes through the parser and renderer"""
+        response = authenticated_teacher_client.patch(
+            f'/api/courses/{course.id}/', {'name': 'Veri Yapıları'}, format='json'
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        assert 'Veri Yapıları'.encode() in response.content
+
+
+# =============================================================================
+# STREAMING TESTS
+# =============================================================================
+
+def _consume(response):
+    """Read a streaming response fully and return its bytes."""
+    return b''.join(response.streaming_content)
+
+
+def _grades(course, count, prefix):
+    """Create `count` students with one grade each (bypassing signals)."""
+    assessment = Assessment.objects.create(
+        course=course, title=f'Stream {prefix}', assessment_type=Assessment.AssessmentType.QUIZ,
+        weight=Decimal('10.00'), max_score=Decimal('100.00'),
+    )
+    students = create_test_students(count, prefix, first_name='Stream')
+    StudentGrade.objects.bulk_create([
+        StudentGrade(student=student, assessment=assessment, score=Decimal(index % 100), feedback='ok')
+        for index, student in enumerate(students)
+    ])
+    return assessment
+
+
+@pytest.mark.unit
+class TestStreamingJSONResponse:
+    """Test that streamed JSON is byte-identical to rendered JSON"""
+
+    @pytest.mark.parametrize('count', [0, 1, 1201])
+    def test_array_matches_renderer(self, count):
+        """Test empty, single and multi-batch arrays"""
+        items = [{'id': index, 'score': Decimal('1.50'), 'name': 'Öğrenci'} for index in range(count)]
+
+        streamed = _consume(StreamingJSONResponse(iter(items)))
+
+        assert streamed == ORJSONRenderer().render(items)
+        assert streamed == JSONRenderer().render(items)
+
+    @pytest.mark.parametrize('count', [0, 3])
+    def test_envelope_matches_renderer(self, count):
+        """Test that envelope keys, the list and its count keep their order"""
+        items = [{'id': index} for index in range(count)]
+
+        streamed = _consume(StreamingJSONResponse(
+            iter(items), envelope={'success': True}, list_key='logs', count_key='count'
+        ))
+
+        assert streamed == JSONRenderer().render({'success': True, 'logs': items, 'count': count})
+
+    def test_envelope_without_count(self):
+        """Test an empty envelope with no count key"""
+        streamed = _consume(StreamingJSONResponse(iter([1, 2]), envelope={}, list_key='results'))
+
+        assert streamed == b'{"results":[1,2]}'
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestStreamedEndpoints:
+    """Test the list endpoints that stream above STREAMING_JSON_MIN_ITEMS"""
+
+    def test_grade_list_streams_same_bytes(self, settings, authenticated_teacher_client, course):
+        """Test that /api/grades/ streams exactly what it used to render"""
+        _grades(course, 30, 'gl')
+        rendered = authenticated_teacher_client.get('/api/grades/')
+        settings.STREAMING_JSON_MIN_ITEMS = 10
+
+        streamed = authenticated_teacher_client.get('/api/grades/')
+
+        assert not rendered.streaming
+        assert streamed.streaming
+        assert streamed['Content-Type'] == 'application/json'
+        assert _consume(streamed) == rendered.content
+
+    def test_browsable_api_is_not_streamed(self, settings, authenticated_teacher_client, course):
+        """Test that the browsable API keeps a regular response"""
+        _grades(course, 5, 'ba')
+        settings.STREAMING_JSON_MIN_ITEMS = 1
+
+        response = authenticated_teacher_client.get('/api/grades/?format=api')
+
+        assert not response.streaming
+
+    def test_activity_logs_stream_same_bytes(self, settings, api_client, db):
+        """Test that a large ?limit= streams the same envelope"""
+        admin = get_user_model().objects.create_superuser(
+            username='stream_admin', email='stream_admin@test.com', password='testpass123'
+        )
+        ActivityLog.objects.bulk_create([
+            ActivityLog(action_type=ActivityLog.ActionType.USER_CREATED, user=admin, description=f'Log {index}')
+            for index in range(25)
+        ])
+        api_client.force_authenticate(user=admin)
+        rendered = api_client.get('/api/super-admin/activity-logs/?limit=20')
+        settings.STREAMING_JSON_MIN_ITEMS = 5
+
+        streamed = api_client.get('/api/super-admin/activity-logs/?limit=20')
+
+        assert streamed.streaming
+        assert _consume(streamed) == rendered.content
+        assert rendered.data['count'] == 20
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestDashboardRenderBenchmark:
+    """Benchmark: rendering the teacher and institution dashboard payloads"""
+
+    @pytest.mark.parametrize('role, url', [
+        ('teacher', '/api/dashboard/teacher/'),
+        ('institution', '/api/dashboard/institution/'),
+    ])
+    def test_dashboard_render_speed(self, db, api_client, role, url):
+        """Test that orjson renders the same bytes at least twice as fast"""
+        dataset = seed_budget_dataset()
+        cache.clear()
+        api_client.force_authenticate(user=dataset['users'][role])
+        data = api_client.get(url).data
+        drf, fast = JSONRenderer(), ORJSONRenderer()
+        rounds = 300
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            expected = drf.render(data)
+        drf_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            rendered = fast.render(data)
+        fast_seconds = time.perf_counter() - started
+
+        assert rendered == expected
+        assert fast_seconds * 2 < drf_seconds, (
+            f'{role} dashboard: json {drf_seconds / rounds * 1e6:.0f} us, orjson {fast_seconds / rounds * 1e6:.0f} us'
+        )
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+class TestStreamingMemoryBenchmark:
+    """Benchmark: streaming memory does not grow with the number of rows"""
+
+    def _peak_memory(self, assessment):
+        grades = StudentGrade.objects.filter(assessment=assessment).order_by('id')
+        tracemalloc.start()
+        response = StreamingJSONResponse(StudentGradeProjection(grades).iter_data())
+        total_bytes = sum(len(chunk) for chunk in response.streaming_content)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, total_bytes
+
+    def test_peak_memory_independent_of_row_count(self, course):
+        """Test that 10x more grades does not mean 10x more memory"""
+        small = _grades(course, 2000, 'ms')
+        large = _grades(course, 20000, 'ml')
+
+        small_peak, small_bytes = self._peak_memory(small)
+        large_peak, large_bytes = self._peak_memory(large)
+
+        assert large_bytes > 9 * small_bytes
+        assert large_peak < small_peak * 2, f'{small_peak} B for 2k grades, {large_peak} B for 20k grades'
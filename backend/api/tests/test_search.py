@@ -0,0 +1,258 @@
+"""
+Full-Text Search Tests - Pytest Version
+
+Tests for api/search.py: the generated search_vector columns, prefix
+matching and ranking of FullTextSearchFilter, searching related documents,
+the activity log search and the Django admin search.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import ActivityLog, Course, LearningOutcome, StudentGrade, StudentLOAchievement, User
+from api.search import defer_search_vectors, full_text_search, search_terms
+from api.tests.utils import build_test_student
+
+
+def _results(response):
+    assert response.status_code == status.HTTP_200_OK, response.content
+    data = response.data
+    return data['results'] if isinstance(data, dict) else data
+
+
+def _usernames(response):
+    return [user['username'] for user in _results(response)]
+
+
+@pytest.fixture
+def people(db):
+    """Students whose names and ids exercise prefix, substring and weighting"""
+    return User.objects.bulk_create([
+        build_test_student('ada', student_id='S2024001', first_name='Ada', last_name='Lovelace'),
+        build_test_student('grace', student_id='S2024002', first_name='Grace', last_name='Hopper'),
+        build_test_student('lovelace_fan', student_id='S2023999', first_name='Alan', last_name='Turing'),
+        build_test_student('obrien', student_id='S2022010', first_name='Conan', last_name="O'Brien"),
+    ])
+
+
+# =============================================================================
+# QUERY TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestSearchQuery:
+    """Test search term parsing and the generated search vectors"""
+
+    def test_terms_drop_punctuation(self):
+        """Test that words without letters or digits are ignored"""
+        assert search_terms('ada , - "lo v"') == ['ada', 'lo v']
+
+    def test_quotes_and_backslashes_are_escaped(self, people):
+        """Test that tsquery syntax in the input cannot break the query"""
+        for search in ["O'Brien", 'a\\', "':* | !"]:
+            list(full_text_search(User.objects.all(), search))
+
+        assert list(full_text_search(User.objects.all(), "o'brien").values_list('username', flat=True)) == ['obrien']
+
+    def test_vector_follows_updates(self, people):
+        """Test that PostgreSQL keeps the document current on UPDATE"""
+        User.objects.filter(username='grace').update(last_name='Brewster')
+
+        matches = full_text_search(User.objects.all(), 'brewster')
+
+        assert list(matches.values_list('username', flat=True)) == ['grace']
+        assert not full_text_search(User.objects.all(), 'hopper').exists()
+
+    def test_empty_search_is_a_no_op(self, people):
+        """Test that a search without terms leaves the queryset alone"""
+        queryset = User.objects.all()
+
+        assert full_text_search(queryset, ' , ') is queryset
+
+
+@pytest.mark.unit
+class TestSearchVectorDeferred:
+    """Test that the tsvector columns are not loaded unless asked for"""
+
+    def test_default_manager_defers(self, people, course):
+        """Test that plain fetches leave search_vector out"""
+        for model in (User, Course):
+            assert 'search_vector' in model.objects.first().get_deferred_fields()
+
+    def test_select_related_defers(self, student_grade):
+        """Test that joined rows skip search_vector as well"""
+        queryset = defer_search_vectors(StudentGrade.objects.select_related('student', 'assessment__course'))
+
+        with CaptureQueriesContext(connection) as queries:
+            fetched = queryset.get(pk=student_grade.pk)
+
+        assert 'search_vector' not in queries[0]['sql']
+        assert 'search_vector' in fetched.student.get_deferred_fields()
+        assert 'search_vector' in fetched.assessment.course.get_deferred_fields()
+
+    def test_enrollment_list_skips_search_vector(self, authenticated_teacher_client, enrollment):
+        """Test that the enrollment list joins students and courses without their documents"""
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_teacher_client.get('/api/enrollments/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not [query for query in queries if '"search_vector"' in query['sql']]
+
+
+# =============================================================================
+# FILTER BACKEND TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestUserSearch:
+    """Test ?search= on /api/users/"""
+
+    def test_word_prefixes_match(self, authenticated_institution_client, people):
+        """Test that every word has to match as a prefix"""
+        response = authenticated_institution_client.get('/api/users/?search=ada lov')
+
+        assert _usernames(response) == ['ada']
+
+    def test_student_id_substring(self, authenticated_institution_client, people):
+        """Test that the end of a student id still matches"""
+        response = authenticated_institution_client.get('/api/users/?search=4002')
+
+        assert _usernames(response) == ['grace']
+
+    def test_ranked_by_weight(self, authenticated_institution_client, people):
+        """Test that a username match outranks a last name match"""
+        response = authenticated_institution_client.get('/api/users/?search=lovelace')
+
+        assert _usernames(response) == ['lovelace_fan', 'ada']
+
+    def test_explicit_ordering_wins(self, authenticated_institution_client, people):
+        """Test that ?ordering= replaces the relevance order"""
+        response = authenticated_institution_client.get('/api/users/?search=lovelace&ordering=username')
+
+        assert _usernames(response) == ['ada', 'lovelace_fan']
+
+    def test_no_match(self, authenticated_institution_client, people):
+        """Test that an unknown word returns nothing"""
+        response = authenticated_institution_client.get('/api/users/?search=babbage')
+
+        assert _usernames(response) == []
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestCourseAndOutcomeSearch:
+    """Test ?search= on courses and LO achievements"""
+
+    def test_name_outranks_description(self, authenticated_teacher_client, course, teacher_user):
+        """Test that a match in the name ranks above one in the description"""
+        named = Course.objects.create(
+            code='CSE999', name='Graph Theory', description='Vertices and edges', department='Computer Science',
+            credits=3, semester=Course.Semester.SPRING, academic_year='2024-2025', teacher=teacher_user,
+        )
+        Course.objects.filter(pk=course.pk).update(description='Trees and graph traversal')
+
+        response = authenticated_teacher_client.get('/api/courses/?search=graph')
+
+        assert [item['id'] for item in _results(response)] == [named.id, course.id]
+
+    def test_keyset_pages_keep_list_order(self, authenticated_teacher_client, course, teacher_user):
+        """Test that keyset pages are not reordered by rank"""
+        Course.objects.create(
+            code='AAA100', name='Compilers', description='Parse structures', department='Computer Science',
+            credits=3, semester=Course.Semester.SPRING, academic_year='2024-2025', teacher=teacher_user,
+        )
+
+        response = authenticated_teacher_client.get('/api/courses/?search=structures&page_size=10')
+
+        assert [item['code'] for item in _results(response)] == ['AAA100', course.code]
+
+    def test_code_substring(self, authenticated_teacher_client, course, learning_outcome_1):
+        """Test that the number part of a course or outcome code still matches"""
+        outcome = LearningOutcome.objects.create(
+            course=course, code='LO301', title='Analysis', target_percentage=Decimal('70.00')
+        )
+
+        courses = authenticated_teacher_client.get('/api/courses/?search=301')
+        outcomes = authenticated_teacher_client.get('/api/learning-outcomes/?search=301')
+
+        assert course.code.startswith('CSE301')
+        assert [item['id'] for item in _results(courses)] == [course.id]
+        assert [item['id'] for item in _results(outcomes)] == [outcome.id]
+
+    def test_lo_achievements_match_related_documents(self, authenticated_teacher_client, lo_achievement,
+                                                     learning_outcome_1, course, student_user):
+        """Test matching the student, the learning outcome and the course"""
+        other = LearningOutcome.objects.create(
+            course=course, code='LO9', title='Sorting', description='Quicksort', target_percentage=Decimal('70.00')
+        )
+        sorting = StudentLOAchievement.objects.create(
+            student=student_user, learning_outcome=other, current_percentage=Decimal('50.00')
+        )
+
+        def ids(search):
+            response = authenticated_teacher_client.get(f'/api/lo-achievements/?search={search}')
+            return {item['id'] for item in _results(response)}
+
+        assert ids('sorting') == {sorting.id}
+        assert ids('understand data') == {lo_achievement.id}
+        assert ids(course.code.split('_')[0]) == {lo_achievement.id, sorting.id}
+        assert ids(student_user.student_id[-3:]) == {lo_achievement.id, sorting.id}
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestActivityLogSearch:
+    """Test ?search= on /api/super-admin/activity-logs/"""
+
+    def test_search_descriptions(self, api_client, db):
+        """Test that log descriptions are matched by word prefix"""
+        admin = get_user_model().objects.create_superuser(
+            username='search_admin', email='search_admin@test.com', password='testpass123'
+        )
+        ActivityLog.objects.bulk_create([
+            ActivityLog(action_type=ActivityLog.ActionType.GRADE_ASSIGNED, user=admin,
+                        description='Grade assigned for Midterm Exam'),
+            ActivityLog(action_type=ActivityLog.ActionType.COURSE_CREATED, user=admin,
+                        description='Course created: CSE301 - Algorithms'),
+        ])
+        api_client.force_authenticate(user=admin)
+
+        response = api_client.get('/api/super-admin/activity-logs/?search=midterm gra')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [log['description'] for log in response.data['logs']] == ['Grade assigned for Midterm Exam']
+
+
+@pytest.mark.integration
+class TestAdminSearch:
+    """Test the Django admin changelist and autocomplete searches"""
+
+    def test_changelist_uses_search_vector(self, admin_client, course, people):
+        """Test that changelist search matches word prefixes and code substrings"""
+        users = admin_client.get('/admin/api/user/', {'q': 'ada lov'})
+        courses = admin_client.get('/admin/api/course/', {'q': '301'})
+
+        assert list(users.context['cl'].queryset.values_list('username', flat=True)) == ['ada']
+        assert list(courses.context['cl'].queryset) == [course]
+        assert '@@' in str(users.context['cl'].queryset.query)
+
+    def test_related_documents(self, admin_client, enrollment, student_user):
+        """Test that enrollments match the student's document"""
+        response = admin_client.get('/admin/api/enrollment/', {'q': student_user.student_id[-3:]})
+
+        assert list(response.context['cl'].queryset) == [enrollment]
+
+    def test_autocomplete(self, admin_client, course):
+        """Test that autocomplete goes through the same search"""
+        response = admin_client.get('/admin/autocomplete/', {
+            'term': '301', 'app_label': 'api', 'model_name': 'enrollment', 'field_name': 'course',
+        })
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['id'] for result in response.json()['results']] == [str(course.pk)]
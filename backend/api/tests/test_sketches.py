@@ -0,0 +1,257 @@
+"""
+Quantile Sketch Tests - Pytest Version
+
+Tests for the KLL sketch in api/sketches.py and the per-course
+analytics sketches used by the institution analytics views.
+"""
+
+import bisect
+import random
+
+import pytest
+from decimal import Decimal
+from rest_framework import status
+
+from api.models import Course, CourseAnalyticsSketch, Enrollment, StudentPOAchievement
+from api.services.analytics_sketch_service import AnalyticsSketchService
+from api.sketches import KLLSketch
+from api.tests.utils import create_test_students
+
+
+# =============================================================================
+# KLL SKETCH TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestKLLSketch:
+    """Test KLLSketch accuracy, merging and serialization"""
+
+    def test_small_sketch_is_exact(self):
+        """Test that sketches below k hold every value"""
+        sketch = KLLSketch(k=200)
+        sketch.update_many(range(1, 101))
+
+        assert sketch.is_exact
+        assert sketch.quantile(0.5) == 50
+        assert sketch.count_le(20) == 20
+        assert sketch.quantile(0) == 1
+        assert sketch.quantile(1) == 100
+
+    def test_large_sketch_within_rank_error(self):
+        """Test that quantiles stay within the documented rank error"""
+        rng = random.Random(42)
+        values = [rng.uniform(0, 100) for _ in range(20000)]
+        sketch = KLLSketch()
+        sketch.update_many(values)
+
+        ordered = sorted(values)
+        for q in (0.1, 0.5, 0.9):
+            estimate = sketch.quantile(q)
+            true_rank = bisect.bisect_right(ordered, estimate) / len(ordered)
+            assert abs(true_rank - q) < 0.03
+        assert sum(len(items) for items in sketch.compactors) < 1000
+
+    def test_merge_matches_single_sketch(self):
+        """Test that merged partial sketches summarise the union"""
+        rng = random.Random(7)
+        values = [rng.gauss(70, 10) for _ in range(10000)]
+        parts = [KLLSketch() for _ in range(5)]
+        for index, value in enumerate(values):
+            parts[index % 5].update(value)
+
+        merged = KLLSketch()
+        for part in parts:
+            merged.merge(part)
+
+        ordered = sorted(values)
+        assert merged.n == len(values)
+        assert merged.min_value == ordered[0]
+        assert merged.max_value == ordered[-1]
+        true_rank = bisect.bisect_right(ordered, merged.quantile(0.5)) / len(ordered)
+        assert abs(true_rank - 0.5) < 0.03
+
+    def test_serialization_round_trip(self):
+        """Test that to_dict/from_dict preserves the sketch"""
+        sketch = KLLSketch(k=50)
+        sketch.update_many(float(i) for i in range(500))
+
+        restored = KLLSketch.from_dict(sketch.to_dict())
+
+        assert restored.n == sketch.n
+        assert restored.k == 50
+        assert restored.quantiles([0.1, 0.5, 0.9]) == sketch.quantiles([0.1, 0.5, 0.9])
+
+    def test_empty_sketch(self):
+        """Test queries on an empty sketch"""
+        sketch = KLLSketch()
+
+        assert sketch.quantile(0.5) is None
+        assert sketch.rank(50) == 0.0
+
+    def test_invalid_quantile(self):
+        """Test that out-of-range quantiles are rejected"""
+        sketch = KLLSketch()
+        sketch.update(1)
+
+        with pytest.raises(ValueError):
+            sketch.quantile(1.5)
+
+
+# =============================================================================
+# COURSE ANALYTICS SKETCH TESTS
+# =============================================================================
+
+@pytest.mark.integration
+class TestAnalyticsSketchService:
+    """Test building, refreshing and invalidating course sketches"""
+
+    def test_refresh_builds_missing_sketch(self, enrollment, course):
+        """Test that refresh builds sketches for courses without one"""
+        enrollment.final_grade = Decimal('72.50')
+        enrollment.save()
+
+        rebuilt = AnalyticsSketchService.refresh([course.id])
+
+        assert rebuilt == 1
+        sketch = CourseAnalyticsSketch.objects.get(course=course)
+        assert sketch.final_grade_count == 1
+        assert sketch.is_stale is False
+        assert AnalyticsSketchService.refresh([course.id]) == 0
+
+    def test_final_grade_change_marks_sketch_stale(self, enrollment, course):
+        """Test that saving an enrollment flags the course sketch"""
+        AnalyticsSketchService.rebuild_course(course.id)
+
+        enrollment.final_grade = Decimal('90.00')
+        enrollment.save()
+
+        assert CourseAnalyticsSketch.objects.get(course=course).is_stale is True
+        merged = AnalyticsSketchService.merge_final_grades([course.id])
+        assert merged.n == 0
+
+        AnalyticsSketchService.refresh([course.id])
+        merged = AnalyticsSketchService.merge_final_grades([course.id])
+        assert merged.quantile(0.5) == 90.0
+
+    def test_merge_by_department_segment(self, enrollment, course, student_user):
+        """Test that final grades are segmented by student department"""
+        enrollment.final_grade = Decimal('64.00')
+        enrollment.save()
+        AnalyticsSketchService.refresh([course.id])
+
+        assert AnalyticsSketchService.merge_final_grades(
+            [course.id], department=student_user.department
+        ).n == 1
+        assert AnalyticsSketchService.merge_final_grades(
+            [course.id], department='Other Department'
+        ).n == 0
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestSketchBackedAnalytics:
+    """Test analytics endpoints on the exact and sketch-backed paths"""
+
+    @pytest.fixture
+    def graded_enrollment(self, enrollment, student_user, program_outcome_1):
+        enrollment.final_grade = Decimal('85.00')
+        enrollment.save()
+        StudentPOAchievement.objects.create(
+            student=student_user,
+            program_outcome=program_outcome_1,
+            current_percentage=Decimal('78.00')
+        )
+        return enrollment
+
+    @pytest.mark.parametrize('threshold', [10000, 0])
+    def test_performance_distribution(self, authenticated_institution_client, graded_enrollment, monkeypatch, threshold):
+        """Test that exact and sketch paths agree on a small population"""
+        monkeypatch.setattr('api.views.analytics.SKETCH_EXACT_THRESHOLD', threshold)
+        AnalyticsSketchService.refresh()
+
+        response = authenticated_institution_client.get('/api/analytics/performance-distribution/')
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.data['statistics']
+        assert stats['approximate'] is (threshold == 0)
+        assert stats['total_students'] == Enrollment.objects.filter(final_grade__isnull=False).count()
+        assert stats['percentiles']['p50'] is not None
+        assert sum(response.data['distribution'].values()) == stats['total_students']
+
+    @pytest.mark.parametrize('threshold', [10000, 0])
+    def test_po_trends_percentiles(self, authenticated_institution_client, graded_enrollment, program_outcome_1, monkeypatch, threshold):
+        """Test that PO trends report per-PO percentiles"""
+        monkeypatch.setattr('api.views.analytics.SKETCH_EXACT_THRESHOLD', threshold)
+        AnalyticsSketchService.refresh()
+
+        response = authenticated_institution_client.get('/api/analytics/po-trends/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['percentiles_approximate'] is (threshold == 0)
+        po_data = next(
+            po for po in response.data['program_outcomes'] if po['code'] == program_outcome_1.code
+        )
+        assert po_data['percentiles']['p50'] == 78.0
+
+    @pytest.mark.parametrize('threshold', [10000, 0])
+    def test_po_trends_count_each_enrollment(
+        self, authenticated_institution_client, course, teacher_user, program_outcome_1, monkeypatch, threshold
+    ):
+        """Test that both paths weight a student by their graded enrollments"""
+        monkeypatch.setattr('api.views.analytics.SKETCH_EXACT_THRESHOLD', threshold)
+        second = Course.objects.create(
+            code='SKT200', name='Second', department=course.department, credits=3,
+            semester=Course.Semester.SPRING, academic_year='2024-2025', teacher=teacher_user,
+        )
+        twice, once, other = create_test_students(3, 'sketch')
+        Enrollment.objects.bulk_create([
+            Enrollment(student=student, course=target, final_grade=Decimal('70.00'))
+            for student, target in ((twice, course), (twice, second), (once, course), (other, course))
+        ])
+        StudentPOAchievement.objects.bulk_create([
+            StudentPOAchievement(student=student, program_outcome=program_outcome_1, current_percentage=Decimal(value))
+            for student, value in ((twice, '10.00'), (once, '50.00'), (other, '90.00'))
+        ])
+        AnalyticsSketchService.refresh()
+
+        response = authenticated_institution_client.get('/api/analytics/po-trends/')
+
+        assert response.data['percentiles_approximate'] is (threshold == 0)
+        po_data = next(
+            po for po in response.data['program_outcomes'] if po['code'] == program_outcome_1.code
+        )
+        # [10, 10, 50, 90]: per student the median would be 50
+        assert po_data['percentiles'] == {'p10': 10.0, 'p50': 10.0, 'p90': 90.0}
+
+    def test_po_trends_without_graded_enrollments(
+        self, authenticated_institution_client, enrollment, student_user, program_outcome_1
+    ):
+        """Test that achievements outside graded enrollments do not count"""
+        StudentPOAchievement.objects.create(
+            student=student_user, program_outcome=program_outcome_1, current_percentage=Decimal('78.00')
+        )
+
+        response = authenticated_institution_client.get('/api/analytics/po-trends/')
+
+        po_data = next(
+            po for po in response.data['program_outcomes'] if po['code'] == program_outcome_1.code
+        )
+        assert po_data['percentiles'] == {'p10': None, 'p50': None, 'p90': None}
+
+    def test_stale_sketch_is_not_rebuilt_in_request(
+        self, authenticated_institution_client, graded_enrollment, course, monkeypatch
+    ):
+        """Test that a stale sketch is queued for rebuild and the read answers exactly"""
+        monkeypatch.setattr('api.views.analytics.SKETCH_EXACT_THRESHOLD', 0)
+        queued = []
+        monkeypatch.setattr(AnalyticsSketchService, 'schedule_refresh', staticmethod(queued.append))
+        AnalyticsSketchService.refresh()
+        graded_enrollment.final_grade = Decimal('55.00')
+        graded_enrollment.save()
+
+        response = authenticated_institution_client.get('/api/analytics/performance-distribution/')
+
+        assert response.data['statistics']['approximate'] is False
+        assert response.data['statistics']['percentiles']['p50'] == 55.0
+        assert queued == [[course.id]]
+        assert CourseAnalyticsSketch.objects.get(course=course).is_stale is True
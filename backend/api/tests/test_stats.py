@@ -0,0 +1,189 @@
+"""
+Aggregate Statistics Tests - Pytest Version
+
+Tests for api/stats.py and the stats/ summary endpoints built on it: every
+statistic, grouped or not, must come from a single query.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import LearningOutcome, StudentLOAchievement, User
+from api.views.viewsets import LO_ACHIEVEMENT_STATS
+
+
+def _get_in_one_query(client, url):
+    """GET ``url`` and check that exactly one SQL query ran."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK, response.content
+    assert len(queries) == 1, [query['sql'] for query in queries]
+    return response
+
+
+@pytest.fixture
+def lo_achievements(lo_achievement, learning_outcome_1, course):
+    """LO1: 80% (3/3) and 60% (2/4); LO2: 90% (1/2)."""
+    other = User.objects.create_user(
+        username='stats_student', email='stats_student@test.com',
+        password='testpass123', role=User.Role.STUDENT, student_id='STATS001'
+    )
+    lo2 = LearningOutcome.objects.create(
+        course=course, code='LO2', title='Algorithms', target_percentage=Decimal('85.00')
+    )
+    StudentLOAchievement.objects.create(
+        student=other, learning_outcome=learning_outcome_1,
+        current_percentage=Decimal('60.00'), total_assessments=4, completed_assessments=2,
+    )
+    StudentLOAchievement.objects.create(
+        student=other, learning_outcome=lo2,
+        current_percentage=Decimal('90.00'), total_assessments=2, completed_assessments=1,
+    )
+    return lo2
+
+
+# =============================================================================
+# LO ACHIEVEMENT STATS TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestLOAchievementStats:
+    """Test /api/lo-achievements/summary/ and stats/"""
+
+    def test_summary_in_one_query(self, authenticated_teacher_client, lo_achievements, learning_outcome_1):
+        """Test that the summary widget numbers come from one aggregate() call"""
+        response = _get_in_one_query(
+            authenticated_teacher_client,
+            f'/api/lo-achievements/summary/?learning_outcome={learning_outcome_1.id}',
+        )
+
+        assert response.data == {
+            'total_achievements': 2,
+            'student_count': 2,
+            'targets_met': 1,
+            'average_percentage': 70.0,
+            'min_percentage': 60.0,
+            'max_percentage': 80.0,
+            'stddev_percentage': 10.0,
+            'average_completion_rate': 75.0,
+            'targets_not_met': 1,
+            'success_rate': 50.0,
+        }
+
+    def test_group_by_learning_outcome(self, authenticated_teacher_client, lo_achievements, learning_outcome_1):
+        """Test one row per LO, sorted by code, still in one query"""
+        response = _get_in_one_query(
+            authenticated_teacher_client,
+            '/api/lo-achievements/stats/?group_by=learning_outcome&stats=total_achievements,success_rate',
+        )
+
+        assert response.data == [
+            {'learning_outcome': learning_outcome_1.id, 'lo_code': 'LO1',
+             'total_achievements': 2, 'success_rate': 50.0},
+            {'learning_outcome': lo_achievements.id, 'lo_code': 'LO2',
+             'total_achievements': 1, 'success_rate': 100.0},
+        ]
+
+    def test_group_by_course(self, authenticated_teacher_client, lo_achievements, course):
+        """Test grouping by course"""
+        response = _get_in_one_query(
+            authenticated_teacher_client, '/api/lo-achievements/stats/?group_by=course&stats=targets_met'
+        )
+
+        assert response.data == [{'course': course.id, 'course_code': course.code, 'targets_met': 2}]
+
+    def test_students_see_their_own_stats(self, authenticated_student_client, lo_achievements):
+        """Test that stats respect the role filtering of the list"""
+        response = authenticated_student_client.get('/api/lo-achievements/stats/?stats=total_achievements')
+
+        assert response.data == {'total_achievements': 1}
+
+    @pytest.mark.parametrize('query', ['group_by=planet', 'stats=total_achievements,bogus'])
+    def test_invalid_parameters(self, authenticated_teacher_client, query):
+        """Test that unknown dimensions and statistics are a 400"""
+        response = authenticated_teacher_client.get(f'/api/lo-achievements/stats/?{query}')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# =============================================================================
+# PROGRAM OUTCOME / PO ACHIEVEMENT / GRADE STATS TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestOutcomeAndGradeStats:
+    """Test the PO statistics, PO achievement and grade stats endpoints"""
+
+    def test_po_statistics(self, authenticated_institution_client, po_achievement, program_outcome_1,
+                           program_outcome_2):
+        """Test one row per active PO, including POs without achievements"""
+        response = _get_in_one_query(authenticated_institution_client, '/api/program-outcomes/statistics/')
+
+        rows = {row['code']: row for row in response.data}
+        assert rows['PO1']['total_students'] == 1
+        assert rows['PO1']['students_achieved'] == 1
+        assert rows['PO1']['average_achievement'] == 75.0
+        assert rows['PO1']['achievement_rate'] == 100.0
+        assert rows[program_outcome_2.code]['total_students'] == 0
+        assert rows[program_outcome_2.code]['achievement_rate'] == 0
+
+    def test_po_achievements_by_department(self, authenticated_institution_client, po_achievement):
+        """Test PO achievement stats grouped by department"""
+        response = _get_in_one_query(
+            authenticated_institution_client,
+            '/api/po-achievements/stats/?group_by=department&stats=total_achievements,average_completion_rate',
+        )
+
+        assert response.data == [
+            {'department': 'Computer Science', 'total_achievements': 1, 'average_completion_rate': 80.0},
+        ]
+
+    def test_grade_stats_by_assessment(self, authenticated_teacher_client, student_grade, assessment):
+        """Test grade stats grouped by assessment"""
+        response = _get_in_one_query(
+            authenticated_teacher_client, '/api/grades/stats/?group_by=assessment'
+        )
+
+        assert response.data == [{
+            'assessment': assessment.id,
+            'assessment_title': assessment.title,
+            'total_grades': 1,
+            'student_count': 1,
+            'average_score': 85.0,
+            'lowest_score': 85.0,
+            'highest_score': 85.0,
+            'stddev_score': 0.0,
+            'average_percentage': 85.0,
+        }]
+
+
+# =============================================================================
+# STATS SPEC TESTS
+# =============================================================================
+
+@pytest.mark.unit
+class TestStatsSpec:
+    """Test StatsSpec on its own"""
+
+    def test_empty_queryset_defaults(self, db):
+        """Test counts and averages default to 0, extremes to None"""
+        stats = LO_ACHIEVEMENT_STATS.compute(StudentLOAchievement.objects.none())
+
+        assert stats['total_achievements'] == 0
+        assert stats['average_percentage'] == 0
+        assert stats['success_rate'] == 0
+        assert stats['max_percentage'] is None
+
+    def test_only_needed_aggregates_are_computed(self, db):
+        """Test that a derived statistic pulls in just the aggregates it requires"""
+        with CaptureQueriesContext(connection) as queries:
+            stats = LO_ACHIEVEMENT_STATS.compute(StudentLOAchievement.objects.all(), names=['success_rate'])
+
+        assert stats == {'success_rate': 0}
+        assert 'AVG' not in queries[0]['sql'].upper()
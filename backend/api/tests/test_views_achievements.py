@@ -0,0 +1,76 @@
+"""
+Achievement Views Tests - Pytest Version
+
+Tests for the achievement ViewSets in api/views/viewsets.py
+"""
+
+import pytest
+from decimal import Decimal
+from rest_framework import status
+
+from api.models import LearningOutcome, StudentLOAchievement
+
+
+# =============================================================================
+# LO HEATMAP TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestLOHeatmap:
+    """Test StudentLOAchievementViewSet.heatmap"""
+
+    def test_heatmap_columnar_payload(self, authenticated_teacher_client, course, enrollment, lo_achievement, student_user):
+        """Test that the heatmap returns axes and a row-major matrix with nulls"""
+        LearningOutcome.objects.create(
+            course=course, code='LO2', title='Second', description='Second LO',
+            target_percentage=Decimal('70.00')
+        )
+
+        response = authenticated_teacher_client.get('/api/lo-achievements/heatmap/', {'course_id': course.id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['student_ids'] == [student_user.id]
+        assert response.data['lo_codes'] == ['LO1', 'LO2']
+        assert response.data['shape'] == [1, 2]
+        assert response.data['matrix'] == [80.0, None]
+
+    def test_heatmap_cache_invalidated_on_achievement_change(
+        self, authenticated_teacher_client, course, enrollment, lo_achievement
+    ):
+        """Test that the cached heatmap is dropped when an LO achievement changes"""
+        params = {'course_id': course.id}
+        authenticated_teacher_client.get('/api/lo-achievements/heatmap/', params)
+
+        lo_achievement.current_percentage = Decimal('55.00')
+        lo_achievement.save()
+
+        response = authenticated_teacher_client.get('/api/lo-achievements/heatmap/', params)
+        assert response.data['matrix'] == [55.0]
+
+    def test_heatmap_other_teacher_forbidden(self, api_client, course, unique_id):
+        """Test that teachers cannot read heatmaps of other teachers' courses"""
+        from api.models import User
+        other = User.objects.create_user(
+            username=f'other_teacher_{unique_id}',
+            email=f'other_teacher_{unique_id}@test.com',
+            password='testpass123',
+            role=User.Role.TEACHER
+        )
+        api_client.force_authenticate(user=other)
+
+        response = api_client.get('/api/lo-achievements/heatmap/', {'course_id': course.id})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_heatmap_students_forbidden(self, authenticated_student_client, course):
+        """Test that students cannot read the course heatmap"""
+        response = authenticated_student_client.get('/api/lo-achievements/heatmap/', {'course_id': course.id})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_heatmap_requires_course(self, authenticated_teacher_client):
+        """Test that course_id is required"""
+        response = authenticated_teacher_client.get('/api/lo-achievements/heatmap/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
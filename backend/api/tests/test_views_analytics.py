@@ -115,3 +115,141 @@ class TestCourseAnalyticsDetail:
 
 
 
+
+
+# =============================================================================
+# COURSE SUCCESS TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestAnalyticsCourseSuccess:
+    """Test analytics_course_success view"""
+    
+    def test_course_success_rates(self, authenticated_institution_client, enrollment, course):
+        """Test success rate and average computed per course"""
+        enrollment.final_grade = Decimal('75.00')
+        enrollment.save()
+        
+        response = authenticated_institution_client.get('/api/analytics/course-success/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        course_data = next(c for c in response.data['courses'] if c['course_id'] == course.id)
+        assert course_data['total_students'] == 1
+        assert course_data['successful_students'] == 1
+        assert course_data['success_rate'] == 100.0
+        assert course_data['average_grade'] == 75.0
+    
+    def test_course_success_query_count_is_constant(
+        self, authenticated_institution_client, enrollment, teacher_user, django_assert_max_num_queries
+    ):
+        """Test that adding courses does not add queries"""
+        from api.models import Course
+        for index in range(5):
+            Course.objects.create(
+                code=f'EXTRA{index}', name='Extra', department='Computer Science',
+                credits=3, semester=Course.Semester.FALL, academic_year='2024-2025',
+                teacher=teacher_user
+            )
+        
+        with django_assert_max_num_queries(4):
+            response = authenticated_institution_client.get('/api/analytics/course-success/')
+        
+        assert response.status_code == status.HTTP_200_OK
+
+
+# =============================================================================
+# ALERTS TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestAnalyticsAlerts:
+    """Test analytics_alerts view"""
+    
+    def test_alerts_cover_all_departments(self, authenticated_institution_client, program_outcome_1, unique_id):
+        """Test that department alerts are not limited to the first departments"""
+        from api.models import User, StudentPOAchievement
+        for index in range(4):
+            student = User.objects.create_user(
+                username=f'alert_student_{unique_id}_{index}',
+                email=f'alert_{unique_id}_{index}@test.com',
+                password='testpass123',
+                role=User.Role.STUDENT,
+                department=f'Dept {index}'
+            )
+            StudentPOAchievement.objects.create(
+                student=student,
+                program_outcome=program_outcome_1,
+                current_percentage=Decimal('40.00') + index
+            )
+        
+        response = authenticated_institution_client.get('/api/analytics/alerts/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        # 1 PO below target + 4 low departments
+        assert response.data['total_alerts'] == 5
+        assert len(response.data['alerts']) == 5
+        assert all('severity' not in alert for alert in response.data['alerts'])
+    
+    def test_alerts_forbidden_for_students(self, authenticated_student_client):
+        """Test that students cannot access alerts"""
+        response = authenticated_student_client.get('/api/analytics/alerts/')
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+# =============================================================================
+# DEPARTMENT CURRICULUM TESTS
+# =============================================================================
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestDepartmentCurriculum:
+    """Test department_curriculum view and the persisted year_of_study"""
+    
+    def test_year_of_study_computed_on_save(self, course):
+        """Test that year_of_study is derived from the course code"""
+        from api.models import Course
+        assert course.year_of_study == 3
+        assert Course.extract_year_of_study('MATH101') == 1
+        assert Course.extract_year_of_study('ENG2A') == 2
+        assert Course.extract_year_of_study('HIST') == 0
+        
+        course.code = 'CSE401'
+        course.save(update_fields=['code'])
+        course.refresh_from_db()
+        assert course.year_of_study == 4
+    
+    def test_curriculum_buckets_and_counts(self, authenticated_institution_client, course, enrollment):
+        """Test that courses land in their year/semester bucket with enrollment counts"""
+        response = authenticated_institution_client.get(
+            '/api/analytics/department-curriculum/', {'department': 'Computer Science'}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        year_three = response.data['curriculum'][2]
+        assert year_three['year'] == 3
+        course_data = next(c for c in year_three['fall_semester'] if c['course_id'] == course.id)
+        assert course_data['enrollment_count'] == 1
+        assert year_three['total_credits_fall'] >= course.credits
+    
+    def test_curriculum_cache_invalidated_on_enrollment(self, authenticated_institution_client, course, enrollment):
+        """Test that cached curriculum is served until enrollments change"""
+        params = {'department': 'Computer Science'}
+        authenticated_institution_client.get('/api/analytics/department-curriculum/', params)
+        
+        enrollment.is_active = False
+        enrollment.save()
+        
+        response = authenticated_institution_client.get('/api/analytics/department-curriculum/', params)
+        course_data = next(
+            c for c in response.data['curriculum'][2]['fall_semester'] if c['course_id'] == course.id
+        )
+        assert course_data['enrollment_count'] == 0
+    
+    def test_curriculum_requires_department(self, authenticated_institution_client):
+        """Test that the department parameter is required"""
+        response = authenticated_institution_client.get('/api/analytics/department-curriculum/')
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
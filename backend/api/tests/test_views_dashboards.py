@@ -6,9 +6,12 @@ Tests for dashboard views in api/views/dashboards.py
 
 import pytest
 from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
-from api.models import Enrollment, StudentGrade, StudentPOAchievement, Assessment
+from api.models import Course, Enrollment, StudentGrade, StudentPOAchievement, Assessment, User
 
 
 # =============================================================================
@@ -96,6 +99,40 @@ class TestTeacherDashboard:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['courses']) >= 1
         assert any(c['code'] in course.code for c in response.data['courses'])
+    
+    def test_teacher_dashboard_query_count_is_constant(self, authenticated_teacher_client, teacher_user, course, student_user):
+        """Test that dashboard queries do not grow with courses or enrollments"""
+        Enrollment.objects.create(student=student_user, course=course)
+        cache.clear()
+        with CaptureQueriesContext(connection) as one_course:
+            authenticated_teacher_client.get('/api/dashboard/teacher/')
+        
+        for index in range(3):
+            extra = Course.objects.create(
+                code=f'{course.code}X{index}',
+                name=f'Extra {index}',
+                department=course.department,
+                credits=3,
+                semester=course.semester,
+                academic_year=course.academic_year,
+                teacher=teacher_user
+            )
+            for number in range(4):
+                student = User.objects.create_user(
+                    username=f'dash_{index}_{number}_{extra.id}',
+                    email=f'dash_{index}_{number}_{extra.id}@test.com',
+                    password='testpass123',
+                    role=User.Role.STUDENT
+                )
+                Enrollment.objects.create(student=student, course=extra)
+        cache.clear()
+        with CaptureQueriesContext(connection) as four_courses:
+            response = authenticated_teacher_client.get('/api/dashboard/teacher/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['courses']) == 4
+        assert sorted(c['enrollment_count'] for c in response.data['courses']) == [1, 4, 4, 4]
+        assert len(four_courses) == len(one_course)
 
 
 # =============================================================================
@@ -6,6 +6,8 @@ Shared utilities and helpers for tests.
 
 from .test_data_factories import (
     create_test_user,
+    build_test_student,
+    create_test_students,
     create_test_course,
     create_test_assessment,
     create_test_enrollment,
@@ -31,6 +33,8 @@ from .test_constants import (
 __all__ = [
     # Factories
     'create_test_user',
+    'build_test_student',
+    'create_test_students',
     'create_test_course',
     'create_test_assessment',
     'create_test_enrollment',
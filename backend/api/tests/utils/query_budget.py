@@ -0,0 +1,402 @@
+"""
+Query Budget Harness
+
+Helpers for the per-endpoint budget test (test_query_budgets.py): seeding a
+scaled synthetic dataset, enumerating the GET routes of the API, measuring a
+request's SQL query count, total DB time and response size with
+``CaptureQueriesContext``, and reading/writing the checked-in budget table.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from api.models import (
+    User, Department, ProgramOutcome, Course, CoursePO, Enrollment, Assessment, AssessmentLO,
+    StudentGrade, LearningOutcome, LOPO, StudentLOAchievement, StudentPOAchievement,
+    ActivityLog, ContactRequest, ImportJob
+)
+from .test_constants import TEST_PASSWORD, TEST_DEPARTMENT, TEST_ACADEMIC_YEAR
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+BUDGETS_PATH = Path(__file__).resolve().parent.parent / 'query_budgets.json'
+BUDGET_ROLES = ('student', 'teacher', 'institution', 'super_admin')
+
+# Dataset size the checked-in budgets were recorded at
+BUDGET_COURSES = 3
+BUDGET_STUDENTS = 12
+BUDGET_ASSESSMENTS_PER_COURSE = 4
+BUDGET_LOS_PER_COURSE = 3
+BUDGET_POS = 3
+
+# Headroom applied when budgets are (re)recorded; query counts are exact
+DB_TIME_FACTOR = 5
+DB_TIME_FLOOR_MS = 100
+SIZE_FACTOR = 1.25
+SIZE_SLACK_BYTES = 1024
+
+# Query parameters some routes need to do real work
+ROUTE_QUERY_PARAMS = {
+    'loachievement-by-student': {'student_id': 'student'},
+    'loachievement-by-course': {'course_id': 'course'},
+    'loachievement-heatmap': {'course_id': 'course'},
+    'loachievement-by-learning-outcome': {'lo_id': 'learningoutcome'},
+    'bulk-export-gradebook': {'course_id': 'course'},
+}
+
+# URL kwargs of parameterised routes, as keys into the seeded objects
+ROUTE_KWARGS = {
+    'course_id': 'course',
+    'job_id': 'importjob',
+}
+
+# Routes that answer 500 for a role because of known view bugs. They get no
+# budget; any other 5xx fails the budget test, and so does one of these
+# starting to succeed (drop it from here and re-record).
+KNOWN_SERVER_ERRORS = frozenset({
+    'grade-detail [student]',  # StudentGradeDetailSerializer has no get_student
+    'grade-detail [teacher]',
+    'grade-detail [institution]',
+    'assessmentlo-list [institution]',  # FieldError in the institution queryset
+    'assessmentlo-detail [institution]',
+    'lopo-list [institution]',  # FieldError in the institution queryset
+    'lopo-detail [institution]',
+})
+
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_SELECT_LIST = re.compile(r'^SELECT .*? FROM ', re.DOTALL)
+
+
+# =============================================================================
+# DATA CLASSES
+# =============================================================================
+
+@dataclass
+class Budget:
+    """Allowed cost of one route for one role."""
+    queries: int
+    db_ms: float
+    bytes: int
+
+
+@dataclass
+class Measurement:
+    """Measured cost of one request."""
+    route: str
+    role: str
+    status: int
+    queries: int
+    db_ms: float
+    bytes: int
+    sql: list[str] = field(default_factory=list, repr=False)
+
+    @property
+    def key(self) -> str:
+        return budget_key(self.route, self.role)
+
+
+def budget_key(route: str, role: str) -> str:
+    return f'{route} [{role}]'
+
+
+# =============================================================================
+# DATASET
+# =============================================================================
+
+def seed_budget_dataset() -> dict:
+    """
+    Create the synthetic dataset the budgets are recorded against.
+
+    Grades, enrollments and achievements are bulk-inserted so the dataset
+    does not depend on (or pay for) the achievement recalculation signals.
+
+    Returns:
+        Seeded objects by role and by router basename.
+    """
+    def make_user(username: str, role: str, **extra) -> User:
+        return User.objects.create_user(
+            username=username,
+            email=f'{username}@budget.test',
+            password=TEST_PASSWORD,
+            role=role,
+            department=TEST_DEPARTMENT,
+            first_name='Budget',
+            last_name=username.title(),
+            **extra
+        )
+
+    department = Department.objects.get_or_create(name=TEST_DEPARTMENT, defaults={'code': 'CS'})[0]
+    institution = make_user('budget_institution', User.Role.INSTITUTION)
+    super_admin = User.objects.create_superuser(
+        username='budget_root', email='budget_root@budget.test', password=TEST_PASSWORD
+    )
+    teachers = [make_user(f'budget_teacher_{index}', User.Role.TEACHER) for index in range(2)]
+    students = [
+        make_user(f'budget_student_{index}', User.Role.STUDENT, student_id=f'BUD{index:05d}', year_of_study=2)
+        for index in range(BUDGET_STUDENTS)
+    ]
+
+    pos = [
+        ProgramOutcome.objects.create(
+            code=f'BPO{index}', title=f'Budget PO {index}', description='Budget PO',
+            department=TEST_DEPARTMENT, target_percentage=Decimal('70.00')
+        )
+        for index in range(BUDGET_POS)
+    ]
+
+    courses, los, assessments = [], [], []
+    for index in range(BUDGET_COURSES):
+        course = Course.objects.create(
+            code=f'BUD{100 + index}', name=f'Budget Course {index}', description='Budget course',
+            department=TEST_DEPARTMENT, credits=3, semester=Course.Semester.FALL,
+            academic_year=TEST_ACADEMIC_YEAR, teacher=teachers[0] if index < 2 else teachers[1]
+        )
+        courses.append(course)
+        CoursePO.objects.bulk_create([CoursePO(course=course, program_outcome=po) for po in pos])
+        course_los = [
+            LearningOutcome.objects.create(
+                code=f'LO{number}', title=f'Budget LO {number}', description='Budget LO', course=course
+            )
+            for number in range(BUDGET_LOS_PER_COURSE)
+        ]
+        los.extend(course_los)
+        LOPO.objects.bulk_create([
+            LOPO(learning_outcome=lo, program_outcome=pos[number % BUDGET_POS])
+            for number, lo in enumerate(course_los)
+        ])
+        course_assessments = [
+            Assessment.objects.create(
+                course=course, title=f'Budget Assessment {number}',
+                assessment_type=Assessment.AssessmentType.QUIZ,
+                weight=Decimal('25.00'), max_score=Decimal('100.00')
+            )
+            for number in range(BUDGET_ASSESSMENTS_PER_COURSE)
+        ]
+        assessments.extend(course_assessments)
+        AssessmentLO.objects.bulk_create([
+            AssessmentLO(assessment=assessment, learning_outcome=course_los[number % len(course_los)])
+            for number, assessment in enumerate(course_assessments)
+        ])
+
+    Enrollment.objects.bulk_create([
+        Enrollment(student=student, course=course) for course in courses for student in students
+    ])
+    StudentGrade.objects.bulk_create([
+        StudentGrade(student=student, assessment=assessment, score=Decimal(50 + (index * 7) % 50))
+        for index, (student, assessment) in enumerate(
+            (student, assessment) for assessment in assessments for student in students
+        )
+    ])
+    StudentLOAchievement.objects.bulk_create([
+        StudentLOAchievement(student=student, learning_outcome=lo, current_percentage=Decimal('72.50'))
+        for lo in los for student in students
+    ])
+    StudentPOAchievement.objects.bulk_create([
+        StudentPOAchievement(student=student, program_outcome=po, current_percentage=Decimal('68.00'))
+        for po in pos for student in students
+    ])
+    ActivityLog.objects.bulk_create([
+        ActivityLog(
+            action_type=ActivityLog.ActionType.GRADE_ASSIGNED, user=teachers[0],
+            institution=institution, department=TEST_DEPARTMENT, description=f'Budget log {index}'
+        )
+        for index in range(20)
+    ])
+    contact = ContactRequest.objects.create(
+        institution_name='Budget University',
+        institution_type=ContactRequest.InstitutionType.values[0],
+        contact_name='Budget Contact',
+        contact_email='contact@budget.test',
+        request_type=ContactRequest.RequestType.values[0],
+        message='Budget request'
+    )
+    job = ImportJob.objects.create(created_by=institution, original_filename='budget.csv')
+
+    student = students[0]
+    return {
+        'users': {
+            'student': student,
+            'teacher': teachers[0],
+            'institution': institution,
+            'super_admin': super_admin,
+        },
+        'objects': {
+            'department': department,
+            'user': student,
+            'student': student,
+            'programoutcome': pos[0],
+            'learningoutcome': los[0],
+            'course': courses[0],
+            'enrollment': Enrollment.objects.filter(student=student, course=courses[0]).first(),
+            'assessment': assessments[0],
+            'grade': StudentGrade.objects.filter(student=student, assessment=assessments[0]).first(),
+            'poachievement': StudentPOAchievement.objects.filter(student=student).first(),
+            'loachievement': StudentLOAchievement.objects.filter(student=student).first(),
+            'contactrequest': contact,
+            'assessmentlo': AssessmentLO.objects.filter(assessment=assessments[0]).first(),
+            'lopo': LOPO.objects.filter(learning_outcome=los[0]).first(),
+            'importjob': job,
+        },
+    }
+
+
+# =============================================================================
+# ROUTES
+# =============================================================================
+
+def _walk(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern):
+            yield namespace, pattern
+
+
+def _allows_get(callback) -> bool:
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+    return view_class is not None and hasattr(view_class, 'get')
+
+
+def iter_get_routes(namespace: str = 'api') -> list[tuple[str, tuple[str, ...]]]:
+    """
+    Return (url name, kwarg names) for every GET route in ``namespace``.
+
+    Format-suffix variants added by the router are skipped.
+    """
+    routes = {}
+    for route_namespace, pattern in _walk(get_resolver().url_patterns):
+        kwargs = tuple(pattern.pattern.regex.groupindex)
+        if route_namespace != namespace or not pattern.name or 'format' in kwargs:
+            continue
+        if _allows_get(pattern.callback):
+            routes.setdefault(pattern.name, kwargs)
+    return sorted(routes.items())
+
+
+def route_url(name: str, kwarg_names: tuple[str, ...], objects: dict) -> str | None:
+    """Build the URL of a route from the seeded objects; None if it cannot be filled."""
+    kwargs = {}
+    for kwarg in kwarg_names:
+        key = name.rsplit('-', 1)[0] if kwarg == 'pk' else ROUTE_KWARGS.get(kwarg)
+        instance = objects.get(key)
+        if instance is None:
+            return None
+        kwargs[kwarg] = instance.pk
+
+    url = reverse(f'api:{name}', kwargs=kwargs)
+    params = {
+        param: objects[key].pk for param, key in ROUTE_QUERY_PARAMS.get(name, {}).items()
+    }
+    if params:
+        url += '?' + '&'.join(f'{param}={value}' for param, value in params.items())
+    return url
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def measure(client, route: str, role: str, url: str) -> Measurement:
+    """Request ``url`` with a cold cache and record its cost."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+
+    return Measurement(
+        route=route,
+        role=role,
+        status=response.status_code,
+        queries=len(context.captured_queries),
+        db_ms=round(sum(float(query['time']) for query in context.captured_queries) * 1000, 2),
+        bytes=size,
+        sql=[query['sql'] for query in context.captured_queries],
+    )
+
+
+def server_errors(measurements: list[Measurement]) -> tuple[list[str], list[str]]:
+    """
+    Check 5xx responses against KNOWN_SERVER_ERRORS.
+
+    Returns:
+        (unexpected 5xx keys, known-broken keys that no longer fail)
+    """
+    failing = {m.key for m in measurements if m.status >= 500}
+    return sorted(failing - KNOWN_SERVER_ERRORS), sorted(KNOWN_SERVER_ERRORS - failing)
+
+
+def duplicated_queries(sql: list[str], limit: int = 5) -> list[tuple[int, str]]:
+    """Return the most repeated statements (literals masked) and their counts."""
+    counts = Counter(_SQL_LITERALS.sub('?', statement) for statement in sql)
+    return [(count, statement) for statement, count in counts.most_common(limit) if count > 1]
+
+
+def over_budget(measurement: Measurement, budget: Budget) -> list[str]:
+    """Return a line per exceeded limit."""
+    problems = []
+    if measurement.queries > budget.queries:
+        problems.append(f'{measurement.queries} queries > {budget.queries}')
+    if measurement.db_ms > budget.db_ms:
+        problems.append(f'{measurement.db_ms} ms DB time > {budget.db_ms} ms')
+    if measurement.bytes > budget.bytes:
+        problems.append(f'{measurement.bytes} bytes > {budget.bytes} bytes')
+    return problems
+
+
+def format_violation(measurement: Measurement, problems: list[str]) -> str:
+    lines = [f'{measurement.key} (HTTP {measurement.status}): ' + '; '.join(problems)]
+    for count, statement in duplicated_queries(measurement.sql):
+        # The column list is noise; the table and WHERE clause point at the loop
+        statement = _SQL_SELECT_LIST.sub('SELECT ... FROM ', statement)
+        lines.append(f'    {count}x {statement[:300]}')
+    return '\n'.join(lines)
+
+
+# =============================================================================
+# BUDGET TABLE
+# =============================================================================
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, Budget]:
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as budget_file:
+        return {key: Budget(**values) for key, values in json.load(budget_file).items()}
+
+
+def budget_for(measurement: Measurement) -> Budget:
+    """Budget recorded for a measurement, with headroom for noisy timings."""
+    return Budget(
+        queries=measurement.queries,
+        db_ms=float(max(math.ceil(measurement.db_ms * DB_TIME_FACTOR), DB_TIME_FLOOR_MS)),
+        bytes=math.ceil(measurement.bytes * SIZE_FACTOR) + SIZE_SLACK_BYTES,
+    )
+
+
+def write_budgets(measurements: list[Measurement], path: Path = BUDGETS_PATH) -> None:
+    """Record budgets for the successful measurements; error responses never get one."""
+    table = {
+        m.key: asdict(budget_for(m))
+        for m in sorted(measurements, key=lambda m: m.key) if m.status < 500
+    }
+    with open(path, 'w', encoding='utf-8') as budget_file:
+        json.dump(table, budget_file, indent=2)
+        budget_file.write('\n')
@@ -60,6 +60,33 @@ def create_test_user(
     return User.objects.create_user(**user_data)
 
 
+def build_test_student(username, **kwargs):
+    """Build an unsaved student for bulk_create"""
+    return User(
+        username=username,
+        email=f'{username}@test.com',
+        role=User.Role.STUDENT,
+        **kwargs
+    )
+
+
+def create_test_students(count, prefix='student', **kwargs):
+    """
+    Bulk-create `count` students named `<prefix>_<n>`.
+
+    Skips password hashing and model signals, so it is cheap enough for
+    benchmarks and query-count tests with thousands of rows.
+    """
+    return User.objects.bulk_create([
+        build_test_student(
+            f'{prefix}_{index}',
+            student_id=f'{prefix}{index:05d}',
+            **kwargs
+        )
+        for index in range(count)
+    ])
+
+
 def create_test_department(name=TEST_DEPARTMENT, code='CS', **kwargs):
     """Create a test department"""
     return Department.objects.get_or_create(
@@ -219,12 +246,3 @@ def create_test_grade(
         score=Decimal(str(score or TEST_GRADE_SCORE)),
         **kwargs
     )
-
-
-
-
-
-
-
-
-
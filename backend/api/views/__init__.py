@@ -54,6 +54,7 @@ from .contact import (
 from .bulk_operations import (
     bulk_import_students,
     bulk_export_grades,
+    bulk_export_gradebook,
     bulk_import_grades,
 )
 
@@ -127,6 +128,7 @@ __all__ = [
     # Bulk Operations
     'bulk_import_students',
     'bulk_export_grades',
+    'bulk_export_gradebook',
     'bulk_import_grades',
     # Bulk Views (class-based)
     'BulkStudentImportView',
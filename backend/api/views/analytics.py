@@ -1,5 +1,7 @@
 """ANALYTICS Views Module"""
 
+import math
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
@@ -21,7 +23,13 @@ from ..models import (
     AssessmentLO, LOPO
 )
 from ..utils import log_activity, get_institution_for_user
-from ..cache_utils import cache_response, invalidate_dashboard_cache
+from ..cache_utils import (
+    cache_response, invalidate_dashboard_cache, get_or_set_cache, curriculum_cache_key
+)
+from ..models.course import MAX_YEAR_OF_STUDY
+from ..services.analytics_sketch_service import AnalyticsSketchService, SKETCH_EXACT_THRESHOLD
+from ..services.achievement_snapshot_service import AchievementSnapshotService
+from ..sketches import DEFAULT_K as SKETCH_K
 from ..serializers import (
     UserSerializer, UserDetailSerializer, UserCreateSerializer, LoginSerializer,
     TeacherCreateSerializer, InstitutionCreateSerializer,
@@ -40,6 +48,33 @@ from ..serializers import (
 )
 
 
+# Percentiles reported by institution-wide distribution endpoints
+REPORTED_PERCENTILES = (('p10', 0.1), ('p50', 0.5), ('p90', 0.9))
+
+# Approximate normalized rank error of merged KLL sketches (see api.sketches)
+SKETCH_RANK_ERROR = round(1.7 / SKETCH_K, 4)
+
+
+def _exact_percentiles(sorted_values):
+    """
+    Nearest-rank percentiles of an already sorted list of floats: the first
+    value whose rank reaches ``q * n``, the same rule ``KLLSketch.quantiles``
+    applies, so small populations get the same answer on both paths.
+    """
+    n = len(sorted_values)
+    return {
+        name: round(sorted_values[max(math.ceil(q * n) - 1, 0)], 1) if n > 0 else None
+        for name, q in REPORTED_PERCENTILES
+    }
+
+
+def _sketch_percentiles(sketch):
+    """Percentiles estimated from a (merged) KLL sketch."""
+    values = sketch.quantiles([q for _, q in REPORTED_PERCENTILES])
+    return {
+        name: round(value, 1) if value is not None else None
+        for (name, _), value in zip(REPORTED_PERCENTILES, values)
+    }
 
 
 @api_view(['GET'])
@@ -63,6 +98,11 @@ def course_analytics_overview(request):
         student=user
     ).select_related('course', 'course__teacher')
     
+    # Trends come from the achievement snapshot history (one query for all courses)
+    course_trends = AchievementSnapshotService.course_trends(
+        enrollments.values_list('course_id', flat=True)
+    )
+    
     # Use a set to track unique course codes to avoid duplicates
     seen_courses = set()
     course_analytics_list = []
@@ -108,8 +148,8 @@ def course_analytics_overview(request):
         
         class_stats['median'] = median
         
-        # Determine trend (simplified - compare with previous semester if available)
-        trend = 'neutral'  # Will be calculated based on historical data
+        # Trend of the class's PO achievement between the two latest snapshots
+        course_trend = course_trends.get(course.id, {'trend': 'neutral', 'delta': None})
         
         course_analytics_list.append({
             'course_id': course.id,
@@ -122,7 +162,8 @@ def course_analytics_overview(request):
             'class_size': class_stats['count'],
             'user_score': float(user_score) if user_score else None,
             'user_percentile': user_percentile,
-            'trend': trend
+            'trend': course_trend['trend'],
+            'trend_delta': course_trend['delta']
         })
     
     return Response({
@@ -376,6 +417,13 @@ def analytics_po_trends(request):
     GET /api/analytics/po-trends/
     Query params: ?semester=FALL&academic_year=2024-2025
     Returns PO achievement trends for chart visualization
+    
+    Per-PO P10/P50/P90 percentiles cover the PO achievements of students
+    with a graded enrollment in the filtered courses, counted once per
+    enrollment (null when there is none). They are exact for small
+    populations and merged from current per-course quantile sketches above
+    ANALYTICS_SKETCH_EXACT_THRESHOLD achievements. History, trend and
+    delta are read from the daily achievement snapshots.
     """
     user = request.user
     
@@ -411,6 +459,40 @@ def analytics_po_trends(request):
     # Get students from enrollments
     student_ids = list(enrollments.values_list('student_id', flat=True).distinct())
     
+    # PO achievement percentiles over the graded enrollments of the filtered
+    # courses, one value per enrollment like the per-course sketches, so the
+    # exact and the merged answer describe the same population
+    enrolled_achievements = StudentPOAchievement.objects.filter(
+        program_outcome__in=pos,
+        student__enrollments__in=enrollments.values('pk')
+    )
+    approximate = enrolled_achievements.count() > SKETCH_EXACT_THRESHOLD
+    if approximate:
+        course_ids = list(enrollments.values_list('course_id', flat=True).distinct())
+        approximate = AnalyticsSketchService.sketches_current(course_ids)
+    
+    if approximate:
+        po_sketches = AnalyticsSketchService.merge_po_achievements(course_ids)
+        po_percentiles = {
+            po_id: _sketch_percentiles(sketch) for po_id, sketch in po_sketches.items()
+        }
+    else:
+        values_by_po = {}
+        for po_id, percentage in enrolled_achievements.values_list(
+            'program_outcome_id', 'current_percentage'
+        ):
+            values_by_po.setdefault(po_id, []).append(float(percentage))
+        po_percentiles = {
+            po_id: _exact_percentiles(sorted(values)) for po_id, values in values_by_po.items()
+        }
+    empty_percentiles = {name: None for name, _ in REPORTED_PERCENTILES}
+    
+    # Historical series from achievement snapshots (no recomputation from grades)
+    po_history = AchievementSnapshotService.po_history(
+        semester=int(semester) if semester and semester.isdigit() else None,
+        academic_year=academic_year
+    )
+    
     # Calculate PO trends
     po_trends = []
     for po in pos:
@@ -451,6 +533,9 @@ def analytics_po_trends(request):
         else:
             po_status = 'not-achieved'
         
+        history = po_history.get(po.id, [])
+        trend = AchievementSnapshotService.delta(history)
+        
         po_trends.append({
             'code': po.code,
             'title': po.title,
@@ -459,12 +544,18 @@ def analytics_po_trends(request):
             'total_students': total_students,
             'students_achieved': students_achieved,
             'achievement_rate': achievement_rate,
+            'percentiles': po_percentiles.get(po.id, empty_percentiles),
+            'history': history,
+            'trend': trend['trend'],
+            'delta': trend['delta'],
             'status': po_status
         })
     
     return Response({
         'success': True,
         'program_outcomes': po_trends,
+        'percentiles_approximate': approximate,
+        'percentile_rank_error': SKETCH_RANK_ERROR if approximate else 0,
         'filters': {
             'semester': semester,
             'academic_year': academic_year
@@ -481,6 +572,10 @@ def analytics_performance_distribution(request):
     GET /api/analytics/performance-distribution/
     Query params: ?department=Computer Science
     Returns performance distribution for histogram chart
+    
+    Above ANALYTICS_SKETCH_EXACT_THRESHOLD final grades the histogram and
+    percentiles are merged from current per-course quantile sketches
+    (statistics.approximate / statistics.rank_error describe the bound).
     """
     user = request.user
     
@@ -506,7 +601,11 @@ def analytics_performance_distribution(request):
         )
         enrollments_query = enrollments_query.filter(student__in=dept_students)
     
-    enrollments = enrollments_query.select_related('student')
+    total_students = enrollments_query.count()
+    approximate = total_students > SKETCH_EXACT_THRESHOLD
+    if approximate:
+        course_ids = list(enrollments_query.values_list('course_id', flat=True).distinct())
+        approximate = AnalyticsSketchService.sketches_current(course_ids)
     
     # Calculate distribution (bins: 0-20, 21-40, 41-60, 61-80, 81-100)
     distribution = {
@@ -517,30 +616,60 @@ def analytics_performance_distribution(request):
         '81-100': 0
     }
     
-    for enrollment in enrollments:
-        score = float(enrollment.final_grade)
-        if score <= 20:
-            distribution['0-20'] += 1
-        elif score <= 40:
-            distribution['21-40'] += 1
-        elif score <= 60:
-            distribution['41-60'] += 1
-        elif score <= 80:
-            distribution['61-80'] += 1
-        else:
-            distribution['81-100'] += 1
-    
-    # Calculate statistics
-    scores = [float(e.final_grade) for e in enrollments]
-    total_students = len(scores)
-    
-    stats = {
-        'total_students': total_students,
-        'average': round(sum(scores) / total_students, 1) if total_students > 0 else 0,
-        'median': round(sorted(scores)[total_students // 2], 1) if total_students > 0 else 0,
-        'min': round(min(scores), 1) if scores else 0,
-        'max': round(max(scores), 1) if scores else 0
-    }
+    if approximate:
+        # Large populations: merge per-course quantile sketches instead of
+        # loading every enrollment (see api.sketches for error bounds)
+        sketch = AnalyticsSketchService.merge_final_grades(course_ids, department=department)
+        
+        previous = 0
+        for label, upper in (('0-20', 20), ('21-40', 40), ('41-60', 60), ('61-80', 80)):
+            below = sketch.count_le(upper)
+            distribution[label] = max(below - previous, 0)
+            previous = max(below, previous)
+        distribution['81-100'] = max(sketch.n - previous, 0)
+        
+        aggregates = enrollments_query.aggregate(
+            avg=Avg('final_grade'),
+            min_score=Min('final_grade'),
+            max_score=Max('final_grade')
+        )
+        percentiles = _sketch_percentiles(sketch)
+        stats = {
+            'total_students': total_students,
+            'average': round(float(aggregates['avg']), 1) if aggregates['avg'] is not None else 0,
+            'median': percentiles['p50'] if percentiles['p50'] is not None else 0,
+            'min': round(float(aggregates['min_score']), 1) if aggregates['min_score'] is not None else 0,
+            'max': round(float(aggregates['max_score']), 1) if aggregates['max_score'] is not None else 0
+        }
+    else:
+        scores = sorted(float(score) for score in enrollments_query.values_list('final_grade', flat=True))
+        
+        for score in scores:
+            if score <= 20:
+                distribution['0-20'] += 1
+            elif score <= 40:
+                distribution['21-40'] += 1
+            elif score <= 60:
+                distribution['41-60'] += 1
+            elif score <= 80:
+                distribution['61-80'] += 1
+            else:
+                distribution['81-100'] += 1
+        
+        # Calculate statistics
+        total_students = len(scores)
+        percentiles = _exact_percentiles(scores)
+        stats = {
+            'total_students': total_students,
+            'average': round(sum(scores) / total_students, 1) if total_students > 0 else 0,
+            'median': round(scores[total_students // 2], 1) if total_students > 0 else 0,
+            'min': round(scores[0], 1) if scores else 0,
+            'max': round(scores[-1], 1) if scores else 0
+        }
+    
+    stats['percentiles'] = percentiles
+    stats['approximate'] = approximate
+    stats['rank_error'] = SKETCH_RANK_ERROR if approximate else 0
     
     return Response({
         'success': True,
@@ -596,24 +725,24 @@ def analytics_course_success(request):
     if academic_year:
         courses_query = courses_query.filter(academic_year=academic_year)
     
-    courses = courses_query.select_related('teacher')
+    # One grouped query for every course instead of per-course enrollment queries
+    graded = Q(enrollments__final_grade__isnull=False)
+    courses = courses_query.select_related('teacher').annotate(
+        graded_students=Count('enrollments', filter=graded),
+        passed_students=Count('enrollments', filter=graded & Q(enrollments__final_grade__gte=60)),
+        avg_final_grade=Avg('enrollments__final_grade', filter=graded)
+    )
     
     course_success = []
     for course in courses:
-        # Get all enrollments for this course
-        enrollments = Enrollment.objects.filter(
-            course=course,
-            final_grade__isnull=False
-        )
-        
-        total_students = enrollments.count()
+        total_students = course.graded_students
         
         # Success rate: students with grade >= 60
-        successful_students = enrollments.filter(final_grade__gte=60).count()
+        successful_students = course.passed_students
         success_rate = round((successful_students / total_students * 100), 1) if total_students > 0 else 0
         
         # Average grade
-        avg_grade = enrollments.aggregate(avg=Avg('final_grade'))['avg']
+        avg_grade = course.avg_final_grade
         avg_grade = round(float(avg_grade), 1) if avg_grade else None
         
         course_success.append({
@@ -652,6 +781,10 @@ def analytics_alerts(request):
     
     GET /api/analytics/alerts/
     Returns alerts about PO achievements, departments, etc.
+    
+    Rules are evaluated over a metrics frame covering every PO and every
+    department (see _build_alert_metrics); the five most severe alerts are
+    returned along with the total count.
     """
     user = request.user
     
@@ -660,82 +793,114 @@ def analytics_alerts(request):
             'error': 'This endpoint is only for institution admins'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    alerts = []
+    metrics = _build_alert_metrics()
+    alerts = _evaluate_alert_rules(metrics)
+    
+    # Most severe first, limit to 5
+    total_alerts = len(alerts)
+    alerts.sort(key=lambda x: x['severity'], reverse=True)
+    alerts = [
+        {key: value for key, value in alert.items() if key != 'severity'}
+        for alert in alerts[:5]
+    ]
+    
+    return Response({
+        'success': True,
+        'alerts': alerts,
+        'total_alerts': total_alerts
+    })
+
+
+# Department-level PO achievement thresholds used by the alert rules
+DEPARTMENT_WARNING_THRESHOLD = 70
+DEPARTMENT_SUCCESS_THRESHOLD = 80
+
+
+def _build_alert_metrics():
+    """
+    Precompute the metrics frame the alert rules run over.
+    
+    Two grouped queries cover every active PO and every department, so
+    alert cost does not grow with the number of departments.
+    """
+    program_outcomes = list(
+        ProgramOutcome.objects.filter(is_active=True).annotate(
+            avg_achievement=Avg('student_achievements__current_percentage')
+        ).values('code', 'target_percentage', 'avg_achievement')
+    )
     
-    # Check for POs below target
-    pos_below_target = ProgramOutcome.objects.filter(is_active=True).annotate(
-        avg_achievement=Avg('student_achievements__current_percentage')
-    ).filter(
-        avg_achievement__lt=F('target_percentage')
+    departments = list(
+        StudentPOAchievement.objects.filter(
+            student__role=User.Role.STUDENT,
+            student__is_active=True,
+            student__department__isnull=False
+        ).exclude(
+            student__department=''
+        ).values('student__department').annotate(
+            avg_achievement=Avg('current_percentage')
+        ).order_by('student__department').values_list('student__department', 'avg_achievement')
     )
     
-    for po in pos_below_target:
-        avg = float(po.avg_achievement) if po.avg_achievement else 0
-        target = float(po.target_percentage)
+    return {
+        'program_outcomes': program_outcomes,
+        'departments': departments,
+    }
+
+
+def _evaluate_alert_rules(metrics):
+    """
+    Evaluate alert rules over a precomputed metrics frame.
+    
+    Each alert carries a 'severity' used for ordering (removed before the
+    response is returned).
+    """
+    now = timezone.now().isoformat()
+    alerts = []
+    
+    # POs below target
+    for po in metrics['program_outcomes']:
+        if po['avg_achievement'] is None or po['avg_achievement'] >= po['target_percentage']:
+            continue
+        avg = float(po['avg_achievement'])
+        target = float(po['target_percentage'])
         alerts.append({
             'type': 'warning',
-            'title': f'{po.code} Below Target',
+            'title': f"{po['code']} Below Target",
             'description': f'Current: {avg:.1f}% (Target: {target:.1f}%)',
-            'created_at': timezone.now().isoformat(),
-            'time': 'Recently'
+            'created_at': now,
+            'time': 'Recently',
+            'severity': 100 + (target - avg)
         })
     
-    # Check for departments with low PO achievement
-    department_list = User.objects.filter(
-        role=User.Role.STUDENT,
-        is_active=True,
-        department__isnull=False
-    ).values_list('department', flat=True).distinct()
-    
-    for dept in department_list[:3]:  # Limit to 3 departments
-        dept_students = User.objects.filter(
-            role=User.Role.STUDENT,
-            is_active=True,
-            department=dept
-        )
-        dept_po_achievements = StudentPOAchievement.objects.filter(
-            student__in=dept_students
-        )
-        po_avg = dept_po_achievements.aggregate(avg=Avg('current_percentage'))['avg']
-        
-        if po_avg and po_avg < 70:
+    # Departments with low PO achievement
+    for dept, po_avg in metrics['departments']:
+        if po_avg and po_avg < DEPARTMENT_WARNING_THRESHOLD:
             alerts.append({
                 'type': 'warning',
                 'title': f'{dept} - Low PO Achievement',
                 'description': f'Average PO achievement: {float(po_avg):.1f}%',
-                'created_at': timezone.now().isoformat(),
-                'time': 'Recently'
-            })
-    
-    # Success alerts for departments exceeding targets
-    for dept in department_list[:2]:  # Limit to 2
-        dept_students = User.objects.filter(
-            role=User.Role.STUDENT,
-            is_active=True,
-            department=dept
-        )
-        dept_po_achievements = StudentPOAchievement.objects.filter(
-            student__in=dept_students
-        )
-        po_avg = dept_po_achievements.aggregate(avg=Avg('current_percentage'))['avg']
-        
-        if po_avg and po_avg >= 80:
-            alerts.append({
-                'type': 'success',
-                'title': f'{dept} Exceeds All Targets',
-                'description': f'All POs above target (Avg: {float(po_avg):.1f}%)',
-                'created_at': timezone.now().isoformat(),
-                'time': 'Recently'
+                'created_at': now,
+                'time': 'Recently',
+                'severity': 100 + (DEPARTMENT_WARNING_THRESHOLD - float(po_avg))
             })
-            break  # Only one success alert
     
-    # Sort by created_at (most recent first) and limit to 5
-    alerts = sorted(alerts, key=lambda x: x.get('created_at', ''), reverse=True)[:5]
+    # Success alert for the best department exceeding targets (only one)
+    exceeding = [
+        (dept, po_avg) for dept, po_avg in metrics['departments']
+        if po_avg and po_avg >= DEPARTMENT_SUCCESS_THRESHOLD
+    ]
+    if exceeding:
+        dept, po_avg = max(exceeding, key=lambda item: item[1])
+        alerts.append({
+            'type': 'success',
+            'title': f'{dept} Exceeds All Targets',
+            'description': f'All POs above target (Avg: {float(po_avg):.1f}%)',
+            'created_at': now,
+            'time': 'Recently',
+            'severity': 0
+        })
     
-    return Response({
-        'success': True,
-        'alerts': alerts
-    })
+    return alerts
 
 # =============================================================================
 # DEPARTMENT CURRICULUM VIEW
@@ -749,6 +914,9 @@ def department_curriculum(request):
     
     GET /api/analytics/department-curriculum/?department=Computer Science
     Returns curriculum structure with courses organized by year and semester
+    
+    The assembled curriculum is cached per department and invalidated
+    when the department's courses or their enrollments change.
     """
     user = request.user
     
@@ -763,35 +931,38 @@ def department_curriculum(request):
             'error': 'Department parameter is required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Get all courses for this department
-    courses = Course.objects.filter(department=department).select_related('teacher').order_by('code', 'academic_year')
-    
-    # Helper function to extract year of study from course code
-    # Examples: CS101 -> 1, CS201 -> 2, CS301 -> 3, CS401 -> 4
-    def extract_year_from_code(course_code):
-        """Extract year of study from course code (assuming format like CS101, CS201, CS301, CS401, etc.)"""
-        import re
-        # Try to find a 3-digit number pattern (e.g., 101, 201, 301, 401)
-        # This matches patterns like: CS101, CS201, CS301, CS401, MATH101, etc.
-        match = re.search(r'(\d{3})', course_code)
-        if match:
-            code_number = int(match.group(1))
-            # Extract the hundreds digit
-            hundreds = code_number // 100
-            # Course codes typically follow: 1xx = year 1, 2xx = year 2, 3xx = year 3, 4xx = year 4, 5xx = year 5, 6xx = year 6
-            if 1 <= hundreds <= 6:
-                return hundreds
-        # Fallback: try to find any first digit
-        match = re.search(r'(\d)', course_code)
-        if match:
-            first_digit = int(match.group(1))
-            if 1 <= first_digit <= 6:
-                return first_digit
-        return 0  # Unknown year
+    data = get_or_set_cache(
+        curriculum_cache_key(department),
+        settings.CACHE_TIMEOUT_STATIC_DATA,
+        _build_department_curriculum,
+        department
+    )
+    
+    return Response({
+        'success': True,
+        'department': department,
+        **data,
+    })
+
+
+def _build_department_curriculum(department):
+    """
+    Assemble the curriculum of a department from one annotated query.
+    
+    Courses are bucketed by their persisted year_of_study (1-6) and
+    semester; courses with an unknown year are skipped.
+    """
+    courses = Course.objects.filter(
+        department=department,
+        year_of_study__gte=1,
+        year_of_study__lte=MAX_YEAR_OF_STUDY
+    ).select_related('teacher').annotate(
+        enrollment_count=Count('enrollments', filter=Q(enrollments__is_active=True))
+    ).order_by('code', 'academic_year')
     
     # Initialize all 6 years (1-6) with empty data (to support 2, 4, and 6 year programs)
     curriculum_by_year = {}
-    for year in range(1, 7):
+    for year in range(1, MAX_YEAR_OF_STUDY + 1):
         curriculum_by_year[year] = {
             'year': year,
             'fall_semester': [],
@@ -802,19 +973,20 @@ def department_curriculum(request):
             'total_credits_summer': 0,
         }
     
+    semester_buckets = {
+        Course.Semester.FALL: 'fall',
+        Course.Semester.SPRING: 'spring',
+        Course.Semester.SUMMER: 'summer',
+    }
+    
     # Group courses by year of study
     for course in courses:
-        year = extract_year_from_code(course.code)
-        if year == 0 or year > 6:
-            continue  # Skip courses we can't categorize or beyond year 6
-        
-        # Get enrollment count for this course
-        enrollment_count = Enrollment.objects.filter(
-            course=course,
-            is_active=True
-        ).count()
+        bucket = semester_buckets.get(course.semester)
+        if bucket is None:
+            continue
         
-        course_data = {
+        year_data = curriculum_by_year[course.year_of_study]
+        year_data[f'{bucket}_semester'].append({
             'course_id': course.id,
             'course_code': course.code,
             'course_name': course.name,
@@ -822,23 +994,12 @@ def department_curriculum(request):
             'semester': course.get_semester_display(),
             'academic_year': course.academic_year,
             'teacher': course.teacher.get_full_name() if course.teacher else 'TBA',
-            'enrollment_count': enrollment_count,
+            'enrollment_count': course.enrollment_count,
             'description': course.description or '',
-        }
-        
-        # Add to appropriate semester
-        if course.semester == Course.Semester.FALL:
-            curriculum_by_year[year]['fall_semester'].append(course_data)
-            curriculum_by_year[year]['total_credits_fall'] += course.credits
-        elif course.semester == Course.Semester.SPRING:
-            curriculum_by_year[year]['spring_semester'].append(course_data)
-            curriculum_by_year[year]['total_credits_spring'] += course.credits
-        elif course.semester == Course.Semester.SUMMER:
-            curriculum_by_year[year]['summer_semester'].append(course_data)
-            curriculum_by_year[year]['total_credits_summer'] += course.credits
-    
-    # Convert to list and sort by year (should already be sorted 1-4)
-    curriculum_list = sorted(curriculum_by_year.values(), key=lambda x: x['year'])
+        })
+        year_data[f'total_credits_{bucket}'] += course.credits
+    
+    curriculum_list = [curriculum_by_year[year] for year in sorted(curriculum_by_year)]
     
     # Calculate totals
     total_credits = sum(
@@ -848,10 +1009,8 @@ def department_curriculum(request):
         for year_data in curriculum_list
     )
     
-    return Response({
-        'success': True,
-        'department': department,
+    return {
         'curriculum': curriculum_list,
         'total_credits': total_credits,
         'total_years': len(curriculum_list),
-    })
+    }
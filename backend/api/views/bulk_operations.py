@@ -7,22 +7,42 @@ SECURITY: Includes file size limits, row limits, encoding validation
 import csv
 import io
 import logging
+import zlib
+from contextlib import nullcontext
+from itertools import islice
+from typing import NamedTuple
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.db import transaction
-from decimal import Decimal, InvalidOperation
+from django.utils import timezone
+from django.utils.text import slugify
 
-from ..models import User, Course, Enrollment, Assessment, StudentGrade
+from ..models import User, Course, Enrollment, StudentGrade, ActivityLog
+from ..hashers import make_temporary_password_hashes
+from ..services.grade_copy_import_service import GradeCopyImportService
+from ..services.grade_import_service import GradeImportService
+from ..services.gradebook_export_service import GradebookExportService
+from ..services.student_import_service import iter_decoded_lines
 from ..utils import log_activity
+from ..xlsx import XLSX_CONTENT_TYPE
 
 logger = logging.getLogger(__name__)
 
 # SECURITY: CSV Import limits
 MAX_CSV_SIZE = 10 * 1024 * 1024  # 10MB max file size
 MAX_CSV_ROWS = 10000  # Maximum rows to process
+STUDENT_BATCH_SIZE = 500  # Users per INSERT/UPDATE statement
+
+# Streaming export settings
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per server-side cursor round trip
+EXPORT_FLUSH_ROWS = 500  # Rows buffered before a chunk is yielded to the client
+GRADE_EXPORT_HEADER = [
+    'Student ID', 'Student Name', 'Course Code', 'Course Name', 'Assessment',
+    'Score', 'Max Score', 'Percentage', 'Feedback'
+]
 
 
 @api_view(['POST'])
@@ -38,8 +58,12 @@ def bulk_import_students(request):
     CSV Format:
     email,first_name,last_name,student_id,department,year_of_study
     student1@example.com,John,Doe,2024001,Computer Science,2
+    
+    Query Parameters:
+    - dry_run: true to validate and count without writing anything
     """
     user = request.user
+    dry_run = _is_dry_run(request)
     
     if user.role != User.Role.INSTITUTION and not user.is_staff:
         return Response(
@@ -98,9 +122,33 @@ def bulk_import_students(request):
         )
     
     try:
-        # SECURITY: Read and validate CSV encoding (UTF-8 required)
+        # Rows are decoded (UTF-8 required) and parsed lazily, one batch at a time
+        csv_reader = csv.DictReader(iter_decoded_lines(file, 'utf-8'))
+        rows = enumerate(csv_reader, start=2)  # Start at 2 (header is row 1)
+        
+        errors = []
+        credentials = []
+        created_count = 0
+        updated_count = 0
+        processed = 0
+        seen_student_ids = set()
+        dry_run_emails = set() if dry_run else None
+        
         try:
-            decoded_file = file.read().decode('utf-8')
+            with nullcontext() if dry_run else transaction.atomic():
+                while batch := list(islice(rows, STUDENT_BATCH_SIZE)):
+                    processed += len(batch)
+                    # SECURITY: Abort (and roll back) as soon as the row limit is exceeded
+                    if processed > MAX_CSV_ROWS:
+                        raise _RowLimitExceeded()
+                    created, updated = _import_student_batch(
+                        batch, user, errors, seen_student_ids, dry_run_emails=dry_run_emails
+                    )
+                    created_count += len(created)
+                    updated_count += updated
+                    # Only what the emails need outlives the batch
+                    if not dry_run:
+                        credentials.extend(_StudentCredentials.of(student) for student in created)
         except UnicodeDecodeError:
             return Response(
                 {
@@ -113,12 +161,7 @@ def bulk_import_students(request):
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        csv_reader = csv.DictReader(io.StringIO(decoded_file))
-        
-        # SECURITY: Count rows first to prevent DoS
-        rows = list(csv_reader)
-        if len(rows) > MAX_CSV_ROWS:
+        except _RowLimitExceeded:
             return Response(
                 {
                     'success': False,
@@ -131,98 +174,25 @@ def bulk_import_students(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        logger.info(f"Processing student CSV import with {len(rows)} rows by user {request.user.username}")
+        logger.info(f"Processed student CSV import with {processed} rows by user {request.user.username}")
         
-        created_count = 0
-        updated_count = 0
-        errors = []
+        if dry_run:
+            return _dry_run_response(created_count, updated_count, errors, 'students')
         
-        with transaction.atomic():
-            for row_num, row in enumerate(rows, start=2):  # Start at 2 (header is row 1)
-                try:
-                    email = row.get('email', '').strip()
-                    if not email:
-                        errors.append(f"Row {row_num}: Email is required")
-                        continue
-                    
-                    # Get or create user
-                    student, created = User.objects.get_or_create(
-                        email=email,
-                        defaults={
-                            'username': email,
-                            'first_name': row.get('first_name', '').strip(),
-                            'last_name': row.get('last_name', '').strip(),
-                            'role': User.Role.STUDENT,
-                            'student_id': row.get('student_id', '').strip(),
-                            'department': row.get('department', '').strip(),
-                            'year_of_study': int(row.get('year_of_study', 1)) if row.get('year_of_study') else 1,
-                        }
-                    )
-                    
-                    if created:
-                        # Generate temporary password and set it
-                        from ..serializers import generate_temp_password
-                        temp_password = generate_temp_password()
-                        student.set_password(temp_password)
-                        student.is_temporary_password = True
-                        student.created_by = user
-                        student.save()
-                        created_count += 1
-                        
-                        # Send email with credentials (optional, can be skipped if email fails)
-                        try:
-                            from django.core.mail import send_mail
-                            from django.conf import settings
-                            import ssl
-                            import os
-                            
-                            # Ensure SSL skip is applied if needed
-                            if os.environ.get("SENDGRID_SKIP_SSL_VERIFY", "").lower() == "true":
-                                ssl._create_default_https_context = ssl._create_unverified_context
-                            
-                            sendgrid_api_key = getattr(settings, "SENDGRID_API_KEY", "")
-                            if sendgrid_api_key and sendgrid_api_key != "your-sendgrid-api-key-here":
-                                full_name = (student.get_full_name() or "").strip()
-                                greeting = f"Hello {full_name},\n\n" if full_name else "Hello,\n\n"
-                                
-                                send_mail(
-                                    subject="Your AcuRate Student Account",
-                                    message=(
-                                        greeting
-                                        + "Your AcuRate student account has been created.\n\n"
-                                        + f"Username: {student.username}\n"
-                                        + f"Email: {student.email}\n"
-                                        + f"Student ID: {student.student_id or 'N/A'}\n"
-                                        + f"Temporary password: {temp_password}\n\n"
-                                        + "Please log in using your EMAIL ADDRESS or USERNAME and this temporary password.\n"
-                                        + "After logging in, you will be REQUIRED to change your password immediately.\n"
-                                        + "You will not be able to use the system until you update your password.\n"
-                                    ),
-                                    from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
-                                    recipient_list=[student.email],
-                                    fail_silently=True,
-                                )
-                        except Exception:
-                            # Email sending failed, but student is created - continue
-                            pass
-                    else:
-                        # Update existing student
-                        student.first_name = row.get('first_name', '').strip() or student.first_name
-                        student.last_name = row.get('last_name', '').strip() or student.last_name
-                        student.department = row.get('department', '').strip() or student.department
-                        if row.get('year_of_study'):
-                            student.year_of_study = int(row.get('year_of_study'))
-                        student.save()
-                        updated_count += 1
-                        
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
+        # Send emails with credentials (optional, can be skipped if email fails)
+        for student in credentials:
+            _send_student_credentials(student)
         
         log_activity(
+            action_type=ActivityLog.ActionType.USER_CREATED,
             user=user,
-            action_type='CREATE',
-            model_name='User',
-            description=f'Bulk imported {created_count} students, updated {updated_count}'
+            description=f'Bulk imported {created_count} students, updated {updated_count}',
+            related_object_type='User',
+            metadata={
+                'created': created_count,
+                'updated': updated_count,
+                'errors': len(errors),
+            }
         )
         
         return Response(
@@ -250,6 +220,192 @@ def bulk_import_students(request):
         )
 
 
+class _RowLimitExceeded(Exception):
+    """Raised to roll back a streaming import that exceeds MAX_CSV_ROWS."""
+
+
+def _is_dry_run(request):
+    """Return True if the import was requested with ?dry_run=true."""
+    return request.query_params.get('dry_run', '').lower() in ('true', '1', 'yes')
+
+
+def _dry_run_response(created_count, updated_count, errors, noun):
+    """Report what an import would do without having written anything."""
+    return Response(
+        {
+            'success': True,
+            'dry_run': True,
+            'created': created_count,
+            'updated': updated_count,
+            'errors': errors if errors else None,
+            'message': f'Dry run: {created_count} {noun} would be created, {updated_count} updated'
+        },
+        status=status.HTTP_200_OK
+    )
+
+
+class _StudentCredentials(NamedTuple):
+    """What the credentials email of a newly imported student needs."""
+    username: str
+    email: str
+    full_name: str
+    student_id: str | None
+    temp_password: str
+    
+    @classmethod
+    def of(cls, student):
+        return cls(student.username, student.email, student.get_full_name(),
+                   student.student_id, student._temp_password)
+
+
+def _import_student_batch(batch, created_by, errors, seen_student_ids, dry_run_emails=None):
+    """
+    Create or update the students of one batch of (row number, row) pairs.
+    
+    Existing users and the student IDs of new students are resolved with
+    one IN query each; new students are inserted with bulk_create and
+    existing ones updated with bulk_update. Student IDs already taken in
+    the database or earlier in the file (``seen_student_ids``, shared
+    across batches) are reported as row errors. Row errors are appended
+    to ``errors``.
+    
+    Passing ``dry_run_emails`` (a set shared across batches) makes it a dry
+    run: nothing is written, and the emails of students that would be
+    created are remembered there so later batches count them as updates,
+    as a real import (which finds them in the database) would.
+    
+    Returns:
+        Tuple of (created students, updated row count).
+    """
+    from ..serializers import generate_temp_password
+    
+    parsed_rows = []
+    for row_num, row in batch:
+        email = row.get('email', '').strip()
+        if not email:
+            errors.append(f"Row {row_num}: Email is required")
+            continue
+        try:
+            year_of_study = int(row.get('year_of_study')) if row.get('year_of_study') else None
+        except ValueError as e:
+            errors.append(f"Row {row_num}: {str(e)}")
+            continue
+        parsed_rows.append((row_num, email, row, year_of_study))
+    
+    existing_users = User.objects.in_bulk(
+        {email for _, email, _, _ in parsed_rows}, field_name='email'
+    )
+    taken_student_ids = set(
+        User.objects.filter(
+            student_id__in={
+                row.get('student_id', '').strip() for _, email, row, _ in parsed_rows
+                if email not in existing_users
+            } - {''}
+        ).values_list('student_id', flat=True)
+    )
+    
+    dry_run = dry_run_emails is not None
+    new_students = {}
+    updated_students = {}
+    updated_count = 0
+    for row_num, email, row, year_of_study in parsed_rows:
+        student = existing_users.get(email) or new_students.get(email)
+        if student is None and dry_run and email in dry_run_emails:
+            # Would have been created by an earlier batch
+            updated_count += 1
+            continue
+        if student is None:
+            student_id = row.get('student_id', '').strip()
+            if student_id and (student_id in taken_student_ids or student_id in seen_student_ids):
+                errors.append(f"Row {row_num}: Student ID {student_id} already exists")
+                continue
+            if student_id:
+                seen_student_ids.add(student_id)
+            student = User(
+                email=email,
+                username=email,
+                first_name=row.get('first_name', '').strip(),
+                last_name=row.get('last_name', '').strip(),
+                role=User.Role.STUDENT,
+                student_id=student_id or None,
+                department=row.get('department', '').strip(),
+                year_of_study=year_of_study or 1,
+                is_temporary_password=True,
+                created_by=created_by,
+            )
+            student._temp_password = generate_temp_password()
+            new_students[email] = student
+            continue
+        
+        # Update existing student (or a repeated row of a new one)
+        student.first_name = row.get('first_name', '').strip() or student.first_name
+        student.last_name = row.get('last_name', '').strip() or student.last_name
+        student.department = row.get('department', '').strip() or student.department
+        if year_of_study:
+            student.year_of_study = year_of_study
+        if student.pk:
+            student.updated_at = timezone.now()
+            updated_students[student.pk] = student
+        updated_count += 1
+    
+    created = list(new_students.values())
+    if dry_run:
+        dry_run_emails.update(new_students)
+        return created, updated_count
+    
+    # Temporary passwords are hashed for the whole batch; brand-new
+    # accounts have no password history to maintain
+    hashes = make_temporary_password_hashes(student._temp_password for student in created)
+    for student, password_hash in zip(created, hashes):
+        student.password = password_hash
+    User.objects.bulk_create(created, batch_size=STUDENT_BATCH_SIZE)
+    User.objects.bulk_update(
+        list(updated_students.values()),
+        ['first_name', 'last_name', 'department', 'year_of_study', 'updated_at'],
+        batch_size=STUDENT_BATCH_SIZE,
+    )
+    return created, updated_count
+
+
+def _send_student_credentials(student):
+    """Email a newly created student (``_StudentCredentials``) their temporary credentials (best effort)."""
+    try:
+        from django.core.mail import send_mail
+        from django.conf import settings
+        import ssl
+        import os
+        
+        # Ensure SSL skip is applied if needed
+        if os.environ.get("SENDGRID_SKIP_SSL_VERIFY", "").lower() == "true":
+            ssl._create_default_https_context = ssl._create_unverified_context
+        
+        sendgrid_api_key = getattr(settings, "SENDGRID_API_KEY", "")
+        if sendgrid_api_key and sendgrid_api_key != "your-sendgrid-api-key-here":
+            full_name = (student.full_name or "").strip()
+            greeting = f"Hello {full_name},\n\n" if full_name else "Hello,\n\n"
+            
+            send_mail(
+                subject="Your AcuRate Student Account",
+                message=(
+                    greeting
+                    + "Your AcuRate student account has been created.\n\n"
+                    + f"Username: {student.username}\n"
+                    + f"Email: {student.email}\n"
+                    + f"Student ID: {student.student_id or 'N/A'}\n"
+                    + f"Temporary password: {student.temp_password}\n\n"
+                    + "Please log in using your EMAIL ADDRESS or USERNAME and this temporary password.\n"
+                    + "After logging in, you will be REQUIRED to change your password immediately.\n"
+                    + "You will not be able to use the system until you update your password.\n"
+                ),
+                from_email=getattr(settings, "DEFAULT_FROM_EMAIL", None),
+                recipient_list=[student.email],
+                fail_silently=True,
+            )
+    except Exception:
+        # Email sending failed, but student is created - continue
+        pass
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def bulk_export_grades(request):
@@ -257,6 +413,9 @@ def bulk_export_grades(request):
     Export grades to CSV
     
     GET /api/bulk/export/grades/?course_id=1&assessment_id=2
+    Optional: &compress=gzip to download a gzip-compressed file
+    
+    The CSV is streamed, so memory use does not grow with the export size.
     """
     user = request.user
     
@@ -277,7 +436,7 @@ def bulk_export_grades(request):
     assessment_id = request.query_params.get('assessment_id')
     
     # Build query
-    grades_query = StudentGrade.objects.select_related('student', 'assessment', 'assessment__course')
+    grades_query = StudentGrade.objects.all()
     
     if course_id:
         grades_query = grades_query.filter(assessment__course_id=course_id)
@@ -286,31 +445,169 @@ def bulk_export_grades(request):
     if user.role == User.Role.TEACHER:
         grades_query = grades_query.filter(assessment__course__teacher=user)
     
-    grades = grades_query.all()
+    rows = _grade_export_csv(grades_query)
     
-    # Create CSV response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="grades_export.csv"'
+    if request.query_params.get('compress', '').lower() == 'gzip':
+        response = StreamingHttpResponse(_gzip_stream(rows), content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename="grades_export.csv.gz"'
+    else:
+        response = StreamingHttpResponse(rows, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="grades_export.csv"'
     
-    writer = csv.writer(response)
-    writer.writerow(['Student ID', 'Student Name', 'Course Code', 'Course Name', 'Assessment', 'Score', 'Max Score', 'Percentage', 'Feedback'])
+    return response
+
+
+def _grade_export_csv(grades_query):
+    """
+    Yield the grade export as CSV text chunks.
     
-    for grade in grades:
+    Rows are read as tuples through a server-side cursor, so memory stays
+    bounded by EXPORT_CHUNK_SIZE regardless of how many grades are exported.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(GRADE_EXPORT_HEADER)
+    
+    rows = grades_query.order_by('id').values_list(
+        'student__student_id',
+        'student__first_name',
+        'student__last_name',
+        'assessment__course__code',
+        'assessment__course__name',
+        'assessment__title',
+        'score',
+        'assessment__max_score',
+        'feedback',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    for count, row in enumerate(rows, start=1):
+        (student_id, first_name, last_name, course_code, course_name,
+         assessment_title, score, max_score, feedback) = row
+        percentage = (score / max_score) * 100 if max_score > 0 else 0
         writer.writerow([
-            grade.student.student_id or '',
-            f"{grade.student.first_name} {grade.student.last_name}",
-            grade.assessment.course.code,
-            grade.assessment.course.name,
-            grade.assessment.title,
-            float(grade.score),
-            float(grade.assessment.max_score),
-            f"{grade.percentage:.2f}%",
-            grade.feedback or '',
+            student_id or '',
+            f"{first_name} {last_name}",
+            course_code,
+            course_name,
+            assessment_title,
+            float(score),
+            float(max_score),
+            f"{percentage:.2f}%",
+            feedback or '',
         ])
+        
+        if count % EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    
+    yield buffer.getvalue()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bulk_export_gradebook(request):
+    """
+    Export a wide gradebook (one row per student, one column per assessment)
+    
+    GET /api/bulk/export/gradebook/?course_id=1
+    GET /api/bulk/export/gradebook/?department=Computer%20Science
+    Optional: &file_format=xlsx for an Excel workbook (default: csv)
+    Optional: &compress=gzip to download a gzip-compressed CSV
+    
+    Assessment columns are followed by LO and PO achievement columns. The
+    file is streamed from a single ordered query, so memory use does not
+    grow with the number of students.
+    """
+    user = request.user
+    
+    if user.role != User.Role.TEACHER and user.role != User.Role.INSTITUTION and not user.is_staff:
+        return Response(
+            {
+                'success': False,
+                'error': {
+                    'type': 'PermissionDenied',
+                    'message': 'Only teachers and institution admins can export gradebooks',
+                    'code': status.HTTP_403_FORBIDDEN,
+                }
+            },
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    course_id = request.query_params.get('course_id')
+    department = request.query_params.get('department')
+    file_format = request.query_params.get('file_format', 'csv').lower()
+    
+    if not course_id and not department:
+        return Response(
+            {
+                'success': False,
+                'error': {
+                    'type': 'ValidationError',
+                    'message': 'course_id or department is required',
+                    'code': status.HTTP_400_BAD_REQUEST,
+                }
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if file_format not in ('csv', 'xlsx'):
+        return Response(
+            {
+                'success': False,
+                'error': {
+                    'type': 'ValidationError',
+                    'message': 'file_format must be csv or xlsx',
+                    'code': status.HTTP_400_BAD_REQUEST,
+                }
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    courses = Course.objects.filter(id=course_id) if course_id else Course.objects.filter(department=department)
+    if user.role == User.Role.TEACHER:
+        courses = courses.filter(teacher=user)
+    
+    scope = courses.values_list('code', flat=True).first() if course_id else department
+    if scope is None:
+        return Response(
+            {
+                'success': False,
+                'error': {
+                    'type': 'NotFound',
+                    'message': 'Course not found',
+                    'code': status.HTTP_404_NOT_FOUND,
+                }
+            },
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    export = GradebookExportService(courses)
+    filename = f"gradebook_{slugify(scope) or 'export'}"
+    
+    if file_format == 'xlsx':
+        response = StreamingHttpResponse(export.iter_xlsx(sheet_name=scope), content_type=XLSX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
+    elif request.query_params.get('compress', '').lower() == 'gzip':
+        response = StreamingHttpResponse(_gzip_stream(export.iter_csv()), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv.gz"'
+    else:
+        response = StreamingHttpResponse(export.iter_csv(), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
     
     return response
 
 
+def _gzip_stream(chunks):
+    """Gzip-compress a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_import_grades(request):
@@ -324,6 +621,9 @@ def bulk_import_grades(request):
     CSV Format:
     student_id,assessment_id,score,feedback
     2024001,1,85.5,Good work
+    
+    Query Parameters:
+    - dry_run: true to validate and count without writing anything
     """
     user = request.user
     
@@ -356,81 +656,35 @@ def bulk_import_grades(request):
     file = request.FILES['file']
     
     try:
-        # Read CSV
-        decoded_file = file.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(decoded_file))
+        if _is_dry_run(request):
+            csv_reader = csv.DictReader(iter_decoded_lines(file, 'utf-8'))
+            result = GradeImportService(user).preview(csv_reader)
+            return _dry_run_response(result.created, result.updated, result.errors, 'grades')
         
-        created_count = 0
-        updated_count = 0
-        errors = []
-        
-        with transaction.atomic():
-            for row_num, row in enumerate(csv_reader, start=2):
-                try:
-                    student_id = row.get('student_id', '').strip()
-                    assessment_id = row.get('assessment_id', '').strip()
-                    score = row.get('score', '').strip()
-                    
-                    if not all([student_id, assessment_id, score]):
-                        errors.append(f"Row {row_num}: student_id, assessment_id, and score are required")
-                        continue
-                    
-                    # Get student and assessment
-                    try:
-                        student = User.objects.get(student_id=student_id, role=User.Role.STUDENT)
-                    except User.DoesNotExist:
-                        errors.append(f"Row {row_num}: Student with ID {student_id} not found")
-                        continue
-                    
-                    try:
-                        assessment = Assessment.objects.get(id=int(assessment_id))
-                    except (Assessment.DoesNotExist, ValueError):
-                        errors.append(f"Row {row_num}: Assessment with ID {assessment_id} not found")
-                        continue
-                    
-                    # Check if teacher has access to this assessment
-                    if user.role == User.Role.TEACHER and assessment.course.teacher != user:
-                        errors.append(f"Row {row_num}: You don't have permission to grade this assessment")
-                        continue
-                    
-                    # Parse score
-                    try:
-                        score_decimal = Decimal(score)
-                    except (InvalidOperation, ValueError):
-                        errors.append(f"Row {row_num}: Invalid score format: {score}")
-                        continue
-                    
-                    # Validate score
-                    if score_decimal < 0 or score_decimal > assessment.max_score:
-                        errors.append(f"Row {row_num}: Score must be between 0 and {assessment.max_score}")
-                        continue
-                    
-                    # Get or create grade
-                    grade, created = StudentGrade.objects.get_or_create(
-                        student=student,
-                        assessment=assessment,
-                        defaults={
-                            'score': score_decimal,
-                            'feedback': row.get('feedback', '').strip(),
-                        }
-                    )
-                    
-                    if not created:
-                        grade.score = score_decimal
-                        grade.feedback = row.get('feedback', '').strip() or grade.feedback
-                        grade.save()
-                        updated_count += 1
-                    else:
-                        created_count += 1
-                        
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
+        if GradeCopyImportService.should_handle(file):
+            # Large loads: COPY into a staging table and merge set-based
+            result = GradeCopyImportService(user).import_file(file)
+        else:
+            # Read CSV
+            decoded_file = file.read().decode('utf-8')
+            csv_reader = csv.DictReader(io.StringIO(decoded_file))
+            
+            # Validate every row up front, then upsert the valid set in one go
+            result = GradeImportService(user).import_rows(csv_reader)
+        created_count = result.created
+        updated_count = result.updated
+        errors = result.errors
         
         log_activity(
+            action_type=ActivityLog.ActionType.GRADE_ASSIGNED,
             user=user,
-            action_type='CREATE',
-            model_name='StudentGrade',
-            description=f'Bulk imported {created_count} grades, updated {updated_count}'
+            description=f'Bulk imported {created_count} grades, updated {updated_count}',
+            related_object_type='StudentGrade',
+            metadata={
+                'created': created_count,
+                'updated': updated_count,
+                'errors': len(errors),
+            }
         )
         
         return Response(
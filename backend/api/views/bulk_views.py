@@ -14,15 +14,16 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.urls import reverse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from ..models import User
+from ..models import User, ImportJob
+from ..serializers import ImportJobSerializer
+from ..services.import_job_service import ImportJobService
 from ..services.student_import_service import (
-    StudentImportService,
-    StudentImportServiceError,
+    MAX_FILE_SIZE, StudentImportService, StudentImportServiceError
 )
-from ..utils import log_activity
 
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,8 @@ class BulkStudentImportView(APIView):
     
     This endpoint allows institution admins to upload a CSV file
     containing student information to create multiple student accounts
-    at once.
+    at once. The upload is stored and processed by a background job;
+    progress is polled from ImportJobStatusView.
     
     Permissions:
         - Requires authentication
@@ -49,17 +51,21 @@ class BulkStudentImportView(APIView):
         - Content-Type: multipart/form-data
         - Body: file (CSV file)
     
-    Response:
+    Response (202):
         {
             "success": true,
-            "data": {
-                "success_count": 10,
-                "skipped_count": 2,
-                "errors": [
-                    {"row": 3, "message": "Email already exists", "email": "..."}
-                ]
-            },
-            "message": "Successfully imported 10 students"
+            "data": {"id": 12, "status": "pending", "processed_rows": 0, ...},
+            "status_url": "/api/students/import/jobs/12/",
+            "message": "Import job submitted. Poll the status URL for progress."
+        }
+    
+    With ``?dry_run=true`` the file is validated synchronously and nothing
+    is written (200):
+        {
+            "success": true,
+            "dry_run": true,
+            "data": {"success_count": 10, "skipped_count": 2, "errors": [...]},
+            "message": "Dry run: 10 students would be created, 2 skipped"
         }
     """
     
@@ -97,36 +103,18 @@ class BulkStudentImportView(APIView):
                 default=False,
                 description='Send welcome emails to newly created students'
             ),
+            openapi.Parameter(
+                name='dry_run',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+                default=False,
+                description='Validate the file and report what would be imported without writing anything'
+            ),
         ],
         responses={
-            200: openapi.Response(
-                description="Import completed",
-                schema=openapi.Schema(
-                    type=openapi.TYPE_OBJECT,
-                    properties={
-                        'success': openapi.Schema(type=openapi.TYPE_BOOLEAN),
-                        'data': openapi.Schema(
-                            type=openapi.TYPE_OBJECT,
-                            properties={
-                                'success_count': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                'skipped_count': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                'errors': openapi.Schema(
-                                    type=openapi.TYPE_ARRAY,
-                                    items=openapi.Schema(
-                                        type=openapi.TYPE_OBJECT,
-                                        properties={
-                                            'row': openapi.Schema(type=openapi.TYPE_INTEGER),
-                                            'message': openapi.Schema(type=openapi.TYPE_STRING),
-                                            'email': openapi.Schema(type=openapi.TYPE_STRING),
-                                        }
-                                    )
-                                ),
-                            }
-                        ),
-                        'message': openapi.Schema(type=openapi.TYPE_STRING),
-                    }
-                )
-            ),
+            200: openapi.Response(description="Dry run result"),
+            202: openapi.Response(description="Import job submitted"),
             400: openapi.Response(description="Validation error"),
             403: openapi.Response(description="Permission denied"),
         },
@@ -195,70 +183,92 @@ class BulkStudentImportView(APIView):
         skip_existing = self._parse_boolean(request.data.get('skip_existing', 'true'))
         send_emails = self._parse_boolean(request.data.get('send_emails', 'false'))
         
+        if uploaded_file.size > MAX_FILE_SIZE:
+            return Response(
+                {
+                    'success': False,
+                    'error': {
+                        'type': 'ValidationError',
+                        'message': f'File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB',
+                        'code': status.HTTP_400_BAD_REQUEST,
+                    }
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if self._parse_boolean(request.query_params.get('dry_run', 'false')):
+            return self._dry_run(uploaded_file, user, skip_existing)
+        
         try:
-            # Create service and perform import
-            service = StudentImportService(uploaded_file)
-            result = service.import_students(
+            # Persist the upload and process it in the background
+            job = ImportJobService.submit(
+                uploaded_file,
                 created_by=user,
-                skip_existing=skip_existing,
-                send_emails=send_emails,
-            )
-            
-            # Log activity
-            log_activity(
-                user=user,
-                action_type='CREATE',
-                model_name='User',
-                description=(
-                    f'Bulk imported {result.success_count} students, '
-                    f'skipped {result.skipped_count}'
-                )
+                options={
+                    'skip_existing': skip_existing,
+                    'send_emails': send_emails,
+                },
             )
             
-            logger.info(
-                f"Student import by {user.username}: "
-                f"{result.success_count} created, {result.skipped_count} skipped"
-            )
+            logger.info(f"Student import job {job.id} submitted by {user.username}")
             
             return Response(
                 {
                     'success': True,
-                    'data': result.to_dict(),
-                    'message': (
-                        f'Successfully imported {result.success_count} students'
-                        + (f', skipped {result.skipped_count}' if result.skipped_count else '')
-                    ),
+                    'data': ImportJobSerializer(job).data,
+                    'status_url': reverse('api:import-job-detail', args=[job.id]),
+                    'message': 'Import job submitted. Poll the status URL for progress.',
                 },
-                status=status.HTTP_200_OK
+                status=status.HTTP_202_ACCEPTED
             )
             
-        except StudentImportServiceError as e:
-            logger.warning(f"Student import validation error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error submitting student import: {str(e)}", exc_info=True)
             return Response(
                 {
                     'success': False,
                     'error': {
-                        'type': 'ValidationError',
-                        'message': str(e),
-                        'code': status.HTTP_400_BAD_REQUEST,
+                        'type': 'ServerError',
+                        'message': f'Failed to submit import: {str(e)}',
+                        'code': status.HTTP_500_INTERNAL_SERVER_ERROR,
                     }
                 },
-                status=status.HTTP_400_BAD_REQUEST
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-            
-        except Exception as e:
-            logger.error(f"Unexpected error during student import: {str(e)}", exc_info=True)
+    
+    def _dry_run(self, uploaded_file, user: User, skip_existing: bool) -> Response:
+        """Validate the upload inline and report the would-be outcome."""
+        try:
+            result = StudentImportService(uploaded_file).import_students(
+                created_by=user,
+                skip_existing=skip_existing,
+                dry_run=True,
+            )
+        except StudentImportServiceError as e:
             return Response(
                 {
                     'success': False,
                     'error': {
-                        'type': 'ServerError',
-                        'message': f'Failed to import students: {str(e)}',
-                        'code': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        'type': 'ValidationError',
+                        'message': str(e),
+                        'code': status.HTTP_400_BAD_REQUEST,
                     }
                 },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                status=status.HTTP_400_BAD_REQUEST
             )
+        
+        return Response(
+            {
+                'success': True,
+                'dry_run': True,
+                'data': result.to_dict(),
+                'message': (
+                    f'Dry run: {result.success_count} students would be created, '
+                    f'{result.skipped_count} skipped'
+                ),
+            },
+            status=status.HTTP_200_OK
+        )
     
     def _parse_boolean(self, value: Any) -> bool:
         """Parse a boolean value from request data."""
@@ -320,3 +330,63 @@ class BulkStudentImportView(APIView):
             status=status.HTTP_200_OK
         )
 
+
+
+# =============================================================================
+# IMPORT JOB STATUS VIEW
+# =============================================================================
+
+class ImportJobStatusView(APIView):
+    """
+    API View for polling a background import job.
+    
+    Returns status, processed/total rows, throughput and per-row errors.
+    Jobs are visible to the user who submitted them and to staff.
+    """
+    
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_summary="Get import job status",
+        responses={
+            200: openapi.Response(description="Import job"),
+            404: openapi.Response(description="Job not found"),
+        },
+        tags=['Bulk Operations'],
+    )
+    def get(self, request: Request, job_id: int) -> Response:
+        """
+        Handle GET request for an import job.
+        
+        Args:
+            request: DRF Request object.
+            job_id: ImportJob ID.
+        
+        Returns:
+            Response with the serialized job.
+        """
+        jobs = ImportJob.objects.all()
+        if not request.user.is_staff:
+            jobs = jobs.filter(created_by=request.user)
+        
+        job = jobs.filter(pk=job_id).first()
+        if job is None:
+            return Response(
+                {
+                    'success': False,
+                    'error': {
+                        'type': 'NotFound',
+                        'message': 'Import job not found',
+                        'code': status.HTTP_404_NOT_FOUND,
+                    }
+                },
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(
+            {
+                'success': True,
+                'data': ImportJobSerializer(job).data,
+            },
+            status=status.HTTP_200_OK
+        )
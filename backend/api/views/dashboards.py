@@ -176,13 +176,7 @@ def teacher_dashboard(request):
         }, status=status.HTTP_403_FORBIDDEN)
     
     # Get teacher's courses with all necessary prefetches
-    courses = Course.objects.filter(
-        teacher=user
-    ).prefetch_related(
-        'enrollments',
-        'course_pos__program_outcome',
-        'learning_outcomes'
-    ).select_related('teacher')
+    courses = CourseDetailSerializer.setup_eager_loading(Course.objects.filter(teacher=user))
     
     # Calculate total students (active enrollments)
     total_students = Enrollment.objects.filter(
@@ -244,32 +238,25 @@ def teacher_dashboard(request):
                 })
     
     # Calculate PO achievement per course for better frontend display
+    # (one grouped query over the active enrollments of all courses)
+    course_po_averages = {}
+    if po_achievements_data and teacher_dept:
+        course_po_averages = dict(Enrollment.objects.filter(
+            course__teacher=user,
+            is_active=True
+        ).values('course_id').annotate(
+            avg=Avg(
+                'student__po_achievements__current_percentage',
+                filter=Q(student__po_achievements__program_outcome__department=teacher_dept)
+            )
+        ).values_list('course_id', 'avg'))
+    
     courses_with_po = []
     for course in courses:
-        # Get students enrolled in this course
-        course_student_ids = Enrollment.objects.filter(
-            course=course,
-            is_active=True
-        ).values_list('student_id', flat=True).distinct()
-        
-        # Calculate average PO achievement for this course's students
-        course_po_avg = 0
-        if course_student_ids and po_achievements_data:
-            # Get PO achievements for students in this course
-            course_po_achievements = StudentPOAchievement.objects.filter(
-                student_id__in=course_student_ids,
-                program_outcome__department=teacher_dept
-            ) if teacher_dept else StudentPOAchievement.objects.none()
-            
-            if course_po_achievements.exists():
-                course_avg = course_po_achievements.aggregate(
-                    avg=Avg('current_percentage')
-                )['avg']
-                course_po_avg = round(float(course_avg), 2) if course_avg else 0
-        
+        course_avg = course_po_averages.get(course.id)
         courses_with_po.append({
             'course_id': course.id,
-            'avg_po_achievement': course_po_avg
+            'avg_po_achievement': round(float(course_avg), 2) if course_avg else 0
         })
     
     # Serialize data manually (like student_dashboard)
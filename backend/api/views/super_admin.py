@@ -23,6 +23,9 @@ from ..models import (
     AssessmentLO, LOPO
 )
 from ..utils import log_activity, get_institution_for_user
+from ..pagination import KeysetPagination
+from ..renderers import json_list_response
+from ..search import full_text_search
 from ..serializers import (
     UserSerializer, UserDetailSerializer, UserCreateSerializer, LoginSerializer,
     TeacherCreateSerializer, InstitutionCreateSerializer,
@@ -246,8 +249,11 @@ def super_admin_activity_logs(request):
     Get activity logs for super admin
     
     GET /api/super-admin/activity-logs/
-    Query params: ?institution_id=1&action_type=user_created&department=Computer Science&limit=100
+    Query params: ?institution_id=1&action_type=user_created&department=Computer Science&search=grade&limit=100
     Returns activity logs with filtering options
+
+    Pass ?page_size=N (and then the returned ?cursor=...) for keyset pages
+    instead of the most recent ``limit`` logs.
     """
     user = request.user
     
@@ -288,45 +294,53 @@ def super_admin_activity_logs(request):
         logs = logs.filter(department=department)
     
     if search:
-        logs = logs.filter(description__icontains=search)
+        logs = full_text_search(logs, search)
     
     # Order by most recent first
-    logs = logs.order_by('-created_at')[:limit]
-    
-    # Serialize logs
-    log_data = []
-    for log in logs:
-        log_data.append({
-            'id': log.id,
-            'action_type': log.action_type,
-            'action_type_display': log.get_action_type_display(),
-            'description': log.description,
-            'user': {
-                'id': log.user.id if log.user else None,
-                'username': log.user.username if log.user else None,
-                'full_name': log.user.get_full_name() if log.user else None,
-                'role': log.user.role if log.user else None,
-            } if log.user else None,
-            'institution': {
-                'id': log.institution.id if log.institution else None,
-                'username': log.institution.username if log.institution else None,
-                'full_name': log.institution.get_full_name() if log.institution else None,
-            } if log.institution else None,
-            'department': log.department,
-            'related_object_type': log.related_object_type,
-            'related_object_id': log.related_object_id,
-            'metadata': log.metadata,
-            'created_at': log.created_at.isoformat(),
-            'time_ago': _get_time_ago(log.created_at)
-        })
+    logs = logs.order_by('-created_at')
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(logs, request)
+    if page is None:
+        # Large ?limit= values are streamed straight from the cursor
+        rows = map(_serialize_activity_log, logs[:limit].iterator(chunk_size=2000))
+        return json_list_response(request, rows, envelope={'success': True}, list_key='logs', count_key='count')
     
+    log_data = [_serialize_activity_log(log) for log in page]
     return Response({
         'success': True,
         'logs': log_data,
-        'count': len(log_data)
+        'count': len(log_data),
+        'next': paginator.get_next_link(),
     })
 
 
+def _serialize_activity_log(log):
+    """Serialize one activity log for super_admin_activity_logs"""
+    return {
+        'id': log.id,
+        'action_type': log.action_type,
+        'action_type_display': log.get_action_type_display(),
+        'description': log.description,
+        'user': {
+            'id': log.user.id if log.user else None,
+            'username': log.user.username if log.user else None,
+            'full_name': log.user.get_full_name() if log.user else None,
+            'role': log.user.role if log.user else None,
+        } if log.user else None,
+        'institution': {
+            'id': log.institution.id if log.institution else None,
+            'username': log.institution.username if log.institution else None,
+            'full_name': log.institution.get_full_name() if log.institution else None,
+        } if log.institution else None,
+        'department': log.department,
+        'related_object_type': log.related_object_type,
+        'related_object_id': log.related_object_id,
+        'metadata': log.metadata,
+        'created_at': log.created_at.isoformat(),
+        'time_ago': _get_time_ago(log.created_at)
+    }
+
+
 def _get_time_ago(dt):
     """Helper function to get human-readable time ago"""
     from django.utils import timezone
@@ -3,6 +3,8 @@
 All database write operations use transactions to ensure data consistency.
 """
 
+from dataclasses import asdict
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
@@ -10,7 +12,8 @@ from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.exceptions import PermissionDenied
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.db.models import Q, Avg, Count, F, Min, Max, StdDev
+from django.db.models import Q, Avg, Count, F, Min, Max, StdDev, Case, When, Value, FloatField
+from django.db.models.functions import Cast
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -25,7 +28,15 @@ from ..models import (
     AssessmentLO, LOPO
 )
 from ..utils import log_activity, get_institution_for_user
-from ..cache_utils import cache_response, invalidate_dashboard_cache
+from ..pagination import KeysetPaginationMixin
+from ..fieldsets import SparseFieldsetMixin
+from ..stats import StatsMixin, StatsSpec, Derived, percent
+from ..search import FullTextSearchFilter
+from ..renderers import json_list_response
+from ..services.grade_import_service import GradeImportService, GRADE_BATCH_MAX_ITEMS
+from ..cache_utils import (
+    cache_response, invalidate_dashboard_cache, get_or_set_cache, lo_heatmap_cache_key
+)
 from ..serializers import (
     UserSerializer, UserDetailSerializer, UserCreateSerializer, LoginSerializer,
     TeacherCreateSerializer, InstitutionCreateSerializer,
@@ -34,9 +45,9 @@ from ..serializers import (
     LearningOutcomeSerializer,
     CourseSerializer, CourseDetailSerializer,
     EnrollmentSerializer, AssessmentSerializer,
-    StudentGradeSerializer, StudentGradeDetailSerializer,
+    StudentGradeSerializer, StudentGradeDetailSerializer, StudentGradeProjection,
     StudentPOAchievementSerializer, StudentPOAchievementDetailSerializer,
-    StudentLOAchievementSerializer,
+    StudentLOAchievementSerializer, StudentLOAchievementProjection,
     StudentDashboardSerializer, TeacherDashboardSerializer, InstitutionDashboardSerializer,
     ContactRequestSerializer, ContactRequestCreateSerializer,
     AssessmentLOSerializer, LOPOSerializer,
@@ -45,19 +56,119 @@ from ..serializers import (
 
 
 
+# =============================================================================
+# STATISTICS
+# =============================================================================
+
+def _ratio_percent(numerator, denominator):
+    """Average-able ``numerator / denominator * 100`` per row, 0 where the denominator is 0"""
+    return Case(
+        When(**{f'{denominator}__gt': 0}, then=Cast(numerator, FloatField()) * 100 / F(denominator)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def _achievement_stats(outcome, dimensions):
+    """Statistics shared by the PO and LO achievement viewsets"""
+    return StatsSpec(
+        aggregates={
+            'total_achievements': Count('id'),
+            'student_count': Count('student', distinct=True),
+            'targets_met': Count('id', filter=Q(current_percentage__gte=F(f'{outcome}__target_percentage'))),
+            'average_percentage': Avg('current_percentage', default=0),
+            'min_percentage': Min('current_percentage'),
+            'max_percentage': Max('current_percentage'),
+            'stddev_percentage': StdDev('current_percentage'),
+            'average_completion_rate': Avg(
+                _ratio_percent('completed_assessments', 'total_assessments'), default=0.0
+            ),
+        },
+        derived={
+            'targets_not_met': Derived(
+                lambda row: row['total_achievements'] - row['targets_met'],
+                ('total_achievements', 'targets_met'),
+            ),
+            'success_rate': Derived(
+                lambda row: percent(row['targets_met'], row['total_achievements']),
+                ('total_achievements', 'targets_met'),
+            ),
+        },
+        dimensions=dimensions,
+    )
+
+
+GRADE_STATS = StatsSpec(
+    aggregates={
+        'total_grades': Count('id'),
+        'student_count': Count('student', distinct=True),
+        'average_score': Avg('score', default=0),
+        'lowest_score': Min('score'),
+        'highest_score': Max('score'),
+        'stddev_score': StdDev('score'),
+        'average_percentage': Avg(_ratio_percent('score', 'assessment__max_score'), default=0.0),
+    },
+    dimensions={
+        'assessment': {'assessment': 'assessment_id', 'assessment_title': 'assessment__title'},
+        'course': {'course': 'assessment__course_id', 'course_code': 'assessment__course__code'},
+        'department': {'department': 'assessment__course__department'},
+    },
+)
+
+PO_ACHIEVEMENT_STATS = _achievement_stats('program_outcome', {
+    'program_outcome': {'program_outcome': 'program_outcome_id', 'po_code': 'program_outcome__code'},
+    'department': {'department': 'program_outcome__department'},
+})
+
+LO_ACHIEVEMENT_STATS = _achievement_stats('learning_outcome', {
+    'learning_outcome': {'learning_outcome': 'learning_outcome_id', 'lo_code': 'learning_outcome__code'},
+    'course': {'course': 'learning_outcome__course_id', 'course_code': 'learning_outcome__course__code'},
+    'department': {'department': 'learning_outcome__course__department'},
+})
+
+# Per-PO numbers over ProgramOutcome rows, so POs without achievements still appear
+PROGRAM_OUTCOME_STATS = StatsSpec(
+    aggregates={
+        'total_students': Count('student_achievements__student', distinct=True),
+        'students_achieved': Count(
+            'student_achievements__student',
+            filter=Q(student_achievements__current_percentage__gte=F('target_percentage')),
+            distinct=True,
+        ),
+        'average_achievement': Avg('student_achievements__current_percentage', default=0),
+        'min_achievement': Min('student_achievements__current_percentage'),
+        'max_achievement': Max('student_achievements__current_percentage'),
+        'stddev_achievement': StdDev('student_achievements__current_percentage'),
+    },
+    derived={
+        'achievement_rate': Derived(
+            lambda row: percent(row['students_achieved'], row['total_students']),
+            ('students_achieved', 'total_students'),
+        ),
+    },
+    dimensions={
+        'program_outcome': {
+            'id': 'id', 'code': 'code', 'title': 'title', 'description': 'description',
+            'department': 'department', 'target_percentage': 'target_percentage',
+        },
+        'department': {'department': 'department'},
+    },
+)
+
 
 # =============================================================================
 # USER VIEWSET
 # =============================================================================
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for User CRUD operations
     """
     queryset = User.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['username', 'email', 'first_name', 'last_name', 'student_id']
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_vectors = ['search_vector']
+    search_trigram_fields = ['student_id', 'username', 'first_name', 'last_name']
     ordering_fields = ['created_at', 'username', 'role']
     ordering = ['-created_at']
     
@@ -98,7 +209,7 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Get current user info"""
-        serializer = UserDetailSerializer(request.user)
+        serializer = UserDetailSerializer(request.user, context=self.get_serializer_context())
         return Response(serializer.data)
     
     @action(detail=False, methods=['put', 'patch'])
@@ -387,7 +498,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
 # PROGRAM OUTCOME VIEWSET
 # =============================================================================
 
-class ProgramOutcomeViewSet(viewsets.ModelViewSet):
+class ProgramOutcomeViewSet(StatsMixin, SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for ProgramOutcome CRUD operations
     Only INSTITUTION role can create/update/delete POs
@@ -395,10 +506,12 @@ class ProgramOutcomeViewSet(viewsets.ModelViewSet):
     queryset = ProgramOutcome.objects.all()
     serializer_class = ProgramOutcomeSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['code', 'title', 'description']
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_vectors = ['search_vector']
+    search_trigram_fields = ['code']
     ordering_fields = ['code', 'created_at']
     ordering = ['code']
+    stats_spec = PROGRAM_OUTCOME_STATS
     
     def get_queryset(self):
         """Filter active POs for non-admin users and filter by department if provided"""
@@ -446,25 +559,24 @@ class ProgramOutcomeViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """Get PO statistics with achievement data"""
-        pos = ProgramOutcome.objects.filter(is_active=True).annotate(
-            total_students=Count('studentpoachievement__student', distinct=True),
-            students_achieved=Count(
-                'studentpoachievement',
-                filter=Q(studentpoachievement__achievement_percentage__gte=F('target_percentage')),
-                distinct=True
-            ),
-            average_achievement=Avg('studentpoachievement__achievement_percentage')
+        """Get PO statistics with achievement data (one grouped query)"""
+        pos = self.filter_queryset(self.get_queryset()).filter(is_active=True)
+        rows = self.stats_spec.compute(
+            pos, names=['total_students', 'students_achieved', 'average_achievement', 'achievement_rate'],
+            group_by='program_outcome',
         )
-        
-        serializer = ProgramOutcomeStatsSerializer(pos, many=True)
+        serializer = ProgramOutcomeStatsSerializer(rows, many=True)
         return Response(serializer.data)
 
 
@@ -472,14 +584,15 @@ class ProgramOutcomeViewSet(viewsets.ModelViewSet):
 # COURSE VIEWSET
 # =============================================================================
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for Course CRUD operations
     """
     queryset = Course.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['code', 'name', 'description']
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_vectors = ['search_vector']
+    search_trigram_fields = ['code']
     ordering_fields = ['code', 'semester', 'academic_year', 'created_at']
     ordering = ['code']
     
@@ -580,8 +693,12 @@ class CourseViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -589,10 +706,7 @@ class CourseViewSet(viewsets.ModelViewSet):
     def students(self, request, pk=None):
         """Get all students enrolled in this course"""
         course = self.get_object()
-        enrollments = Enrollment.objects.filter(
-            course=course,
-            is_active=True
-        ).select_related('student')
+        enrollments = course.enrollments.filter(is_active=True).select_related('student')
         
         serializer = EnrollmentSerializer(enrollments, many=True)
         return Response(serializer.data)
@@ -610,7 +724,7 @@ class CourseViewSet(viewsets.ModelViewSet):
 # ENROLLMENT VIEWSET
 # =============================================================================
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for Enrollment CRUD operations
     """
@@ -697,8 +811,12 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -707,7 +825,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
 # ASSESSMENT VIEWSET
 # =============================================================================
 
-class AssessmentViewSet(viewsets.ModelViewSet):
+class AssessmentViewSet(SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for Assessment CRUD operations
     """
@@ -746,8 +864,12 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         return queryset
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -765,7 +887,7 @@ class AssessmentViewSet(viewsets.ModelViewSet):
 # STUDENT GRADE VIEWSET
 # =============================================================================
 
-class StudentGradeViewSet(viewsets.ModelViewSet):
+class StudentGradeViewSet(StatsMixin, SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for StudentGrade CRUD operations
     """
@@ -774,6 +896,7 @@ class StudentGradeViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['graded_at', 'score']
     ordering = ['-graded_at']
+    stats_spec = GRADE_STATS
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -857,10 +980,76 @@ class StudentGradeViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
+        # Full lists can run to thousands of grades: read them as dicts, streamed when large
+        rows = self.project(StudentGradeProjection, queryset)
+        if rows is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+        return json_list_response(request, rows)
+    
+    @action(detail=False, methods=['post'], url_path='batch')
+    def batch(self, request):
+        """
+        Create or update many grades in one request
+        
+        POST /api/grades/batch/
+        Body: [{"student": 5, "assessment": 2, "score": 85.5, "feedback": "..."}, ...]
+              (or {"grades": [...]})
+        
+        Entries are validated together and the valid ones upserted in bulk;
+        invalid entries are reported per item without blocking the rest.
+        """
+        user = request.user
+        if user.role != User.Role.TEACHER and not user.is_staff:
+            raise PermissionDenied('Only teachers can grade in batch')
+        
+        entries = request.data.get('grades') if isinstance(request.data, dict) else request.data
+        if not isinstance(entries, list) or not entries:
+            return Response({
+                'success': False,
+                'error': 'Expected a non-empty list of grades'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > GRADE_BATCH_MAX_ITEMS:
+            return Response({
+                'success': False,
+                'error': f'At most {GRADE_BATCH_MAX_ITEMS} grades per batch'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = GradeImportService(user).batch(entries)
+        
+        # One log entry for the whole batch instead of one per grade
+        if result.created or result.updated:
+            assessment_ids = sorted({
+                int(entry['assessment']) for entry, item in zip(entries, result.items)
+                if item.status in ('created', 'updated')
+            })
+            log_activity(
+                action_type=ActivityLog.ActionType.GRADE_ASSIGNED,
+                user=user,
+                institution=get_institution_for_user(user),
+                department=user.department,
+                description=f"Batch graded: {result.created} assigned, {result.updated} updated",
+                related_object_type='StudentGrade',
+                metadata={
+                    'created': result.created,
+                    'updated': result.updated,
+                    'errors': result.failed,
+                    'assessment_ids': assessment_ids,
+                }
+            )
+        
+        return Response({
+            'success': True,
+            'created': result.created,
+            'updated': result.updated,
+            'failed': result.failed,
+            'results': [asdict(item) for item in result.items],
+        })
     
     def perform_create(self, serializer):
         """Save grade"""
@@ -871,7 +1060,7 @@ class StudentGradeViewSet(viewsets.ModelViewSet):
 # STUDENT PO ACHIEVEMENT VIEWSET
 # =============================================================================
 
-class StudentPOAchievementViewSet(viewsets.ReadOnlyModelViewSet):
+class StudentPOAchievementViewSet(StatsMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for StudentPOAchievement (Read-only)
     Achievements are calculated automatically
@@ -881,6 +1070,7 @@ class StudentPOAchievementViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['current_percentage', 'created_at']
     ordering = ['-created_at']
+    stats_spec = PO_ACHIEVEMENT_STATS
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -911,7 +1101,7 @@ class StudentPOAchievementViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset
 
-class LearningOutcomeViewSet(viewsets.ModelViewSet):
+class LearningOutcomeViewSet(SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for LearningOutcome CRUD operations
     Only TEACHER role can create/update/delete LOs for their courses
@@ -919,8 +1109,9 @@ class LearningOutcomeViewSet(viewsets.ModelViewSet):
     queryset = LearningOutcome.objects.all()
     serializer_class = LearningOutcomeSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['code', 'title', 'description']
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_vectors = ['search_vector']
+    search_trigram_fields = ['code']
     ordering_fields = ['code', 'created_at', 'course__code']
     ordering = ['course__code', 'code']
     
@@ -950,8 +1141,12 @@ class LearningOutcomeViewSet(viewsets.ModelViewSet):
         return queryset
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
@@ -993,7 +1188,7 @@ class LearningOutcomeViewSet(viewsets.ModelViewSet):
         
         instance.delete()
 
-class ContactRequestViewSet(viewsets.ModelViewSet):
+class ContactRequestViewSet(SparseFieldsetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for ContactRequest CRUD operations (admin only)
     """
@@ -1028,12 +1223,16 @@ class ContactRequestViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
     
     def list(self, request, *args, **kwargs):
-        """Override list to ensure proper response format"""
+        """Override list to ensure proper response format (keyset-paginated on request)"""
         queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_keyset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_keyset_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-class StudentLOAchievementViewSet(viewsets.ModelViewSet):
+class StudentLOAchievementViewSet(StatsMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Student LO Achievement model
     Endpoints: /api/lo-achievements/
@@ -1041,12 +1240,13 @@ class StudentLOAchievementViewSet(viewsets.ModelViewSet):
     queryset = StudentLOAchievement.objects.all()
     serializer_class = StudentLOAchievementSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['student__username', 'student__student_id', 
-                     'learning_outcome__code', 'learning_outcome__title',
-                     'learning_outcome__course__code']
+    filter_backends = [filters.OrderingFilter, FullTextSearchFilter]
+    search_vectors = ['student__search_vector', 'learning_outcome__search_vector',
+                      'learning_outcome__course__search_vector']
+    search_trigram_fields = ['student__student_id', 'student__username']
     ordering_fields = ['last_calculated', 'current_percentage']
     ordering = ['-last_calculated']
+    stats_spec = LO_ACHIEVEMENT_STATS
     
     def get_queryset(self):
         """Filter based on user role"""
@@ -1127,8 +1327,82 @@ class StudentLOAchievementViewSet(viewsets.ModelViewSet):
                 raise PermissionDenied("You can only view LO achievements for your own courses")
         
         achievements = self.get_queryset().filter(learning_outcome__course_id=course_id)
-        serializer = self.get_serializer(achievements, many=True)
-        return Response(serializer.data)
+        rows = self.project(StudentLOAchievementProjection, achievements)
+        if rows is None:
+            return Response(self.get_serializer(achievements, many=True).data)
+        return json_list_response(request, rows)
+    
+    @action(detail=False, methods=['get'])
+    def heatmap(self, request):
+        """
+        Get the student x LO achievement matrix of a course in columnar form
+        
+        GET /api/lo-achievements/heatmap/?course_id=1
+        Returns:
+            {
+                "course_id": 1,
+                "student_ids": [12, 15, ...],
+                "lo_codes": ["LO1", "LO2", ...],
+                "shape": [n_students, n_los],
+                "matrix": [72.5, null, ...]   # row-major, one row per student
+            }
+        """
+        course_id = request.query_params.get('course_id', None)
+        if not course_id:
+            return Response({'error': 'course_id parameter required'}, status=400)
+        
+        course = get_object_or_404(Course, id=course_id)
+        user = request.user
+        if user.role == User.Role.TEACHER:
+            if course.teacher_id != user.id:
+                raise PermissionDenied("You can only view LO achievements for your own courses")
+        elif user.role != User.Role.INSTITUTION and not user.is_staff:
+            raise PermissionDenied("Only teachers and institution admins can view course heatmaps")
+        
+        data = get_or_set_cache(
+            lo_heatmap_cache_key(course.id),
+            settings.CACHE_TIMEOUT_ANALYTICS,
+            self._build_heatmap,
+            course.id
+        )
+        return Response(data)
+    
+    @staticmethod
+    def _build_heatmap(course_id):
+        """Assemble the columnar heatmap payload for a course."""
+        lo_rows = list(
+            LearningOutcome.objects.filter(
+                course_id=course_id, is_active=True
+            ).order_by('code').values_list('id', 'code')
+        )
+        student_ids = list(
+            Enrollment.objects.filter(
+                course_id=course_id, is_active=True
+            ).exclude(
+                student__is_superuser=True
+            ).order_by('student_id').values_list('student_id', flat=True)
+        )
+        
+        lo_index = {lo_id: column for column, (lo_id, _) in enumerate(lo_rows)}
+        student_index = {student_id: row for row, student_id in enumerate(student_ids)}
+        width = len(lo_rows)
+        matrix = [None] * (len(student_ids) * width)
+        
+        # All cells come from a single query over the course's LO achievements
+        cells = StudentLOAchievement.objects.filter(
+            learning_outcome_id__in=list(lo_index),
+            student_id__in=list(student_index)
+        ).values_list('student_id', 'learning_outcome_id', 'current_percentage')
+        for student_id, lo_id, percentage in cells:
+            matrix[student_index[student_id] * width + lo_index[lo_id]] = float(percentage)
+        
+        return {
+            'course_id': course_id,
+            'student_ids': student_ids,
+            'lo_codes': [code for _, code in lo_rows],
+            'shape': [len(student_ids), width],
+            'matrix': matrix,
+        }
     
     @action(detail=False, methods=['get'])
     def by_learning_outcome(self, request):
@@ -1143,32 +1417,10 @@ class StudentLOAchievementViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        """Get summary statistics for LO achievements"""
-        queryset = self.get_queryset()
-        
-        total_achievements = queryset.count()
-        targets_met = queryset.filter(
-            current_percentage__gte=F('learning_outcome__target_percentage')
-        ).count()
-        
-        avg_percentage = queryset.aggregate(
-            avg=Avg('current_percentage')
-        )['avg'] or 0
-        
-        avg_completion = queryset.aggregate(
-            avg=Avg('completion_rate')
-        )['avg'] or 0
-        
-        return Response({
-            'total_achievements': total_achievements,
-            'targets_met': targets_met,
-            'targets_not_met': total_achievements - targets_met,
-            'average_percentage': round(avg_percentage, 2),
-            'average_completion_rate': round(avg_completion, 2),
-            'success_rate': round((targets_met / total_achievements * 100) if total_achievements > 0 else 0, 2)
-        })
+        """Get summary statistics for LO achievements (same as stats/, in one query)"""
+        return self.stats_response(request)
 
-class AssessmentLOViewSet(viewsets.ModelViewSet):
+class AssessmentLOViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Assessment-LO mapping CRUD operations
     Teachers can manage which assessments contribute to which LOs and their weights
@@ -1260,7 +1512,7 @@ class AssessmentLOViewSet(viewsets.ModelViewSet):
         
         serializer.save()
 
-class LOPOViewSet(viewsets.ModelViewSet):
+class LOPOViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for LO-PO mapping CRUD operations
     Teachers can manage which LOs contribute to which POs and their weights
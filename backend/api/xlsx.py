@@ -0,0 +1,158 @@
+"""
+AcuRate - Streaming XLSX Writer
+
+Writes single-sheet .xlsx workbooks row by row so large exports can be
+streamed to the client with bounded memory. A workbook is a zip archive of
+a few XML parts; the worksheet part is deflated as rows arrive and the
+compressed bytes are yielded as they are produced, so neither the rows nor
+the archive are ever held in full. Cells are numbers or inline strings,
+which every spreadsheet application reads without a shared strings table.
+
+Usage:
+    from api.xlsx import XLSX_CONTENT_TYPE, iter_xlsx
+
+    response = StreamingHttpResponse(
+        iter_xlsx(header, rows, sheet_name='Gradebook'),
+        content_type=XLSX_CONTENT_TYPE,
+    )
+"""
+
+import io
+import re
+import zipfile
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+XLSX_FLUSH_ROWS = 500  # Rows written before compressed output is yielded
+
+# Control characters are not allowed in XML 1.0 documents
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+# Characters Excel rejects in sheet names
+_ILLEGAL_SHEET_NAME_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+class _ChunkSink(io.RawIOBase):
+    """Unseekable output that collects written bytes until drained."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _cell(value: Any) -> str:
+    if value is None or value == '':
+        return '<c/>'
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(values: Sequence[Any]) -> str:
+    return '<row>' + ''.join(_cell(value) for value in values) + '</row>'
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+
+def iter_xlsx(
+    header: Sequence[Any],
+    rows: Iterable[Sequence[Any]],
+    sheet_name: str = 'Sheet1',
+    flush_rows: int = XLSX_FLUSH_ROWS,
+) -> Iterator[bytes]:
+    """
+    Yield the bytes of a one-sheet workbook containing ``header`` and ``rows``.
+
+    Args:
+        header: First row of the sheet.
+        rows: Row sequences; numbers become numeric cells, None an empty cell
+              and anything else a text cell.
+        sheet_name: Name of the worksheet tab (max. 31 characters).
+        flush_rows: Rows written between yields of compressed output.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        sheet_name = _ILLEGAL_SHEET_NAME_CHARS.sub(' ', sheet_name)[:31] or 'Sheet1'
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(sheet_name=escape(sheet_name, {'"': '&quot;'})))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(_SHEET_HEAD.encode('utf-8'))
+            for count, values in enumerate(chain([header], rows), start=1):
+                sheet.write(_row(values).encode('utf-8'))
+                if count % flush_rows == 0 and (data := sink.drain()):
+                    yield data
+            sheet.write(_SHEET_TAIL.encode('utf-8'))
+
+    yield sink.drain()
@@ -125,6 +125,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Full-text / trigram search lookups
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',  # For token blacklisting
@@ -140,7 +141,7 @@ if SPECTACULAR_AVAILABLE:
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.middleware.gzip.GZipMiddleware',  # Response compression
+    'api.middleware.CompressionMiddleware',  # Response compression (brotli / gzip)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -335,6 +336,30 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'api.exceptions.custom_exception_handler',
 }
 
+# Faster JSON (de)serialization with orjson when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'api.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
+# Responses smaller than this (bytes) are not worth compressing
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+
+# Unpaginated lists with at least this many items are streamed
+STREAMING_JSON_MIN_ITEMS = int(os.environ.get('STREAMING_JSON_MIN_ITEMS', '1000'))
+
 # Add API Documentation schema only if drf-spectacular is available
 if SPECTACULAR_AVAILABLE:
     REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
@@ -421,6 +446,14 @@ CACHE_TIMEOUT_ANALYTICS = 600  # 10 minutes - for analytics/dashboard data
 CACHE_TIMEOUT_DASHBOARD = 600  # 10 minutes - for dashboard data
 CACHE_TIMEOUT_STATIC_DATA = 3600  # 1 hour - for static data (departments, etc.)
 
+# --- Analytics ---
+# Populations at or below this size are answered exactly instead of from quantile sketches
+ANALYTICS_SKETCH_EXACT_THRESHOLD = int(os.environ.get('ANALYTICS_SKETCH_EXACT_THRESHOLD', '2000'))
+
+# --- Bulk Imports ---
+# Grade CSV uploads of at least this many bytes use the PostgreSQL COPY fast path (0 disables it)
+GRADE_IMPORT_COPY_THRESHOLD = int(os.environ.get('GRADE_IMPORT_COPY_THRESHOLD', str(1024 * 1024)))
+
 # --- Rate Limiting ---
 RATELIMIT_ENABLE = not DEBUG  # Enable in production
 RATELIMIT_USE_CACHE = 'default'
@@ -452,6 +485,16 @@ if CELERY_AVAILABLE:
     CELERY_TASK_SOFT_TIME_LIMIT = 25 * 60  # 25 minutes
     CELERY_TASK_ALWAYS_EAGER = DEBUG  # Run tasks synchronously in DEBUG mode
     CELERY_TASK_EAGER_PROPAGATES = True
+    CELERY_BEAT_SCHEDULE = {
+        'refresh-course-sketches': {
+            'task': 'api.tasks.refresh_course_sketches',
+            'schedule': 15 * 60,  # every 15 minutes
+        },
+        'snapshot-achievements': {
+            'task': 'api.tasks.snapshot_achievements',
+            'schedule': 24 * 60 * 60,  # daily
+        },
+    }
 
 # --- Sentry Integration (Optional - for error tracking) ---
 if not DEBUG: